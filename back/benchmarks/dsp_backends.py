@@ -0,0 +1,270 @@
+"""Compare the memory and speed of the signal processing backends.
+
+Synthetic recordings are written to a temporary directory. Each backend
+then runs in a fresh interpreter, which reports the time of the first
+spectrogram, which includes loading the signal processing libraries,
+and the peak memory before and after computing spectrograms (with the
+default parameters, which include PCEN), spectrograms of resampled and
+band-pass filtered audio, and resampled audio chunks for streaming.
+Running each backend in its own process keeps the libraries loaded by
+one backend out of the memory of the other.
+
+Finally, both backends compute the same spectrograms and audio chunks in
+this process and the largest differences between their outputs are
+reported.
+
+Usage::
+
+    python -m benchmarks.dsp_backends
+    python -m benchmarks.dsp_backends --recordings 5 --rounds 10
+
+Run the commands from the ``back`` directory.
+"""
+
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from benchmarks.suite.synthetic import write_recordings
+
+BACKENDS = ("torch", "numpy")
+
+WINDOW = 10.0
+"""Seconds of audio in each spectrogram and audio chunk."""
+
+STREAM_SAMPLERATE = 48_000
+"""Sample rate of the resampled audio chunks."""
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB and macOS reports bytes.
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def create_recording(path: Path, audio_dir: Path):
+    from whombat import schemas
+
+    info = sf.info(str(path))
+    return schemas.Recording(
+        uuid=uuid.uuid4(),
+        id=0,
+        path=path.relative_to(audio_dir),
+        date=None,
+        time=None,
+        latitude=None,
+        longitude=None,
+        time_expansion=1.0,
+        hash="",
+        duration=info.duration,
+        channels=info.channels,
+        samplerate=info.samplerate,
+        rights=None,
+    )
+
+
+def get_cases(audio_dir: Path, backend: str) -> dict:
+    """Operations to time, by name."""
+    from whombat import api, schemas
+
+    recordings = [
+        create_recording(path, audio_dir)
+        for path in sorted(audio_dir.glob("**/*.wav"))
+    ]
+    spectrogram_parameters = schemas.SpectrogramParameters()
+    filtered = schemas.AudioParameters(
+        resample=True,
+        samplerate=STREAM_SAMPLERATE,
+        low_freq=1_000,
+        high_freq=10_000,
+    )
+
+    def spectrograms(audio_parameters: schemas.AudioParameters):
+        return [
+            api.compute_spectrogram(
+                recording,
+                0,
+                min(WINDOW, recording.duration),
+                audio_parameters,
+                spectrogram_parameters,
+                audio_dir=audio_dir,
+                backend=backend,
+            )
+            for recording in recordings
+        ]
+
+    def stream():
+        return [
+            api.load_clip_bytes(
+                path=audio_dir / recording.path,
+                start=0,
+                frames=int(WINDOW * STREAM_SAMPLERATE),
+                target_samplerate=STREAM_SAMPLERATE,
+                backend=backend,
+            )[0]
+            for recording in recordings
+        ]
+
+    return {
+        "spectrogram": lambda: spectrograms(schemas.AudioParameters()),
+        "spectrogram (resampled, filtered)": lambda: spectrograms(filtered),
+        "stream (resampled)": stream,
+    }
+
+
+def run_worker(backend: str, audio_dir: Path, rounds: int) -> None:
+    """Time the cases of a backend and print the results as JSON."""
+    cases = get_cases(audio_dir, backend)
+    start_rss = peak_rss_mb()
+
+    times = {}
+    first_call = None
+    for name, func in cases.items():
+        start = time.perf_counter()
+        func()
+        if first_call is None:
+            first_call = time.perf_counter() - start
+
+        times[name] = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            func()
+            times[name].append(time.perf_counter() - start)
+
+    print(
+        json.dumps(
+            {
+                "first_call": first_call,
+                "start_rss": start_rss,
+                "peak_rss": peak_rss_mb(),
+                "torch_loaded": "torch" in sys.modules,
+                "times": {
+                    name: statistics.median(values)
+                    for name, values in times.items()
+                },
+            }
+        )
+    )
+
+
+def compare_outputs(audio_dir: Path) -> dict[str, float]:
+    """Largest absolute difference between the outputs of the backends."""
+    outputs = {
+        backend: {
+            name: func()
+            for name, func in get_cases(audio_dir, backend).items()
+        }
+        for backend in BACKENDS
+    }
+    differences = {}
+    for name, reference in outputs[BACKENDS[0]].items():
+        difference = 0.0
+        for expected, value in zip(
+            reference, outputs[BACKENDS[1]][name], strict=True
+        ):
+            if isinstance(expected, bytes):
+                expected = np.frombuffer(expected[44:], dtype=np.int16)
+                value = np.frombuffer(value[44:], dtype=np.int16)
+            difference = max(
+                difference,
+                float(np.abs(expected.astype(float) - value).max()),
+            )
+        differences[name] = difference
+    return differences
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--recordings", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--worker", choices=BACKENDS, help=argparse.SUPPRESS)
+    parser.add_argument("--audio-dir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        run_worker(args.worker, args.audio_dir, args.rounds)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        audio_dir = Path(tmp_dir)
+        write_recordings(
+            audio_dir,
+            args.recordings,
+            np.random.default_rng(args.seed),
+        )
+
+        results = {}
+        for backend in BACKENDS:
+            process = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.dsp_backends",
+                    "--worker",
+                    backend,
+                    "--audio-dir",
+                    str(audio_dir),
+                    "--rounds",
+                    str(args.rounds),
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            results[backend] = json.loads(process.stdout.splitlines()[-1])
+
+        differences = compare_outputs(audio_dir)
+
+    print(
+        f"{args.recordings} recordings, {WINDOW:.0f}s windows, "
+        f"median of {args.rounds} rounds\n"
+    )
+    width = max(len(name) for name in results[BACKENDS[0]]["times"])
+    header = "".join(f"{backend:>12}" for backend in BACKENDS)
+    print(f"{'':<{width}} {header}")
+    rows = [
+        ("first spectrogram", "first_call", 1000, "ms"),
+        ("peak RSS before", "start_rss", 1, "MB"),
+        ("peak RSS", "peak_rss", 1, "MB"),
+    ]
+    for label, key, scale, unit in rows:
+        values = "".join(
+            f"{results[backend][key] * scale:>10.0f}{unit}"
+            for backend in BACKENDS
+        )
+        print(f"{label:<{width}} {values}")
+    for name in results[BACKENDS[0]]["times"]:
+        values = "".join(
+            f"{results[backend]['times'][name] * 1000:>10.1f}ms"
+            for backend in BACKENDS
+        )
+        print(f"{name:<{width}} {values}")
+
+    for backend in BACKENDS:
+        if backend != "torch" and results[backend]["torch_loaded"]:
+            print(f"\nWarning: the {backend} backend imported torch")
+
+    print(
+        "\nLargest absolute difference between the backends "
+        "(spectrograms are scaled to [0, 1], audio is in 16 bit steps)"
+    )
+    for name, difference in differences.items():
+        print(f"  {name:<{width}} {difference:.3g}")
+
+
+if __name__ == "__main__":
+    main()
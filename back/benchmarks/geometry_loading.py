@@ -0,0 +1,143 @@
+"""Benchmark loading sound event geometries.
+
+Compares decoding geometries from their JSON representation, as they were
+stored before, against the compact binary encoding, and times loading
+sound events from a SQLite database with and without touching their
+geometries.
+
+Usage::
+
+    python benchmarks/geometry_loading.py --sound-events 10000
+"""
+
+import argparse
+import asyncio
+import datetime
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+from soundevent import data
+from sqlalchemy import insert, select
+
+from whombat import models, schemas
+from whombat.core.geometries import decode_geometry, encode_geometry
+from whombat.system.database import (
+    dispose_async_db_engines,
+    get_async_db_engine,
+    get_async_session,
+    init_database,
+)
+from whombat.system.settings import Settings
+
+
+def create_geometries(num: int, seed: int = 0) -> list[data.Geometry]:
+    rng = np.random.default_rng(seed)
+    start = rng.uniform(0, 60, num)
+    low = rng.uniform(1_000, 20_000, num)
+    return [
+        data.BoundingBox(
+            coordinates=[
+                float(start[i]),
+                float(low[i]),
+                float(start[i] + 0.1),
+                float(low[i] + 2_000),
+            ]
+        )
+        for i in range(num)
+    ]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+async def seed(settings: Settings, geometries: list[data.Geometry]) -> None:
+    await init_database(settings)
+    engine = get_async_db_engine(settings)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    async with get_async_session(engine) as session:
+        recording_id = await session.scalar(
+            insert(models.Recording)
+            .values(
+                uuid=uuid.uuid4(),
+                path=Path("recording.wav"),
+                hash="benchmark",
+                duration=60,
+                samplerate=48_000,
+                channels=1,
+                time_expansion=1,
+                created_on=now,
+            )
+            .returning(models.Recording.id)
+        )
+        await session.execute(
+            insert(models.SoundEvent),
+            [
+                dict(
+                    uuid=uuid.uuid4(),
+                    recording_id=recording_id,
+                    geometry_type=geometry.type,
+                    geometry=geometry,
+                    created_on=now,
+                )
+                for geometry in geometries
+            ],
+        )
+        await session.commit()
+
+
+async def load(settings: Settings, validate: bool) -> float:
+    engine = get_async_db_engine(settings)
+    async with get_async_session(engine) as session:
+        start = time.perf_counter()
+        result = await session.scalars(select(models.SoundEvent))
+        sound_events = result.unique().all()
+        if validate:
+            for sound_event in sound_events:
+                schemas.SoundEvent.model_validate(sound_event)
+        return time.perf_counter() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sound-events", type=int, default=10_000)
+    args = parser.parse_args()
+
+    geometries = create_geometries(args.sound_events)
+    encoded_json = [geometry.model_dump_json() for geometry in geometries]
+    encoded_binary = [encode_geometry(geometry) for geometry in geometries]
+
+    _, json_time = timed(
+        lambda: [
+            data.geometry_validate(value, mode="json")
+            for value in encoded_json
+        ]
+    )
+    _, binary_time = timed(
+        lambda: [decode_geometry(value) for value in encoded_binary]
+    )
+    print(f"Decoding {args.sound_events} geometries")
+    print(f"  json:   {json_time * 1000:8.1f}ms")
+    print(f"  binary: {binary_time * 1000:8.1f}ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = Settings(db_name=str(Path(tmp) / "whombat.db"))
+        await seed(settings, geometries)
+
+        # Warm up the connection pool and the statement cache.
+        await load(settings, validate=False)
+        lazy_time = await load(settings, validate=False)
+        schema_time = await load(settings, validate=True)
+        print(f"Loading {args.sound_events} sound events")
+        print(f"  models only:  {lazy_time * 1000:8.1f}ms")
+        print(f"  with schemas: {schema_time * 1000:8.1f}ms")
+        await dispose_async_db_engines(settings)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,466 @@
+"""Simulate concurrent annotators against the Whombat ASGI app.
+
+Each virtual user logs in as its own annotator and repeats the session of
+someone working through an annotation project: claim the next task, load
+its clip annotation, fetch the spectrogram, stream the audio with range
+requests, draw sound events with tags, add another tag and mark the task
+as completed. Users wait a random think time between actions.
+
+The app is created with the regular settings and middlewares and called
+in process through ``httpx.ASGITransport``, so a run measures what a
+single worker sustains. The database is populated with the synthetic
+data of the benchmark suite, in a temporary SQLite file or in the
+database given with ``--database-url``, whose tables are dropped.
+
+With ``--url`` the requests go over HTTP to a running server instead,
+which is how a server with several workers is measured. The server must
+use the database given with ``--database-url`` and the audio directory
+given with ``--audio-dir``, where the synthetic recordings are written.
+
+Throughput and p50/p95/p99 latencies are reported per endpoint for each
+number of concurrent users.
+
+Usage::
+
+    python -m benchmarks.load_generator --users 1,5,10,20 --duration 30
+    python -m benchmarks.load_generator --users 10 --think-time 2
+    python -m benchmarks.load_generator --output load.json
+    python -m benchmarks.load_generator --url http://localhost:5000 \
+        --database-url sqlite+aiosqlite:////tmp/load/load.db \
+        --audio-dir /tmp/load/audio
+
+Run the commands from the ``back`` directory.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+from benchmarks.suite.cases import login, reset_database
+from benchmarks.suite.synthetic import SyntheticConfig, create_synthetic_data
+
+from whombat import api
+from whombat.system import create_app
+from whombat.system.database import (
+    dispose_async_db_engines,
+    get_async_db_engine,
+    get_async_session,
+    init_database,
+)
+from whombat.system.settings import Settings, get_settings
+
+PASSWORD = "annotator"
+
+TAGS = [
+    {
+        "key": "species",
+        "value": f"species_{index}",
+        "canonical_name": f"Species {index}",
+    }
+    for index in range(20)
+]
+"""Tags created by the synthetic data."""
+
+MAX_RANGE_REQUESTS = 8
+"""Maximum number of audio chunks streamed per task."""
+
+
+@dataclass
+class Stats:
+    """Latencies and failures of the requests of a run."""
+
+    latencies: dict[str, list[float]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    tasks: int = 0
+
+    def summary(self, elapsed: float) -> dict[str, dict[str, float]]:
+        summary = {}
+        for name, latencies in sorted(self.latencies.items()):
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            summary[name] = {
+                "requests": len(latencies),
+                "errors": self.errors.get(name, 0),
+                "throughput": len(latencies) / elapsed,
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99),
+            }
+        return summary
+
+
+class Annotator:
+    """A virtual user annotating the tasks of a project."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        project_uuid: str,
+        stats: Stats,
+        rng: np.random.Generator,
+        think_time: float,
+    ):
+        self.client = client
+        self.project_uuid = project_uuid
+        self.stats = stats
+        self.rng = rng
+        self.think_time = think_time
+
+    async def request(
+        self,
+        name: str,
+        method: str,
+        url: str,
+        **kwargs,
+    ) -> httpx.Response | None:
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        self.stats.latencies[name].append(time.perf_counter() - start)
+        if response is None or response.is_error:
+            self.stats.errors[name] += 1
+            return None
+        return response
+
+    async def think(self) -> None:
+        if self.think_time > 0:
+            await asyncio.sleep(self.rng.exponential(self.think_time))
+
+    async def run(self, deadline: float) -> None:
+        after = None
+        while time.perf_counter() < deadline:
+            task = await self.request(
+                "GET /annotation_tasks/next/",
+                "GET",
+                "/api/v1/annotation_tasks/next/",
+                params={
+                    "annotation_project_uuid": self.project_uuid,
+                    "claim": True,
+                    **({"after": after} if after else {}),
+                },
+            )
+            if task is None:
+                return
+            after = task.json()["uuid"]
+            await self.annotate(after)
+            self.stats.tasks += 1
+
+    async def annotate(self, task_uuid: str) -> None:
+        response = await self.request(
+            "GET /annotation_tasks/detail/clip_annotation/",
+            "GET",
+            "/api/v1/annotation_tasks/detail/clip_annotation/",
+            params={"annotation_task_uuid": task_uuid},
+        )
+        if response is None:
+            return
+        clip_annotation = response.json()
+        clip = clip_annotation["clip"]
+        recording = clip["recording"]
+        window = {
+            "recording_uuid": recording["uuid"],
+            "start_time": clip["start_time"],
+            "end_time": clip["end_time"],
+        }
+
+        await self.request(
+            "GET /spectrograms/",
+            "GET",
+            "/api/v1/spectrograms/",
+            params=window,
+        )
+        await self.stream_audio(window)
+        await self.think()
+
+        for _ in range(self.rng.integers(1, 4)):
+            annotation = await self.create_sound_event(
+                clip_annotation["uuid"],
+                clip,
+                recording["samplerate"],
+            )
+            await self.think()
+            if annotation is None:
+                continue
+            used = {tag["value"] for tag in annotation["tags"]}
+            tag = self.rng.choice(
+                [tag for tag in TAGS if tag["value"] not in used]
+            )
+            await self.request(
+                "POST /sound_event_annotations/detail/tags/",
+                "POST",
+                "/api/v1/sound_event_annotations/detail/tags/",
+                params={
+                    "sound_event_annotation_uuid": annotation["uuid"],
+                    "key": tag["key"],
+                    "value": tag["value"],
+                },
+            )
+
+        await self.request(
+            "POST /annotation_tasks/detail/badges/",
+            "POST",
+            "/api/v1/annotation_tasks/detail/badges/",
+            params={"annotation_task_uuid": task_uuid, "state": "completed"},
+        )
+        await self.think()
+
+    async def stream_audio(self, window: dict) -> None:
+        start = 0
+        for _ in range(MAX_RANGE_REQUESTS):
+            response = await self.request(
+                "GET /audio/stream/",
+                "GET",
+                "/api/v1/audio/stream/",
+                params=window,
+                headers={"Range": f"bytes={start}-"},
+            )
+            if response is None:
+                return
+            content_range = response.headers.get("content-range", "")
+            _, _, positions = content_range.partition(" ")
+            byte_range, _, size = positions.partition("/")
+            if not byte_range or not size:
+                return
+            start = int(byte_range.split("-")[1]) + 1
+            if start >= int(size):
+                return
+
+    async def create_sound_event(
+        self,
+        clip_annotation_uuid: str,
+        clip: dict,
+        samplerate: int,
+    ) -> dict | None:
+        start = self.rng.uniform(clip["start_time"], clip["end_time"] - 0.2)
+        low = self.rng.uniform(0.05, 0.8) * samplerate / 2
+        high = low + self.rng.uniform(0.05, 0.15) * samplerate / 2
+        response = await self.request(
+            "POST /sound_event_annotations/",
+            "POST",
+            "/api/v1/sound_event_annotations/",
+            params={"clip_annotation_uuid": clip_annotation_uuid},
+            json={
+                "geometry": {
+                    "type": "BoundingBox",
+                    "coordinates": [start, low, start + 0.2, high],
+                },
+                "tags": [TAGS[self.rng.integers(len(TAGS))]],
+            },
+        )
+        return response.json() if response is not None else None
+
+
+async def create_annotators(settings: Settings, num: int) -> list[str]:
+    usernames = [f"annotator_{index}" for index in range(num)]
+    engine = get_async_db_engine(settings)
+    async with get_async_session(engine) as session:
+        existing = {
+            user.username
+            for user in (await api.users.get_many(session, limit=None))[0]
+        }
+        for username in usernames:
+            if username in existing:
+                continue
+            await api.users.create(
+                session,
+                username=username,
+                password=PASSWORD,
+                email=f"{username}@example.com",
+            )
+        await session.commit()
+    return usernames
+
+
+async def simulate(
+    settings: Settings,
+    project_uuid: str,
+    num_users: int,
+    duration: float,
+    ramp_up: float,
+    think_time: float,
+    seed: int,
+    url: str | None = None,
+) -> tuple[Stats, float]:
+    usernames = await create_annotators(settings, num_users)
+    transport = None
+    if url is None:
+        app = create_app(settings)
+        app.dependency_overrides[get_settings] = lambda: settings
+        transport = httpx.ASGITransport(app=app)
+    stats = Stats()
+    clients = []
+    annotators = []
+    for index, username in enumerate(usernames):
+        client = httpx.AsyncClient(
+            transport=transport,
+            base_url=url or "http://localhost",
+            timeout=None,
+        )
+        await login(client, username, PASSWORD)
+        clients.append(client)
+        annotators.append(
+            Annotator(
+                client,
+                project_uuid,
+                stats,
+                np.random.default_rng([seed, index]),
+                think_time,
+            )
+        )
+
+    async def start(index: int, annotator: Annotator, deadline: float):
+        await asyncio.sleep(ramp_up * index / num_users)
+        await annotator.run(deadline)
+
+    begin = time.perf_counter()
+    deadline = begin + duration
+    try:
+        await asyncio.gather(
+            *(
+                start(index, annotator, deadline)
+                for index, annotator in enumerate(annotators)
+            )
+        )
+    finally:
+        elapsed = time.perf_counter() - begin
+        for client in clients:
+            await client.aclose()
+    return stats, elapsed
+
+
+def print_summary(num_users: int, stats: Stats, elapsed: float) -> None:
+    summary = stats.summary(elapsed)
+    total = sum(entry["requests"] for entry in summary.values())
+    print(
+        f"\n{num_users} users: {total / elapsed:.1f} requests/s, "
+        f"{stats.tasks / elapsed * 60:.1f} tasks/min over {elapsed:.1f}s"
+    )
+    width = max((len(name) for name in summary), default=10)
+    print(
+        f"{'endpoint':<{width}} {'req/s':>8} {'errors':>7} "
+        f"{'p50':>9} {'p95':>9} {'p99':>9}"
+    )
+    for name, entry in summary.items():
+        print(
+            f"{name:<{width}} {entry['throughput']:>8.1f} "
+            f"{entry['errors']:>7} "
+            f"{entry['p50'] * 1000:>7.1f}ms "
+            f"{entry['p95'] * 1000:>7.1f}ms "
+            f"{entry['p99'] * 1000:>7.1f}ms"
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--users",
+        type=lambda value: [int(num) for num in value.split(",")],
+        default=[1, 5, 10],
+        help="Comma separated numbers of concurrent users to simulate.",
+    )
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--ramp-up", type=float, default=5)
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=0,
+        help="Mean seconds users wait between actions.",
+    )
+    parser.add_argument("--recordings", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--database-url")
+    parser.add_argument(
+        "--url",
+        help="Base URL of a running server to send the requests to.",
+    )
+    parser.add_argument(
+        "--audio-dir",
+        type=Path,
+        help="Directory for the recordings, the audio directory of the "
+        "server when using --url.",
+    )
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+    if args.url and not (args.database_url and args.audio_dir):
+        parser.error("--url requires --database-url and --audio-dir")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        audio_dir = args.audio_dir or Path(tmp_dir)
+        audio_dir.mkdir(parents=True, exist_ok=True)
+        settings = Settings(
+            db_url=args.database_url,
+            db_name=str(audio_dir / "load.db"),
+            audio_dir=audio_dir,
+            open_on_startup=False,
+        )
+        await init_database(settings)
+        engine = get_async_db_engine(settings)
+        if args.database_url:
+            await reset_database(engine)
+
+        async with get_async_session(engine) as session:
+            data = await create_synthetic_data(
+                session,
+                audio_dir,
+                SyntheticConfig(
+                    recordings=args.recordings,
+                    tasks=args.tasks,
+                    sound_events=args.tasks,
+                    seed=args.seed,
+                ),
+            )
+        print(
+            f"Created {args.recordings} recordings and {args.tasks} tasks "
+            f"on {engine.url.get_backend_name()}"
+        )
+
+        for num_users in args.users:
+            stats, elapsed = await simulate(
+                settings,
+                str(data.annotation_project.uuid),
+                num_users=num_users,
+                duration=args.duration,
+                ramp_up=args.ramp_up,
+                think_time=args.think_time,
+                seed=args.seed,
+                url=args.url,
+            )
+            print_summary(num_users, stats, elapsed)
+            results[num_users] = {
+                "tasks": stats.tasks,
+                "elapsed": elapsed,
+                "endpoints": stats.summary(elapsed),
+            }
+
+        await dispose_async_db_engines()
+
+    if args.output is not None:
+        args.output.write_text(
+            json.dumps(
+                {"config": vars(args), "results": results},
+                indent=2,
+                default=str,
+            )
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
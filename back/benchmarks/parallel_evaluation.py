@@ -0,0 +1,129 @@
+"""Benchmark the parallel evaluation of model runs.
+
+Evaluates a synthetic sound event detection model run sequentially and
+with an increasing number of worker processes, and reports the speed-up
+over the sequential evaluation.
+
+Usage::
+
+    python benchmarks/parallel_evaluation.py --clips 5000 --workers 1 2 4 8
+"""
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+import numpy as np
+from soundevent import data
+
+from whombat.api.evaluations import (
+    evaluate_predictions,
+    evaluate_predictions_in_parallel,
+)
+from whombat.schemas.evaluation_sets import PredictionTypes
+
+TAGS = [data.Tag(key="species", value=f"species_{i}") for i in range(10)]
+
+
+def create_model_run(
+    num_clips: int,
+    sound_events_per_clip: int,
+    seed: int = 0,
+) -> tuple[list[data.ClipPrediction], list[data.ClipAnnotation]]:
+    rng = np.random.default_rng(seed)
+    recording = data.Recording(
+        path=Path("recording.wav"),
+        duration=num_clips,
+        samplerate=48_000,
+        channels=1,
+    )
+    predictions = []
+    annotations = []
+    for index in range(num_clips):
+        clip = data.Clip(
+            recording=recording,
+            start_time=index,
+            end_time=index + 1,
+        )
+        annotated = []
+        predicted = []
+        for _ in range(sound_events_per_clip):
+            start = index + rng.uniform(0, 0.9)
+            low = rng.uniform(1_000, 20_000)
+            geometry = data.BoundingBox(
+                coordinates=[start, low, start + 0.1, low + 2_000]
+            )
+            annotated.append(
+                data.SoundEventAnnotation(
+                    sound_event=data.SoundEvent(
+                        recording=recording,
+                        geometry=geometry,
+                    ),
+                    tags=[TAGS[rng.integers(len(TAGS))]],
+                )
+            )
+            jitter = rng.normal(0, 0.02, 4) * [1, 100, 1, 100]
+            predicted.append(
+                data.SoundEventPrediction(
+                    sound_event=data.SoundEvent(
+                        recording=recording,
+                        geometry=data.BoundingBox(
+                            coordinates=list(
+                                np.array(geometry.coordinates) + jitter
+                            )
+                        ),
+                    ),
+                    score=float(rng.uniform()),
+                    tags=[
+                        data.PredictedTag(tag=tag, score=float(score))
+                        for tag, score in zip(
+                            TAGS,
+                            rng.dirichlet(np.ones(len(TAGS))),
+                            strict=True,
+                        )
+                    ],
+                )
+            )
+        annotations.append(
+            data.ClipAnnotation(clip=clip, sound_events=annotated)
+        )
+        predictions.append(
+            data.ClipPrediction(clip=clip, sound_events=predicted)
+        )
+    return predictions, annotations
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clips", type=int, default=2000)
+    parser.add_argument("--sound-events", type=int, default=5)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    predictions, annotations = create_model_run(args.clips, args.sound_events)
+    task = PredictionTypes.sound_event_detection
+
+    start = time.perf_counter()
+    evaluate_predictions(predictions, annotations, TAGS, task)
+    baseline = time.perf_counter() - start
+    print(f"sequential: {baseline:.2f}s")
+
+    for workers in args.workers:
+        start = time.perf_counter()
+        await evaluate_predictions_in_parallel(
+            predictions,
+            annotations,
+            TAGS,
+            task,
+            max_workers=workers,
+        )
+        elapsed = time.perf_counter() - start
+        print(
+            f"parallel ({workers} workers): {elapsed:.2f}s "
+            f"speed-up {baseline / elapsed:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,170 @@
+"""Benchmark the serialization of API list responses.
+
+Builds a page of clip annotations, each with its clip, recording, tags
+and sound event annotations, and times turning it into a JSON response
+with the regular FastAPI serialization rendered by the standard library
+and by orjson, and with the fast path used for routes that return the
+exact response model.
+
+Usage::
+
+    python benchmarks/response_serialization.py --items 100 --repeat 50
+"""
+
+import argparse
+import asyncio
+import datetime
+import time
+import uuid
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from pydantic import TypeAdapter
+from soundevent import data
+
+from whombat import schemas
+from whombat.system.app.responses import get_exact_response
+
+
+def create_page(
+    num_items: int,
+    num_tags: int = 3,
+    num_sound_events: int = 5,
+) -> schemas.Page:
+    user = schemas.SimpleUser(
+        id=uuid.uuid4(),
+        username="annotator",
+        email="annotator@example.com",
+    )
+    tags = [
+        schemas.Tag(
+            id=index,
+            key="species",
+            value=f"Species {index}",
+            canonical_name=f"Species {index}",
+        )
+        for index in range(num_tags)
+    ]
+    items = []
+    for index in range(num_items):
+        recording = schemas.Recording(
+            uuid=uuid.uuid4(),
+            id=index,
+            path=Path(f"recordings/{index}.wav"),
+            date=datetime.date(2024, 1, 1),
+            time=datetime.time(12, 0),
+            latitude=51.5,
+            longitude=-0.1,
+            time_expansion=1,
+            hash=uuid.uuid4().hex,
+            duration=60,
+            channels=1,
+            samplerate=48_000,
+            rights=None,
+            tags=tags,
+        )
+        clip = schemas.Clip(
+            uuid=uuid.uuid4(),
+            id=index,
+            start_time=0,
+            end_time=10,
+            recording=recording,
+        )
+        sound_events = [
+            schemas.SoundEventAnnotation(
+                uuid=uuid.uuid4(),
+                id=index * num_sound_events + offset,
+                created_by=user,
+                sound_event=schemas.SoundEvent(
+                    uuid=uuid.uuid4(),
+                    id=index * num_sound_events + offset,
+                    geometry=data.BoundingBox(
+                        coordinates=[offset, 1_000, offset + 0.5, 5_000]
+                    ),
+                    geometry_type="BoundingBox",
+                ),
+                tags=tags[:1],
+            )
+            for offset in range(num_sound_events)
+        ]
+        items.append(
+            schemas.ClipAnnotation(
+                uuid=uuid.uuid4(),
+                id=index,
+                clip=clip,
+                tags=tags,
+                sound_events=sound_events,
+            )
+        )
+    return schemas.Page(
+        items=items,
+        total=num_items,
+        offset=0,
+        limit=num_items,
+    )
+
+
+def get_route(response_model) -> APIRoute:
+    app = FastAPI()
+
+    @app.get("/", response_model=response_model)
+    async def endpoint():
+        pass
+
+    (route,) = [r for r in app.routes if isinstance(r, APIRoute)]
+    return route
+
+
+async def time_fastapi(route: APIRoute, page, response_class) -> float:
+    start = time.perf_counter()
+    content = await serialize_response(
+        field=route.response_field,
+        response_content=page,
+    )
+    response_class(content)
+    return time.perf_counter() - start
+
+
+def time_fast_path(route: APIRoute, adapter: TypeAdapter, page) -> float:
+    start = time.perf_counter()
+    adapter.dump_json(
+        get_exact_response(page, route.response_model),
+        by_alias=True,
+    )
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    response_model = schemas.Page[schemas.ClipAnnotation]
+    route = get_route(response_model)
+    adapter = TypeAdapter(response_model)
+    page = create_page(args.items)
+
+    timings = {
+        "fastapi + json": [
+            await time_fastapi(route, page, JSONResponse)
+            for _ in range(args.repeat)
+        ],
+        "fastapi + orjson": [
+            await time_fastapi(route, page, ORJSONResponse)
+            for _ in range(args.repeat)
+        ],
+        "exact model": [
+            time_fast_path(route, adapter, page) for _ in range(args.repeat)
+        ],
+    }
+
+    print(f"Page of {args.items} clip annotations, best of {args.repeat}")
+    for name, values in timings.items():
+        print(f"  {name:>16}: {min(values) * 1000:8.2f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
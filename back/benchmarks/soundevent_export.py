@@ -0,0 +1,251 @@
+"""Benchmark the export of annotation projects to `soundevent` format.
+
+Creates a synthetic annotation project in a temporary SQLite database and
+times `annotation_projects.to_soundevent`, which converts all tasks and
+clip annotations in bulk. With `--legacy`, also times the conversion of
+the same clip annotations one at a time with
+`clip_annotations.to_soundevent`, as the export used to do.
+
+Usage::
+
+    python benchmarks/soundevent_export.py --clips 10000 --sound-events 5
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from uuid import uuid4
+
+import numpy as np
+from soundevent import data
+
+from whombat import api, models, schemas
+from whombat.api.common import create_objects
+from whombat.system.database import get_database_url, init_database
+from whombat.system.settings import Settings
+
+BATCH_SIZE = 1000
+
+
+async def insert(session, model, rows, returning=None):
+    ids = []
+    for start in range(0, len(rows), BATCH_SIZE):
+        result = await create_objects(
+            session,
+            model,
+            rows[start : start + BATCH_SIZE],
+            returning=[returning] if returning is not None else None,
+        )
+        if returning is not None:
+            ids.extend(row[0] for row in result or [])
+    return ids
+
+
+async def create_project(
+    session,
+    num_clips: int,
+    sound_events_per_clip: int,
+    num_recordings: int = 100,
+    num_tags: int = 20,
+    seed: int = 0,
+) -> schemas.AnnotationProject:
+    rng = np.random.default_rng(seed)
+    user = await api.users.create(
+        session,
+        username="benchmark",
+        password="benchmark",
+        email="benchmark@example.com",
+    )
+    project = await api.annotation_projects.create(
+        session,
+        name="benchmark",
+        description="Synthetic project",
+        user=user,
+    )
+    tag_ids = await insert(
+        session,
+        models.Tag,
+        [
+            {
+                "key": "species",
+                "value": f"species_{index}",
+                "canonical_name": f"Species {index}",
+            }
+            for index in range(num_tags)
+        ],
+        returning=models.Tag.id,
+    )
+    clips_per_recording = max(num_clips // num_recordings, 1)
+    recording_ids = await insert(
+        session,
+        models.Recording,
+        [
+            {
+                "uuid": uuid4(),
+                "hash": uuid4().hex,
+                "path": Path(f"recording_{index}.wav"),
+                "duration": float(clips_per_recording),
+                "samplerate": 48_000,
+                "channels": 1,
+            }
+            for index in range(num_recordings)
+        ],
+        returning=models.Recording.id,
+    )
+    clip_rows = [
+        {
+            "uuid": uuid4(),
+            "recording_id": recording_ids[index % num_recordings],
+            "start_time": float(index // num_recordings),
+            "end_time": float(index // num_recordings + 1),
+        }
+        for index in range(num_clips)
+    ]
+    clip_ids = await insert(
+        session,
+        models.Clip,
+        clip_rows,
+        returning=models.Clip.id,
+    )
+    annotation_ids = await insert(
+        session,
+        models.ClipAnnotation,
+        [{"uuid": uuid4(), "clip_id": clip_id} for clip_id in clip_ids],
+        returning=models.ClipAnnotation.id,
+    )
+    await insert(
+        session,
+        models.AnnotationTask,
+        [
+            {
+                "uuid": uuid4(),
+                "annotation_project_id": project.id,
+                "clip_id": clip_id,
+                "clip_annotation_id": annotation_id,
+            }
+            for clip_id, annotation_id in zip(
+                clip_ids, annotation_ids, strict=True
+            )
+        ],
+    )
+
+    sound_event_rows = []
+    parents = []
+    for clip, annotation_id in zip(clip_rows, annotation_ids, strict=True):
+        for _ in range(sound_events_per_clip):
+            start = clip["start_time"] + rng.uniform(0, 0.9)
+            low = rng.uniform(1_000, 20_000)
+            sound_event_rows.append(
+                {
+                    "uuid": uuid4(),
+                    "recording_id": clip["recording_id"],
+                    "geometry_type": "BoundingBox",
+                    "geometry": data.BoundingBox(
+                        coordinates=[start, low, start + 0.1, low + 2_000]
+                    ),
+                }
+            )
+            parents.append(annotation_id)
+    sound_event_ids = await insert(
+        session,
+        models.SoundEvent,
+        sound_event_rows,
+        returning=models.SoundEvent.id,
+    )
+    sound_event_annotation_ids = await insert(
+        session,
+        models.SoundEventAnnotation,
+        [
+            {
+                "uuid": uuid4(),
+                "clip_annotation_id": annotation_id,
+                "sound_event_id": sound_event_id,
+                "created_by_id": user.id,
+            }
+            for annotation_id, sound_event_id in zip(
+                parents, sound_event_ids, strict=True
+            )
+        ],
+        returning=models.SoundEventAnnotation.id,
+    )
+    await insert(
+        session,
+        models.SoundEventAnnotationTag,
+        [
+            {
+                "sound_event_annotation_id": annotation_id,
+                "tag_id": tag_ids[rng.integers(num_tags)],
+                "created_by_id": user.id,
+            }
+            for annotation_id in sound_event_annotation_ids
+        ],
+    )
+    await session.commit()
+    return project
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clips", type=int, default=10_000)
+    parser.add_argument("--sound-events", type=int, default=5)
+    parser.add_argument("--legacy", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        audio_dir = Path(tmp_dir)
+        settings = Settings(
+            db_dialect="sqlite",
+            db_name=str(audio_dir / "benchmark.db"),
+            audio_dir=audio_dir,
+        )
+        await init_database(settings)
+        db_url = get_database_url(settings)
+
+        async with api.create_session(db_url) as session:
+            start = time.perf_counter()
+            project = await create_project(
+                session,
+                args.clips,
+                args.sound_events,
+            )
+            print(
+                f"created {args.clips} clip annotations with "
+                f"{args.clips * args.sound_events} sound event annotations "
+                f"in {time.perf_counter() - start:.2f}s"
+            )
+
+        async with api.create_session(db_url) as session:
+            start = time.perf_counter()
+            await api.annotation_projects.to_soundevent(
+                session,
+                project,
+                audio_dir=audio_dir,
+            )
+            print(f"bulk export: {time.perf_counter() - start:.2f}s")
+
+        if not args.legacy:
+            return
+
+        async with api.create_session(db_url) as session:
+            start = time.perf_counter()
+            annotations, _ = await api.annotation_projects.get_annotations(
+                session,
+                project,
+                limit=-1,
+            )
+            for annotation in annotations:
+                await api.clip_annotations.to_soundevent(
+                    session,
+                    annotation,
+                    audio_dir=audio_dir,
+                )
+            print(
+                "one at a time (clip annotations only): "
+                f"{time.perf_counter() - start:.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
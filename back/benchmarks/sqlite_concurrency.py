@@ -0,0 +1,180 @@
+"""Benchmark concurrent annotators against a SQLite database.
+
+Seeds a fresh database for each SQLite profile and runs several annotator
+processes at once. Each annotator reads a page of clip annotations and then
+adds a sound event annotation to one of them, committing after each write.
+The benchmark reports the throughput, the latency percentiles and the
+number of operations that failed because the database was locked.
+
+Usage::
+
+    python benchmarks/sqlite_concurrency.py --annotators 8 --duration 10
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+from soundevent import data
+from sqlalchemy.exc import OperationalError
+
+from whombat import api
+from whombat.system.database import (
+    create_async_db_engine,
+    get_async_session,
+    get_database_url,
+    get_sqlite_pragmas,
+    init_database,
+)
+from whombat.system.settings import Settings
+
+PROFILES = ["default", "performance"]
+
+
+def get_settings(directory: Path, profile: str) -> Settings:
+    return Settings(
+        db_name=str(directory / f"{profile}.db"),
+        db_sqlite_profile=profile,  # type: ignore
+        audio_dir=directory,
+    )
+
+
+async def seed(settings: Settings, num_clips: int) -> None:
+    await init_database(settings)
+    path = settings.audio_dir / "recording.wav"
+    sf.write(path, np.zeros(8_000 * num_clips, dtype=np.float32), 8_000)
+
+    engine = create_async_db_engine(
+        get_database_url(settings),
+        sqlite_pragmas=get_sqlite_pragmas(settings),
+    )
+    try:
+        async with get_async_session(engine) as session:
+            recording = await api.recordings.create(
+                session,
+                path,
+                audio_dir=settings.audio_dir,
+            )
+            for index in range(num_clips):
+                clip = await api.clips.create(
+                    session,
+                    recording,
+                    start_time=index,
+                    end_time=index + 1,
+                )
+                await api.clip_annotations.create(session, clip)
+            await session.commit()
+    finally:
+        await engine.dispose()
+
+
+async def annotate(
+    settings: Settings,
+    duration: float,
+    num_clips: int,
+    seed: int,
+    page_size: int = 50,
+) -> tuple[list[float], int]:
+    rng = random.Random(seed)
+    engine = create_async_db_engine(
+        get_database_url(settings),
+        sqlite_pragmas=get_sqlite_pragmas(settings),
+    )
+    latencies = []
+    locked = 0
+    try:
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end:
+            start = time.perf_counter()
+            try:
+                async with get_async_session(engine) as session:
+                    clip_annotations, _ = await api.clip_annotations.get_many(
+                        session,
+                        limit=page_size,
+                        offset=rng.randrange(max(num_clips - page_size, 1)),
+                    )
+                    clip_annotation = rng.choice(clip_annotations)
+                    offset = clip_annotation.clip.start_time
+                    sound_event = await api.sound_events.create(
+                        session,
+                        recording=clip_annotation.clip.recording,
+                        geometry=data.TimeStamp(
+                            coordinates=offset + rng.random()
+                        ),
+                    )
+                    await api.sound_event_annotations.create(
+                        session,
+                        sound_event=sound_event,
+                        clip_annotation=clip_annotation,
+                    )
+                    await session.commit()
+            except OperationalError as error:
+                if "locked" not in str(error):
+                    raise
+                locked += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+    finally:
+        await engine.dispose()
+    return latencies, locked
+
+
+def run_annotator(
+    settings: Settings,
+    duration: float,
+    num_clips: int,
+    seed: int,
+) -> tuple[list[float], int]:
+    return asyncio.run(annotate(settings, duration, num_clips, seed))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--annotators", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--clips", type=int, default=500)
+    parser.add_argument("--profiles", nargs="+", default=PROFILES)
+    args = parser.parse_args()
+
+    print(
+        f"{args.annotators} annotators, {args.duration}s, {args.clips} clips"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in args.profiles:
+            directory = Path(tmp) / profile
+            directory.mkdir()
+            settings = get_settings(directory, profile)
+            asyncio.run(seed(settings, args.clips))
+
+            with ProcessPoolExecutor(args.annotators) as executor:
+                results = list(
+                    executor.map(
+                        run_annotator,
+                        [settings] * args.annotators,
+                        [args.duration] * args.annotators,
+                        [args.clips] * args.annotators,
+                        range(args.annotators),
+                    )
+                )
+
+            latencies = np.array([t for result, _ in results for t in result])
+            locked = sum(count for _, count in results)
+            p50, p95 = (
+                np.percentile(latencies, [50, 95]) * 1000
+                if len(latencies)
+                else (float("nan"), float("nan"))
+            )
+            print(
+                f"{profile:>12}: {len(latencies) / args.duration:8.1f} ops/s"
+                f"  p50 {p50:7.1f}ms  p95 {p95:7.1f}ms  locked {locked}"
+            )
+
+
+if __name__ == "__main__":
+    main()
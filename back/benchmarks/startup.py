@@ -0,0 +1,199 @@
+"""Measure the cold start of the server against import time budgets.
+
+Each run imports the app module in a fresh interpreter with
+``python -X importtime``, which reports the self and cumulative import
+time of every module. Importing ``whombat.app`` also creates the FastAPI
+app, so the run covers everything the server does before it accepts
+connections, except the database initialisation.
+
+The run fails when the median cumulative time of a budgeted module is
+over its budget, or when a module that should be imported lazily, such
+as ``torch`` or ``xarray``, is loaded during startup.
+
+Usage::
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --top 30
+    python -m benchmarks.startup --budget whombat.app=2500
+
+Run the commands from the ``back`` directory.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+
+DEFAULT_MODULE = "whombat.app"
+
+DEFAULT_BUDGETS = {
+    "whombat.system": 2_000,
+    "whombat.api": 1_500,
+    "whombat.app": 5_000,
+}
+"""Maximum cumulative import time of each module in milliseconds.
+
+The budgets leave some headroom over the times on a single slow core.
+Loading ``torch`` alone takes longer than the headroom.
+"""
+
+LAZY_MODULES = (
+    "matplotlib",
+    "pandas",
+    "pygbif",
+    "scipy",
+    "soundevent.audio",
+    "soundevent.evaluation",
+    "soundevent.geometry",
+    "torch",
+    "torchaudio",
+    "xarray",
+)
+"""Modules that are only imported on first audio or spectrogram use."""
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+@dataclass
+class ImportTime:
+    """Import times of a module in microseconds."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def measure(
+    module: str, env: dict[str, str]
+) -> tuple[list[ImportTime], float]:
+    """Import a module in a fresh interpreter.
+
+    Returns
+    -------
+    list[ImportTime]
+        Import times of every imported module.
+    float
+        Wall time of the interpreter run in seconds.
+    """
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    elapsed = time.perf_counter() - start
+    if process.returncode != 0:
+        raise RuntimeError(f"Could not import {module}:\n{process.stderr}")
+
+    times = []
+    for line in process.stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, _, name = match.groups()
+        times.append(ImportTime(name, int(self_us), int(cumulative_us)))
+    return times, elapsed
+
+
+def parse_budget(value: str) -> tuple[str, float]:
+    module, _, budget = value.partition("=")
+    return module, float(budget)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--module", default=DEFAULT_MODULE)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=15,
+        help="Number of slowest modules to list.",
+    )
+    parser.add_argument(
+        "--budget",
+        type=parse_budget,
+        action="append",
+        default=[],
+        help="Budget of a module in ms, as module=ms. Can be repeated.",
+    )
+    args = parser.parse_args()
+    budgets = {**DEFAULT_BUDGETS, **dict(args.budget)}
+
+    cumulative: dict[str, list[float]] = {}
+    self_times: dict[str, list[float]] = {}
+    wall_times = []
+    loaded: set[str] = set()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = {**os.environ, "WHOMBAT_DATA_DIR": tmp_dir}
+        # The first run writes the default settings and compiles the
+        # bytecode of the modules, so it is not timed.
+        measure(args.module, env)
+        for _ in range(args.runs):
+            times, elapsed = measure(args.module, env)
+            wall_times.append(elapsed)
+            for entry in times:
+                loaded.add(entry.module)
+                cumulative.setdefault(entry.module, []).append(
+                    entry.cumulative_us / 1000
+                )
+                self_times.setdefault(entry.module, []).append(
+                    entry.self_us / 1000
+                )
+
+    print(
+        f"python -c 'import {args.module}': "
+        f"{statistics.median(wall_times) * 1000:.0f}ms median wall time "
+        f"over {args.runs} runs"
+    )
+
+    print(f"\nSlowest modules by self time (median of {args.runs} runs)")
+    slowest = sorted(
+        self_times,
+        key=lambda name: statistics.median(self_times[name]),
+        reverse=True,
+    )[: args.top]
+    width = max((len(name) for name in slowest), default=10)
+    for name in slowest:
+        print(
+            f"  {name:<{width}} "
+            f"{statistics.median(self_times[name]):>8.1f}ms self "
+            f"{statistics.median(cumulative[name]):>8.1f}ms cumulative"
+        )
+
+    failures = []
+    print("\nBudgets")
+    for name, budget in budgets.items():
+        if name not in cumulative:
+            print(f"  {name:<{width}} not imported")
+            continue
+        value = statistics.median(cumulative[name])
+        status = "ok" if value <= budget else "OVER"
+        print(f"  {name:<{width}} {value:>8.1f}ms / {budget:.0f}ms {status}")
+        if value > budget:
+            failures.append(
+                f"{name} took {value:.0f}ms (budget {budget:.0f}ms)"
+            )
+
+    eager = sorted(name for name in LAZY_MODULES if name in loaded)
+    for name in eager:
+        failures.append(f"{name} was imported at startup")
+
+    if failures:
+        print("\nStartup budget exceeded:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Reproducible benchmark suite of the Whombat backend.
+
+Populates a database with synthetic data, with N recordings written as
+WAV files, an annotation project with M tasks and K annotated sound
+events, and times:
+
+* ``audio``: `compute_spectrogram` and `load_clip_bytes`, once for each
+  sample rate of the recordings.
+* ``db``: bulk inserts, such as `clips.create_many_without_duplicates`.
+* ``endpoints``: list and detail endpoints, called in process through
+  ``httpx.ASGITransport``.
+* ``io``: export of the project to AOEF and its import into empty
+  tables.
+
+Runs use a temporary SQLite database unless a database URL is given.
+The tables of that database are dropped, so do not point it at a
+database with data you want to keep.
+
+Results are written as JSON, together with the commit, machine and
+configuration of the run, and can be compared against a previous run.
+
+Usage::
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --recordings 20 --tasks 5000 --only io
+    python -m benchmarks.suite --compare results.json --threshold 1.2
+    python -m benchmarks.suite --database-url postgresql+asyncpg:///bench
+
+Run the commands from the ``back`` directory.
+"""
@@ -0,0 +1,160 @@
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from contextlib import AsyncExitStack
+from dataclasses import asdict
+from pathlib import Path
+
+from benchmarks.suite import __doc__ as description
+from benchmarks.suite.cases import GROUPS, Context, reset_database
+from benchmarks.suite.runner import (
+    BenchmarkResult,
+    compare_results,
+    load_results,
+    run_benchmark,
+    save_results,
+)
+from benchmarks.suite.synthetic import SyntheticConfig, create_synthetic_data
+
+from whombat.system.database import (
+    dispose_async_db_engines,
+    get_async_db_engine,
+    get_async_session,
+    init_database,
+)
+from whombat.system.settings import Settings
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=description,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--recordings", type=int, default=10)
+    parser.add_argument("--tasks", type=int, default=1_000)
+    parser.add_argument("--sound-events", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument(
+        "--only",
+        type=lambda value: value.split(","),
+        default=list(GROUPS),
+        help=f"Comma separated groups to run: {','.join(GROUPS)}.",
+    )
+    parser.add_argument(
+        "--database-url",
+        help="Database to use instead of a temporary SQLite file.",
+    )
+    parser.add_argument("--output", type=Path)
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        help="Results of a previous run to compare against.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="Median time ratio above which a benchmark has regressed.",
+    )
+    args = parser.parse_args()
+    unknown = set(args.only) - set(GROUPS)
+    if unknown:
+        parser.error(f"unknown groups: {', '.join(sorted(unknown))}")
+    return args
+
+
+async def run(args: argparse.Namespace, audio_dir: Path):
+    config = SyntheticConfig(
+        recordings=args.recordings,
+        tasks=args.tasks,
+        sound_events=args.sound_events,
+        seed=args.seed,
+    )
+    settings = Settings(
+        db_url=args.database_url,
+        db_name=str(audio_dir / "benchmark.db"),
+        audio_dir=audio_dir,
+        open_on_startup=False,
+        metrics=False,
+    )
+    await init_database(settings)
+    engine = get_async_db_engine(settings)
+    if args.database_url:
+        await reset_database(engine)
+
+    start = time.perf_counter()
+    async with get_async_session(engine) as session:
+        data = await create_synthetic_data(session, audio_dir, config)
+    print(
+        f"Created {config.recordings} recordings, {config.tasks} tasks and "
+        f"{config.sound_events} sound events in "
+        f"{time.perf_counter() - start:.1f}s on "
+        f"{engine.url.get_backend_name()}\n"
+    )
+
+    results: list[BenchmarkResult] = []
+    async with AsyncExitStack() as exit_stack:
+        context = Context(
+            settings=settings,
+            engine=engine,
+            config=config,
+            data=data,
+            exit_stack=exit_stack,
+        )
+        for group, get_benchmarks in GROUPS.items():
+            if group not in args.only:
+                continue
+            for benchmark in await get_benchmarks(context):
+                result = await run_benchmark(
+                    benchmark,
+                    rounds=args.rounds,
+                    warmup=args.warmup,
+                )
+                summary = result.summary()
+                print(
+                    f"{benchmark.name:<50} "
+                    f"median {summary['median'] * 1000:9.2f}ms  "
+                    f"min {summary['min'] * 1000:9.2f}ms  "
+                    f"{benchmark.params}"
+                )
+                results.append(result)
+
+    await dispose_async_db_engines()
+    return results, {
+        **asdict(config),
+        "database": engine.url.get_backend_name(),
+        "rounds": args.rounds,
+        "warmup": args.warmup,
+    }
+
+
+async def main() -> int:
+    args = parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results, config = await run(args, Path(tmp_dir))
+
+    if args.output is not None:
+        save_results(args.output, results, config)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare is not None:
+        regressions = compare_results(
+            load_results(args.compare),
+            results,
+            args.threshold,
+        )
+        if regressions:
+            print(f"\n{len(regressions)} benchmarks regressed.")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
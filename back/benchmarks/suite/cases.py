@@ -0,0 +1,274 @@
+"""Benchmarks of the audio pipeline, database, endpoints and AOEF I/O.
+
+Each group function returns the benchmarks of the group for a populated
+`Context`. The import benchmark recreates the database tables before
+each round, so the `io` group must run last.
+"""
+
+import io
+from collections.abc import Callable
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+import numpy as np
+from soundevent.io.aoef import to_aeof
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from benchmarks.suite.runner import Benchmark
+from benchmarks.suite.synthetic import (
+    PASSWORD,
+    USERNAME,
+    SyntheticConfig,
+    SyntheticData,
+    create_clip,
+)
+
+from whombat import api, models, schemas
+from whombat.api.io import aoef
+from whombat.system import create_app
+from whombat.system.database import get_async_session
+from whombat.system.settings import Settings, get_settings
+
+__all__ = [
+    "GROUPS",
+    "Context",
+    "login",
+    "reset_database",
+]
+
+PAGE_SIZE = 100
+"""Number of items requested from list endpoints."""
+
+SPECTROGRAM_WINDOW = 10.0
+"""Duration in seconds of the audio shown in the spectrogram viewer."""
+
+STREAM_FRAMES = 1024 * 128
+"""Frames in each audio chunk streamed to the browser."""
+
+
+@dataclass
+class Context:
+    """State shared by the benchmarks of a run."""
+
+    settings: Settings
+    engine: AsyncEngine
+    config: SyntheticConfig
+    data: SyntheticData
+    exit_stack: AsyncExitStack
+    exported: bytes | None = None
+    rng: np.random.Generator = field(
+        default_factory=lambda: np.random.default_rng(1)
+    )
+
+    @property
+    def audio_dir(self) -> Path:
+        return self.settings.audio_dir
+
+
+async def reset_database(engine: AsyncEngine) -> None:
+    """Drop and recreate all tables."""
+    async with engine.begin() as conn:
+        await conn.run_sync(models.Base.metadata.drop_all)
+        await conn.run_sync(models.Base.metadata.create_all)
+
+
+async def login(
+    client: httpx.AsyncClient,
+    username: str,
+    password: str,
+) -> None:
+    """Log in and keep the session cookie in the client."""
+    response = await client.post(
+        "/api/v1/auth/login",
+        data={"username": username, "password": password},
+    )
+    response.raise_for_status()
+    # NOTE: The cookie is set for the `localhost` domain, which the cookie
+    # jar never matches as it has no dots, so it is stored without one.
+    client.cookies = dict(response.cookies)
+
+
+def _by_samplerate(
+    recordings: list[schemas.Recording],
+) -> list[schemas.Recording]:
+    recordings_by_samplerate: dict[int, schemas.Recording] = {}
+    for recording in recordings:
+        recordings_by_samplerate.setdefault(recording.samplerate, recording)
+    return [
+        recordings_by_samplerate[samplerate]
+        for samplerate in sorted(recordings_by_samplerate)
+    ]
+
+
+async def audio_benchmarks(context: Context) -> list[Benchmark]:
+    """Spectrogram and audio streaming, once per sample rate."""
+    audio_parameters = schemas.AudioParameters()
+    spectrogram_parameters = schemas.SpectrogramParameters()
+    benchmarks = []
+    for recording in _by_samplerate(context.data.recordings):
+        params = {
+            "samplerate": recording.samplerate,
+            "duration": recording.duration,
+        }
+        end_time = min(SPECTROGRAM_WINDOW, recording.duration)
+        path = context.audio_dir / recording.path
+        benchmarks.extend(
+            [
+                Benchmark(
+                    name="audio.compute_spectrogram",
+                    func=lambda recording=recording, end_time=end_time: (
+                        api.compute_spectrogram(
+                            recording,
+                            0,
+                            end_time,
+                            audio_parameters,
+                            spectrogram_parameters,
+                            audio_dir=context.audio_dir,
+                        )
+                    ),
+                    params={**params, "window": end_time},
+                ),
+                Benchmark(
+                    name="audio.load_clip_bytes",
+                    func=lambda path=path, recording=recording: (
+                        api.load_clip_bytes(
+                            path=path,
+                            start=0,
+                            frames=STREAM_FRAMES,
+                            time_expansion=recording.time_expansion,
+                            start_time=0,
+                            end_time=recording.duration,
+                        )
+                    ),
+                    params={**params, "frames": STREAM_FRAMES},
+                ),
+            ]
+        )
+    return benchmarks
+
+
+async def database_benchmarks(context: Context) -> list[Benchmark]:
+    """Bulk inserts, rolled back after each round."""
+    session = await context.exit_stack.enter_async_context(
+        get_async_session(context.engine)
+    )
+    recordings = context.data.recordings
+    rows: list[dict] = []
+
+    def make_clips():
+        rows[:] = [
+            create_clip(recordings[index % len(recordings)], context.rng)
+            for index in range(context.config.tasks)
+        ]
+
+    async def create_clips():
+        await api.clips.create_many_without_duplicates(session, rows)
+
+    return [
+        Benchmark(
+            name="db.clips.create_many_without_duplicates",
+            func=create_clips,
+            params={"clips": context.config.tasks},
+            setup=make_clips,
+            teardown=session.rollback,
+        ),
+    ]
+
+
+async def endpoint_benchmarks(context: Context) -> list[Benchmark]:
+    """List and detail endpoints, called through the ASGI interface."""
+    app = create_app(context.settings)
+    app.dependency_overrides[get_settings] = lambda: context.settings
+    client = await context.exit_stack.enter_async_context(
+        httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://localhost",
+        )
+    )
+    await login(client, USERNAME, PASSWORD)
+
+    project_uuid = str(context.data.annotation_project.uuid)
+    endpoints = [
+        ("/api/v1/recordings/", {"limit": PAGE_SIZE}),
+        ("/api/v1/annotation_tasks/", {"limit": PAGE_SIZE}),
+        ("/api/v1/clip_annotations/", {"limit": PAGE_SIZE}),
+        ("/api/v1/sound_event_annotations/", {"limit": PAGE_SIZE}),
+        (
+            "/api/v1/annotation_projects/detail/",
+            {"annotation_project_uuid": project_uuid},
+        ),
+        (
+            "/api/v1/annotation_projects/detail/stats/",
+            {"annotation_project_uuid": project_uuid},
+        ),
+    ]
+    return [
+        Benchmark(
+            name=f"endpoint.GET {path}",
+            func=_get(client, path, params),
+            params={
+                key: value for key, value in params.items() if key == "limit"
+            },
+        )
+        for path, params in endpoints
+    ]
+
+
+def _get(client: httpx.AsyncClient, path: str, params: dict) -> Callable:
+    async def get():
+        response = await client.get(path, params=params)
+        response.raise_for_status()
+
+    return get
+
+
+async def io_benchmarks(context: Context) -> list[Benchmark]:
+    """Export of the project to AOEF and its import into empty tables."""
+    project = context.data.annotation_project
+    dataset_dir = context.audio_dir / "dataset"
+
+    async def export():
+        async with get_async_session(context.engine) as session:
+            annotation_project = await api.annotation_projects.to_soundevent(
+                session,
+                project,
+                audio_dir=dataset_dir,
+            )
+        obj = to_aeof(annotation_project, audio_dir=dataset_dir)
+        context.exported = obj.model_dump_json().encode()
+
+    async def import_():
+        assert context.exported is not None
+        async with get_async_session(context.engine) as session:
+            await aoef.import_annotation_project(
+                session,
+                io.BytesIO(context.exported),
+                audio_dir=dataset_dir,
+                base_audio_dir=context.audio_dir,
+            )
+            await session.commit()
+
+    params = {
+        "tasks": context.config.tasks,
+        "sound_events": context.config.sound_events,
+    }
+    return [
+        Benchmark(name="io.aoef.export", func=export, params=params),
+        Benchmark(
+            name="io.aoef.import",
+            func=import_,
+            params=params,
+            setup=lambda: reset_database(context.engine),
+        ),
+    ]
+
+
+GROUPS = {
+    "audio": audio_benchmarks,
+    "db": database_benchmarks,
+    "endpoints": endpoint_benchmarks,
+    "io": io_benchmarks,
+}
+"""Benchmark groups in the order in which they run."""
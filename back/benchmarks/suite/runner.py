@@ -0,0 +1,186 @@
+"""Timing, storage and comparison of benchmark results."""
+
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+__all__ = [
+    "Benchmark",
+    "BenchmarkResult",
+    "compare_results",
+    "load_results",
+    "run_benchmark",
+    "save_results",
+]
+
+Step = Callable[[], Any | Awaitable[Any]]
+
+
+@dataclass
+class Benchmark:
+    """A timed operation with optional untimed setup and teardown."""
+
+    name: str
+    """Name of the benchmark, such as `audio.compute_spectrogram`."""
+
+    func: Step
+    """Operation to time. Can be a function or a coroutine function."""
+
+    params: dict[str, Any] = field(default_factory=dict)
+    """Parameters of the benchmark, stored with the results."""
+
+    setup: Step | None = None
+    """Called before every round, outside of the timed section."""
+
+    teardown: Step | None = None
+    """Called after every round, outside of the timed section."""
+
+    rounds: int | None = None
+    """Number of timed rounds. Defaults to the value of the run."""
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings of a benchmark."""
+
+    name: str
+    params: dict[str, Any]
+    times: list[float]
+    """Duration of each round in seconds."""
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "min": min(self.times),
+            "median": statistics.median(self.times),
+            "mean": statistics.mean(self.times),
+            "stdev": (
+                statistics.stdev(self.times) if len(self.times) > 1 else 0.0
+            ),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), **self.summary()}
+
+
+async def _call(step: Step | None) -> None:
+    if step is None:
+        return
+    result = step()
+    if inspect.isawaitable(result):
+        await result
+
+
+async def run_benchmark(
+    benchmark: Benchmark,
+    rounds: int,
+    warmup: int = 1,
+) -> BenchmarkResult:
+    """Time a benchmark, discarding the warmup rounds."""
+    times = []
+    for index in range(warmup + (benchmark.rounds or rounds)):
+        await _call(benchmark.setup)
+        start = time.perf_counter()
+        await _call(benchmark.func)
+        elapsed = time.perf_counter() - start
+        await _call(benchmark.teardown)
+        if index >= warmup:
+            times.append(elapsed)
+    return BenchmarkResult(
+        name=benchmark.name,
+        params=benchmark.params,
+        times=times,
+    )
+
+
+def get_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(
+    path: Path,
+    results: list[BenchmarkResult],
+    config: dict[str, Any],
+) -> None:
+    """Store the results with the machine and configuration of the run."""
+    content = {
+        "created_on": datetime.now(timezone.utc).isoformat(),
+        "commit": get_commit(),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": config,
+        "benchmarks": [result.to_dict() for result in results],
+    }
+    path.write_text(json.dumps(content, indent=2, default=str))
+
+
+def load_results(path: Path) -> dict[str, dict[str, Any]]:
+    """Load stored results, keyed by benchmark name and parameters."""
+    content = json.loads(path.read_text())
+    return {
+        _key(result["name"], result["params"]): result
+        for result in content["benchmarks"]
+    }
+
+
+def compare_results(
+    baseline: dict[str, dict[str, Any]],
+    results: list[BenchmarkResult],
+    threshold: float,
+) -> list[str]:
+    """Compare median times against a baseline.
+
+    Returns
+    -------
+    list[str]
+        Keys of the benchmarks whose median time grew by more than the
+        threshold ratio.
+    """
+    rows = []
+    regressions = []
+    for result in results:
+        key = _key(result.name, result.params)
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        current = result.summary()["median"]
+        ratio = current / previous["median"]
+        rows.append((key, previous["median"], current, ratio))
+        if ratio > threshold:
+            regressions.append(key)
+
+    width = max((len(row[0]) for row in rows), default=10)
+    print(f"\n{'benchmark':<{width}} {'baseline':>10} {'current':>10} ratio")
+    for key, previous, current, ratio in rows:
+        flag = " !" if key in regressions else ""
+        print(
+            f"{key:<{width}} {previous * 1000:>8.2f}ms "
+            f"{current * 1000:>8.2f}ms {ratio:>5.2f}x{flag}"
+        )
+    return regressions
+
+
+def _key(name: str, params: dict[str, Any]) -> str:
+    if not params:
+        return name
+    values = ",".join(f"{key}={value}" for key, value in params.items())
+    return f"{name}[{values}]"
@@ -0,0 +1,283 @@
+"""Synthetic data for the benchmark suite.
+
+Recordings are written as real WAV files, so the audio pipeline and the
+import of projects, which checks that recording files exist, work on
+them as they would on field recordings. The durations and sample rates
+are drawn from values common in passive acoustic monitoring, from
+speech-band recorders to ultrasonic bat detectors.
+
+All random draws use a seeded generator, so the same configuration
+produces the same data.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import uuid4
+
+import numpy as np
+import soundfile as sf
+from soundevent import data
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, models, schemas
+from whombat.api.common import create_objects
+
+__all__ = [
+    "SyntheticConfig",
+    "SyntheticData",
+    "create_synthetic_data",
+    "write_recordings",
+]
+
+DURATIONS = (10.0, 30.0, 60.0)
+"""Recording durations in seconds."""
+
+SAMPLERATES = (22_050, 44_100, 48_000, 96_000, 192_000)
+"""Recording sample rates in Hz."""
+
+CLIP_DURATION = 3.0
+"""Duration of the clips of the annotation tasks in seconds."""
+
+USERNAME = "benchmark"
+PASSWORD = "benchmark"
+
+BATCH_SIZE = 1000
+
+
+@dataclass
+class SyntheticConfig:
+    """Size of the synthetic data."""
+
+    recordings: int = 10
+    """Number of recordings (N)."""
+
+    tasks: int = 1_000
+    """Number of annotation tasks in the project (M)."""
+
+    sound_events: int = 5_000
+    """Number of annotated sound events across all tasks (K)."""
+
+    tags: int = 20
+    """Number of species tags used to label the sound events."""
+
+    seed: int = 0
+    """Seed of the random generator."""
+
+
+@dataclass
+class SyntheticData:
+    """Objects created by `create_synthetic_data`."""
+
+    user: schemas.SimpleUser
+    dataset: schemas.Dataset
+    annotation_project: schemas.AnnotationProject
+    recordings: list[schemas.Recording]
+
+
+def write_recordings(
+    directory: Path,
+    num: int,
+    rng: np.random.Generator,
+) -> list[Path]:
+    """Write WAV files with background noise and tonal calls."""
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in range(num):
+        duration = float(rng.choice(DURATIONS))
+        samplerate = int(rng.choice(SAMPLERATES))
+        times = np.arange(int(duration * samplerate)) / samplerate
+        signal = rng.normal(0, 0.05, size=times.shape)
+        for start in rng.uniform(0, duration - 0.2, size=int(duration)):
+            mask = (times >= start) & (times < start + 0.2)
+            frequency = rng.uniform(0.05, 0.4) * samplerate
+            signal[mask] += 0.3 * np.sin(2 * np.pi * frequency * times[mask])
+        path = directory / f"recording_{index:04d}.wav"
+        sf.write(path, signal.astype(np.float32), samplerate, subtype="PCM_16")
+        paths.append(path)
+    return paths
+
+
+async def insert(session: AsyncSession, model, rows: list[dict], returning):
+    ids = []
+    for start in range(0, len(rows), BATCH_SIZE):
+        result = await create_objects(
+            session,
+            model,
+            rows[start : start + BATCH_SIZE],
+            returning=[returning] if returning is not None else None,
+        )
+        if returning is not None:
+            ids.extend(row[0] for row in result or [])
+    return ids
+
+
+async def create_synthetic_data(
+    session: AsyncSession,
+    audio_dir: Path,
+    config: SyntheticConfig,
+) -> SyntheticData:
+    """Create a dataset and an annotated project from synthetic audio.
+
+    The dataset is registered with the regular API, which reads the
+    metadata and computes the hash of every recording. Clips and tasks
+    are created with the bulk API methods, and the sound event
+    annotations are inserted directly.
+    """
+    rng = np.random.default_rng(config.seed)
+    write_recordings(audio_dir / "dataset", config.recordings, rng)
+
+    user = await api.users.create(
+        session,
+        username=USERNAME,
+        password=PASSWORD,
+        email="benchmark@example.com",
+    )
+    dataset = await api.datasets.create(
+        session,
+        name="benchmark",
+        dataset_dir=audio_dir / "dataset",
+        audio_dir=audio_dir,
+        description="Synthetic dataset",
+        user=user,
+    )
+    recordings, _ = await api.recordings.get_many(session, limit=None)
+    recordings = sorted(recordings, key=lambda recording: recording.path)
+
+    project = await api.annotation_projects.create(
+        session,
+        name="benchmark",
+        description="Synthetic project",
+        user=user,
+        visibility=models.VisibilityLevel.PUBLIC,
+    )
+    await api.clips.create_many_without_duplicates(
+        session,
+        [
+            create_clip(recordings[index % len(recordings)], rng)
+            for index in range(config.tasks)
+        ],
+    )
+    await api.annotation_tasks.create_from_clips(session, project)
+
+    await create_sound_event_annotations(session, user, project, config, rng)
+    await session.commit()
+    return SyntheticData(
+        user=user,
+        dataset=dataset,
+        annotation_project=project,
+        recordings=list(recordings),
+    )
+
+
+def create_clip(
+    recording: schemas.Recording,
+    rng: np.random.Generator,
+) -> dict:
+    duration = min(CLIP_DURATION, recording.duration)
+    start = round(float(rng.uniform(0, recording.duration - duration)), 3)
+    return dict(
+        recording_id=recording.id,
+        start_time=start,
+        end_time=start + duration,
+    )
+
+
+async def create_sound_event_annotations(
+    session: AsyncSession,
+    user: schemas.SimpleUser,
+    project: schemas.AnnotationProject,
+    config: SyntheticConfig,
+    rng: np.random.Generator,
+) -> None:
+    tag_ids = await insert(
+        session,
+        models.Tag,
+        [
+            {
+                "key": "species",
+                "value": f"species_{index}",
+                "canonical_name": f"Species {index}",
+            }
+            for index in range(config.tags)
+        ],
+        returning=models.Tag.id,
+    )
+    rows = (
+        await session.execute(
+            select(
+                models.AnnotationTask.clip_annotation_id,
+                models.Clip.start_time,
+                models.Clip.end_time,
+                models.Recording.id,
+                models.Recording.samplerate,
+            )
+            .join(models.Clip, models.AnnotationTask.clip_id == models.Clip.id)
+            .join(
+                models.Recording,
+                models.Clip.recording_id == models.Recording.id,
+            )
+            .where(models.AnnotationTask.annotation_project_id == project.id)
+            .order_by(models.AnnotationTask.id)
+        )
+    ).all()
+    if not rows:
+        return
+
+    sound_events = []
+    parents = []
+    for index in range(config.sound_events):
+        clip_annotation_id, start_time, end_time, recording_id, samplerate = (
+            rows[index % len(rows)]
+        )
+        start = float(rng.uniform(start_time, end_time - 0.2))
+        nyquist = samplerate / 2
+        low = float(rng.uniform(0.05, 0.8) * nyquist)
+        high = min(low + float(rng.uniform(0.05, 0.15) * nyquist), nyquist)
+        sound_events.append(
+            {
+                "uuid": uuid4(),
+                "recording_id": recording_id,
+                "geometry_type": "BoundingBox",
+                "geometry": data.BoundingBox(
+                    coordinates=[start, low, start + 0.2, high],
+                ),
+            }
+        )
+        parents.append(clip_annotation_id)
+
+    sound_event_ids = await insert(
+        session,
+        models.SoundEvent,
+        sound_events,
+        returning=models.SoundEvent.id,
+    )
+    annotation_ids = await insert(
+        session,
+        models.SoundEventAnnotation,
+        [
+            {
+                "uuid": uuid4(),
+                "clip_annotation_id": clip_annotation_id,
+                "sound_event_id": sound_event_id,
+                "created_by_id": user.id,
+            }
+            for clip_annotation_id, sound_event_id in zip(
+                parents, sound_event_ids, strict=True
+            )
+        ],
+        returning=models.SoundEventAnnotation.id,
+    )
+    await insert(
+        session,
+        models.SoundEventAnnotationTag,
+        [
+            {
+                "sound_event_annotation_id": annotation_id,
+                "tag_id": tag_ids[rng.integers(len(tag_ids))],
+                "created_by_id": user.id,
+            }
+            for annotation_id in annotation_ids
+        ],
+        returning=None,
+    )
@@ -1,25 +1,92 @@
 """Main entry point for whombat.
 
 This module is used to run the app using uvicorn.
+
+It also provides maintenance commands::
+
+    whombat rebuild-stats [--project UUID ...]
 """
 
+import argparse
+import asyncio
+import os
+from uuid import UUID
+
 import uvicorn
 
 from whombat.system import get_logging_config, get_settings
 
 
-def main():
+def serve():
     settings = get_settings()
     config = get_logging_config(settings)
+    workers = 1 if settings.dev else settings.workers
+
+    if workers > 1:
+        from whombat.cache import share_caches
+        from whombat.jobs import jobs
+        from whombat.system.boot import whombat_init
+        from whombat.system.data import get_whombat_cache_file
+
+        # Run migrations and the startup checks once, before the workers
+        # start, and tell the workers not to run them again.
+        asyncio.run(whombat_init(settings))
+        share_caches(get_whombat_cache_file(), clear=True)
+        jobs.share(get_whombat_cache_file(), clear=True)
+        os.environ["WHOMBAT_INIT_ON_STARTUP"] = "false"
+
     uvicorn.run(
         "whombat.app:app",
         host=settings.host,
         port=settings.port,
         log_level=settings.log_level,
         reload=settings.dev,
+        workers=workers,
         log_config=config,
     )
 
 
+async def rebuild_stats(project_uuids: list[UUID] | None = None) -> None:
+    """Recompute the progress statistics of annotation projects."""
+    from whombat import api
+    from whombat.system.database import get_database_url, init_database
+
+    settings = get_settings()
+    await init_database(settings)
+    async with api.create_session(get_database_url(settings)) as session:
+        project_ids = None
+        if project_uuids:
+            project_ids = [
+                (await api.annotation_projects.get(session, uuid)).id
+                for uuid in project_uuids
+            ]
+        await api.project_stats.rebuild(session, project_ids)
+        await session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="whombat")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("serve", help="Run the whombat server (default).")
+    rebuild = subparsers.add_parser(
+        "rebuild-stats",
+        help="Recompute the progress statistics of annotation projects.",
+    )
+    rebuild.add_argument(
+        "--project",
+        type=UUID,
+        action="append",
+        dest="projects",
+        help="UUID of a project to rebuild. Defaults to all projects.",
+    )
+    args = parser.parse_args()
+
+    if args.command == "rebuild-stats":
+        asyncio.run(rebuild_stats(args.projects))
+        return
+
+    serve()
+
+
 if __name__ == "__main__":
     main()
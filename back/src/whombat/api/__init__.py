@@ -1,31 +1,48 @@
-"""Python API for Whombat."""
+"""Python API for Whombat.
+
+The audio, spectrogram, acoustic feature and species functions depend on
+heavy numeric libraries (``torch``, ``torchaudio``, ``xarray``,
+``pygbif``). They are imported on first access, so that importing the
+API, and hence starting the server, does not load those libraries.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
 
 from whombat.api.annotation_projects import annotation_projects
 from whombat.api.annotation_tasks import annotation_tasks
-from whombat.api.audio import load_audio, load_clip_bytes
 from whombat.api.clip_annotations import clip_annotations
 from whombat.api.clip_evaluations import clip_evaluations
 from whombat.api.clip_predictions import clip_predictions
 from whombat.api.clips import clips
 from whombat.api.datasets import datasets
+from whombat.api.embeddings import embeddings
 from whombat.api.evaluation_sets import evaluation_sets
 from whombat.api.evaluations import evaluations
 from whombat.api.features import features, find_feature, find_feature_value
 from whombat.api.groups import groups
 from whombat.api.model_runs import model_runs
 from whombat.api.notes import notes
+from whombat.api.project_stats import project_stats
 from whombat.api.recordings import recordings
 from whombat.api.sessions import create_session
 from whombat.api.sound_event_annotations import sound_event_annotations
 from whombat.api.sound_event_evaluations import sound_event_evaluations
 from whombat.api.sound_event_predictions import sound_event_predictions
 from whombat.api.sound_events import sound_events
-from whombat.api.species import search_gbif_species
-from whombat.api.spectrograms import compute_spectrogram
 from whombat.api.tags import find_tag, find_tag_value, tags
 from whombat.api.user_runs import user_runs
 from whombat.api.users import users
 
+if TYPE_CHECKING:
+    from whombat.api.acoustic_features import (
+        compute_dataset_acoustic_features,
+        compute_recording_acoustic_features,
+    )
+    from whombat.api.audio import load_audio, load_clip_bytes
+    from whombat.api.species import search_gbif_species
+    from whombat.api.spectrograms import compute_spectrogram
+
 __all__ = [
     "annotation_projects",
     "annotation_tasks",
@@ -33,9 +50,12 @@ __all__ = [
     "clip_evaluations",
     "clip_predictions",
     "clips",
+    "compute_dataset_acoustic_features",
+    "compute_recording_acoustic_features",
     "compute_spectrogram",
     "create_session",
     "datasets",
+    "embeddings",
     "evaluation_sets",
     "evaluations",
     "features",
@@ -48,6 +68,7 @@ __all__ = [
     "load_clip_bytes",
     "model_runs",
     "notes",
+    "project_stats",
     "recordings",
     "sound_event_annotations",
     "sound_event_evaluations",
@@ -58,3 +79,22 @@ __all__ = [
     "user_runs",
     "users",
 ]
+
+_LAZY_ATTRIBUTES = {
+    "compute_dataset_acoustic_features": "whombat.api.acoustic_features",
+    "compute_recording_acoustic_features": "whombat.api.acoustic_features",
+    "compute_spectrogram": "whombat.api.spectrograms",
+    "load_audio": "whombat.api.audio",
+    "load_clip_bytes": "whombat.api.audio",
+    "search_gbif_species": "whombat.api.species",
+}
+"""Functions imported on first access, mapped to their modules."""
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,419 @@
+"""Batch extraction of acoustic features of sound events.
+
+Geometric features such as duration or bandwidth are computed when a
+sound event is created. The features in this module describe the audio
+content within the bounds of each sound event instead, and are computed
+in bulk: the audio of a recording is loaded once, a power spectrogram is
+computed over the span covered by its sound events, and the descriptors
+of all the events are computed at once with array operations. The results
+are stored as regular sound event features, so they can be used for
+filtering, sorting and scatter plots like any other feature.
+"""
+
+import asyncio
+import datetime
+from functools import partial
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import xarray as xr
+from soundevent.geometry import compute_bounds
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import models, schemas
+from whombat.api.common.utils import (
+    batched,
+    get_insert,
+    get_max_rows_per_insert,
+)
+from whombat.api.features import features
+from whombat.api.recordings import recordings
+from whombat.api.spectrograms import compute_power_spectrogram
+from whombat.core.geometries import load_geometry
+from whombat.filters.recordings import DatasetFilter
+from whombat.jobs import ProgressReporter
+
+__all__ = [
+    "ACOUSTIC_FEATURES",
+    "compute_acoustic_features",
+    "compute_dataset_acoustic_features",
+    "compute_recording_acoustic_features",
+    "extract_acoustic_features",
+]
+
+ACOUSTIC_FEATURES = (
+    "peak_frequency",
+    "spectral_centroid",
+    "spectral_bandwidth",
+    "spectral_rolloff",
+    "spectral_flatness",
+    "energy",
+)
+"""Names of the acoustic features, in the order they are computed.
+
+* `peak_frequency`: Frequency (Hz) with the most energy in the event.
+* `spectral_centroid`: Mean frequency (Hz) weighted by energy.
+* `spectral_bandwidth`: Standard deviation (Hz) around the centroid.
+* `spectral_rolloff`: Frequency (Hz) below which 85% of the energy lies.
+* `spectral_flatness`: Ratio of the geometric to the arithmetic mean of
+  the spectrum, from 0 (tonal) to 1 (noise like).
+* `energy`: Mean power spectral density within the event, in dB.
+"""
+
+ROLLOFF = 0.85
+"""Fraction of the energy used for the spectral rolloff."""
+
+MAX_SPAN = 60.0
+"""Maximum duration (s) of audio processed at once.
+
+Sound events are grouped into consecutive spans of at most this length so
+that the spectrogram of long recordings does not have to fit in memory.
+Longer sound events are processed on their own.
+"""
+
+DEFAULT_SPECTROGRAM_PARAMETERS = schemas.SpectrogramParameters(pcen=False)
+"""Spectrogram parameters used for feature extraction."""
+
+_EPS = 1e-12
+
+
+def compute_acoustic_features(
+    spectrogram: xr.DataArray,
+    bounds: np.ndarray,
+) -> np.ndarray:
+    """Compute the acoustic features of many sound events at once.
+
+    Parameters
+    ----------
+    spectrogram
+        Power spectrogram with `frequency` and `time` dimensions, as
+        returned by `compute_power_spectrogram`. Channels are averaged.
+    bounds
+        Array of shape (events, 4) with the start time, low frequency, end
+        time and high frequency of each event.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (events, features), with the features in the order
+        of `ACOUSTIC_FEATURES`.
+    """
+    bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
+    if "channel" in spectrogram.dims:
+        spectrogram = spectrogram.mean(dim="channel")
+    power = np.asarray(
+        spectrogram.transpose("frequency", "time").data,
+        dtype=np.float64,
+    )
+    freqs = np.asarray(spectrogram.frequency.data, dtype=np.float64)
+    times = np.asarray(spectrogram.time.data, dtype=np.float64)
+
+    start, low, end, high = bounds.T
+    time_mask = _interval_mask(times, start, end)
+    freq_mask = _interval_mask(freqs, low, np.minimum(high, freqs[-1]))
+
+    # Spectrum of each event, summed over the frames within its bounds.
+    spectrum = (time_mask.astype(np.float64) @ power.T) * freq_mask
+    num_frames = time_mask.sum(axis=1)
+    num_bins = freq_mask.sum(axis=1)
+    total = spectrum.sum(axis=1)
+    safe_total = np.where(total > 0, total, 1)
+
+    centroid = spectrum @ freqs / safe_total
+    variance = spectrum @ freqs**2 / safe_total - centroid**2
+    bandwidth = np.sqrt(np.maximum(variance, 0))
+
+    peak = freqs[np.argmax(np.where(freq_mask, spectrum, -np.inf), axis=1)]
+
+    cumulative = np.cumsum(spectrum, axis=1)
+    rolloff = freqs[np.argmax(cumulative >= ROLLOFF * total[:, None], axis=1)]
+
+    mean_spectrum = spectrum / num_frames[:, None]
+    log_mean = (np.log(mean_spectrum + _EPS) * freq_mask).sum(axis=1)
+    geometric_mean = np.exp(log_mean / num_bins)
+    arithmetic_mean = mean_spectrum.sum(axis=1) / num_bins
+    flatness = geometric_mean / (arithmetic_mean + _EPS)
+
+    energy = 10 * np.log10(total / (num_frames * num_bins) + _EPS)
+
+    return np.stack(
+        [peak, centroid, bandwidth, rolloff, flatness, energy],
+        axis=1,
+    )
+
+
+def extract_acoustic_features(
+    recording: schemas.Recording,
+    bounds: np.ndarray,
+    audio_dir: Path | None = None,
+    audio_parameters: schemas.AudioParameters | None = None,
+    spectrogram_parameters: schemas.SpectrogramParameters | None = None,
+    max_span: float = MAX_SPAN,
+) -> np.ndarray:
+    """Extract the acoustic features of sound events of a recording.
+
+    Parameters
+    ----------
+    recording
+        The recording of the sound events.
+    bounds
+        Array of shape (events, 4) with the bounds of each sound event, see
+        `compute_acoustic_features`.
+    audio_dir
+        The directory where the audio files are stored.
+    audio_parameters
+        Parameters used to load the audio.
+    spectrogram_parameters
+        Parameters used to compute the spectrogram. Defaults to
+        `DEFAULT_SPECTROGRAM_PARAMETERS`.
+    max_span
+        Maximum duration of audio processed at once.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (events, features).
+    """
+    if audio_parameters is None:
+        audio_parameters = schemas.AudioParameters()
+
+    if spectrogram_parameters is None:
+        spectrogram_parameters = DEFAULT_SPECTROGRAM_PARAMETERS
+
+    bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
+    values = np.full((len(bounds), len(ACOUSTIC_FEATURES)), np.nan)
+    for indices in _group_by_span(bounds, max_span):
+        start = max(bounds[indices, 0].min(), 0)
+        end = min(bounds[indices, 2].max(), recording.duration)
+        if end <= start:
+            continue
+
+        spectrogram = compute_power_spectrogram(
+            recording,
+            start,
+            end,
+            audio_parameters=audio_parameters,
+            spectrogram_parameters=spectrogram_parameters,
+            audio_dir=audio_dir,
+        )
+        if spectrogram.sizes["time"] == 0:
+            continue
+
+        values[indices] = compute_acoustic_features(
+            spectrogram,
+            bounds[indices],
+        )
+    return values
+
+
+async def compute_recording_acoustic_features(
+    session: AsyncSession,
+    recording: schemas.Recording,
+    audio_dir: Path | None = None,
+    audio_parameters: schemas.AudioParameters | None = None,
+    spectrogram_parameters: schemas.SpectrogramParameters | None = None,
+) -> int:
+    """Compute and store the acoustic features of a recording's events.
+
+    All sound events of the recording are processed, whether they belong
+    to annotations or predictions. Existing values of the acoustic
+    features are overwritten.
+
+    Parameters
+    ----------
+    session
+        SQLAlchemy AsyncSession.
+    recording
+        The recording whose sound events to process.
+    audio_dir
+        The directory where the audio files are stored.
+    audio_parameters
+        Parameters used to load the audio.
+    spectrogram_parameters
+        Parameters used to compute the spectrogram.
+
+    Returns
+    -------
+    int
+        The number of sound events processed.
+    """
+    result = await session.execute(
+        select(models.SoundEvent.id, models.SoundEvent.geometry)
+        .where(models.SoundEvent.recording_id == recording.id)
+        .order_by(models.SoundEvent.id)
+    )
+    rows = result.all()
+    if not rows:
+        return 0
+
+    ids = [id for id, _ in rows]
+    bounds = np.array(
+        [compute_bounds(load_geometry(geometry)) for _, geometry in rows]
+    )
+
+    # Decoding audio and computing spectrograms is blocking work.
+    loop = asyncio.get_running_loop()
+    values = await loop.run_in_executor(
+        None,
+        partial(
+            extract_acoustic_features,
+            recording,
+            bounds,
+            audio_dir=audio_dir,
+            audio_parameters=audio_parameters,
+            spectrogram_parameters=spectrogram_parameters,
+        ),
+    )
+    await _store_features(session, ids, values)
+    return len(ids)
+
+
+async def compute_dataset_acoustic_features(
+    session: AsyncSession,
+    dataset: schemas.Dataset,
+    audio_dir: Path | None = None,
+    audio_parameters: schemas.AudioParameters | None = None,
+    spectrogram_parameters: schemas.SpectrogramParameters | None = None,
+    progress: ProgressReporter | None = None,
+    batch_size: int = 100,
+) -> int:
+    """Compute and store the acoustic features of a dataset's events.
+
+    Recordings are processed one at a time, and the features of each
+    recording are committed before moving on to the next one, so that
+    progress is kept if the job is interrupted.
+
+    Parameters
+    ----------
+    session
+        SQLAlchemy AsyncSession.
+    dataset
+        The dataset to process.
+    audio_dir
+        The root audio directory.
+    audio_parameters
+        Parameters used to load the audio.
+    spectrogram_parameters
+        Parameters used to compute the spectrogram.
+    progress
+        Reporter for the progress of the job, counted in recordings.
+    batch_size
+        Number of recordings fetched from the database at a time.
+
+    Returns
+    -------
+    int
+        The number of sound events processed.
+    """
+    filters = [DatasetFilter(eq=dataset.uuid)]
+    offset = 0
+    processed = 0
+    while True:
+        batch, total = await recordings.get_many(
+            session,
+            limit=batch_size,
+            offset=offset,
+            filters=filters,
+            sort_by="id",
+        )
+        if progress is not None:
+            progress.set_total(total)
+
+        for recording in batch:
+            if progress is not None:
+                progress.set_message(str(recording.path))
+            processed += await compute_recording_acoustic_features(
+                session,
+                recording,
+                audio_dir=audio_dir,
+                audio_parameters=audio_parameters,
+                spectrogram_parameters=spectrogram_parameters,
+            )
+            await session.commit()
+            if progress is not None:
+                progress.advance()
+
+        offset += len(batch)
+        if len(batch) < batch_size:
+            break
+
+    if progress is not None:
+        progress.set_message(None)
+    return processed
+
+
+async def _store_features(
+    session: AsyncSession,
+    sound_event_ids: Sequence[int],
+    values: np.ndarray,
+) -> None:
+    """Insert or update the acoustic features of sound events."""
+    names = [
+        await features.get_or_create(session, name=name)
+        for name in ACOUSTIC_FEATURES
+    ]
+    now = datetime.datetime.now(datetime.timezone.utc)
+    rows = [
+        {
+            "sound_event_id": sound_event_id,
+            "feature_name_id": name.id,
+            "value": float(value),
+            "created_on": now,
+        }
+        for sound_event_id, row in zip(sound_event_ids, values, strict=True)
+        for name, value in zip(names, row, strict=True)
+        if np.isfinite(value)
+    ]
+    if not rows:
+        return
+
+    for batch in batched(rows, get_max_rows_per_insert(session, 4)):
+        stmt = get_insert(session, models.SoundEventFeature).values(batch)
+        await session.execute(
+            stmt.on_conflict_do_update(  # type: ignore
+                index_elements=["sound_event_id", "feature_name_id"],
+                set_={"value": stmt.excluded.value},  # type: ignore
+            )
+        )
+
+
+def _interval_mask(
+    values: np.ndarray,
+    start: np.ndarray,
+    end: np.ndarray,
+) -> np.ndarray:
+    """Mask of the values within each interval.
+
+    Intervals that contain no value get the value nearest to their center,
+    so very short events are still described by one frame or bin.
+    """
+    mask = (values[None, :] >= start[:, None]) & (
+        values[None, :] <= end[:, None]
+    )
+    empty = ~mask.any(axis=1)
+    if empty.any():
+        center = (start[empty] + end[empty]) / 2
+        nearest = np.abs(values[None, :] - center[:, None]).argmin(axis=1)
+        mask[np.flatnonzero(empty), nearest] = True
+    return mask
+
+
+def _group_by_span(bounds: np.ndarray, max_span: float) -> list[np.ndarray]:
+    """Group events, sorted by start time, into spans of limited length."""
+    groups: list[np.ndarray] = []
+    order = np.argsort(bounds[:, 0], kind="stable")
+    current: list[int] = []
+    span_start = 0.0
+    for index in order.tolist():
+        start, _, end, _ = bounds[index]
+        if current and end - span_start > max_span:
+            groups.append(np.array(current))
+            current = []
+        if not current:
+            span_start = start
+        current.append(index)
+    if current:
+        groups.append(np.array(current))
+    return groups
@@ -22,11 +22,9 @@ from whombat.api.common.permissions import (
     can_view_annotation_project,
     filter_annotation_projects_by_access,
 )
+from whombat.api.converters import SoundEventConverter
 from whombat.api.tags import tags
 from whombat.api.users import ensure_system_user
-from whombat.filters.annotation_tasks import (
-    AnnotationProjectFilter as AnnotationTaskAnnotationProjectFilter,
-)
 from whombat.filters.base import Filter
 from whombat.filters.clip_annotations import AnnotationProjectFilter
 from whombat.system.settings import get_settings
@@ -411,6 +409,50 @@ class AnnotationProjectAPI(
             clip_annotation_id=clip_annotation.id,
         )
 
+    async def add_tasks_from_clips(
+        self,
+        session: AsyncSession,
+        obj: schemas.AnnotationProject,
+        filters: Sequence[Filter | ColumnExpressionArgument] | None = None,
+        *,
+        user: models.User | schemas.SimpleUser | None = None,
+    ) -> list[UUID]:
+        """Add a task for every clip matching the given filters.
+
+        Clips that already have a task in the project are skipped.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        obj
+            Annotation project to add the tasks to.
+        filters
+            Filters on the clips for which to create tasks.
+        user
+            User adding the tasks.
+
+        Returns
+        -------
+        list[UUID]
+            The UUIDs of the created tasks.
+
+        Raises
+        ------
+        exceptions.PermissionDeniedError
+            If the user cannot modify the annotation project.
+        """
+        db_user = await self._resolve_user(session, user)
+        if not await can_edit_annotation_project(session, obj, db_user):
+            raise exceptions.PermissionDeniedError(
+                "You do not have permission to modify this annotation project"
+            )
+        return await annotation_tasks.create_from_clips(
+            session,
+            obj,
+            filters=filters,
+        )
+
     async def get_annotations(
         self,
         session: AsyncSession,
@@ -522,49 +564,37 @@ class AnnotationProjectAPI(
             SQLAlchemy AsyncSession.
         obj
             Whombat annotation project.
+        audio_dir
+            The root directory of the audio files.
 
         Returns
         -------
         data.AnnotationProject
             soundevent annotation project.
         """
-        tasks, _ = await annotation_tasks.get_many(
-            session,
-            limit=-1,
-            filters=[AnnotationTaskAnnotationProjectFilter(eq=obj.uuid)],
+        task_ids = await session.scalars(
+            select(models.AnnotationTask.id)
+            .where(models.AnnotationTask.annotation_project_id == obj.id)
+            .order_by(models.AnnotationTask.created_on.desc())
         )
-
-        stmt = (
-            select(models.Clip, models.AnnotationTask.id)
+        annotation_ids = await session.scalars(
+            select(models.ClipAnnotation.id)
             .join(
                 models.AnnotationTask,
-                models.Clip.id == models.AnnotationTask.clip_id,
-            )
-            .where(
-                models.AnnotationTask.id.in_({t.id for t in tasks}),
+                models.AnnotationTask.clip_annotation_id
+                == models.ClipAnnotation.id,
             )
+            .where(models.AnnotationTask.annotation_project_id == obj.id)
+            .order_by(models.ClipAnnotation.created_on.desc())
         )
-        results = await session.execute(stmt)
-        mapping = {r[1]: r[0] for r in results.unique().all()}
 
-        se_tasks = [
-            await annotation_tasks.to_soundevent(
-                session,
-                task,
-                audio_dir=audio_dir,
-                clip=mapping[task.id],
-            )
-            for task in tasks
-            if task.id in mapping
-        ]
-
-        annotations, _ = await self.get_annotations(session, obj, limit=-1)
-        se_clip_annotations = [
-            await clip_annotations.to_soundevent(
-                session, ca, audio_dir=audio_dir
-            )
-            for ca in annotations
-        ]
+        # NOTE: A single converter is used so that the clips and recordings
+        # shared by tasks and annotations are only loaded once.
+        converter = SoundEventConverter(session, audio_dir=audio_dir)
+        se_tasks = await converter.get_annotation_tasks(task_ids.all())
+        se_clip_annotations = await converter.get_clip_annotations(
+            annotation_ids.all()
+        )
 
         return data.AnnotationProject(
             uuid=obj.uuid,
@@ -1,18 +1,22 @@
 """Python API for interacting with Tasks."""
 
 from pathlib import Path
+from typing import Sequence
 from uuid import UUID
 
 from soundevent import data
-from sqlalchemy import and_, select, tuple_
+from sqlalchemy import and_, delete, or_, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
+from sqlalchemy.sql import ColumnElement, ColumnExpressionArgument
 
 from whombat import exceptions, models, schemas
 from whombat.api import common
 from whombat.api.clip_annotations import clip_annotations
 from whombat.api.clips import clips
 from whombat.api.common import BaseAPI
+from whombat.api.common.utils import batched, get_max_rows_per_insert
+from whombat.api.project_stats import STATUS_COUNTS, project_stats
 from whombat.api.users import users
 from whombat.filters.base import Filter
 
@@ -111,12 +115,217 @@ class AnnotationTaskAPI(
         schemas.AnnotationTask
             Created task.
         """
-        return await self.create_from_data(
+        task = await self.create_from_data(
             session,
             annotation_project_id=annotation_project.id,
             clip_id=clip.id,
             **kwargs,
         )
+        if kwargs.get("clip_annotation_id") is not None:
+            # The existing clip annotation may already have tags and
+            # sound events that now count towards the project.
+            await project_stats.add_tasks(session, [task.id])
+        else:
+            await project_stats.update_task_counts(
+                session,
+                annotation_project.id,
+                num_tasks=1,
+            )
+        return task
+
+    async def create_many(
+        self,
+        session: AsyncSession,
+        data: Sequence[dict],
+    ) -> None | Sequence[schemas.AnnotationTask]:
+        """Create many tasks.
+
+        The created tasks are added to the statistics of their projects.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        data
+            The data to use for creation of the tasks.
+        """
+        objs = await super().create_many(session, data)
+        await project_stats.add_tasks(
+            session,
+            await self._get_task_ids(session, data),
+        )
+        return objs
+
+    async def create_many_without_duplicates(
+        self,
+        session: AsyncSession,
+        data: Sequence[dict],
+        return_all: bool = False,
+    ) -> Sequence[schemas.AnnotationTask]:
+        """Create many tasks, skipping those that already exist.
+
+        The created tasks are added to the statistics of their projects.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        data
+            The data to use for creation of the tasks.
+        return_all
+            Whether to return all tasks, or only those created.
+
+        Returns
+        -------
+        list[schemas.AnnotationTask]
+            The created tasks.
+        """
+        existing = set(await self._get_task_ids(session, data))
+        objs = await super().create_many_without_duplicates(
+            session,
+            data,
+            return_all=return_all,
+        )
+        await project_stats.add_tasks(
+            session,
+            [
+                task_id
+                for task_id in await self._get_task_ids(session, data)
+                if task_id not in existing
+            ],
+        )
+        return objs
+
+    async def delete(
+        self,
+        session: AsyncSession,
+        obj: schemas.AnnotationTask,
+    ) -> schemas.AnnotationTask:
+        """Delete a task.
+
+        The task is removed from the statistics of its project, along
+        with the clip annotation, tags and badges it takes with it.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        obj
+            Task to delete.
+
+        Returns
+        -------
+        schemas.AnnotationTask
+            The deleted task.
+        """
+        await project_stats.remove_tasks(session, [obj.id])
+        return await super().delete(session, obj)
+
+    async def create_from_clips(
+        self,
+        session: AsyncSession,
+        annotation_project: schemas.AnnotationProject,
+        filters: Sequence[Filter | ColumnExpressionArgument] | None = None,
+        batch_size: int = 1000,
+    ) -> list[UUID]:
+        """Create tasks for all clips matching the given filters.
+
+        Clips are selected in the database, so there is no need to send
+        their UUIDs. Each batch of clips is inserted with a single
+        `INSERT ... ON CONFLICT DO NOTHING` statement per table, and clips
+        that already have a task in the project are skipped. No objects
+        are loaded back from the database.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        annotation_project
+            Annotation project to which the tasks belong.
+        filters
+            Filters on the clips for which to create tasks.
+        batch_size
+            Number of clips handled by each round of inserts.
+
+        Returns
+        -------
+        list[UUID]
+            The UUIDs of the created tasks.
+        """
+        has_task = (
+            select(models.AnnotationTask.id)
+            .where(
+                models.AnnotationTask.annotation_project_id
+                == annotation_project.id,
+                models.AnnotationTask.clip_id == models.Clip.id,
+            )
+            .exists()
+        )
+        query = select(models.Clip.id).where(~has_task)
+        for filter_ in filters or []:
+            if isinstance(filter_, Filter):
+                query = filter_.filter(query)
+            else:
+                query = query.where(filter_)
+        query = query.distinct().order_by(models.Clip.id).limit(batch_size)
+
+        created: list[UUID] = []
+        last_id = None
+        while True:
+            stmt = (
+                query
+                if last_id is None
+                else query.where(models.Clip.id > last_id)
+            )
+            clip_ids = (await session.scalars(stmt)).all()
+            if not clip_ids:
+                break
+            last_id = clip_ids[-1]
+
+            annotations = await common.create_objects(
+                session,
+                models.ClipAnnotation,
+                [dict(clip_id=clip_id) for clip_id in clip_ids],
+                returning=[models.ClipAnnotation.id],
+            )
+            annotation_ids = [row.id for row in annotations or []]
+            tasks = await common.create_objects_ignoring_duplicates(
+                session,
+                models.AnnotationTask,
+                [
+                    dict(
+                        annotation_project_id=annotation_project.id,
+                        clip_id=clip_id,
+                        clip_annotation_id=annotation_id,
+                    )
+                    for clip_id, annotation_id in zip(
+                        clip_ids, annotation_ids, strict=True
+                    )
+                ],
+                returning=[
+                    models.AnnotationTask.uuid,
+                    models.AnnotationTask.clip_annotation_id,
+                ],
+            )
+            created.extend(task.uuid for task in tasks)
+
+            # NOTE: Tasks created concurrently for the same clips are
+            # skipped, which leaves their clip annotations unused.
+            used = {task.clip_annotation_id for task in tasks}
+            unused = [id for id in annotation_ids if id not in used]
+            if unused:
+                await session.execute(
+                    delete(models.ClipAnnotation).where(
+                        models.ClipAnnotation.id.in_(unused)
+                    )
+                )
+
+        await project_stats.update_task_counts(
+            session,
+            annotation_project.id,
+            num_tasks=len(created),
+        )
+        return created
 
     async def create_clip_annotation(
         self,
@@ -192,6 +401,15 @@ class AnnotationTaskAPI(
             annotation_task_id=obj.id,
             user_id=user.id if user else None,
         )
+        await self.update_status_flags(session, [obj.id])
+        if state == data.AnnotationState.completed and user is not None:
+            await project_stats.update_user_activity(
+                session,
+                await self._get_project_id(session, obj),
+                user.id,
+                badge.created_on,
+                completed_tasks=1,
+            )
 
         obj = obj.model_copy(
             update=dict(
@@ -234,7 +452,7 @@ class AnnotationTaskAPI(
                 f"Status badge with state {state} not found in task {obj.id}"
             )
 
-        await common.delete_object(
+        badge = await common.delete_object(
             session,
             models.AnnotationStatusBadge,
             and_(
@@ -242,6 +460,18 @@ class AnnotationTaskAPI(
                 models.AnnotationStatusBadge.state == b.state,
             ),
         )
+        await self.update_status_flags(session, [obj.id])
+        if (
+            badge.state == data.AnnotationState.completed
+            and badge.user_id is not None
+        ):
+            await project_stats.update_user_activity(
+                session,
+                await self._get_project_id(session, obj),
+                badge.user_id,
+                badge.created_on,
+                completed_tasks=-1,
+            )
 
         obj = obj.model_copy(
             update=dict(
@@ -254,6 +484,187 @@ class AnnotationTaskAPI(
         self._update_cache(obj)
         return obj
 
+    async def get_next(
+        self,
+        session: AsyncSession,
+        annotation_project: schemas.AnnotationProject,
+        *,
+        after: schemas.AnnotationTask | None = None,
+        filters: Sequence[Filter | ColumnExpressionArgument] | None = None,
+        claim_for: schemas.SimpleUser | None = None,
+    ) -> schemas.AnnotationTask:
+        """Get the next task of a project that matches the filters.
+
+        Tasks are ordered by creation, and the next task is found with an
+        index seek on the task id instead of an offset, so the cost does
+        not grow with the position in the queue.
+
+        If `claim_for` is given, tasks assigned to other users are skipped
+        and the returned task is assigned to the user. On PostgreSQL the
+        candidate row is locked with `FOR UPDATE SKIP LOCKED`, so concurrent
+        annotators pulling from the same queue get different tasks.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        annotation_project
+            The project of the task queue.
+        after
+            The current task. If given, only tasks after it are considered.
+        filters
+            Filters the next task must match.
+        claim_for
+            The user that claims the task, if any.
+
+        Returns
+        -------
+        schemas.AnnotationTask
+            The next task.
+
+        Raises
+        ------
+        exceptions.NotFoundError
+            If there is no task left in the queue.
+        """
+        query = (
+            select(
+                models.AnnotationTask.id,
+                models.AnnotationTask.uuid,
+                models.AnnotationTask.is_assigned,
+            )
+            .where(
+                models.AnnotationTask.annotation_project_id
+                == annotation_project.id
+            )
+            .order_by(models.AnnotationTask.id)
+            .limit(1)
+        )
+        for filter_ in filters or []:
+            if isinstance(filter_, Filter):
+                query = filter_.filter(query)
+            else:
+                query = query.where(filter_)
+
+        if after is not None:
+            query = query.where(models.AnnotationTask.id > after.id)
+
+        if claim_for is None:
+            row = (await session.execute(query)).first()
+            if row is None:
+                raise exceptions.NotFoundError("No more tasks in the queue.")
+            return await self.get(session, row.uuid)
+
+        # A task can be assigned to several users, so the assignment badges
+        # are checked in addition to the last assigned user.
+        claimable = or_(
+            ~models.AnnotationTask.is_assigned,
+            models.AnnotationTask.assigned_to_id == claim_for.id,
+            models.AnnotationTask.status_badges.any(
+                and_(
+                    models.AnnotationStatusBadge.state
+                    == data.AnnotationState.assigned,
+                    models.AnnotationStatusBadge.user_id == claim_for.id,
+                )
+            ),
+        )
+        query = query.where(claimable).with_for_update(
+            skip_locked=True, of=models.AnnotationTask
+        )
+
+        while True:
+            row = (await session.execute(query)).first()
+            if row is None:
+                raise exceptions.NotFoundError("No more tasks in the queue.")
+
+            # Mark the task as assigned only if nobody claimed it since it
+            # was selected. Needed on databases without row locks.
+            result = await session.execute(
+                update(models.AnnotationTask)
+                .where(
+                    models.AnnotationTask.id == row.id,
+                    models.AnnotationTask.is_assigned == row.is_assigned,
+                    claimable,
+                )
+                .values(is_assigned=True, assigned_to_id=claim_for.id)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:  # type: ignore
+                break
+
+        if not row.is_assigned:
+            await project_stats.update_task_counts(
+                session,
+                annotation_project.id,
+                num_assigned=1,
+            )
+
+        task = await self.get(session, row.uuid)
+        if any(
+            badge.state == data.AnnotationState.assigned
+            and badge.user is not None
+            and badge.user.id == claim_for.id
+            for badge in task.status_badges
+        ):
+            return task
+
+        return await self.add_status_badge(
+            session,
+            task,
+            state=data.AnnotationState.assigned,
+            user=claim_for,
+        )
+
+    async def update_status_flags(
+        self,
+        session: AsyncSession,
+        ids: Sequence[int],
+    ) -> None:
+        """Recompute the status flags of tasks from their status badges.
+
+        The status flags (`is_completed`, `is_verified`, `is_rejected`,
+        `is_assigned` and `assigned_to_id`) are stored in the task table so
+        that tasks can be filtered by status without querying the badges.
+        Call this function after modifying the status badges of tasks
+        without `add_status_badge` or `remove_status_badge`.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        ids
+            Database ids of the tasks to update.
+        """
+        ids = list(ids)
+        for start in range(0, len(ids), 500):
+            batch = ids[start : start + 500]
+            before = await _get_status_flags(session, batch)
+            await session.execute(
+                update(models.AnnotationTask)
+                .where(models.AnnotationTask.id.in_(batch))
+                .values(**_get_status_flag_values())
+                .execution_options(synchronize_session=False)
+            )
+            after = await _get_status_flags(session, batch)
+
+            deltas: dict[int, dict[str, int]] = {}
+            for id, (project_id, *old) in before.items():
+                _, *new = after[id]
+                counts = deltas.setdefault(project_id, {})
+                for counter, was_set, is_set in zip(
+                    STATUS_COUNTS.values(), old, new, strict=True
+                ):
+                    counts[counter] = (
+                        counts.get(counter, 0) + int(is_set) - int(was_set)
+                    )
+
+            for project_id, counts in deltas.items():
+                await project_stats.update_task_counts(
+                    session,
+                    project_id,
+                    **counts,
+                )
+
     async def from_soundevent(
         self,
         session: AsyncSession,
@@ -422,6 +833,38 @@ class AnnotationTaskAPI(
             created_on=data.created_on,
         )
 
+    async def _get_project_id(
+        self,
+        session: AsyncSession,
+        obj: schemas.AnnotationTask,
+    ) -> int:
+        project_id = await session.scalar(
+            select(models.AnnotationTask.annotation_project_id).where(
+                models.AnnotationTask.id == obj.id
+            )
+        )
+        if project_id is None:
+            raise exceptions.NotFoundError(f"Task {obj.id} not found.")
+        return project_id
+
+    async def _get_task_ids(
+        self,
+        session: AsyncSession,
+        data: Sequence[dict],
+    ) -> list[int]:
+        """Get the ids of the existing tasks with the keys of the data."""
+        keys = list({self._key_fn(datum) for datum in data})
+        ids = []
+        for batch in batched(keys, get_max_rows_per_insert(session, 2)):
+            ids.extend(
+                await session.scalars(
+                    select(models.AnnotationTask.id).where(
+                        self._get_key_column().in_(batch)
+                    )
+                )
+            )
+        return ids
+
     def _key_fn(self, obj: dict):
         return (obj.get("annotation_project_id"), obj.get("clip_id"))
 
@@ -433,3 +876,55 @@ class AnnotationTaskAPI(
 
 
 annotation_tasks = AnnotationTaskAPI()
+
+
+def _get_status_flag_values() -> dict[str, ColumnElement]:
+    """Get the expressions that compute the status flags of a task.
+
+    The expressions are correlated to the `annotation_task` table and can
+    be used as the values of an update statement.
+    """
+    badge = models.AnnotationStatusBadge
+
+    def has_badge(state: data.AnnotationState) -> ColumnElement[bool]:
+        return (
+            select(badge.id)
+            .where(
+                badge.annotation_task_id == models.AnnotationTask.id,
+                badge.state == state,
+            )
+            .exists()
+        )
+
+    return {
+        "is_completed": has_badge(data.AnnotationState.completed),
+        "is_verified": has_badge(data.AnnotationState.verified),
+        "is_rejected": has_badge(data.AnnotationState.rejected),
+        "is_assigned": has_badge(data.AnnotationState.assigned),
+        "assigned_to_id": (
+            select(badge.user_id)
+            .where(
+                badge.annotation_task_id == models.AnnotationTask.id,
+                badge.state == data.AnnotationState.assigned,
+                badge.user_id.is_not(None),
+            )
+            .order_by(badge.created_on.desc(), badge.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        ),
+    }
+
+
+async def _get_status_flags(
+    session: AsyncSession,
+    ids: Sequence[int],
+) -> dict[int, tuple]:
+    """Get the project and status flags of tasks by id."""
+    result = await session.execute(
+        select(
+            models.AnnotationTask.id,
+            models.AnnotationTask.annotation_project_id,
+            *[getattr(models.AnnotationTask, flag) for flag in STATUS_COUNTS],
+        ).where(models.AnnotationTask.id.in_(ids))
+    )
+    return {id: tuple(values) for id, *values in result}
@@ -9,14 +9,19 @@ from pathlib import Path
 
 import numpy as np
 import soundfile as sf
-import torch
 import xarray as xr
-from soundevent.arrays import ArrayAttrs, Dimensions, create_time_range, extend_dim
+from soundevent.arrays import (
+    ArrayAttrs,
+    Dimensions,
+    create_time_range,
+    extend_dim,
+)
 from soundevent.audio.attributes import AudioAttrs
 from soundevent.audio.io import audio_to_bytes
-from torchaudio import functional as taF
 
 from whombat import schemas
+from whombat.core.dsp import DSPBackend, get_dsp_backend
+from whombat.system.metrics import timed
 
 __all__ = [
     "load_audio",
@@ -46,14 +51,15 @@ def _probe_audio(path: Path) -> _AudioMetadata:
 
 
 def _apply_filters(
-    waveform: torch.Tensor,
+    waveform: np.ndarray,
     samplerate: int,
     low_freq: float | None,
     high_freq: float | None,
     order: int,
-) -> torch.Tensor:
-    """Apply simple cascaded biquad filters using torchaudio."""
-    if samplerate <= 0 or waveform.numel() == 0:
+    backend: DSPBackend,
+) -> np.ndarray:
+    """Apply simple cascaded biquad filters."""
+    if samplerate <= 0 or waveform.size == 0:
         return waveform
 
     nyquist = samplerate / 2
@@ -86,31 +92,33 @@ def _apply_filters(
 
     if low_freq is not None:
         for _ in range(passes):
-            filtered = taF.highpass_biquad(
+            filtered = backend.biquad(
                 filtered,
                 samplerate,
-                cutoff_freq=low_freq,
-                Q=0.707,
+                low_freq,
+                "highpass",
             )
 
     if high_freq is not None:
         for _ in range(passes):
-            filtered = taF.lowpass_biquad(
+            filtered = backend.biquad(
                 filtered,
                 samplerate,
-                cutoff_freq=high_freq,
-                Q=0.707,
+                high_freq,
+                "lowpass",
             )
 
     return filtered
 
 
+@timed("audio")
 def load_audio(
     recording: schemas.Recording,
     start_time: float | None = None,
     end_time: float | None = None,
     audio_dir: Path | None = None,
     audio_parameters: schemas.AudioParameters | None = None,
+    backend: str | None = None,
 ):
     """Load audio.
 
@@ -126,12 +134,17 @@ def load_audio(
         The directory where the audio files are stored.
     audio_parameters
         Audio parameters.
+    backend
+        Name of the signal processing backend used to resample and
+        filter. Defaults to the backend set from the settings.
 
     Returns
     -------
     bytes
         Audio data.
     """
+    dsp = get_dsp_backend(backend)
+
     if audio_dir is None:
         audio_dir = Path().cwd()
 
@@ -181,10 +194,7 @@ def load_audio(
         expected_frames = available_frames
 
     channels = metadata.num_channels or recording.channels or 1
-    waveform = torch.zeros(
-        (channels, expected_frames),
-        dtype=torch.float32,
-    )
+    waveform = np.zeros((channels, expected_frames), dtype=np.float32)
 
     if expected_frames > 0 and frame_offset < total_frames:
         with sf.SoundFile(audio_path) as sf_file:
@@ -195,11 +205,10 @@ def load_audio(
                 always_2d=True,
             )
         if segment.size > 0:
-            segment_tensor = torch.from_numpy(segment.T.copy())
-            frames_to_copy = min(segment_tensor.shape[1], expected_frames)
-            waveform[: segment_tensor.shape[0], :frames_to_copy] = (
-                segment_tensor[:, :frames_to_copy]
-            )
+            frames_to_copy = min(segment.shape[0], expected_frames)
+            waveform[: segment.shape[1], :frames_to_copy] = segment[
+                :frames_to_copy
+            ].T
 
     current_samplerate = int(effective_samplerate)
 
@@ -210,7 +219,7 @@ def load_audio(
     ):
         target_samplerate = audio_parameters.samplerate
         if waveform.shape[1] > 0:
-            waveform = taF.resample(
+            waveform = dsp.resample(
                 waveform,
                 current_samplerate,
                 target_samplerate,
@@ -231,6 +240,7 @@ def load_audio(
             audio_parameters.low_freq,
             audio_parameters.high_freq,
             audio_parameters.filter_order,
+            dsp,
         )
 
     actual_start_time = (
@@ -248,7 +258,7 @@ def load_audio(
     )
 
     data_array = xr.DataArray(
-        data=waveform.transpose(1, 0).cpu().numpy(),
+        data=waveform.T,
         dims=(Dimensions.time.value, Dimensions.channel.value),
         coords={
             Dimensions.time.value: time_coord,
@@ -285,6 +295,7 @@ BIT_DEPTH_MAP: dict[str, int] = {
 }
 
 
+@timed("audio")
 def load_clip_bytes(
     path: Path,
     start: int,
@@ -295,6 +306,7 @@ def load_clip_bytes(
     end_time: float | None = None,
     bit_depth: int = 16,
     target_samplerate: int | None = None,
+    backend: str | None = None,
 ) -> tuple[bytes, int, int, int]:
     """Load audio bytes for streaming playback.
 
@@ -325,6 +337,9 @@ def load_clip_bytes(
         Bit depth of the output audio. Default is 16 bits.
     target_samplerate
         Target sample rate for resampling. If None, uses file_samplerate.
+    backend
+        Name of the signal processing backend used to resample. Defaults
+        to the backend set from the settings.
 
     Returns
     -------
@@ -417,15 +432,14 @@ def load_clip_bytes(
             and target_samplerate != file_samplerate
         ):
             try:
-                # Convert to torch tensor for resampling
-                waveform = torch.from_numpy(audio_data.T).to(torch.float32)
+                waveform = np.ascontiguousarray(audio_data.T, np.float32)
                 if waveform.shape[1] > 0:
-                    waveform = taF.resample(
+                    waveform = get_dsp_backend(backend).resample(
                         waveform,
                         file_samplerate,
                         target_samplerate,
                     )
-                audio_data = waveform.T.cpu().numpy()
+                audio_data = waveform.T
                 logger.debug(
                     f"Resampled from {file_samplerate}Hz to {target_samplerate}Hz, "
                     f"output shape: {audio_data.shape}"
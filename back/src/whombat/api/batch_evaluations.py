@@ -0,0 +1,658 @@
+"""Batched evaluation of model runs.
+
+The default evaluation path converts a whole model run and evaluation set
+into `soundevent` objects, evaluates them in memory and imports the result
+back into the database object by object. This does not scale to model runs
+with tens of thousands of clip predictions.
+
+This module implements the sound event detection evaluation by streaming
+the clip predictions in batches. For each batch, only the columns needed
+for matching (ids, geometries and tag scores) are loaded, predictions and
+annotations are matched with the vectorized functions in
+`whombat.core.matching`, and the resulting clip and sound event
+evaluations are written with bulk inserts.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Sequence
+
+import numpy as np
+from soundevent import data, terms
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import models, schemas
+from whombat.api.common import create_objects
+from whombat.api.features import features
+from whombat.core.geometries import load_geometry
+from whombat.core.matching import (
+    compute_affinity_matrix,
+    get_geometry_bounds,
+    select_matches,
+)
+
+__all__ = [
+    "BatchEvaluator",
+    "ClipMatches",
+    "count_clip_pairs",
+    "evaluate_clip_matches",
+    "iterate_clip_pairs",
+]
+
+logger = logging.getLogger(__name__)
+
+RUN_METRICS: Sequence[tuple[data.Term, str]] = (
+    (terms.mean_average_precision, "mean_average_precision"),
+    (terms.balanced_accuracy, "balanced_accuracy"),
+    (terms.accuracy, "accuracy"),
+    (terms.top_3_accuracy, "top_3_accuracy"),
+)
+"""Metrics computed over all matches of the evaluation.
+
+Each term is paired with the name of its `soundevent.evaluation.metrics`
+function, which is imported when the metrics are computed.
+
+These are the same metrics computed by
+`soundevent.evaluation.sound_event_detection`.
+"""
+
+TRUE_CLASS_PROBABILITY = data.Feature(
+    term=terms.true_class_probability,
+    value=0,
+).name
+"""Name of the metric stored for every matched sound event."""
+
+DEFAULT_BATCH_SIZE = 200
+"""Default number of clip predictions evaluated per batch."""
+
+
+@dataclass
+class ClipMatches:
+    """Result of matching the sound events of a single clip.
+
+    All arrays have one entry per match. Unmatched predictions have a
+    target index of -1 and unmatched annotations a source index of -1.
+    """
+
+    source_index: np.ndarray
+    """Index of the matched prediction within the clip."""
+
+    target_index: np.ndarray
+    """Index of the matched annotation within the clip."""
+
+    affinity: np.ndarray
+    """Affinity between the prediction and the annotation."""
+
+    score: np.ndarray
+    """Classification score of each match."""
+
+    true_class: np.ndarray
+    """Encoded class of the annotation, or -1 if no class applies."""
+
+    class_scores: np.ndarray
+    """Array of shape (N, K) with the predicted score of each class."""
+
+    @property
+    def is_match(self) -> np.ndarray:
+        """Boolean mask of the entries with both a source and a target."""
+        return (self.source_index >= 0) & (self.target_index >= 0)
+
+    @property
+    def clip_score(self) -> float:
+        """The score of the clip, the mean score of all its matches."""
+        if len(self.score) == 0:
+            return 0.0
+        score = float(np.mean(self.score))
+        if np.isnan(score):
+            return 0.0
+        return score
+
+
+def evaluate_clip_matches(
+    prediction_bounds: np.ndarray,
+    annotation_bounds: np.ndarray,
+    prediction_scores: np.ndarray,
+    annotation_classes: np.ndarray,
+    prediction_is_time: np.ndarray | None = None,
+    annotation_is_time: np.ndarray | None = None,
+    prediction_is_buffered: np.ndarray | None = None,
+    annotation_is_buffered: np.ndarray | None = None,
+) -> ClipMatches:
+    """Match and score the sound events of a single clip.
+
+    Parameters
+    ----------
+    prediction_bounds
+        Array of shape (P, 4) with the bounds of the predicted sound events.
+    annotation_bounds
+        Array of shape (A, 4) with the bounds of the annotated sound events.
+    prediction_scores
+        Array of shape (P, K) with the score of each class for each
+        predicted sound event.
+    annotation_classes
+        Array of shape (A,) with the encoded class of each annotated sound
+        event, or -1 if the annotation has none of the evaluated tags.
+    prediction_is_time
+        Which predicted geometries are purely temporal.
+    annotation_is_time
+        Which annotated geometries are purely temporal.
+    prediction_is_buffered
+        Which predicted geometries are buffered before matching.
+    annotation_is_buffered
+        Which annotated geometries are buffered before matching.
+
+    Returns
+    -------
+    ClipMatches
+        The matches of the clip.
+
+    Notes
+    -----
+    Scores follow `soundevent.evaluation.sound_event_detection`: unmatched
+    predictions and annotations get a score of zero, and a matched pair is
+    scored with the predicted probability of the annotated class (or one
+    minus the total predicted probability if the annotation has no class).
+    """
+    num_classes = prediction_scores.shape[1]
+    affinity = compute_affinity_matrix(
+        prediction_bounds,
+        annotation_bounds,
+        source_is_time=prediction_is_time,
+        target_is_time=annotation_is_time,
+        source_is_buffered=prediction_is_buffered,
+        target_is_buffered=annotation_is_buffered,
+    )
+    source_index, target_index, match_affinity = select_matches(affinity)
+
+    has_source = source_index >= 0
+    has_target = target_index >= 0
+
+    class_scores = np.zeros((len(source_index), num_classes), np.float32)
+    class_scores[has_source] = prediction_scores[source_index[has_source]]
+
+    true_class = np.full(len(source_index), -1, dtype=np.int64)
+    true_class[has_target] = annotation_classes[target_index[has_target]]
+
+    is_match = has_source & has_target
+    score = np.zeros(len(source_index), dtype=np.float64)
+    rows = np.flatnonzero(is_match & (true_class >= 0))
+    score[rows] = class_scores[rows, true_class[rows]]
+    rows = np.flatnonzero(is_match & (true_class < 0))
+    score[rows] = 1 - class_scores[rows].sum(axis=1)
+
+    return ClipMatches(
+        source_index=source_index,
+        target_index=target_index,
+        affinity=match_affinity,
+        score=score,
+        true_class=true_class,
+        class_scores=class_scores,
+    )
+
+
+def _clip_pairs_query(model_run_id: int, evaluation_set_id: int):
+    """Select the clip predictions of a run with an annotation in the set.
+
+    If a clip has more than one annotation in the evaluation set, the last
+    one is used, as done by `soundevent`.
+    """
+    return (
+        select(
+            models.ClipPrediction.id,
+            func.max(models.ClipAnnotation.id),
+        )
+        .join(
+            models.ModelRunPrediction,
+            models.ModelRunPrediction.clip_prediction_id
+            == models.ClipPrediction.id,
+        )
+        .join(
+            models.ClipAnnotation,
+            models.ClipAnnotation.clip_id == models.ClipPrediction.clip_id,
+        )
+        .join(
+            models.EvaluationSetAnnotation,
+            models.EvaluationSetAnnotation.clip_annotation_id
+            == models.ClipAnnotation.id,
+        )
+        .where(
+            models.ModelRunPrediction.model_run_id == model_run_id,
+            models.EvaluationSetAnnotation.evaluation_set_id
+            == evaluation_set_id,
+        )
+        .group_by(models.ClipPrediction.id)
+    )
+
+
+async def count_clip_pairs(
+    session: AsyncSession,
+    model_run_id: int,
+    evaluation_set_id: int,
+) -> int:
+    """Count the clip predictions that will be evaluated."""
+    query = _clip_pairs_query(model_run_id, evaluation_set_id).subquery()
+    return await session.scalar(select(func.count()).select_from(query)) or 0
+
+
+async def iterate_clip_pairs(
+    session: AsyncSession,
+    model_run_id: int,
+    evaluation_set_id: int,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> AsyncIterator[list[tuple[int, int]]]:
+    """Iterate over batches of (clip prediction, clip annotation) ids.
+
+    Batches are fetched with keyset pagination on the clip prediction id,
+    so every query is cheap regardless of how far into the run it is.
+    """
+    query = _clip_pairs_query(model_run_id, evaluation_set_id).order_by(
+        models.ClipPrediction.id
+    )
+    last_id = None
+    while True:
+        page = query
+        if last_id is not None:
+            page = page.where(models.ClipPrediction.id > last_id)
+
+        result = await session.execute(page.limit(batch_size))
+        batch = [(row[0], row[1]) for row in result.all()]
+        if not batch:
+            return
+
+        yield batch
+        last_id = batch[-1][0]
+
+
+@dataclass
+class _SoundEventRows:
+    """Columns of the sound events of a batch, grouped by clip."""
+
+    ids: dict[int, list[int]] = field(default_factory=dict)
+    geometries: dict[int, list[data.Geometry]] = field(default_factory=dict)
+
+
+async def _get_prediction_rows(
+    session: AsyncSession,
+    clip_prediction_ids: Sequence[int],
+) -> _SoundEventRows:
+    query = (
+        select(
+            models.SoundEventPrediction.id,
+            models.SoundEventPrediction.clip_prediction_id,
+            models.SoundEvent.geometry,
+        )
+        .join(
+            models.SoundEvent,
+            models.SoundEvent.id == models.SoundEventPrediction.sound_event_id,
+        )
+        .where(
+            models.SoundEventPrediction.clip_prediction_id.in_(
+                clip_prediction_ids
+            )
+        )
+        .order_by(models.SoundEventPrediction.id)
+    )
+    rows = _SoundEventRows()
+    for id, clip_prediction_id, geometry in await session.execute(query):
+        rows.ids.setdefault(clip_prediction_id, []).append(id)
+        rows.geometries.setdefault(clip_prediction_id, []).append(
+            load_geometry(geometry)
+        )
+    return rows
+
+
+async def _get_annotation_rows(
+    session: AsyncSession,
+    clip_annotation_ids: Sequence[int],
+) -> _SoundEventRows:
+    query = (
+        select(
+            models.SoundEventAnnotation.id,
+            models.SoundEventAnnotation.clip_annotation_id,
+            models.SoundEvent.geometry,
+        )
+        .join(
+            models.SoundEvent,
+            models.SoundEvent.id == models.SoundEventAnnotation.sound_event_id,
+        )
+        .where(
+            models.SoundEventAnnotation.clip_annotation_id.in_(
+                clip_annotation_ids
+            )
+        )
+        .order_by(models.SoundEventAnnotation.id)
+    )
+    rows = _SoundEventRows()
+    for id, clip_annotation_id, geometry in await session.execute(query):
+        rows.ids.setdefault(clip_annotation_id, []).append(id)
+        rows.geometries.setdefault(clip_annotation_id, []).append(
+            load_geometry(geometry)
+        )
+    return rows
+
+
+async def _get_prediction_scores(
+    session: AsyncSession,
+    clip_prediction_ids: Sequence[int],
+    encoding: dict[int, int],
+) -> dict[int, dict[int, float]]:
+    """Get the scores of the evaluated tags of each sound event prediction."""
+    query = (
+        select(
+            models.SoundEventPredictionTag.sound_event_prediction_id,
+            models.SoundEventPredictionTag.tag_id,
+            models.SoundEventPredictionTag.score,
+        )
+        .join(
+            models.SoundEventPrediction,
+            models.SoundEventPrediction.id
+            == models.SoundEventPredictionTag.sound_event_prediction_id,
+        )
+        .where(
+            models.SoundEventPrediction.clip_prediction_id.in_(
+                clip_prediction_ids
+            ),
+            models.SoundEventPredictionTag.tag_id.in_(list(encoding)),
+        )
+    )
+    scores: dict[int, dict[int, float]] = {}
+    for id, tag_id, score in await session.execute(query):
+        scores.setdefault(id, {})[encoding[tag_id]] = score
+    return scores
+
+
+async def _get_annotation_classes(
+    session: AsyncSession,
+    clip_annotation_ids: Sequence[int],
+    encoding: dict[int, int],
+) -> dict[int, int]:
+    """Get the encoded class of each sound event annotation.
+
+    As in `soundevent.evaluation.encoding.classification_encoding`, the
+    class is given by the first evaluated tag of the annotation.
+    """
+    query = (
+        select(
+            models.SoundEventAnnotationTag.sound_event_annotation_id,
+            models.SoundEventAnnotationTag.tag_id,
+        )
+        .join(
+            models.SoundEventAnnotation,
+            models.SoundEventAnnotation.id
+            == models.SoundEventAnnotationTag.sound_event_annotation_id,
+        )
+        .where(
+            models.SoundEventAnnotation.clip_annotation_id.in_(
+                clip_annotation_ids
+            ),
+            models.SoundEventAnnotationTag.tag_id.in_(list(encoding)),
+        )
+        .order_by(models.SoundEventAnnotationTag.id)
+    )
+    classes: dict[int, int] = {}
+    for id, tag_id in await session.execute(query):
+        classes.setdefault(id, encoding[tag_id])
+    return classes
+
+
+class BatchEvaluator:
+    """Evaluate a model run against an evaluation set in batches.
+
+    Parameters
+    ----------
+    session
+        SQLAlchemy AsyncSession.
+    evaluation
+        The evaluation in which to store the results.
+    model_run
+        The model run to evaluate.
+    evaluation_set
+        The evaluation set to evaluate the model run against.
+    batch_size
+        Number of clip predictions evaluated per batch.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        evaluation: schemas.Evaluation,
+        model_run: schemas.ModelRun,
+        evaluation_set: schemas.EvaluationSet,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        self.session = session
+        self.evaluation = evaluation
+        self.model_run = model_run
+        self.evaluation_set = evaluation_set
+        self.batch_size = batch_size
+        self.encoding = {
+            tag.id: index for index, tag in enumerate(evaluation_set.tags)
+        }
+        self.true_classes: list[int | None] = []
+        self.class_scores: list[np.ndarray] = []
+        self.clip_scores: list[float] = []
+
+    async def count(self) -> int:
+        """Count the number of clip predictions to evaluate."""
+        return await count_clip_pairs(
+            self.session,
+            self.model_run.id,
+            self.evaluation_set.id,
+        )
+
+    async def run(
+        self,
+        on_batch: Callable[[int], None] | None = None,
+    ) -> None:
+        """Evaluate all clip predictions, one batch at a time.
+
+        Parameters
+        ----------
+        on_batch
+            Called with the number of clip predictions after each batch
+            has been written.
+        """
+        metric_name = await features.get_or_create(
+            self.session,
+            TRUE_CLASS_PROBABILITY,
+        )
+        self._metric_name_id = metric_name.id
+
+        async for batch in iterate_clip_pairs(
+            self.session,
+            self.model_run.id,
+            self.evaluation_set.id,
+            batch_size=self.batch_size,
+        ):
+            await self.evaluate_batch(batch)
+            if on_batch is not None:
+                on_batch(len(batch))
+
+    @property
+    def score(self) -> float:
+        """The overall score, the mean score of all evaluated clips."""
+        if not self.clip_scores:
+            return 0.0
+        return float(np.mean(self.clip_scores))
+
+    def compute_metrics(self) -> list[schemas.Feature]:
+        """Compute the run level metrics over all evaluated matches.
+
+        Metrics that are undefined for the evaluated matches, for example
+        because the evaluation set has no tags, are skipped.
+        """
+        if not self.true_classes or not self.encoding:
+            return []
+
+        from soundevent.evaluation import metrics
+
+        class_scores = np.concatenate(self.class_scores, axis=0)
+        evaluation_metrics = []
+        for term, name in RUN_METRICS:
+            metric = getattr(metrics, name)
+            try:
+                value = float(metric(self.true_classes, class_scores))
+            except ValueError:
+                logger.warning("Metric %s is undefined, skipping", term.name)
+                continue
+
+            evaluation_metrics.append(
+                schemas.Feature(
+                    name=data.Feature(term=term, value=0).name,
+                    value=value,
+                )
+            )
+        return evaluation_metrics
+
+    async def evaluate_batch(self, batch: Sequence[tuple[int, int]]) -> None:
+        """Evaluate and store a batch of clip predictions."""
+        clip_prediction_ids = [pair[0] for pair in batch]
+        clip_annotation_ids = list({pair[1] for pair in batch})
+
+        predictions = await _get_prediction_rows(
+            self.session,
+            clip_prediction_ids,
+        )
+        annotations = await _get_annotation_rows(
+            self.session,
+            clip_annotation_ids,
+        )
+        prediction_scores = await _get_prediction_scores(
+            self.session,
+            clip_prediction_ids,
+            self.encoding,
+        )
+        annotation_classes = await _get_annotation_classes(
+            self.session,
+            clip_annotation_ids,
+            self.encoding,
+        )
+
+        clip_matches: list[ClipMatches] = []
+        for clip_prediction_id, clip_annotation_id in batch:
+            matches = self._evaluate_clip(
+                predictions.ids.get(clip_prediction_id, []),
+                predictions.geometries.get(clip_prediction_id, []),
+                annotations.ids.get(clip_annotation_id, []),
+                annotations.geometries.get(clip_annotation_id, []),
+                prediction_scores,
+                annotation_classes,
+            )
+            clip_matches.append(matches)
+
+        clip_evaluation_rows = await create_objects(
+            self.session,
+            models.ClipEvaluation,
+            [
+                dict(
+                    evaluation_id=self.evaluation.id,
+                    clip_prediction_id=clip_prediction_id,
+                    clip_annotation_id=clip_annotation_id,
+                    score=matches.clip_score,
+                )
+                for (clip_prediction_id, clip_annotation_id), matches in zip(
+                    batch, clip_matches, strict=True
+                )
+            ],
+            returning=[models.ClipEvaluation.id],
+        )
+
+        sound_event_evaluations = []
+        matched = []
+        for row, (clip_prediction_id, clip_annotation_id), matches in zip(
+            clip_evaluation_rows or [], batch, clip_matches, strict=True
+        ):
+            prediction_ids = predictions.ids.get(clip_prediction_id, [])
+            annotation_ids = annotations.ids.get(clip_annotation_id, [])
+            is_match = matches.is_match
+            for index in range(len(matches.score)):
+                source = int(matches.source_index[index])
+                target = int(matches.target_index[index])
+                sound_event_evaluations.append(
+                    dict(
+                        clip_evaluation_id=row[0],
+                        source_id=prediction_ids[source]
+                        if source >= 0
+                        else None,
+                        target_id=annotation_ids[target]
+                        if target >= 0
+                        else None,
+                        affinity=float(matches.affinity[index]),
+                        score=float(matches.score[index]),
+                    )
+                )
+                matched.append(bool(is_match[index]))
+
+        sound_event_evaluation_rows = await create_objects(
+            self.session,
+            models.SoundEventEvaluation,
+            sound_event_evaluations,
+            returning=[models.SoundEventEvaluation.id],
+        )
+
+        await create_objects(
+            self.session,
+            models.SoundEventEvaluationMetric,
+            [
+                dict(
+                    sound_event_evaluation_id=row[0],
+                    feature_name_id=self._metric_name_id,
+                    value=values["score"],
+                )
+                for row, values, is_match in zip(
+                    sound_event_evaluation_rows or [],
+                    sound_event_evaluations,
+                    matched,
+                    strict=True,
+                )
+                if is_match
+            ],
+        )
+
+    def _evaluate_clip(
+        self,
+        prediction_ids: Sequence[int],
+        prediction_geometries: Sequence[data.Geometry],
+        annotation_ids: Sequence[int],
+        annotation_geometries: Sequence[data.Geometry],
+        prediction_scores: dict[int, dict[int, float]],
+        annotation_classes: dict[int, int],
+    ) -> ClipMatches:
+        scores = np.zeros(
+            (len(prediction_ids), len(self.encoding)),
+            dtype=np.float32,
+        )
+        for row, id in enumerate(prediction_ids):
+            for index, score in prediction_scores.get(id, {}).items():
+                scores[row, index] = score
+
+        classes = np.array(
+            [annotation_classes.get(id, -1) for id in annotation_ids],
+            dtype=np.int64,
+        )
+
+        prediction_bounds, prediction_is_time, prediction_is_buffered = (
+            get_geometry_bounds(prediction_geometries)
+        )
+        annotation_bounds, annotation_is_time, annotation_is_buffered = (
+            get_geometry_bounds(annotation_geometries)
+        )
+
+        matches = evaluate_clip_matches(
+            prediction_bounds,
+            annotation_bounds,
+            scores,
+            classes,
+            prediction_is_time=prediction_is_time,
+            annotation_is_time=annotation_is_time,
+            prediction_is_buffered=prediction_is_buffered,
+            annotation_is_buffered=annotation_is_buffered,
+        )
+
+        self.clip_scores.append(matches.clip_score)
+        self.true_classes.extend(
+            int(value) if value >= 0 else None for value in matches.true_class
+        )
+        self.class_scores.append(matches.class_scores)
+        return matches
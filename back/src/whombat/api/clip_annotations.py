@@ -13,6 +13,7 @@ from whombat.api import common
 from whombat.api.clips import clips
 from whombat.api.common import BaseAPI
 from whombat.api.notes import notes
+from whombat.api.project_stats import project_stats
 from whombat.api.sound_event_annotations import sound_event_annotations
 from whombat.api.tags import tags
 
@@ -102,6 +103,41 @@ class ClipAnnotationAPI(
         )
         return [self._schema.model_validate(ann) for ann in ret]
 
+    async def delete(
+        self,
+        session: AsyncSession,
+        obj: schemas.ClipAnnotation,
+    ) -> schemas.ClipAnnotation:
+        """Delete a clip annotation.
+
+        If the clip annotation belongs to an annotation task, its tags,
+        sound events and the tags of those are removed from the
+        statistics of the project.
+
+        Parameters
+        ----------
+        session
+            The database session.
+        obj
+            The clip annotation to delete.
+
+        Returns
+        -------
+        schemas.ClipAnnotation
+            The deleted clip annotation.
+        """
+        task_ids = (
+            await session.scalars(
+                select(models.AnnotationTask.id).where(
+                    models.AnnotationTask.clip_annotation_id == obj.id
+                )
+            )
+        ).all()
+        await project_stats.remove_tasks(session, task_ids)
+        obj = await super().delete(session, obj)
+        await project_stats.add_tasks(session, task_ids)
+        return obj
+
     async def add_tag(
         self,
         session: AsyncSession,
@@ -147,6 +183,14 @@ class ClipAnnotationAPI(
             tag_id=tag.id,
             created_by_id=user_id,
         )
+        project_id = await project_stats.get_project_id(session, obj.id)
+        if project_id is not None:
+            await project_stats.update_tag_counts(
+                session,
+                project_id,
+                tag.id,
+                clip_annotations=1,
+            )
 
         obj = obj.model_copy(
             update=dict(
@@ -250,6 +294,14 @@ class ClipAnnotationAPI(
                 models.ClipAnnotationTag.tag_id == tag.id,
             ),
         )
+        project_id = await project_stats.get_project_id(session, obj.id)
+        if project_id is not None:
+            await project_stats.update_tag_counts(
+                session,
+                project_id,
+                tag.id,
+                clip_annotations=-1,
+            )
 
         obj = obj.model_copy(
             update=dict(
@@ -401,7 +453,10 @@ class ClipAnnotationAPI(
         data.ClipAnnotation
             The converted object in the soundevent format.
         """
-        se_clip = clips.to_soundevent(clip_annotation.clip)
+        se_clip = clips.to_soundevent(
+            clip_annotation.clip,
+            audio_dir=audio_dir,
+        )
         se_sound_events = [
             await sound_event_annotations.to_soundevent(
                 session,
@@ -7,6 +7,7 @@ from whombat.api.common.utils import (
     add_tag_to_object,
     create_object,
     create_objects,
+    create_objects_ignoring_duplicates,
     create_objects_without_duplicates,
     delete_object,
     get_count,
@@ -33,6 +34,8 @@ from whombat.api.common.permissions import (  # noqa: F401
     can_view_dataset,
     filter_annotation_projects_by_access,
     filter_datasets_by_access,
+    get_group_roles,
+    invalidate_group_roles,
 )
 
 __all__ = [
@@ -42,6 +45,7 @@ __all__ = [
     "add_tag_to_object",
     "create_object",
     "create_objects",
+    "create_objects_ignoring_duplicates",
     "create_objects_without_duplicates",
     "delete_object",
     "get_count",
@@ -1,8 +1,21 @@
-"""Permission helpers for entity visibility control."""
+"""Permission helpers for entity visibility control.
+
+Permission checks depend on the roles of the user in their groups. These
+are loaded once per session, which is one per request, and answered from
+memory afterwards, so routes can check many objects without querying the
+memberships each time. Loaded roles are also kept in a short lived per
+user cache shared between sessions. Functions that change memberships
+must call `invalidate_group_roles`. The shared cache only sees changes
+made by its own process, so it is turned off with
+`disable_group_roles_cache` when several workers serve the app.
+"""
 
 from __future__ import annotations
 
-from typing import Iterable
+import time
+from types import MappingProxyType
+from typing import Mapping
+from uuid import UUID
 
 from sqlalchemy import and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,8 +25,10 @@ from whombat.models.annotation_project import AnnotationProject
 from whombat.models.dataset import Dataset, VisibilityLevel
 from whombat.models.group import GroupMembership, GroupRole
 from whombat.models.user import User
+from whombat.system.metrics import record_cache_access
 
 __all__ = [
+    "MEMBERSHIP_CACHE_TTL",
     "can_view_dataset",
     "can_edit_dataset",
     "can_delete_dataset",
@@ -24,23 +39,117 @@ __all__ = [
     "can_delete_annotation_project",
     "can_manage_restricted_annotation_project",
     "filter_annotation_projects_by_access",
+    "disable_group_roles_cache",
+    "get_group_roles",
+    "invalidate_group_roles",
 ]
 
+MEMBERSHIP_CACHE_TTL = 5.0
+"""Seconds the group roles of a user are shared between sessions."""
 
-async def _get_membership(
+_MAX_CACHED_USERS = 10_000
+
+_SNAPSHOT_KEY = "whombat.group_roles"
+
+_DIRTY_KEY = "whombat.group_roles_dirty"
+
+_group_roles: dict[UUID, tuple[float, Mapping[int, GroupRole]]] = {}
+
+_share_group_roles = True
+
+
+async def get_group_roles(
+    session: AsyncSession,
+    user: User,
+) -> Mapping[int, GroupRole]:
+    """Return the role of the user in each of their groups, by group id."""
+    snapshots = session.info.setdefault(_SNAPSHOT_KEY, {})
+    roles = snapshots.get(user.id)
+    if roles is not None:
+        return roles
+
+    # Sessions that changed memberships see their own uncommitted
+    # changes, which must not leak into the shared cache.
+    shared = _share_group_roles and not session.info.get(_DIRTY_KEY, False)
+    now = time.monotonic()
+    if shared:
+        cached = _group_roles.get(user.id)
+        if cached is not None and cached[0] > now:
+            record_cache_access("group_roles", hit=True)
+            snapshots[user.id] = cached[1]
+            return cached[1]
+        record_cache_access("group_roles", hit=False)
+
+    result = await session.execute(
+        select(GroupMembership.group_id, GroupMembership.role).where(
+            GroupMembership.user_id == user.id
+        )
+    )
+    roles = MappingProxyType(
+        {group_id: role for group_id, role in result.all()}
+    )
+    snapshots[user.id] = roles
+    if shared:
+        if len(_group_roles) >= _MAX_CACHED_USERS:
+            _prune_group_roles(now)
+        _group_roles[user.id] = (now + MEMBERSHIP_CACHE_TTL, roles)
+    return roles
+
+
+def invalidate_group_roles(
+    session: AsyncSession | None = None,
+    user_id: UUID | None = None,
+) -> None:
+    """Forget the cached group roles of a user, or of all users.
+
+    If a session is given, its snapshot is dropped too, and it stops
+    using the shared cache.
+    """
+    if user_id is None:
+        _group_roles.clear()
+    else:
+        _group_roles.pop(user_id, None)
+
+    if session is None:
+        return
+
+    session.info[_DIRTY_KEY] = True
+    snapshots = session.info.get(_SNAPSHOT_KEY, {})
+    if user_id is None:
+        snapshots.clear()
+    else:
+        snapshots.pop(user_id, None)
+
+
+def disable_group_roles_cache() -> None:
+    """Stop sharing group roles between sessions.
+
+    Roles are still loaded once per session.
+    """
+    global _share_group_roles
+    _share_group_roles = False
+    _group_roles.clear()
+
+
+def _prune_group_roles(now: float) -> None:
+    for user_id, (expires, _) in list(_group_roles.items()):
+        if expires <= now:
+            del _group_roles[user_id]
+
+    if len(_group_roles) >= _MAX_CACHED_USERS:
+        _group_roles.clear()
+
+
+async def _get_role(
     session: AsyncSession,
     group_id: int,
     user: User | None,
-) -> GroupMembership | None:
+) -> GroupRole | None:
     if user is None:
         return None
 
-    return await session.scalar(
-        select(GroupMembership).where(
-            GroupMembership.group_id == group_id,
-            GroupMembership.user_id == user.id,
-        )
-    )
+    roles = await get_group_roles(session, user)
+    return roles.get(group_id)
 
 
 async def can_view_dataset(
@@ -58,9 +167,12 @@ async def can_view_dataset(
     if user.is_superuser or dataset.created_by_id == user.id:
         return True
 
-    if dataset.visibility == VisibilityLevel.RESTRICTED and dataset.owner_group_id:
-        membership = await _get_membership(session, dataset.owner_group_id, user)
-        return membership is not None
+    if (
+        dataset.visibility == VisibilityLevel.RESTRICTED
+        and dataset.owner_group_id
+    ):
+        role = await _get_role(session, dataset.owner_group_id, user)
+        return role is not None
 
     return False
 
@@ -77,9 +189,12 @@ async def can_edit_dataset(
     if user.is_superuser or dataset.created_by_id == user.id:
         return True
 
-    if dataset.visibility == VisibilityLevel.RESTRICTED and dataset.owner_group_id:
-        membership = await _get_membership(session, dataset.owner_group_id, user)
-        return membership is not None and membership.role == GroupRole.MANAGER
+    if (
+        dataset.visibility == VisibilityLevel.RESTRICTED
+        and dataset.owner_group_id
+    ):
+        role = await _get_role(session, dataset.owner_group_id, user)
+        return role == GroupRole.MANAGER
 
     return False
 
@@ -108,8 +223,8 @@ async def can_manage_restricted_dataset(
     if user.is_superuser:
         return True
 
-    membership = await _get_membership(session, group_id, user)
-    return membership is not None and membership.role == GroupRole.MANAGER
+    role = await _get_role(session, group_id, user)
+    return role == GroupRole.MANAGER
 
 
 async def filter_datasets_by_access(
@@ -123,13 +238,7 @@ async def filter_datasets_by_access(
     if user.is_superuser:
         return []
 
-    group_ids: Iterable[int] = (
-        await session.scalars(
-            select(GroupMembership.group_id).where(
-                GroupMembership.user_id == user.id
-            )
-        )
-    ).all()
+    group_ids = list(await get_group_roles(session, user))
 
     conditions: list[ColumnElement[bool]] = [
         Dataset.visibility == VisibilityLevel.PUBLIC,
@@ -162,9 +271,12 @@ async def can_view_annotation_project(
     if user.is_superuser or project.created_by_id == user.id:
         return True
 
-    if project.visibility == VisibilityLevel.RESTRICTED and project.owner_group_id:
-        membership = await _get_membership(session, project.owner_group_id, user)
-        return membership is not None
+    if (
+        project.visibility == VisibilityLevel.RESTRICTED
+        and project.owner_group_id
+    ):
+        role = await _get_role(session, project.owner_group_id, user)
+        return role is not None
 
     return False
 
@@ -181,9 +293,12 @@ async def can_edit_annotation_project(
     if user.is_superuser or project.created_by_id == user.id:
         return True
 
-    if project.visibility == VisibilityLevel.RESTRICTED and project.owner_group_id:
-        membership = await _get_membership(session, project.owner_group_id, user)
-        return membership is not None and membership.role == GroupRole.MANAGER
+    if (
+        project.visibility == VisibilityLevel.RESTRICTED
+        and project.owner_group_id
+    ):
+        role = await _get_role(session, project.owner_group_id, user)
+        return role == GroupRole.MANAGER
 
     return False
 
@@ -212,8 +327,8 @@ async def can_manage_restricted_annotation_project(
     if user.is_superuser:
         return True
 
-    membership = await _get_membership(session, group_id, user)
-    return membership is not None and membership.role == GroupRole.MANAGER
+    role = await _get_role(session, group_id, user)
+    return role == GroupRole.MANAGER
 
 
 async def filter_annotation_projects_by_access(
@@ -227,13 +342,7 @@ async def filter_annotation_projects_by_access(
     if user.is_superuser:
         return []
 
-    group_ids: Iterable[int] = (
-        await session.scalars(
-            select(GroupMembership.group_id).where(
-                GroupMembership.user_id == user.id
-            )
-        )
-    ).all()
+    group_ids = list(await get_group_roles(session, user))
 
     conditions: list[ColumnElement[bool]] = [
         AnnotationProject.visibility == VisibilityLevel.PUBLIC,
@@ -1,15 +1,28 @@
 """Common API functions."""
 
 import re
+import sqlite3
 from dataclasses import MISSING, fields
 from typing import Any, Callable, Generator, Iterable, Sequence, TypeVar
 
 from pydantic import BaseModel
-from sqlalchemy import Result, Select, func, insert, select
+from sqlalchemy import (
+    Column,
+    Insert,
+    PrimaryKeyConstraint,
+    Result,
+    Select,
+    Tuple,
+    UniqueConstraint,
+    func,
+    insert,
+    select,
+)
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.inspection import inspect
-from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.orm import InstrumentedAttribute, QueryableAttribute
 from sqlalchemy.sql import ColumnExpressionArgument
 from sqlalchemy.sql.base import ExecutableOption
 from sqlalchemy.sql.expression import ColumnElement
@@ -43,6 +56,7 @@ __all__ = [
     "add_tag_to_object",
     "create_object",
     "create_objects",
+    "create_objects_ignoring_duplicates",
     "create_objects_without_duplicates",
     "delete_object",
     "get_count",
@@ -59,6 +73,15 @@ __all__ = [
 
 
 A = TypeVar("A", bound=models.Base)
+
+# Maximum number of bound parameters in a single statement. PostgreSQL
+# drivers encode the parameter count as a 16 bit integer, and SQLite's
+# SQLITE_MAX_VARIABLE_NUMBER was raised from 999 in version 3.32.
+_MAX_BIND_PARAMS = {
+    "postgresql": 32767,
+    "sqlite": 32766 if sqlite3.sqlite_version_info >= (3, 32) else 999,
+}
+_DEFAULT_MAX_BIND_PARAMS = 999
 B = TypeVar("B", bound=BaseModel)
 F = TypeVar("F", bound=models.Base)
 
@@ -279,7 +302,8 @@ async def get_objects_from_query(
     filters
         A list of filters to apply, by default None
     sort_by
-        The column to sort by, by default None
+        The column to sort by, by default None. Replaces the relevance
+        ordering of search filters.
 
     Returns
     -------
@@ -307,7 +331,9 @@ async def get_objects_from_query(
     if sort_by is not None:
         if isinstance(sort_by, str):
             sort_by = get_sort_by_col_from_str(model, sort_by)
-        query = query.order_by(sort_by)
+        # NOTE: Search filters sort by relevance, which only applies when
+        # no explicit sort is requested.
+        query = query.order_by(None).order_by(sort_by)
 
     if limit is not None and limit >= 0:
         query = query.limit(limit)
@@ -414,6 +440,7 @@ async def create_objects(
     session: AsyncSession,
     model: type[A],
     data: Sequence[B] | Sequence[dict],
+    returning: Sequence[InstrumentedAttribute] | None = None,
 ) -> Sequence[Any] | None:
     """Create multiple objects.
 
@@ -433,7 +460,15 @@ async def create_objects(
     data
         The data to use for creation of the objects.
     returning
-        The columns to return, by default None.
+        The columns to return, by default None. If given, the values of
+        these columns are returned for each created row, in the same order
+        as the input data.
+
+    Returns
+    -------
+    Sequence[Row] | None
+        The returned columns of the created rows, or None if no columns
+        were requested.
     """
     values = [get_values(obj) for obj in data]
     default_values, default_factories = _get_defaults(model)
@@ -441,8 +476,78 @@ async def create_objects(
         _add_defaults(value, default_values, default_factories)
         for value in values
     ]
-    stmt = insert(model).values(values)
-    await session.execute(stmt)
+
+    if not values:
+        return [] if returning else None
+
+    if not returning:
+        stmt = insert(model).values(values)
+        await session.execute(stmt)
+        return None
+
+    stmt = insert(model).returning(*returning, sort_by_parameter_order=True)
+    result = await session.execute(stmt, values)
+    return result.all()
+
+
+def get_insert(session: AsyncSession, model: type[A]) -> Insert:
+    """Create a dialect specific insert statement for a model.
+
+    The PostgreSQL and SQLite insert statements support `ON CONFLICT`
+    clauses. Other dialects get the generic insert statement.
+    """
+    dialect = get_dialect_name(session)
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    return insert(model)
+
+
+async def create_objects_ignoring_duplicates(
+    session: AsyncSession,
+    model: type[A],
+    data: Sequence[B] | Sequence[dict],
+    returning: Sequence[InstrumentedAttribute],
+    rows_batch: int | None = None,
+) -> list[Any]:
+    """Create multiple objects, skipping those that already exist.
+
+    Rows that would violate a unique constraint are silently skipped using
+    `INSERT ... ON CONFLICT DO NOTHING`, so no existing rows need to be
+    queried beforehand. Only supported on PostgreSQL and SQLite.
+
+    Parameters
+    ----------
+    session
+        The database session to use.
+    model
+        The model to create.
+    data
+        The data to use for creation of the objects.
+    returning
+        The columns to return for each created row.
+    rows_batch
+        Maximum number of rows inserted by a single statement. By default
+        it is derived from the bound parameter limit of the database.
+
+    Returns
+    -------
+    list[Row]
+        The returned columns of the created rows. Skipped rows are not
+        included and the order of the rows is not guaranteed.
+    """
+    if get_dialect_name(session) not in _MAX_BIND_PARAMS:
+        raise NotImplementedError(
+            "Ignoring duplicates is only supported on PostgreSQL and SQLite."
+        )
+    return await _insert_on_conflict_do_nothing(
+        session,
+        model,
+        [get_values(obj) for obj in data],
+        returning=returning,
+        rows_batch=rows_batch,
+    )
 
 
 async def create_objects_without_duplicates(
@@ -452,7 +557,7 @@ async def create_objects_without_duplicates(
     key: Callable[[dict], Any],
     key_column: ColumnElement | InstrumentedAttribute,
     return_all: bool = False,
-    rows_batch: int = 200,
+    rows_batch: int | None = None,
 ) -> list[A]:
     """Create multiple objects.
 
@@ -460,6 +565,12 @@ async def create_objects_without_duplicates(
     will commit the session only once. Should be more efficient than calling
     `object_create` multiple times, specially when creating many objects.
 
+    On PostgreSQL and SQLite, if the key columns are covered by a unique
+    constraint, the objects are inserted with `INSERT ... ON CONFLICT DO
+    NOTHING RETURNING`, which skips existing objects without querying them
+    first. Otherwise the existing keys are selected before inserting the
+    missing objects.
+
     Parameters
     ----------
     session
@@ -478,6 +589,9 @@ async def create_objects_without_duplicates(
         conjunction with `key` to query the database for existing objects.
     return_all
         Whether to return all objects, or only those created.
+    rows_batch
+        Maximum number of rows inserted by a single statement. By default
+        it is derived from the bound parameter limit of the database.
 
     Returns
     -------
@@ -492,7 +606,61 @@ async def create_objects_without_duplicates(
     """
     # Remove duplicates from data
     data = remove_duplicates(list(data), key=key)
+    all_keys = [key(obj) for obj in data]
+
+    conflict_columns = _get_unique_columns(model, key_column)
+    if (
+        conflict_columns is None
+        or get_dialect_name(session) not in _MAX_BIND_PARAMS
+    ):
+        return await _create_missing_objects(
+            session,
+            model,
+            data,
+            key=key,
+            key_column=key_column,
+            return_all=return_all,
+            rows_batch=rows_batch or 200,
+        )
+
+    created = await _insert_on_conflict_do_nothing(
+        session,
+        model,
+        [get_values(obj) for obj in data],
+        returning=conflict_columns,
+        rows_batch=rows_batch,
+        index_elements=conflict_columns,
+    )
+    if not return_all:
+        if not created:
+            return []
+        all_keys = [
+            row[0] if len(conflict_columns) == 1 else tuple(row)
+            for row in created
+        ]
+
+    return await get_objects_by_keys_batched(
+        session,
+        model,
+        key_column,
+        all_keys,
+    )
+
+
+async def _create_missing_objects(
+    session: AsyncSession,
+    model: type[A],
+    data: Sequence[dict],
+    key: Callable[[dict], Any],
+    key_column: ColumnElement | InstrumentedAttribute,
+    return_all: bool = False,
+    rows_batch: int = 200,
+) -> list[A]:
+    """Select the existing keys and insert the missing objects.
 
+    Fallback of `create_objects_without_duplicates` for dialects without
+    `ON CONFLICT` support, or keys without a unique constraint.
+    """
     # Get existing objects
     all_keys = [key(obj) for obj in data]
     existing = await get_objects_by_keys_batched(
@@ -532,6 +700,114 @@ async def create_objects_without_duplicates(
     )
 
 
+async def _insert_on_conflict_do_nothing(
+    session: AsyncSession,
+    model: type[A],
+    values: list[dict],
+    returning: Sequence[ColumnElement | InstrumentedAttribute],
+    rows_batch: int | None = None,
+    index_elements: Sequence[Column] | None = None,
+) -> list[Any]:
+    default_values, default_factories = _get_defaults(model)
+    values = [
+        _add_defaults(value, default_values, default_factories)
+        for value in values
+    ]
+    if not values:
+        return []
+
+    if rows_batch is None:
+        rows_batch = get_max_rows_per_insert(
+            session,
+            max(len(value) for value in values),
+        )
+
+    created = []
+    for batch in batched(values, rows_batch):
+        stmt = get_insert(session, model)
+        assert isinstance(stmt, (postgresql.Insert, sqlite.Insert))
+        stmt = (
+            stmt.values(list(batch))
+            .on_conflict_do_nothing(index_elements=index_elements)
+            .returning(*returning)
+        )
+        result = await session.execute(stmt)
+        created.extend(result.all())
+    return created
+
+
+def get_dialect_name(session: AsyncSession) -> str | None:
+    """Get the name of the database dialect used by a session."""
+    return session.bind.dialect.name if session.bind else None
+
+
+def get_max_rows_per_insert(session: AsyncSession, num_columns: int) -> int:
+    """Get the number of rows that fit in a single multi-row insert.
+
+    Each value of a multi-row `INSERT` is sent as a bound parameter, and
+    the drivers limit the number of parameters of a single statement.
+
+    Parameters
+    ----------
+    session
+        The database session to use.
+    num_columns
+        The number of columns inserted per row.
+
+    Returns
+    -------
+    int
+        The maximum number of rows per statement.
+    """
+    max_params = _MAX_BIND_PARAMS.get(
+        get_dialect_name(session),  # type: ignore
+        _DEFAULT_MAX_BIND_PARAMS,
+    )
+    return max(max_params // max(num_columns, 1), 1)
+
+
+def _get_unique_columns(
+    model: type[A],
+    key_column: ColumnElement | InstrumentedAttribute,
+) -> list[Column] | None:
+    """Get the table columns of a key if they are unique together.
+
+    Returns None if the key is not made of columns of the model table or if
+    there is no unique constraint or index on exactly those columns.
+    """
+    table = model.__table__
+    if isinstance(key_column, Tuple):
+        elements = list(key_column.clauses)
+    else:
+        elements = [key_column]
+
+    columns = []
+    for element in elements:
+        if isinstance(element, QueryableAttribute):
+            element = element.expression
+        name = getattr(element, "name", None)
+        parent = getattr(element, "table", None)
+        if name not in table.c or getattr(parent, "name", None) != table.name:
+            return None
+        columns.append(table.c[name])
+
+    names = {column.name for column in columns}
+    candidates = [
+        {column.name for column in constraint.columns}
+        for constraint in table.constraints
+        if isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint))
+    ]
+    candidates.extend(
+        {column.name for column in index.columns}
+        for index in table.indexes
+        if index.unique
+    )
+    candidates.extend({column.name} for column in table.c if column.unique)
+    if names not in candidates:
+        return None
+    return columns
+
+
 async def get_objects_by_keys_batched(
     session: AsyncSession,
     model: type[A],
@@ -0,0 +1,694 @@
+"""Bulk conversion of stored objects into `soundevent` objects.
+
+The `to_soundevent` methods of the API convert one object at a time and
+rely on the eagerly loaded relationships of each object. Exporting a
+project with thousands of annotations this way loads the same recordings,
+tags and users over and over again.
+
+The functions in this module take the database ids of many objects at
+once, prefetch every related row with a handful of `IN (...)` queries and
+assemble the `soundevent` objects in memory. Objects shared between
+annotations, such as recordings, tags and users, are converted once and
+reused.
+"""
+
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+from uuid import UUID
+
+from soundevent import data
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from whombat import models
+from whombat.core.geometries import load_geometry
+from whombat.system.settings import get_settings
+
+__all__ = [
+    "SoundEventConverter",
+    "get_annotation_tasks",
+    "get_clip_annotations",
+    "get_clip_predictions",
+]
+
+IN_CLAUSE_SIZE = 500
+"""Maximum number of ids sent in a single `IN (...)` clause.
+
+Keeps every query well below the bound parameter limit of SQLite.
+"""
+
+
+async def get_clip_annotations(
+    session: AsyncSession,
+    ids: Sequence[int],
+    audio_dir: Path | None = None,
+) -> list[data.ClipAnnotation]:
+    """Convert many clip annotations to `soundevent` format.
+
+    Parameters
+    ----------
+    session
+        SQLAlchemy AsyncSession.
+    ids
+        The database ids of the clip annotations.
+    audio_dir
+        The root directory of the audio files. Defaults to the configured
+        audio directory.
+
+    Returns
+    -------
+    list[data.ClipAnnotation]
+        The clip annotations in the order of the given ids. Ids that do not
+        exist are skipped.
+    """
+    converter = SoundEventConverter(session, audio_dir=audio_dir)
+    return await converter.get_clip_annotations(ids)
+
+
+async def get_clip_predictions(
+    session: AsyncSession,
+    ids: Sequence[int],
+    audio_dir: Path | None = None,
+) -> list[data.ClipPrediction]:
+    """Convert many clip predictions to `soundevent` format.
+
+    Parameters
+    ----------
+    session
+        SQLAlchemy AsyncSession.
+    ids
+        The database ids of the clip predictions.
+    audio_dir
+        The root directory of the audio files. Defaults to the configured
+        audio directory.
+
+    Returns
+    -------
+    list[data.ClipPrediction]
+        The clip predictions in the order of the given ids. Ids that do
+        not exist are skipped.
+    """
+    converter = SoundEventConverter(session, audio_dir=audio_dir)
+    return await converter.get_clip_predictions(ids)
+
+
+async def get_annotation_tasks(
+    session: AsyncSession,
+    ids: Sequence[int],
+    audio_dir: Path | None = None,
+) -> list[data.AnnotationTask]:
+    """Convert many annotation tasks to `soundevent` format.
+
+    Parameters
+    ----------
+    session
+        SQLAlchemy AsyncSession.
+    ids
+        The database ids of the annotation tasks.
+    audio_dir
+        The root directory of the audio files. Defaults to the configured
+        audio directory.
+
+    Returns
+    -------
+    list[data.AnnotationTask]
+        The annotation tasks in the order of the given ids. Ids that do
+        not exist are skipped.
+    """
+    converter = SoundEventConverter(session, audio_dir=audio_dir)
+    return await converter.get_annotation_tasks(ids)
+
+
+class SoundEventConverter:
+    """Convert stored objects to `soundevent` objects in bulk.
+
+    The converter keeps the objects it has already converted, so a single
+    converter can be used to convert, for instance, the tasks and the clip
+    annotations of a project while loading every clip and recording only
+    once.
+
+    Parameters
+    ----------
+    session
+        SQLAlchemy AsyncSession.
+    audio_dir
+        The root directory of the audio files. Defaults to the configured
+        audio directory.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        audio_dir: Path | None = None,
+    ):
+        self.session = session
+        self.audio_dir = (
+            audio_dir if audio_dir is not None else get_settings().audio_dir
+        )
+        self._users: dict[UUID, data.User] = {}
+        self._tags: dict[int, data.Tag] = {}
+        self._feature_names: dict[int, str] = {}
+        self._notes: dict[int, data.Note] = {}
+        self._recordings: dict[int, data.Recording] = {}
+        self._clips: dict[int, data.Clip] = {}
+        self._sound_events: dict[int, data.SoundEvent] = {}
+
+    async def get_clip_annotations(
+        self,
+        ids: Sequence[int],
+    ) -> list[data.ClipAnnotation]:
+        """Convert many clip annotations, in the order of the given ids."""
+        rows = await self._fetch(
+            select(
+                models.ClipAnnotation.id,
+                models.ClipAnnotation.uuid,
+                models.ClipAnnotation.clip_id,
+                models.ClipAnnotation.created_on,
+            ),
+            models.ClipAnnotation.id,
+            ids,
+        )
+        annotation_ids = [row.id for row in rows]
+
+        tag_rows = await self._fetch(
+            select(
+                models.ClipAnnotationTag.clip_annotation_id,
+                models.ClipAnnotationTag.tag_id,
+            ).order_by(models.ClipAnnotationTag.id),
+            models.ClipAnnotationTag.clip_annotation_id,
+            annotation_ids,
+        )
+        note_rows = await self._fetch(
+            select(
+                models.ClipAnnotationNote.clip_annotation_id,
+                models.ClipAnnotationNote.note_id,
+            ).order_by(models.ClipAnnotationNote.id),
+            models.ClipAnnotationNote.clip_annotation_id,
+            annotation_ids,
+        )
+        sound_event_rows = await self._fetch(
+            select(
+                models.SoundEventAnnotation.id,
+                models.SoundEventAnnotation.uuid,
+                models.SoundEventAnnotation.clip_annotation_id,
+                models.SoundEventAnnotation.sound_event_id,
+                models.SoundEventAnnotation.created_by_id,
+                models.SoundEventAnnotation.created_on,
+            ).order_by(models.SoundEventAnnotation.id),
+            models.SoundEventAnnotation.clip_annotation_id,
+            annotation_ids,
+        )
+        sound_event_annotation_ids = [row.id for row in sound_event_rows]
+        sound_event_tag_rows = await self._fetch(
+            select(
+                models.SoundEventAnnotationTag.sound_event_annotation_id,
+                models.SoundEventAnnotationTag.tag_id,
+            ).order_by(models.SoundEventAnnotationTag.id),
+            models.SoundEventAnnotationTag.sound_event_annotation_id,
+            sound_event_annotation_ids,
+        )
+        sound_event_note_rows = await self._fetch(
+            select(
+                models.SoundEventAnnotationNote.sound_event_annotation_id,
+                models.SoundEventAnnotationNote.note_id,
+            ).order_by(models.SoundEventAnnotationNote.note_id),
+            models.SoundEventAnnotationNote.sound_event_annotation_id,
+            sound_event_annotation_ids,
+        )
+
+        await self._load_clips(row.clip_id for row in rows)
+        await self._load_sound_events(
+            row.sound_event_id for row in sound_event_rows
+        )
+        await self._load_tags(
+            row.tag_id for row in [*tag_rows, *sound_event_tag_rows]
+        )
+        await self._load_notes(
+            row.note_id for row in [*note_rows, *sound_event_note_rows]
+        )
+        await self._load_users(
+            row.created_by_id
+            for row in sound_event_rows
+            if row.created_by_id is not None
+        )
+
+        se_tags = _group(
+            sound_event_tag_rows,
+            lambda row: row.sound_event_annotation_id,
+            lambda row: self._tags[row.tag_id],
+        )
+        se_notes = _group(
+            sound_event_note_rows,
+            lambda row: row.sound_event_annotation_id,
+            lambda row: self._notes[row.note_id],
+        )
+        sound_events = _group(
+            sound_event_rows,
+            lambda row: row.clip_annotation_id,
+            lambda row: data.SoundEventAnnotation(
+                uuid=row.uuid,
+                created_on=row.created_on,
+                created_by=(
+                    self._users[row.created_by_id]
+                    if row.created_by_id is not None
+                    else None
+                ),
+                sound_event=self._sound_events[row.sound_event_id],
+                tags=se_tags.get(row.id, []),
+                notes=se_notes.get(row.id, []),
+            ),
+        )
+        clip_tags = _group(
+            tag_rows,
+            lambda row: row.clip_annotation_id,
+            lambda row: self._tags[row.tag_id],
+        )
+        clip_notes = _group(
+            note_rows,
+            lambda row: row.clip_annotation_id,
+            lambda row: self._notes[row.note_id],
+        )
+        return [
+            data.ClipAnnotation(
+                uuid=row.uuid,
+                created_on=row.created_on,
+                clip=self._clips[row.clip_id],
+                sound_events=sound_events.get(row.id, []),
+                tags=clip_tags.get(row.id, []),
+                notes=clip_notes.get(row.id, []),
+            )
+            for row in _sort_by_ids(rows, ids)
+        ]
+
+    async def get_clip_predictions(
+        self,
+        ids: Sequence[int],
+    ) -> list[data.ClipPrediction]:
+        """Convert many clip predictions, in the order of the given ids."""
+        rows = await self._fetch(
+            select(
+                models.ClipPrediction.id,
+                models.ClipPrediction.uuid,
+                models.ClipPrediction.clip_id,
+            ),
+            models.ClipPrediction.id,
+            ids,
+        )
+        prediction_ids = [row.id for row in rows]
+
+        tag_rows = await self._fetch(
+            select(
+                models.ClipPredictionTag.clip_prediction_id,
+                models.ClipPredictionTag.tag_id,
+                models.ClipPredictionTag.score,
+            ).order_by(models.ClipPredictionTag.tag_id),
+            models.ClipPredictionTag.clip_prediction_id,
+            prediction_ids,
+        )
+        sound_event_rows = await self._fetch(
+            select(
+                models.SoundEventPrediction.id,
+                models.SoundEventPrediction.uuid,
+                models.SoundEventPrediction.clip_prediction_id,
+                models.SoundEventPrediction.sound_event_id,
+                models.SoundEventPrediction.score,
+            ).order_by(models.SoundEventPrediction.id),
+            models.SoundEventPrediction.clip_prediction_id,
+            prediction_ids,
+        )
+        sound_event_tag_rows = await self._fetch(
+            select(
+                models.SoundEventPredictionTag.sound_event_prediction_id,
+                models.SoundEventPredictionTag.tag_id,
+                models.SoundEventPredictionTag.score,
+            ).order_by(models.SoundEventPredictionTag.tag_id),
+            models.SoundEventPredictionTag.sound_event_prediction_id,
+            [row.id for row in sound_event_rows],
+        )
+
+        await self._load_clips(row.clip_id for row in rows)
+        await self._load_sound_events(
+            row.sound_event_id for row in sound_event_rows
+        )
+        await self._load_tags(
+            row.tag_id for row in [*tag_rows, *sound_event_tag_rows]
+        )
+
+        se_tags = _group(
+            sound_event_tag_rows,
+            lambda row: row.sound_event_prediction_id,
+            lambda row: data.PredictedTag(
+                tag=self._tags[row.tag_id],
+                score=row.score,
+            ),
+        )
+        sound_events = _group(
+            sound_event_rows,
+            lambda row: row.clip_prediction_id,
+            lambda row: data.SoundEventPrediction(
+                uuid=row.uuid,
+                sound_event=self._sound_events[row.sound_event_id],
+                score=row.score,
+                tags=se_tags.get(row.id, []),
+            ),
+        )
+        clip_tags = _group(
+            tag_rows,
+            lambda row: row.clip_prediction_id,
+            lambda row: data.PredictedTag(
+                tag=self._tags[row.tag_id],
+                score=row.score,
+            ),
+        )
+        return [
+            data.ClipPrediction(
+                uuid=row.uuid,
+                clip=self._clips[row.clip_id],
+                tags=clip_tags.get(row.id, []),
+                sound_events=sound_events.get(row.id, []),
+            )
+            for row in _sort_by_ids(rows, ids)
+        ]
+
+    async def get_annotation_tasks(
+        self,
+        ids: Sequence[int],
+    ) -> list[data.AnnotationTask]:
+        """Convert many annotation tasks, in the order of the given ids."""
+        rows = await self._fetch(
+            select(
+                models.AnnotationTask.id,
+                models.AnnotationTask.uuid,
+                models.AnnotationTask.clip_id,
+                models.AnnotationTask.created_on,
+            ),
+            models.AnnotationTask.id,
+            ids,
+        )
+        badge_rows = await self._fetch(
+            select(
+                models.AnnotationStatusBadge.annotation_task_id,
+                models.AnnotationStatusBadge.user_id,
+                models.AnnotationStatusBadge.state,
+                models.AnnotationStatusBadge.created_on,
+            ).order_by(models.AnnotationStatusBadge.id),
+            models.AnnotationStatusBadge.annotation_task_id,
+            [row.id for row in rows],
+        )
+
+        await self._load_clips(row.clip_id for row in rows)
+        await self._load_users(
+            row.user_id for row in badge_rows if row.user_id is not None
+        )
+
+        badges = _group(
+            badge_rows,
+            lambda row: row.annotation_task_id,
+            lambda row: data.StatusBadge(
+                owner=(
+                    self._users[row.user_id]
+                    if row.user_id is not None
+                    else None
+                ),
+                state=row.state,
+                created_on=row.created_on,
+            ),
+        )
+        return [
+            data.AnnotationTask(
+                uuid=row.uuid,
+                clip=self._clips[row.clip_id],
+                status_badges=badges.get(row.id, []),
+                created_on=row.created_on,
+            )
+            for row in _sort_by_ids(rows, ids)
+        ]
+
+    async def _load_users(self, ids: Iterable[UUID]) -> None:
+        missing = {id for id in ids if id not in self._users}
+        rows = await self._fetch(
+            select(
+                models.User.id,
+                models.User.username,
+                models.User.email,
+                models.User.name,
+            ),
+            models.User.id,
+            missing,
+        )
+        for row in rows:
+            self._users[row.id] = data.User(
+                uuid=row.id,
+                username=row.username,
+                email=row.email,
+                name=row.name,
+                institution=None,
+            )
+
+    async def _load_tags(self, ids: Iterable[int]) -> None:
+        missing = {id for id in ids if id not in self._tags}
+        rows = await self._fetch(
+            select(models.Tag.id, models.Tag.key, models.Tag.value),
+            models.Tag.id,
+            missing,
+        )
+        for row in rows:
+            self._tags[row.id] = data.Tag(
+                term=data.term_from_key(row.key),
+                value=row.value,
+            )
+
+    async def _load_feature_names(self, ids: Iterable[int]) -> None:
+        missing = {id for id in ids if id not in self._feature_names}
+        rows = await self._fetch(
+            select(models.FeatureName.id, models.FeatureName.name),
+            models.FeatureName.id,
+            missing,
+        )
+        for row in rows:
+            self._feature_names[row.id] = row.name
+
+    async def _load_notes(self, ids: Iterable[int]) -> None:
+        missing = {id for id in ids if id not in self._notes}
+        rows = await self._fetch(
+            select(
+                models.Note.id,
+                models.Note.uuid,
+                models.Note.message,
+                models.Note.created_by_id,
+                models.Note.is_issue,
+                models.Note.created_on,
+            ),
+            models.Note.id,
+            missing,
+        )
+        await self._load_users(
+            row.created_by_id for row in rows if row.created_by_id is not None
+        )
+        for row in rows:
+            self._notes[row.id] = data.Note(
+                uuid=row.uuid,
+                created_on=row.created_on,
+                message=row.message,
+                created_by=(
+                    self._users[row.created_by_id]
+                    if row.created_by_id is not None
+                    else None
+                ),
+                is_issue=row.is_issue,
+            )
+
+    async def _load_features(
+        self,
+        model: Any,
+        column: InstrumentedAttribute,
+        ids: Sequence[int],
+    ) -> dict[int, list[data.Feature]]:
+        rows = await self._fetch(
+            select(column, model.feature_name_id, model.value).order_by(
+                model.feature_name_id
+            ),
+            column,
+            ids,
+        )
+        await self._load_feature_names(row.feature_name_id for row in rows)
+        return _group(
+            rows,
+            lambda row: row[0],
+            lambda row: data.Feature(
+                term=data.term_from_key(
+                    self._feature_names[row.feature_name_id]
+                ),
+                value=row.value,
+            ),
+        )
+
+    async def _load_recordings(self, ids: Iterable[int]) -> None:
+        missing = {id for id in ids if id not in self._recordings}
+        rows = await self._fetch(
+            select(
+                models.Recording.id,
+                models.Recording.uuid,
+                models.Recording.path,
+                models.Recording.time_expansion,
+                models.Recording.channels,
+                models.Recording.samplerate,
+                models.Recording.duration,
+                models.Recording.date,
+                models.Recording.time,
+                models.Recording.latitude,
+                models.Recording.longitude,
+                models.Recording.rights,
+            ),
+            models.Recording.id,
+            missing,
+        )
+        recording_ids = [row.id for row in rows]
+        tag_rows = await self._fetch(
+            select(
+                models.RecordingTag.recording_id, models.RecordingTag.tag_id
+            ),
+            models.RecordingTag.recording_id,
+            recording_ids,
+        )
+        note_rows = await self._fetch(
+            select(
+                models.RecordingNote.recording_id,
+                models.RecordingNote.note_id,
+            ),
+            models.RecordingNote.recording_id,
+            recording_ids,
+        )
+        owner_rows = await self._fetch(
+            select(
+                models.RecordingOwner.recording_id,
+                models.RecordingOwner.user_id,
+            ),
+            models.RecordingOwner.recording_id,
+            recording_ids,
+        )
+        rec_features = await self._load_features(
+            models.RecordingFeature,
+            models.RecordingFeature.recording_id,
+            recording_ids,
+        )
+        await self._load_tags(row.tag_id for row in tag_rows)
+        await self._load_notes(row.note_id for row in note_rows)
+        await self._load_users(row.user_id for row in owner_rows)
+
+        rec_tags = _group(
+            tag_rows,
+            lambda row: row.recording_id,
+            lambda row: self._tags[row.tag_id],
+        )
+        rec_notes = _group(
+            note_rows,
+            lambda row: row.recording_id,
+            lambda row: self._notes[row.note_id],
+        )
+        rec_owners = _group(
+            owner_rows,
+            lambda row: row.recording_id,
+            lambda row: self._users[row.user_id],
+        )
+        for row in rows:
+            self._recordings[row.id] = data.Recording(
+                uuid=row.uuid,
+                path=self.audio_dir / row.path,
+                time_expansion=row.time_expansion,
+                channels=row.channels,
+                samplerate=row.samplerate,
+                duration=row.duration,
+                date=row.date,
+                time=row.time,
+                latitude=row.latitude,
+                longitude=row.longitude,
+                rights=row.rights,
+                tags=rec_tags.get(row.id, []),
+                notes=rec_notes.get(row.id, []),
+                features=rec_features.get(row.id, []),
+                owners=rec_owners.get(row.id, []),
+            )
+
+    async def _load_clips(self, ids: Iterable[int]) -> None:
+        missing = {id for id in ids if id not in self._clips}
+        rows = await self._fetch(
+            select(
+                models.Clip.id,
+                models.Clip.uuid,
+                models.Clip.recording_id,
+                models.Clip.start_time,
+                models.Clip.end_time,
+            ),
+            models.Clip.id,
+            missing,
+        )
+        clip_features = await self._load_features(
+            models.ClipFeature,
+            models.ClipFeature.clip_id,
+            [row.id for row in rows],
+        )
+        await self._load_recordings(row.recording_id for row in rows)
+        for row in rows:
+            self._clips[row.id] = data.Clip(
+                uuid=row.uuid,
+                recording=self._recordings[row.recording_id],
+                start_time=row.start_time,
+                end_time=row.end_time,
+                features=clip_features.get(row.id, []),
+            )
+
+    async def _load_sound_events(self, ids: Iterable[int]) -> None:
+        missing = {id for id in ids if id not in self._sound_events}
+        rows = await self._fetch(
+            select(
+                models.SoundEvent.id,
+                models.SoundEvent.uuid,
+                models.SoundEvent.recording_id,
+                models.SoundEvent.geometry,
+            ),
+            models.SoundEvent.id,
+            missing,
+        )
+        se_features = await self._load_features(
+            models.SoundEventFeature,
+            models.SoundEventFeature.sound_event_id,
+            [row.id for row in rows],
+        )
+        await self._load_recordings(row.recording_id for row in rows)
+        for row in rows:
+            self._sound_events[row.id] = data.SoundEvent(
+                uuid=row.uuid,
+                geometry=load_geometry(row.geometry),
+                recording=self._recordings[row.recording_id],
+                features=se_features.get(row.id, []),
+            )
+
+    async def _fetch(
+        self,
+        stmt: Select,
+        column: InstrumentedAttribute,
+        ids: Iterable[Any],
+    ) -> list[Any]:
+        """Run a query for every chunk of ids and collect all rows."""
+        ids = list(ids)
+        rows = []
+        for start in range(0, len(ids), IN_CLAUSE_SIZE):
+            chunk = ids[start : start + IN_CLAUSE_SIZE]
+            result = await self.session.execute(stmt.where(column.in_(chunk)))
+            rows.extend(result.all())
+        return rows
+
+
+def _group(rows, key, value) -> dict[Any, list]:
+    grouped = defaultdict(list)
+    for row in rows:
+        grouped[key(row)].append(value(row))
+    return grouped
+
+
+def _sort_by_ids(rows: Sequence[Any], ids: Sequence[int]) -> list[Any]:
+    by_id = {row.id: row for row in rows}
+    return [by_id[id] for id in ids if id in by_id]
@@ -4,9 +4,8 @@ import datetime
 import uuid
 import warnings
 from pathlib import Path
-from typing import BinaryIO, Sequence
+from typing import TYPE_CHECKING, BinaryIO, Sequence
 
-import pandas as pd
 from soundevent import data
 from soundevent.io.aoef import AOEFObject, to_aeof
 from sqlalchemy import select, tuple_
@@ -31,6 +30,9 @@ from whombat.filters.base import Filter
 from whombat.filters.recordings import DatasetFilter
 from whombat.system import get_settings
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 __all__ = [
     "DatasetAPI",
     "datasets",
@@ -928,7 +930,7 @@ class DatasetAPI(
         self,
         session: AsyncSession,
         dataset: schemas.Dataset,
-    ) -> pd.DataFrame:
+    ) -> "pd.DataFrame":
         """Convert a dataset to a pandas DataFrame.
 
         Generates a DataFrame containing information about the recordings in
@@ -962,6 +964,8 @@ class DatasetAPI(
         event dataset that can be exported to a JSON file and later imported,
         recovering all information.
         """
+        import pandas as pd
+
         recordings, _ = await self.get_recordings(session, dataset, limit=-1)
         return pd.DataFrame(
             [
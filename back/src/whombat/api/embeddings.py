@@ -0,0 +1,503 @@
+"""API functions to store and search sound event embeddings.
+
+Embeddings are stored in the database, one row per sound event and
+embedding space, and mirrored in memory as a normalised NumPy matrix per
+space. Similarity searches are brute force cosine similarity over that
+matrix, restricted to the sound events that match the given filters.
+
+The in-memory index is filled lazily and only from the database: before
+each search, the vectors of any candidate that is not yet in the index,
+or whose `created_on` differs from the one it was loaded with, are
+loaded. The first search of a space loads all of it and later searches
+only load what was added or replaced since, including embeddings written
+by other processes. Writes never touch the index directly, so vectors of
+transactions that are rolled back are not served either.
+"""
+
+import datetime
+from typing import Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import ColumnExpressionArgument
+
+from whombat import exceptions, models, schemas
+from whombat.api.common.utils import (
+    batched,
+    get_insert,
+    get_max_rows_per_insert,
+)
+from whombat.api.sound_events import sound_events
+from whombat.filters.base import Filter
+
+__all__ = [
+    "EmbeddingAPI",
+    "EmbeddingIndex",
+    "embeddings",
+]
+
+VECTOR_DTYPE = np.dtype("<f4")
+"""Data type of the stored vectors."""
+
+
+class EmbeddingIndex:
+    """In-memory index of the embeddings of an embedding space.
+
+    Vectors are stored normalised to unit length, so the dot product with
+    a normalised query is the cosine similarity. Storage grows by doubling
+    to keep incremental insertion amortised constant time per vector.
+
+    Each vector may carry a version, such as the time it was written, so
+    that `stale` can tell which vectors need to be reloaded.
+    """
+
+    def __init__(self, dimension: int, capacity: int = 1024):
+        self.dimension = dimension
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._vectors = np.empty((capacity, dimension), dtype=np.float32)
+        self._versions = np.empty(capacity, dtype=np.float64)
+        self._positions: dict[int, int] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def ids(self) -> np.ndarray:
+        """Ids of the sound events in the index."""
+        return self._ids[: self._size]
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Normalised vectors, in the same order as `ids`."""
+        return self._vectors[: self._size]
+
+    def add(
+        self,
+        ids: Sequence[int],
+        vectors: np.ndarray,
+        versions: Sequence[float] | np.ndarray | None = None,
+    ) -> None:
+        """Add or replace the vectors of some sound events.
+
+        Vectors added without a version are always reported as stale.
+        """
+        vectors = _normalize(
+            np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimension)
+        )
+        ids = np.asarray(ids, dtype=np.int64)
+        if versions is None:
+            versions = np.full(len(ids), np.nan)
+        versions = np.asarray(versions, dtype=np.float64)
+        if not len(ids) == len(vectors) == len(versions):
+            raise ValueError("The number of ids and vectors must match.")
+
+        # Keep the last vector of ids that appear more than once.
+        _, last = np.unique(ids[::-1], return_index=True)
+        keep = np.sort(len(ids) - 1 - last)
+        ids, vectors, versions = ids[keep], vectors[keep], versions[keep]
+
+        positions = self._get_positions(ids)
+        existing = positions >= 0
+        self._vectors[positions[existing]] = vectors[existing]
+        self._versions[positions[existing]] = versions[existing]
+
+        new_ids = ids[~existing]
+        if not len(new_ids):
+            return
+
+        self._reserve(self._size + len(new_ids))
+        end = self._size + len(new_ids)
+        self._ids[self._size : end] = new_ids
+        self._vectors[self._size : end] = vectors[~existing]
+        self._versions[self._size : end] = versions[~existing]
+        self._positions.update(
+            zip(new_ids.tolist(), range(self._size, end), strict=True)
+        )
+        self._size = end
+
+    def stale(
+        self,
+        ids: Sequence[int] | np.ndarray,
+        versions: Sequence[float] | np.ndarray,
+    ) -> np.ndarray:
+        """Get the ids that are missing or have a different version."""
+        ids = np.asarray(ids, dtype=np.int64)
+        positions = self._get_positions(ids)
+        current = np.where(
+            positions >= 0,
+            self._versions[np.maximum(positions, 0)],
+            np.nan,
+        )
+        # NaN never compares equal, so missing ids are always stale.
+        return ids[current != np.asarray(versions, dtype=np.float64)]
+
+    def search(
+        self,
+        query: np.ndarray,
+        limit: int = 10,
+        candidates: np.ndarray | None = None,
+        exclude: Sequence[int] = (),
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Find the most similar vectors to a query.
+
+        Parameters
+        ----------
+        query
+            The query vector.
+        limit
+            Maximum number of results.
+        candidates
+            Ids of the sound events to consider. All are considered if
+            not given.
+        exclude
+            Ids of sound events to leave out of the results.
+
+        Returns
+        -------
+        ids : np.ndarray
+            Ids of the most similar sound events, most similar first.
+        similarities : np.ndarray
+            The cosine similarity of each result to the query.
+        """
+        query = _normalize(
+            np.asarray(query, dtype=np.float32).reshape(1, self.dimension)
+        )[0]
+        scores = self.vectors @ query
+
+        valid = np.ones(self._size, dtype=bool)
+        if candidates is not None:
+            valid &= np.isin(self.ids, candidates)
+        if len(exclude):
+            valid &= ~np.isin(self.ids, np.asarray(exclude))
+
+        indices = np.flatnonzero(valid)
+        limit = min(limit, len(indices))
+        if limit <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        valid_scores = scores[indices]
+        top = np.argpartition(-valid_scores, limit - 1)[:limit]
+        top = top[np.argsort(-valid_scores[top], kind="stable")]
+        return self.ids[indices[top]], valid_scores[top]
+
+    def _get_positions(self, ids: np.ndarray) -> np.ndarray:
+        return np.array(
+            [self._positions.get(id, -1) for id in ids.tolist()],
+            dtype=np.int64,
+        )
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self._ids)
+        if size <= capacity:
+            return
+
+        while capacity < size:
+            capacity *= 2
+
+        ids = np.empty(capacity, dtype=np.int64)
+        ids[: self._size] = self.ids
+        vectors = np.empty((capacity, self.dimension), dtype=np.float32)
+        vectors[: self._size] = self.vectors
+        versions = np.empty(capacity, dtype=np.float64)
+        versions[: self._size] = self._versions[: self._size]
+        self._ids, self._vectors, self._versions = ids, vectors, versions
+
+
+class EmbeddingAPI:
+    """API to store embeddings and search for similar sound events."""
+
+    def __init__(self):
+        self._indexes: dict[int, EmbeddingIndex] = {}
+
+    async def get_space(
+        self,
+        session: AsyncSession,
+        name: str,
+    ) -> schemas.EmbeddingSpace:
+        """Get an embedding space by name.
+
+        Raises
+        ------
+        whombat.exceptions.NotFoundError
+            If no embedding space with the given name exists.
+        """
+        result = await session.execute(
+            select(models.EmbeddingSpace).where(
+                models.EmbeddingSpace.name == name
+            )
+        )
+        space = result.scalar_one_or_none()
+        if space is None:
+            raise exceptions.NotFoundError(
+                f"Embedding space {name!r} not found"
+            )
+        return schemas.EmbeddingSpace.model_validate(space)
+
+    async def get_or_create_space(
+        self,
+        session: AsyncSession,
+        name: str,
+        dimension: int,
+    ) -> schemas.EmbeddingSpace:
+        """Get an embedding space, creating it if it does not exist.
+
+        Raises
+        ------
+        whombat.exceptions.InvalidDataError
+            If the space exists with a different dimension.
+        """
+        try:
+            space = await self.get_space(session, name)
+        except exceptions.NotFoundError:
+            db_space = models.EmbeddingSpace(name=name, dimension=dimension)
+            session.add(db_space)
+            await session.flush()
+            return schemas.EmbeddingSpace.model_validate(db_space)
+
+        if space.dimension != dimension:
+            raise exceptions.InvalidDataError(
+                f"Embedding space {name!r} has dimension {space.dimension}, "
+                f"got vectors of dimension {dimension}"
+            )
+        return space
+
+    async def add(
+        self,
+        session: AsyncSession,
+        name: str,
+        sound_events: Sequence[schemas.SoundEvent],
+        vectors: np.ndarray | Sequence[Sequence[float]],
+    ) -> schemas.EmbeddingSpace:
+        """Add or replace the embeddings of some sound events.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        name
+            The name of the embedding space. It is created if it does not
+            exist, with the dimension of the given vectors.
+        sound_events
+            The sound events to add embeddings to.
+        vectors
+            Array of shape (sound events, dimension).
+
+        Returns
+        -------
+        schemas.EmbeddingSpace
+            The embedding space.
+        """
+        array = np.asarray(vectors, dtype=VECTOR_DTYPE)
+        if array.ndim != 2 or len(array) != len(sound_events):
+            raise exceptions.InvalidDataError(
+                "Expected one embedding vector per sound event"
+            )
+        if not np.isfinite(array).all():
+            raise exceptions.InvalidDataError(
+                "Embedding vectors must be finite"
+            )
+
+        space = await self.get_or_create_space(
+            session,
+            name,
+            array.shape[1],
+        )
+        ids = [sound_event.id for sound_event in sound_events]
+        now = datetime.datetime.now(datetime.timezone.utc)
+        rows = [
+            {
+                "sound_event_id": id,
+                "embedding_space_id": space.id,
+                "vector": vector.tobytes(),
+                "created_on": now,
+            }
+            for id, vector in zip(ids, array, strict=True)
+        ]
+        for batch in batched(rows, get_max_rows_per_insert(session, 4)):
+            stmt = get_insert(session, models.SoundEventEmbedding).values(
+                batch
+            )
+            await session.execute(
+                stmt.on_conflict_do_update(  # type: ignore
+                    index_elements=["sound_event_id", "embedding_space_id"],
+                    set_={
+                        "vector": stmt.excluded.vector,  # type: ignore
+                        "created_on": stmt.excluded.created_on,  # type: ignore
+                    },
+                )
+            )
+
+        # NOTE: The in-memory index is not updated here. The transaction
+        # may still be rolled back, and other processes cannot see this
+        # index anyway. The new created_on marks the vectors as stale, so
+        # the next search loads them from the database.
+        return space
+
+    async def get_vector(
+        self,
+        session: AsyncSession,
+        name: str,
+        sound_event: schemas.SoundEvent,
+    ) -> np.ndarray:
+        """Get the embedding of a sound event.
+
+        Raises
+        ------
+        whombat.exceptions.NotFoundError
+            If the sound event has no embedding in the given space.
+        """
+        space = await self.get_space(session, name)
+        result = await session.execute(
+            select(models.SoundEventEmbedding.vector).where(
+                models.SoundEventEmbedding.sound_event_id == sound_event.id,
+                models.SoundEventEmbedding.embedding_space_id == space.id,
+            )
+        )
+        vector = result.scalar_one_or_none()
+        if vector is None:
+            raise exceptions.NotFoundError(
+                f"Sound event has no embedding in space {name!r}"
+            )
+        return np.frombuffer(vector, dtype=VECTOR_DTYPE)
+
+    async def find_similar(
+        self,
+        session: AsyncSession,
+        sound_event: schemas.SoundEvent,
+        name: str,
+        limit: int = 10,
+        filters: Sequence[Filter | ColumnExpressionArgument] | None = None,
+    ) -> list[schemas.SimilarSoundEvent]:
+        """Find the sound events most similar to a given one.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        sound_event
+            The query sound event. It must have an embedding in the space.
+        name
+            The name of the embedding space.
+        limit
+            Maximum number of results.
+        filters
+            Filters on the sound events to consider, for example to
+            restrict the search to a dataset or to unannotated events.
+
+        Returns
+        -------
+        list[schemas.SimilarSoundEvent]
+            The most similar sound events, most similar first. The query
+            sound event is not included.
+        """
+        space = await self.get_space(session, name)
+        query = await self.get_vector(session, name, sound_event)
+
+        stmt = (
+            select(
+                models.SoundEventEmbedding.sound_event_id,
+                models.SoundEventEmbedding.created_on,
+            )
+            .join(
+                models.SoundEvent,
+                models.SoundEvent.id
+                == models.SoundEventEmbedding.sound_event_id,
+            )
+            .where(models.SoundEventEmbedding.embedding_space_id == space.id)
+        )
+        for filter_ in filters or []:
+            if isinstance(filter_, Filter):
+                stmt = filter_.filter(stmt)
+            else:
+                stmt = stmt.where(filter_)
+        rows = (await session.execute(stmt)).all()
+        candidates = np.fromiter((id for id, _ in rows), dtype=np.int64)
+        versions = np.fromiter(
+            (_get_version(created_on) for _, created_on in rows),
+            dtype=np.float64,
+        )
+
+        index = await self._get_index(session, space, candidates, versions)
+        ids, similarities = index.search(
+            query,
+            limit=limit,
+            candidates=candidates,
+            exclude=[sound_event.id],
+        )
+        if not len(ids):
+            return []
+
+        results, _ = await sound_events.get_many(
+            session,
+            limit=None,
+            filters=[models.SoundEvent.id.in_(ids.tolist())],
+            sort_by=None,
+        )
+        by_id = {result.id: result for result in results}
+        return [
+            schemas.SimilarSoundEvent(
+                sound_event=by_id[id],
+                similarity=float(similarity),
+            )
+            for id, similarity in zip(
+                ids.tolist(), similarities.tolist(), strict=True
+            )
+            if id in by_id
+        ]
+
+    def clear_cache(self) -> None:
+        """Drop the in-memory indexes."""
+        self._indexes.clear()
+
+    async def _get_index(
+        self,
+        session: AsyncSession,
+        space: schemas.EmbeddingSpace,
+        ids: np.ndarray,
+        versions: np.ndarray,
+    ) -> EmbeddingIndex:
+        """Get the index of a space, loading any missing or stale vectors."""
+        index = self._indexes.get(space.id)
+        if index is None:
+            index = self._indexes[space.id] = EmbeddingIndex(space.dimension)
+
+        stale = index.stale(ids, versions)
+        for batch in batched(stale.tolist(), 1000):
+            result = await session.execute(
+                select(
+                    models.SoundEventEmbedding.sound_event_id,
+                    models.SoundEventEmbedding.vector,
+                    models.SoundEventEmbedding.created_on,
+                ).where(
+                    models.SoundEventEmbedding.embedding_space_id == space.id,
+                    models.SoundEventEmbedding.sound_event_id.in_(batch),
+                )
+            )
+            rows = result.all()
+            if not rows:
+                continue
+            vectors = np.frombuffer(
+                b"".join(vector for _, vector, _ in rows),
+                dtype=VECTOR_DTYPE,
+            ).reshape(-1, space.dimension)
+            index.add(
+                [id for id, _, _ in rows],
+                vectors,
+                [_get_version(created_on) for _, _, created_on in rows],
+            )
+        return index
+
+
+def _get_version(created_on: datetime.datetime) -> float:
+    """Get the version of a stored vector from the time it was written."""
+    return created_on.timestamp()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
+
+
+embeddings = EmbeddingAPI()
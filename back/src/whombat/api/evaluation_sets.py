@@ -9,6 +9,7 @@ from sqlalchemy import and_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import exceptions, models, schemas
+from whombat.api import converters
 from whombat.api.clip_annotations import clip_annotations
 from whombat.api.common import (
     BaseAPI,
@@ -364,7 +365,16 @@ class EvaluationSetAPI(
         audio_dir: Path | None = None,
     ) -> data.EvaluationSet:
         """Create an object in `soundevent` format from an evaluation set."""
-        anns, _ = await self.get_clip_annotations(session, obj, limit=-1)
+        annotation_ids = await session.scalars(
+            select(models.ClipAnnotation.id)
+            .join(
+                models.EvaluationSetAnnotation,
+                models.EvaluationSetAnnotation.clip_annotation_id
+                == models.ClipAnnotation.id,
+            )
+            .where(models.EvaluationSetAnnotation.evaluation_set_id == obj.id)
+            .order_by(models.ClipAnnotation.created_on.desc())
+        )
 
         return data.EvaluationSet(
             uuid=obj.uuid,
@@ -372,14 +382,11 @@ class EvaluationSetAPI(
             name=obj.name,
             description=obj.description,
             evaluation_tags=[tags.to_soundevent(t) for t in obj.tags],
-            clip_annotations=[
-                await clip_annotations.to_soundevent(
-                    session,
-                    a,
-                    audio_dir=audio_dir,
-                )
-                for a in anns
-            ],
+            clip_annotations=await converters.get_clip_annotations(
+                session,
+                annotation_ids.all(),
+                audio_dir=audio_dir,
+            ),
         )
 
     async def _create_from_soundevent(
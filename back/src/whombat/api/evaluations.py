@@ -1,16 +1,21 @@
 """API functions to interact with evaluations."""
 
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.context import BaseContext
 from pathlib import Path
-from typing import Callable, Mapping, Sequence
+from typing import Mapping, Sequence
 from uuid import UUID
 
 from soundevent import data
-from soundevent import evaluation as evaluate
 from soundevent.io.aoef import EvaluationObject, to_aeof
 from sqlalchemy import and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import exceptions, models, schemas
+from whombat.api.batch_evaluations import DEFAULT_BATCH_SIZE, BatchEvaluator
 from whombat.api.clip_evaluations import clip_evaluations
 from whombat.api.common import (
     BaseAPI,
@@ -24,7 +29,9 @@ from whombat.api.io.aoef.evaluations import import_evaluation
 from whombat.api.model_runs import model_runs
 from whombat.filters.base import Filter
 from whombat.filters.clip_evaluations import EvaluationFilter
+from whombat.jobs import ProgressReporter
 from whombat.schemas.evaluation_sets import PredictionTypes
+from whombat.schemas.evaluations import EvaluationMode
 
 
 class EvaluationAPI(
@@ -308,7 +315,33 @@ class EvaluationAPI(
         model_run: schemas.ModelRun,
         evaluation_set: schemas.EvaluationSet,
         audio_dir: Path,
+        mode: EvaluationMode = EvaluationMode.sequential,
+        max_workers: int | None = None,
     ) -> schemas.Evaluation:
+        """Evaluate a model run against an evaluation set.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        model_run
+            The model run to evaluate.
+        evaluation_set
+            The evaluation set to evaluate the model run against.
+        audio_dir
+            The root directory of the audio files.
+        mode
+            Whether to evaluate the clips sequentially or in parallel
+            across a pool of worker processes.
+        max_workers
+            Maximum number of worker processes used in parallel mode.
+            Defaults to the number of CPUs.
+
+        Returns
+        -------
+        schemas.Evaluation
+            The created evaluation.
+        """
         model_run_se = await model_runs.to_soundevent(
             session,
             model_run,
@@ -317,12 +350,21 @@ class EvaluationAPI(
             session,
             evaluation_set,
         )
-        evaluation = evaluate_predictions(
-            model_run_se.clip_predictions,
-            evaluation_set_se.clip_annotations,
-            evaluation_set_se.evaluation_tags,
-            evaluation_set.task,
-        )
+        if mode == EvaluationMode.parallel:
+            evaluation = await evaluate_predictions_in_parallel(
+                model_run_se.clip_predictions,
+                evaluation_set_se.clip_annotations,
+                evaluation_set_se.evaluation_tags,
+                evaluation_set.task,
+                max_workers=max_workers,
+            )
+        else:
+            evaluation = evaluate_predictions(
+                model_run_se.clip_predictions,
+                evaluation_set_se.clip_annotations,
+                evaluation_set_se.evaluation_tags,
+                evaluation_set.task,
+            )
         obj: EvaluationObject = to_aeof(evaluation)  # type: ignore
         db_eval = await import_evaluation(
             session,
@@ -343,13 +385,105 @@ class EvaluationAPI(
         await session.refresh(db_eval)
         return schemas.Evaluation.model_validate(db_eval)
 
+    async def evaluate_model_run_in_batches(
+        self,
+        session: AsyncSession,
+        model_run: schemas.ModelRun,
+        evaluation_set: schemas.EvaluationSet,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        progress: ProgressReporter | None = None,
+    ) -> schemas.Evaluation:
+        """Evaluate a model run by streaming its predictions in batches.
+
+        Produces the same evaluation as `evaluate_model_run` without
+        loading the whole model run and evaluation set into memory. Clip
+        predictions are matched in batches with vectorized geometry
+        matching and the results are written with bulk inserts. Only
+        sound event detection evaluation sets are supported.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        model_run
+            The model run to evaluate.
+        evaluation_set
+            The evaluation set to evaluate the model run against.
+        batch_size
+            Number of clip predictions evaluated per batch.
+        progress
+            Optional progress reporter of the job running the evaluation.
+
+        Returns
+        -------
+        schemas.Evaluation
+            The created evaluation.
+
+        Raises
+        ------
+        ValueError
+            If the evaluation set task is not sound event detection.
+        """
+        if evaluation_set.task != PredictionTypes.sound_event_detection:
+            raise ValueError(
+                f"Task {evaluation_set.task} can not be evaluated in batches."
+            )
+
+        evaluation = await self.create(
+            session,
+            task=BATCHED_EVALUATION_TASK,
+        )
+        evaluator = BatchEvaluator(
+            session,
+            evaluation,
+            model_run,
+            evaluation_set,
+            batch_size=batch_size,
+        )
+
+        if progress is not None:
+            progress.set_total(await evaluator.count())
+
+        await evaluator.run(
+            on_batch=progress.advance if progress is not None else None,
+        )
 
-EVALUATION_METHODS: Mapping[PredictionTypes, Callable] = {
-    PredictionTypes.sound_event_detection: evaluate.sound_event_detection,
-    PredictionTypes.clip_classification: evaluate.clip_classification,
-    PredictionTypes.clip_tagging: evaluate.clip_multilabel_classification,
-    PredictionTypes.sound_event_tagging: evaluate.sound_event_classification,
+        evaluation = await self.update(
+            session,
+            evaluation,
+            schemas.EvaluationUpdate(score=evaluator.score),
+        )
+        for metric in evaluator.compute_metrics():
+            evaluation = await self.add_metric(session, evaluation, metric)
+
+        await create_object(
+            session,
+            models.ModelRunEvaluation,
+            model_run_id=model_run.id,
+            evaluation_id=evaluation.id,
+            evaluation_set_id=evaluation_set.id,
+        )
+        return evaluation
+
+
+BATCHED_EVALUATION_TASK = "sound_event_detection"
+"""Task name stored in evaluations created by the batched engine.
+
+Matches the task name set by `soundevent.evaluation.sound_event_detection`.
+"""
+
+
+EVALUATION_METHODS: Mapping[PredictionTypes, str] = {
+    PredictionTypes.sound_event_detection: "sound_event_detection",
+    PredictionTypes.clip_classification: "clip_classification",
+    PredictionTypes.clip_tagging: "clip_multilabel_classification",
+    PredictionTypes.sound_event_tagging: "sound_event_classification",
 }
+"""Names of the `soundevent.evaluation` functions of each task.
+
+`soundevent.evaluation` imports the geometry and numeric stacks, so it
+is only imported when an evaluation runs.
+"""
 
 
 def evaluate_predictions(
@@ -359,11 +493,15 @@ def evaluate_predictions(
     task: PredictionTypes,
 ) -> data.Evaluation:
     """Evaluate predictions."""
-    eval_fn = EVALUATION_METHODS.get(task)
+    from soundevent import evaluation
 
-    if eval_fn is None:
+    method = EVALUATION_METHODS.get(task)
+
+    if method is None:
         raise ValueError(f"Task {task} not supported.")
 
+    eval_fn = getattr(evaluation, method)
+
     return eval_fn(
         clip_predictions,
         clip_annotations,
@@ -371,4 +509,112 @@ def evaluate_predictions(
     )
 
 
+MIN_CLIPS_PER_PARTITION = 50
+"""Minimum number of clips evaluated by each worker process.
+
+Starting a worker and sending it the clips has a fixed cost, so small
+evaluations are not split across more workers than they can keep busy.
+"""
+
+
+async def evaluate_predictions_in_parallel(
+    clip_predictions: Sequence[data.ClipPrediction],
+    clip_annotations: Sequence[data.ClipAnnotation],
+    tags: Sequence[data.Tag],
+    task: PredictionTypes,
+    max_workers: int | None = None,
+    min_clips_per_partition: int = MIN_CLIPS_PER_PARTITION,
+) -> data.Evaluation:
+    """Evaluate predictions across a pool of worker processes.
+
+    The clips are split into contiguous partitions that are evaluated in
+    separate processes. The partial results are then merged, and the run
+    level metrics are computed over all clips, so the result is the same
+    as the one of `evaluate_predictions`.
+
+    Parameters
+    ----------
+    clip_predictions
+        The clip predictions to evaluate.
+    clip_annotations
+        The ground truth clip annotations.
+    tags
+        The tags to evaluate.
+    task
+        The evaluation task.
+    max_workers
+        Maximum number of worker processes. Defaults to the number of CPUs.
+    min_clips_per_partition
+        Minimum number of clips evaluated by each worker. If there are not
+        enough clips for two partitions, the evaluation runs in the current
+        process.
+
+    Returns
+    -------
+    data.Evaluation
+        The evaluation of all clips.
+    """
+    from whombat.core import evaluation as partitioned
+
+    if task not in partitioned.TASKS:
+        raise ValueError(f"Task {task} not supported.")
+
+    max_workers = max_workers or os.cpu_count() or 1
+    num_partitions = min(
+        max_workers,
+        len(clip_predictions) // max(min_clips_per_partition, 1),
+    )
+    partitions = partitioned.partition_clips(
+        clip_predictions,
+        clip_annotations,
+        num_partitions,
+    )
+
+    if len(partitions) <= 1:
+        return evaluate_predictions(
+            clip_predictions,
+            clip_annotations,
+            tags,
+            task,
+        )
+
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(
+        max_workers=len(partitions),
+        mp_context=_get_worker_context(),
+    ) as executor:
+        results = await asyncio.gather(
+            *[
+                loop.run_in_executor(
+                    executor,
+                    partitioned.evaluate_partition,
+                    task.value,
+                    partitioned.pack_partition(predictions, annotations, tags),
+                    len(tags),
+                )
+                for predictions, annotations in partitions
+            ]
+        )
+
+    return partitioned.merge_partitions(task, partitions, results)
+
+
+def _get_worker_context() -> BaseContext:
+    """Get the multiprocessing context used to start evaluation workers.
+
+    Forking the server process, which runs an event loop and database
+    threads, is unsafe. Where available, workers are forked from a fork
+    server that imports the main module and the evaluation functions
+    once, so workers start without importing anything. The fork server
+    outlives the pool and is reused by later evaluations. Otherwise,
+    workers are spawned.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(["__main__", "whombat.core.evaluation"])
+    return context
+
+
 evaluations = EvaluationAPI()
@@ -11,6 +11,7 @@ from sqlalchemy.orm import selectinload
 
 from whombat import exceptions, models, schemas
 from whombat.api.common import BaseAPI
+from whombat.api.common.permissions import invalidate_group_roles
 
 __all__ = [
     "GroupAPI",
@@ -48,6 +49,16 @@ class GroupAPI(
     def _key_fn(self, obj: dict) -> str:
         return obj["name"]
 
+    async def delete(
+        self,
+        session: AsyncSession,
+        obj: schemas.Group,
+    ) -> schemas.Group:
+        """Delete a group and the memberships of its users."""
+        deleted = await super().delete(session, obj)
+        invalidate_group_roles(session)
+        return deleted
+
     async def get_detail(
         self,
         session: AsyncSession,
@@ -151,6 +162,7 @@ async def add_membership(
     )
     session.add(membership)
     await session.flush()
+    invalidate_group_roles(session, user_id)
     await session.refresh(membership, ["user"])
     return schemas.GroupMembership.model_validate(membership)
 
@@ -176,6 +188,7 @@ async def update_membership_role(
 
     membership.role = role
     await session.flush()
+    invalidate_group_roles(session, user_id)
     await session.refresh(membership, ["user"])
     return schemas.GroupMembership.model_validate(membership)
 
@@ -199,6 +212,7 @@ async def remove_membership(
         raise exceptions.NotFoundError("Membership not found")
 
     await session.delete(membership)
+    invalidate_group_roles(session, user_id)
 
 
 groups = GroupAPI()
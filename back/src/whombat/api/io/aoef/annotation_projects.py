@@ -22,6 +22,7 @@ from whombat.api.io.aoef.sound_event_annotations import (
 from whombat.api.io.aoef.sound_events import get_sound_events
 from whombat.api.io.aoef.tags import import_tags
 from whombat.api.io.aoef.users import import_users
+from whombat.api.project_stats import project_stats
 from whombat.api.users import ensure_system_user
 
 
@@ -111,6 +112,8 @@ async def import_annotation_project(
         tags,
     )
 
+    await project_stats.rebuild(session, [project.id])
+
     session.expire(project, ["tags"])
 
     return project
@@ -7,6 +7,7 @@ from sqlalchemy import insert, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
+from whombat.api.annotation_tasks import annotation_tasks as tasks_api
 from whombat.api.common import create_objects_without_duplicates
 from whombat.api.io.aoef.common import get_mapping
 
@@ -182,3 +183,7 @@ async def _create_annotation_badges(
             models.AnnotationStatusBadge.user_id,
         ),
     )
+    await tasks_api.update_status_flags(
+        session,
+        list({value["annotation_task_id"] for value in values}),
+    )
@@ -2,7 +2,6 @@ import logging
 from pathlib import Path
 from uuid import UUID
 
-from soundevent.audio import compute_md5_checksum
 from soundevent.io.aoef import (
     AnnotationSetObject,
     EvaluationObject,
@@ -217,6 +216,8 @@ def _get_recording_hash(
     if rec.hash:
         return rec.hash
 
+    from soundevent.audio import compute_md5_checksum
+
     path = base_audio_dir / audio_dir / rec.path
     return compute_md5_checksum(path)
 
@@ -1,7 +1,6 @@
 import datetime
 from uuid import UUID
 
-from soundevent.geometry import compute_geometric_features
 from soundevent.io.aoef import (
     AnnotationSetObject,
     EvaluationObject,
@@ -107,6 +106,8 @@ async def _create_sound_event_features(
     mapping: dict[UUID, int],
     feature_names: dict[str, int],
 ) -> None:
+    from soundevent.geometry import compute_geometric_features
+
     values = []
     for sound_event in sound_events:
         if sound_event.geometry is None:
@@ -9,6 +9,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import exceptions, models, schemas
+from whombat.api import converters
 from whombat.api.clip_predictions import clip_predictions
 from whombat.api.common import BaseAPI, create_object
 from whombat.filters.base import Filter
@@ -173,8 +174,26 @@ class ModelRunAPI(
         obj: schemas.ModelRun,
         audio_dir: Path | None = None,
     ) -> data.ModelRun:
-        predictions, _ = await self.get_clip_predictions(
-            session, obj, limit=-1
+        """Convert a model run to `soundevent` format.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        obj
+            The model run to convert.
+        audio_dir
+            The root directory of the audio files.
+
+        Returns
+        -------
+        data.ModelRun
+            The model run with all its clip predictions.
+        """
+        prediction_ids = await session.scalars(
+            select(models.ModelRunPrediction.clip_prediction_id)
+            .where(models.ModelRunPrediction.model_run_id == obj.id)
+            .order_by(models.ModelRunPrediction.clip_prediction_id)
         )
         return data.ModelRun(
             uuid=obj.uuid,
@@ -182,14 +201,11 @@ class ModelRunAPI(
             name=obj.name,
             version=obj.version,
             description=obj.description,
-            clip_predictions=[
-                await clip_predictions.to_soundevent(
-                    session,
-                    cp,
-                    audio_dir=audio_dir,
-                )
-                for cp in predictions
-            ],
+            clip_predictions=await converters.get_clip_predictions(
+                session,
+                prediction_ids.all(),
+                audio_dir=audio_dir,
+            ),
         )
 
 
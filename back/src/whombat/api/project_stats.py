@@ -0,0 +1,580 @@
+"""Python API for annotation project statistics.
+
+The progress statistics of annotation projects are stored in summary
+tables (see `whombat.models.project_stats`) so that they can be read
+without aggregating over all the tasks, badges and tags of a project.
+
+The APIs that modify tasks, status badges, tags and sound event
+annotations keep the summary tables up to date by calling the `update_*`
+methods of this module within the same transaction, and those that
+create or delete whole tasks or clip annotations add or remove the
+contributions of the affected tasks with `add_tasks` and `remove_tasks`.
+Code that modifies these tables in bulk by other means, such as imports,
+should call `rebuild` for the affected projects afterwards.
+"""
+
+import datetime
+from collections import defaultdict
+from typing import Any, Sequence
+
+from soundevent import data
+from sqlalchemy import (
+    ColumnElement,
+    case,
+    delete,
+    func,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import models, schemas
+from whombat.api.common.utils import (
+    batched,
+    get_dialect_name,
+    get_insert,
+    get_max_rows_per_insert,
+)
+
+__all__ = [
+    "ProjectStatsAPI",
+    "project_stats",
+]
+
+STATUS_COUNTS = {
+    "is_completed": "num_completed",
+    "is_verified": "num_verified",
+    "is_rejected": "num_rejected",
+    "is_assigned": "num_assigned",
+}
+"""Task status flags and the counters of the project stats they map to."""
+
+
+class ProjectStatsAPI:
+    """API for the progress statistics of annotation projects."""
+
+    async def get(
+        self,
+        session: AsyncSession,
+        annotation_project: schemas.AnnotationProject,
+    ) -> schemas.AnnotationProjectStats:
+        """Get the progress statistics of an annotation project.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        annotation_project
+            The annotation project.
+
+        Returns
+        -------
+        schemas.AnnotationProjectStats
+            Task counts, tag counts and user activity of the project.
+        """
+        stats = models.AnnotationProjectStats
+        tag_count = models.AnnotationProjectTagCount
+        activity = models.AnnotationProjectUserActivity
+
+        result = await session.execute(
+            select(
+                stats.num_tasks,
+                stats.num_completed,
+                stats.num_verified,
+                stats.num_rejected,
+                stats.num_assigned,
+            ).where(stats.annotation_project_id == annotation_project.id)
+        )
+        counts = result.one_or_none()
+
+        tags = await session.execute(
+            select(
+                models.Tag,
+                tag_count.clip_annotations,
+                tag_count.sound_event_annotations,
+            )
+            .join(tag_count, tag_count.tag_id == models.Tag.id)
+            .where(
+                tag_count.annotation_project_id == annotation_project.id,
+                (tag_count.clip_annotations > 0)
+                | (tag_count.sound_event_annotations > 0),
+            )
+            .order_by(models.Tag.key, models.Tag.value)
+        )
+
+        users = await session.execute(
+            select(
+                models.User,
+                activity.date,
+                activity.sound_event_annotations,
+                activity.completed_tasks,
+            )
+            .join(activity, activity.user_id == models.User.id)
+            .where(
+                activity.annotation_project_id == annotation_project.id,
+                (activity.sound_event_annotations > 0)
+                | (activity.completed_tasks > 0),
+            )
+            .order_by(activity.date, models.User.username)
+        )
+
+        return schemas.AnnotationProjectStats(
+            **(counts._asdict() if counts is not None else {}),
+            tags=[
+                schemas.AnnotationProjectTagCount(
+                    tag=schemas.Tag.model_validate(tag),
+                    clip_annotations=clip_annotations,
+                    sound_event_annotations=sound_event_annotations,
+                )
+                for tag, clip_annotations, sound_event_annotations in tags
+            ],
+            activity=[
+                schemas.AnnotationProjectUserActivity(
+                    user=schemas.SimpleUser.model_validate(user),
+                    date=date,
+                    sound_event_annotations=sound_event_annotations,
+                    completed_tasks=completed_tasks,
+                )
+                for user, date, sound_event_annotations, completed_tasks in users
+            ],
+        )
+
+    async def get_project_id(
+        self,
+        session: AsyncSession,
+        clip_annotation_id: int,
+    ) -> int | None:
+        """Get the id of the project a clip annotation belongs to.
+
+        Returns None if the clip annotation is not part of an annotation
+        task.
+        """
+        return await session.scalar(
+            select(models.AnnotationTask.annotation_project_id)
+            .where(
+                models.AnnotationTask.clip_annotation_id == clip_annotation_id
+            )
+            .limit(1)
+        )
+
+    async def update_task_counts(
+        self,
+        session: AsyncSession,
+        annotation_project_id: int,
+        **deltas: int,
+    ) -> None:
+        """Add to the task counts of a project.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        annotation_project_id
+            The id of the annotation project.
+        **deltas
+            Amounts to add to each counter (e.g. `num_tasks=1`).
+        """
+        await _increment(
+            session,
+            models.AnnotationProjectStats,
+            {"annotation_project_id": annotation_project_id},
+            deltas,
+        )
+
+    async def update_tag_counts(
+        self,
+        session: AsyncSession,
+        annotation_project_id: int,
+        tag_id: int,
+        **deltas: int,
+    ) -> None:
+        """Add to the usage counts of a tag in a project.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        annotation_project_id
+            The id of the annotation project.
+        tag_id
+            The id of the tag.
+        **deltas
+            Amounts to add to each counter (e.g. `clip_annotations=-1`).
+        """
+        await _increment(
+            session,
+            models.AnnotationProjectTagCount,
+            {"annotation_project_id": annotation_project_id, "tag_id": tag_id},
+            deltas,
+        )
+
+    async def update_user_activity(
+        self,
+        session: AsyncSession,
+        annotation_project_id: int,
+        user_id: Any,
+        date: datetime.datetime,
+        **deltas: int,
+    ) -> None:
+        """Add to the daily activity counts of a user in a project.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        annotation_project_id
+            The id of the annotation project.
+        user_id
+            The id of the user.
+        date
+            The time at which the annotations were made. Counts are
+            aggregated by UTC day.
+        **deltas
+            Amounts to add to each counter (e.g. `completed_tasks=1`).
+        """
+        await _increment(
+            session,
+            models.AnnotationProjectUserActivity,
+            {
+                "annotation_project_id": annotation_project_id,
+                "user_id": user_id,
+                "date": _to_utc_date(date),
+            },
+            deltas,
+        )
+
+    async def add_tasks(
+        self,
+        session: AsyncSession,
+        annotation_task_ids: Sequence[int],
+    ) -> None:
+        """Add the contributions of tasks to the statistics of projects.
+
+        The tasks, the tags and sound events of their clip annotations and
+        their completion badges are counted towards the statistics of
+        their projects. Only the given tasks are aggregated, so the cost
+        does not depend on the size of the projects.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        annotation_task_ids
+            The ids of the tasks. Ids of tasks that do not exist are
+            ignored.
+        """
+        await self._update_tasks(session, annotation_task_ids, 1)
+
+    async def remove_tasks(
+        self,
+        session: AsyncSession,
+        annotation_task_ids: Sequence[int],
+    ) -> None:
+        """Remove the contributions of tasks from the statistics.
+
+        Call this before deleting tasks or objects that belong to them,
+        and call `add_tasks` afterwards for the tasks that remain, so that
+        whatever the deletion cascades to is subtracted from the counts.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        annotation_task_ids
+            The ids of the tasks.
+        """
+        await self._update_tasks(session, annotation_task_ids, -1)
+
+    async def rebuild(
+        self,
+        session: AsyncSession,
+        annotation_project_ids: Sequence[int] | None = None,
+    ) -> None:
+        """Recompute the statistics of projects from the source tables.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        annotation_project_ids
+            The ids of the projects to rebuild. If None, the statistics of
+            all projects are rebuilt.
+        """
+
+        def in_projects(model) -> list[ColumnElement[bool]]:
+            if annotation_project_ids is None:
+                return []
+            return [
+                model.annotation_project_id.in_(list(annotation_project_ids))
+            ]
+
+        aggregates = await _aggregate(
+            session,
+            *in_projects(models.AnnotationTask),
+        )
+        for model, rows in aggregates.items():
+            await session.execute(delete(model).where(*in_projects(model)))
+            await _insert_rows(session, model, rows)
+
+    async def _update_tasks(
+        self,
+        session: AsyncSession,
+        annotation_task_ids: Sequence[int],
+        sign: int,
+    ) -> None:
+        batch_size = get_max_rows_per_insert(session, 1)
+        for batch in batched(list(annotation_task_ids), batch_size):
+            aggregates = await _aggregate(
+                session,
+                models.AnnotationTask.id.in_(batch),
+            )
+            for model, rows in aggregates.items():
+                keys = [column.key for column in model.__table__.primary_key]
+                for row in rows:
+                    await _increment(
+                        session,
+                        model,
+                        {key: row[key] for key in keys},
+                        {
+                            name: sign * value
+                            for name, value in row.items()
+                            if name not in keys
+                        },
+                    )
+
+
+project_stats = ProjectStatsAPI()
+
+
+def _get_counters(model) -> list[str]:
+    return [
+        column.key
+        for column in model.__table__.columns
+        if not column.primary_key and column.key != "created_on"
+    ]
+
+
+async def _increment(
+    session: AsyncSession,
+    model,
+    keys: dict[str, Any],
+    deltas: dict[str, int],
+) -> None:
+    """Add to the counters of a summary row, creating it if needed."""
+    deltas = {name: value for name, value in deltas.items() if value}
+    if not deltas:
+        return
+
+    counters = _get_counters(model)
+    unknown = set(deltas) - set(counters)
+    if unknown:
+        raise ValueError(f"Unknown counters for {model.__name__}: {unknown}")
+
+    values = {
+        **keys,
+        **{name: deltas.get(name, 0) for name in counters},
+        "created_on": datetime.datetime.now(datetime.timezone.utc),
+    }
+    stmt = get_insert(session, model).values(**values)
+
+    if hasattr(stmt, "on_conflict_do_update"):
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=list(keys),
+                set_={
+                    name: getattr(model, name) + getattr(stmt.excluded, name)
+                    for name in deltas
+                },
+            )
+        )
+        return
+
+    result = await session.execute(
+        update(model)
+        .where(
+            *[getattr(model, name) == value for name, value in keys.items()]
+        )
+        .values(
+            {
+                name: getattr(model, name) + value
+                for name, value in deltas.items()
+            }
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if not result.rowcount:  # type: ignore
+        await session.execute(stmt)
+
+
+async def _aggregate(
+    session: AsyncSession,
+    *conditions: ColumnElement[bool],
+) -> dict[Any, list[dict[str, Any]]]:
+    """Aggregate the statistics of the tasks that match the conditions.
+
+    Returns the rows of each summary table, keyed by model.
+    """
+    task = models.AnnotationTask
+    badge = models.AnnotationStatusBadge
+    clip_tag = models.ClipAnnotationTag
+    sound_event_annotation = models.SoundEventAnnotation
+    sound_event_tag = models.SoundEventAnnotationTag
+
+    result = await session.execute(
+        select(
+            task.annotation_project_id,
+            func.count().label("num_tasks"),
+            *[
+                func.sum(case((getattr(task, flag), 1), else_=0)).label(
+                    counter
+                )
+                for flag, counter in STATUS_COUNTS.items()
+            ],
+        )
+        .where(*conditions)
+        .group_by(task.annotation_project_id)
+    )
+    task_counts = [row._asdict() for row in result]
+
+    tag_counts: dict[tuple, dict[str, int]] = defaultdict(dict)
+    result = await session.execute(
+        select(task.annotation_project_id, clip_tag.tag_id, func.count())
+        .join(
+            clip_tag,
+            clip_tag.clip_annotation_id == task.clip_annotation_id,
+        )
+        .where(*conditions)
+        .group_by(task.annotation_project_id, clip_tag.tag_id)
+    )
+    for project_id, tag_id, count in result:
+        tag_counts[project_id, tag_id]["clip_annotations"] = count
+
+    result = await session.execute(
+        select(
+            task.annotation_project_id,
+            sound_event_tag.tag_id,
+            func.count(),
+        )
+        .join(
+            sound_event_annotation,
+            sound_event_annotation.clip_annotation_id
+            == task.clip_annotation_id,
+        )
+        .join(
+            sound_event_tag,
+            sound_event_tag.sound_event_annotation_id
+            == sound_event_annotation.id,
+        )
+        .where(*conditions)
+        .group_by(task.annotation_project_id, sound_event_tag.tag_id)
+    )
+    for project_id, tag_id, count in result:
+        tag_counts[project_id, tag_id]["sound_event_annotations"] = count
+
+    activity: dict[tuple, dict[str, int]] = defaultdict(dict)
+    created_on = _date_expression(session, sound_event_annotation)
+    result = await session.execute(
+        select(
+            task.annotation_project_id,
+            sound_event_annotation.created_by_id,
+            created_on,
+            func.count(),
+        )
+        .join(
+            sound_event_annotation,
+            sound_event_annotation.clip_annotation_id
+            == task.clip_annotation_id,
+        )
+        .where(
+            sound_event_annotation.created_by_id.is_not(None),
+            *conditions,
+        )
+        .group_by(
+            task.annotation_project_id,
+            sound_event_annotation.created_by_id,
+            created_on,
+        )
+    )
+    for project_id, user_id, date, count in result:
+        key = (project_id, user_id, _to_utc_date(date))
+        activity[key]["sound_event_annotations"] = count
+
+    created_on = _date_expression(session, badge)
+    result = await session.execute(
+        select(
+            task.annotation_project_id,
+            badge.user_id,
+            created_on,
+            func.count(),
+        )
+        .join(badge, badge.annotation_task_id == task.id)
+        .where(
+            badge.state == data.AnnotationState.completed,
+            badge.user_id.is_not(None),
+            *conditions,
+        )
+        .group_by(task.annotation_project_id, badge.user_id, created_on)
+    )
+    for project_id, user_id, date, count in result:
+        key = (project_id, user_id, _to_utc_date(date))
+        activity[key]["completed_tasks"] = count
+
+    return {
+        models.AnnotationProjectStats: task_counts,
+        models.AnnotationProjectTagCount: [
+            {"annotation_project_id": project_id, "tag_id": tag_id, **c}
+            for (project_id, tag_id), c in tag_counts.items()
+        ],
+        models.AnnotationProjectUserActivity: [
+            {
+                "annotation_project_id": project_id,
+                "user_id": user_id,
+                "date": date,
+                **c,
+            }
+            for (project_id, user_id, date), c in activity.items()
+        ],
+    }
+
+
+async def _insert_rows(
+    session: AsyncSession,
+    model,
+    rows: list[dict[str, Any]],
+) -> None:
+    if not rows:
+        return
+
+    counters = _get_counters(model)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    rows = [
+        {
+            **{name: 0 for name in counters},
+            **row,
+            "created_on": now,
+        }
+        for row in rows
+    ]
+    batch_size = get_max_rows_per_insert(session, len(rows[0]))
+    for batch in batched(rows, batch_size):
+        await session.execute(insert(model).values(list(batch)))
+
+
+def _date_expression(session: AsyncSession, model) -> ColumnElement:
+    """Get the UTC day of the creation time of a model."""
+    if get_dialect_name(session) == "postgresql":
+        return func.date(func.timezone("UTC", model.created_on))
+    return func.date(model.created_on)
+
+
+def _to_utc_date(value: datetime.datetime | datetime.date | str):
+    if isinstance(value, str):
+        return datetime.date.fromisoformat(value)
+
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc)
+        return value.date()
+
+    return value
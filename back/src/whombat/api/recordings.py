@@ -5,13 +5,11 @@ import logging
 from functools import partial
 from multiprocessing import Pool
 from pathlib import Path
-from typing import Sequence
+from typing import TYPE_CHECKING, Sequence
 from uuid import UUID
 
-import cachetools
 import soundfile as sf
 from soundevent import data
-from soundevent.audio import MediaInfo, compute_md5_checksum, get_media_info
 from sqlalchemy import and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -22,10 +20,14 @@ from whombat.api.features import features
 from whombat.api.notes import notes
 from whombat.api.tags import tags
 from whombat.api.users import users
+from whombat.cache import AppCache
 from whombat.core import files
 from whombat.core.common import remove_duplicates
 from whombat.system import get_settings
 
+if TYPE_CHECKING:
+    from soundevent.audio import MediaInfo
+
 __all__ = [
     "RecordingAPI",
     "recordings",
@@ -33,6 +35,9 @@ __all__ = [
 
 logger = logging.getLogger(__name__)
 
+media_info_cache = AppCache("media_info", maxsize=1000)
+"""Media information of the recording files by recording UUID."""
+
 
 class RecordingAPI(
     BaseAPI[
@@ -46,27 +51,26 @@ class RecordingAPI(
     _model = models.Recording
     _schema = schemas.Recording
 
-    def __init__(self):
-        super().__init__()
-        self._media_info_cache = cachetools.LRUCache(maxsize=1000)
-
     async def get_media_info(
         self,
         session: AsyncSession,
         recording_uuid: UUID,
         audio_dir: Path | None = None,
-    ) -> MediaInfo:
+    ) -> "MediaInfo":
+        from soundevent.audio import get_media_info
+
         if audio_dir is None:
             audio_dir = get_settings().audio_dir
 
-        if recording_uuid in self._media_info_cache:
-            return self._media_info_cache[recording_uuid]
+        media_info = media_info_cache.get(recording_uuid)
+        if media_info is not None:
+            return media_info
 
         recording = await self.get(session, recording_uuid)
         full_path = audio_dir / recording.path
 
         media_info = get_media_info(full_path)
-        self._media_info_cache[recording_uuid] = media_info
+        media_info_cache[recording_uuid] = media_info
         return media_info
 
     async def get_by_hash(
@@ -306,6 +310,8 @@ class RecordingAPI(
             audio_dir = get_settings().audio_dir
 
         if data.path is not None:
+            from soundevent.audio import compute_md5_checksum
+
             new_hash = compute_md5_checksum(data.path)
 
             if new_hash != obj.hash:
@@ -1,15 +1,30 @@
+import json
+import struct
 from collections import defaultdict
+from dataclasses import dataclass, field
 from typing import Sequence
 from uuid import UUID
 
+import numpy as np
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models, schemas
 from whombat.api.common.utils import get_count
 from whombat.filters.base import Filter
 
+COLUMNS_MAGIC = b"WSPC"
+"""Magic bytes at the start of the columnar scatter plot format."""
+
+COLUMNS_VERSION = 1
+"""Version of the columnar scatter plot format."""
+
+COLUMNS_MEDIA_TYPE = "application/vnd.whombat.columns"
+"""Media type of the columnar scatter plot format."""
+
+_ALIGNMENT = 8
+
 
 class ScatterPlotData(BaseModel):
     """Data for a scatter plot."""
@@ -140,3 +155,321 @@ async def get_scatterplot_data(
         )
         for ann_id in mapping.keys()
     ], count
+
+
+@dataclass
+class TagColumn:
+    """Dictionary encoded tag column.
+
+    Each row holds the index of its tag value in `values`, or -1 if the
+    row has no tag with the column key.
+    """
+
+    values: list[str]
+    """Tag values of the column key."""
+
+    canonical_names: list[str]
+    """Canonical names of the tag values."""
+
+    codes: np.ndarray
+    """Index of the tag value of each row (int32)."""
+
+
+@dataclass
+class ScatterPlotColumns:
+    """Scatter plot data of sound event annotations in columnar form."""
+
+    uuids: np.ndarray
+    """UUIDs of the annotations, one 16 byte row each (uint8)."""
+
+    feature_names: list[str]
+    """Names of the feature columns."""
+
+    features: np.ndarray
+    """Feature matrix of shape (features, rows) (float32).
+
+    Each feature is a contiguous column. Missing values are NaN.
+    """
+
+    tags: dict[str, TagColumn] = field(default_factory=dict)
+    """Tag columns of the annotations, by tag key."""
+
+    recording_tags: dict[str, TagColumn] = field(default_factory=dict)
+    """Tag columns of the annotation recordings, by tag key."""
+
+    total: int = 0
+    """Number of annotations matching the filters, ignoring the limit."""
+
+    @property
+    def num_rows(self) -> int:
+        return len(self.uuids)
+
+    def to_bytes(self) -> bytes:
+        """Encode the columns in the whombat columnar format.
+
+        The format consists of the magic bytes `WSPC`, the format version
+        and the length of a JSON header as little-endian uint32 values,
+        followed by the header and the column buffers. The header lists
+        every buffer with its `offset` and `length` in bytes, relative to
+        the end of the header. Buffers are little-endian and aligned to 8
+        bytes so they can be viewed as typed arrays without copying.
+        """
+        buffers: list[bytes] = []
+        offset = 0
+
+        def add_buffer(array: np.ndarray) -> dict:
+            nonlocal offset
+            data = np.ascontiguousarray(array).tobytes()
+            padding = -len(data) % _ALIGNMENT
+            buffers.append(data + b"\0" * padding)
+            spec = {"offset": offset, "length": len(data)}
+            offset += len(data) + padding
+            return spec
+
+        def tag_columns(columns: dict[str, TagColumn]) -> list[dict]:
+            return [
+                {
+                    "key": key,
+                    "values": column.values,
+                    "canonical_names": column.canonical_names,
+                    "dtype": "int32",
+                    **add_buffer(column.codes.astype("<i4")),
+                }
+                for key, column in columns.items()
+            ]
+
+        header = {
+            "num_rows": self.num_rows,
+            "total": self.total,
+            "uuid": {"dtype": "uuid", **add_buffer(self.uuids)},
+            "features": {
+                "names": self.feature_names,
+                "dtype": "float32",
+                "layout": "column-major",
+                **add_buffer(self.features.astype("<f4")),
+            },
+            "tags": tag_columns(self.tags),
+            "recording_tags": tag_columns(self.recording_tags),
+        }
+        encoded = json.dumps(header).encode("utf-8")
+        prefix = struct.calcsize("<4sII")
+        encoded += b" " * (-(prefix + len(encoded)) % _ALIGNMENT)
+        return b"".join(
+            [
+                struct.pack(
+                    "<4sII",
+                    COLUMNS_MAGIC,
+                    COLUMNS_VERSION,
+                    len(encoded),
+                ),
+                encoded,
+                *buffers,
+            ]
+        )
+
+
+async def get_scatterplot_columns(
+    session: AsyncSession,
+    limit: int = 100_000,
+    offset: int = 0,
+    filters: Sequence[Filter] | None = None,
+) -> ScatterPlotColumns:
+    """Get the scatter plot data of sound event annotations as columns.
+
+    Unlike `get_scatterplot_data`, no objects are created per annotation.
+    Features and tags are fetched as flat (annotation, value) pairs and
+    pivoted into columns with NumPy, which makes it practical to load
+    hundreds of thousands of annotations at once.
+
+    If an annotation has several tags with the same key, the tag with the
+    lowest database id is used in the tag column.
+
+    Parameters
+    ----------
+    session
+        SQLAlchemy AsyncSession.
+    limit
+        Maximum number of annotations. Use -1 for no limit.
+    offset
+        Number of annotations to skip.
+    filters
+        Filters on the sound event annotations.
+
+    Returns
+    -------
+    ScatterPlotColumns
+        The columns of the annotations, ordered by database id.
+    """
+    query = select(
+        models.SoundEventAnnotation.id,
+        models.SoundEventAnnotation.uuid,
+    )
+    for filter in filters or []:
+        query = filter.filter(query)
+    total = await get_count(session, models.SoundEventAnnotation, query)
+
+    query = query.distinct().order_by(models.SoundEventAnnotation.id)
+    if limit >= 0:
+        query = query.limit(limit)
+    if offset:
+        query = query.offset(offset)
+
+    rows = (await session.execute(query)).all()
+    ids = np.fromiter(
+        (row[0] for row in rows), dtype=np.int64, count=len(rows)
+    )
+    uuids = np.frombuffer(
+        b"".join(row[1].bytes for row in rows),
+        dtype=np.uint8,
+    ).reshape(len(rows), 16)
+    selected = query.subquery()
+
+    feature_query = (
+        select(
+            selected.c.id,
+            models.SoundEventFeature.feature_name_id,
+            models.SoundEventFeature.value,
+        )
+        .join(
+            models.SoundEventAnnotation,
+            models.SoundEventAnnotation.id == selected.c.id,
+        )
+        .join(
+            models.SoundEventFeature,
+            models.SoundEventFeature.sound_event_id
+            == models.SoundEventAnnotation.sound_event_id,
+        )
+    )
+    annotation_ids, name_ids, values = await _fetch_columns(
+        session,
+        feature_query,
+        dtypes=(np.int64, np.int64, np.float32),
+    )
+    name_ids, columns = np.unique(name_ids, return_inverse=True)
+    names = await _get_feature_names(session, name_ids)
+    features = np.full((len(name_ids), len(ids)), np.nan, dtype=np.float32)
+    features[columns, np.searchsorted(ids, annotation_ids)] = values
+
+    tag_query = select(
+        selected.c.id,
+        models.SoundEventAnnotationTag.tag_id,
+    ).join(
+        models.SoundEventAnnotationTag,
+        models.SoundEventAnnotationTag.sound_event_annotation_id
+        == selected.c.id,
+    )
+    recording_tag_query = (
+        select(selected.c.id, models.RecordingTag.tag_id)
+        .join(
+            models.SoundEventAnnotation,
+            models.SoundEventAnnotation.id == selected.c.id,
+        )
+        .join(
+            models.SoundEvent,
+            models.SoundEvent.id == models.SoundEventAnnotation.sound_event_id,
+        )
+        .join(
+            models.RecordingTag,
+            models.RecordingTag.recording_id == models.SoundEvent.recording_id,
+        )
+    )
+
+    return ScatterPlotColumns(
+        uuids=uuids,
+        feature_names=[names[name_id] for name_id in name_ids.tolist()],
+        features=features,
+        tags=await _get_tag_columns(session, tag_query, ids),
+        recording_tags=await _get_tag_columns(
+            session,
+            recording_tag_query,
+            ids,
+        ),
+        total=total,
+    )
+
+
+async def _fetch_columns(
+    session: AsyncSession,
+    query: Select,
+    dtypes: Sequence[type],
+) -> list[np.ndarray]:
+    """Fetch the result of a query as one array per column."""
+    rows = (await session.execute(query)).all()
+    if not rows:
+        return [np.empty(0, dtype=dtype) for dtype in dtypes]
+    columns = zip(*rows, strict=True)
+    return [
+        np.asarray(column, dtype=dtype)
+        for column, dtype in zip(columns, dtypes, strict=True)
+    ]
+
+
+async def _get_feature_names(
+    session: AsyncSession,
+    ids: np.ndarray,
+) -> dict[int, str]:
+    if not len(ids):
+        return {}
+    result = await session.execute(
+        select(models.FeatureName.id, models.FeatureName.name).where(
+            models.FeatureName.id.in_(ids.tolist())
+        )
+    )
+    return {id: name for id, name in result.all()}
+
+
+async def _get_tag_columns(
+    session: AsyncSession,
+    query: Select,
+    ids: np.ndarray,
+) -> dict[str, TagColumn]:
+    """Pivot (annotation id, tag id) pairs into dictionary encoded columns."""
+    annotation_ids, tag_ids = await _fetch_columns(
+        session,
+        query,
+        dtypes=(np.int64, np.int64),
+    )
+    if not len(tag_ids):
+        return {}
+
+    unique_tag_ids, tag_index = np.unique(tag_ids, return_inverse=True)
+    result = await session.execute(
+        select(
+            models.Tag.id,
+            models.Tag.key,
+            models.Tag.value,
+            models.Tag.canonical_name,
+        ).where(models.Tag.id.in_(unique_tag_ids.tolist()))
+    )
+    tags = {id: (key, value, name) for id, key, value, name in result.all()}
+    keys = np.array([tags[id][0] for id in unique_tag_ids.tolist()])
+    rows = np.searchsorted(ids, annotation_ids)
+
+    columns = {}
+    for key in np.unique(keys).tolist():
+        # Tags of the key, with their index within the column dictionary.
+        in_key = np.flatnonzero(keys == key)
+        categories = np.full(len(unique_tag_ids), -1, dtype=np.int32)
+        categories[in_key] = np.arange(len(in_key), dtype=np.int32)
+
+        mask = keys[tag_index] == key
+        key_rows = rows[mask]
+        key_codes = categories[tag_index[mask]]
+
+        # Sort by row and tag id so that the first entry of each row is
+        # the tag with the lowest id.
+        order = np.lexsort((tag_ids[mask], key_rows))
+        key_rows = key_rows[order]
+        key_codes = key_codes[order]
+        _, first = np.unique(key_rows, return_index=True)
+
+        codes = np.full(len(ids), -1, dtype=np.int32)
+        codes[key_rows[first]] = key_codes[first]
+        columns[key] = TagColumn(
+            values=[tags[id][1] for id in unique_tag_ids[in_key].tolist()],
+            canonical_names=[
+                tags[id][2] for id in unique_tag_ids[in_key].tolist()
+            ],
+            codes=codes,
+        )
+    return columns
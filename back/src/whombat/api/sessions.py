@@ -63,5 +63,8 @@ async def create_session(
     keyword.
     """
     engine = database.create_async_db_engine(db_url)
-    async with database.get_async_session(engine) as session:
-        yield session
+    try:
+        async with database.get_async_session(engine) as session:
+            yield session
+    finally:
+        await engine.dispose()
@@ -11,6 +11,7 @@ from whombat import exceptions, models, schemas
 from whombat.api import common
 from whombat.api.common import BaseAPI
 from whombat.api.notes import notes
+from whombat.api.project_stats import project_stats
 from whombat.api.sound_events import sound_events
 from whombat.api.tags import tags
 from whombat.api.users import users
@@ -62,13 +63,78 @@ class SoundEventAnnotationAPI(
         schemas.SoundEventAnnotation
             The created sound event annotation.
         """
-        return await self.create_from_data(
+        obj = await self.create_from_data(
             session,
             sound_event_id=sound_event.id,
             clip_annotation_id=clip_annotation.id,
             created_by_id=created_by.id if created_by else None,
             **kwargs,
         )
+        if created_by is not None:
+            project_id = await project_stats.get_project_id(
+                session,
+                clip_annotation.id,
+            )
+            if project_id is not None:
+                await project_stats.update_user_activity(
+                    session,
+                    project_id,
+                    created_by.id,
+                    obj.created_on,
+                    sound_event_annotations=1,
+                )
+        return obj
+
+    async def delete(
+        self,
+        session: AsyncSession,
+        obj: schemas.SoundEventAnnotation,
+    ) -> schemas.SoundEventAnnotation:
+        """Delete a sound event annotation.
+
+        Parameters
+        ----------
+        session
+            The database session.
+        obj
+            The sound event annotation to delete.
+
+        Returns
+        -------
+        schemas.SoundEventAnnotation
+            The deleted sound event annotation.
+        """
+        project_id = await self._get_project_id(session, obj)
+        tag_ids = (
+            await session.scalars(
+                select(models.SoundEventAnnotationTag.tag_id).where(
+                    models.SoundEventAnnotationTag.sound_event_annotation_id
+                    == obj.id
+                )
+            )
+        ).all()
+
+        obj = await super().delete(session, obj)
+        if project_id is None:
+            return obj
+
+        for tag_id in tag_ids:
+            await project_stats.update_tag_counts(
+                session,
+                project_id,
+                tag_id,
+                sound_event_annotations=-1,
+            )
+
+        if obj.created_by is not None:
+            await project_stats.update_user_activity(
+                session,
+                project_id,
+                obj.created_by.id,
+                obj.created_on,
+                sound_event_annotations=-1,
+            )
+        return obj
 
     async def get_clip_annotation(
         self,
@@ -175,6 +241,14 @@ class SoundEventAnnotationAPI(
             tag_id=tag.id,
             created_by_id=user_id,
         )
+        project_id = await self._get_project_id(session, obj)
+        if project_id is not None:
+            await project_stats.update_tag_counts(
+                session,
+                project_id,
+                tag.id,
+                sound_event_annotations=1,
+            )
 
         obj = obj.model_copy(
             update=dict(
@@ -242,6 +316,14 @@ class SoundEventAnnotationAPI(
                 models.SoundEventAnnotationTag.tag_id == tag.id,
             ),
         )
+        project_id = await self._get_project_id(session, obj)
+        if project_id is not None:
+            await project_stats.update_tag_counts(
+                session,
+                project_id,
+                tag.id,
+                sound_event_annotations=-1,
+            )
 
         obj = obj.model_copy(
             update=dict(
@@ -472,5 +554,21 @@ class SoundEventAnnotationAPI(
 
         return sound_event_annotation
 
+    async def _get_project_id(
+        self,
+        session: AsyncSession,
+        obj: schemas.SoundEventAnnotation,
+    ) -> int | None:
+        return await session.scalar(
+            select(models.AnnotationTask.annotation_project_id)
+            .join(
+                models.SoundEventAnnotation,
+                models.SoundEventAnnotation.clip_annotation_id
+                == models.AnnotationTask.clip_annotation_id,
+            )
+            .where(models.SoundEventAnnotation.id == obj.id)
+            .limit(1)
+        )
+
 
 sound_event_annotations = SoundEventAnnotationAPI()
@@ -5,7 +5,6 @@ from typing import Sequence
 from uuid import UUID
 
 from soundevent import data
-from soundevent.geometry import compute_geometric_features
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,6 +13,7 @@ from whombat.api import common
 from whombat.api.common import BaseAPI
 from whombat.api.features import features
 from whombat.api.recordings import recordings
+from whombat.core.geometries import load_geometry
 
 __all__ = [
     "SoundEventAPI",
@@ -280,9 +280,13 @@ class SoundEventAPI(
         sound_events
             The sound events.
         """
+        from soundevent.geometry import compute_geometric_features
+
         all_features = []
         for sound_event in sound_events:
-            feats = compute_geometric_features(sound_event.geometry)
+            feats = compute_geometric_features(
+                load_geometry(sound_event.geometry)
+            )
             for feature in feats:
                 all_features.append(
                     (sound_event.id, feature.name, feature.value)
@@ -326,6 +330,8 @@ class SoundEventAPI(
         schemas.SoundEvent
             The updated sound event.
         """
+        from soundevent.geometry import compute_geometric_features
+
         geom_features = compute_geometric_features(sound_event.geometry)
 
         for feature in geom_features:
@@ -5,111 +5,53 @@ from __future__ import annotations
 from pathlib import Path
 
 import numpy as np
-import torch
 import xarray as xr
 from soundevent import arrays
-from torchaudio import functional as taF
 
 import whombat.api.audio as audio_api
 from whombat import schemas
+from whombat.core.dsp import get_dsp_backend
 from whombat.core.spectrograms import normalize_spectrogram
+from whombat.system.metrics import timed
 
 __all__ = [
+    "compute_power_spectrogram",
     "compute_spectrogram",
 ]
 
 
-def _build_window(
-    window_type: str,
-    length: int,
-    device: torch.device,
-) -> torch.Tensor:
-    """Create a window tensor compatible with torchaudio."""
-    if length <= 0:
-        return torch.ones(1, device=device)
-
-    window_type = window_type.lower()
-    if window_type == "hann":
-        return torch.hann_window(length, periodic=True, device=device)
-    if window_type == "hamming":
-        return torch.hamming_window(length, periodic=True, device=device)
-    if window_type == "bartlett":
-        return torch.bartlett_window(length, periodic=True, device=device)
-    if window_type == "blackman":
-        return torch.blackman_window(length, periodic=True, device=device)
-
-    # Fallback to numpy window generation.
-    window = None
-    if hasattr(np, window_type):
-        candidate = getattr(np, window_type)
-        try:
-            window = candidate(length)
-        except TypeError:
-            window = None
-    if window is None and hasattr(np, f"{window_type}_window"):
-        candidate = getattr(np, f"{window_type}_window")
-        try:
-            window = candidate(length)
-        except TypeError:
-            window = None
-    if window is None:
-        window = np.hanning(length)
-    return torch.from_numpy(np.asarray(window, dtype=np.float32)).to(device)
-
-
-def _apply_pcen(spec: torch.Tensor) -> torch.Tensor:
-    """Apply PCEN in torch following the original SciPy implementation."""
-    if spec.numel() == 0:
-        return spec
-
-    smooth = 0.025
-    gain = 0.98
-    bias = 2.0
-    power = 0.5
-    eps = 1e-6
-
-    device = spec.device
-    dtype = spec.dtype
-
-    smoothing = torch.zeros_like(spec)
-    smoothing[..., 0] = spec[..., 0]
-
-    smoothing_coef = torch.tensor(smooth, device=device, dtype=dtype)
-    one_minus = 1 - smoothing_coef
-
-    for idx in range(1, spec.shape[-1]):
-        smoothing[..., idx] = (
-            smoothing_coef * spec[..., idx] + one_minus * smoothing[..., idx - 1]
-        )
-
-    eps_t = torch.tensor(eps, device=device, dtype=dtype)
-    smooth_term = torch.exp(
-        -gain * (torch.log(eps_t) + torch.log1p(smoothing / eps_t))
-    )
-    pcen = (bias**power) * torch.expm1(
-        power * torch.log1p(spec * smooth_term / bias)
-    )
-    return pcen
-
-
-def compute_spectrogram(
+def compute_power_spectrogram(
     recording: schemas.Recording,
     start_time: float,
     end_time: float,
     audio_parameters: schemas.AudioParameters,
     spectrogram_parameters: schemas.SpectrogramParameters,
     audio_dir: Path | None = None,
-) -> np.ndarray:
-    """Compute a spectrogram for a recording."""
+    backend: str | None = None,
+) -> xr.DataArray:
+    """Compute the power spectral density of a recording segment.
+
+    The amplitude parameters (dB scaling and normalization) are not
+    applied, but PCEN is if `spectrogram_parameters.pcen` is set. The
+    audio loading and the STFT use the signal processing `backend`,
+    which defaults to the backend set from the settings.
+
+    Returns
+    -------
+    xr.DataArray
+        Spectrogram with dimensions (frequency, time, channel).
+    """
     if audio_dir is None:
         audio_dir = Path.cwd()
 
+    dsp = get_dsp_backend(backend)
     wav = audio_api.load_audio(
         recording,
         start_time,
         end_time,
         audio_parameters=audio_parameters,
         audio_dir=audio_dir,
+        backend=backend,
     )
 
     # Select channel. Do this early to avoid unnecessary computation.
@@ -130,33 +72,15 @@ def compute_spectrogram(
     hop_length = max(1, int(round(hop_size * samplerate)))
     n_fft = max(2, win_length)
 
-    waveform_np = np.asarray(wav.data, dtype=np.float32)
-    if waveform_np.ndim == 1:
-        waveform_np = waveform_np[:, np.newaxis]
-    waveform = torch.from_numpy(waveform_np.T.copy())
-
-    device = waveform.device
-    window_tensor = _build_window(
-        spectrogram_parameters.window,
-        win_length,
-        device=device,
-    )
+    waveform = np.asarray(wav.data, dtype=np.float32)
+    if waveform.ndim == 1:
+        waveform = waveform[:, np.newaxis]
+    waveform = np.ascontiguousarray(waveform.T)
 
-    spec = taF.spectrogram(
-        waveform,
-        pad=0,
-        window=window_tensor,
-        n_fft=n_fft,
-        hop_length=hop_length,
-        win_length=win_length,
-        power=2.0,
-        normalized=False,
-        center=True,
-        pad_mode="constant",
-        onesided=True,
-    )
+    window = dsp.window(spectrogram_parameters.window, win_length)
+    spec = dsp.power_stft(waveform, window, n_fft, hop_length)
 
-    window_energy = torch.sum(window_tensor.pow(2))
+    window_energy = np.sum(window**2)
     if samplerate > 0 and window_energy > 0:
         spec = spec / (samplerate * window_energy)
 
@@ -166,18 +90,17 @@ def compute_spectrogram(
         spec[:, 1:] *= 2
 
     if spectrogram_parameters.pcen:
-        spec = _apply_pcen(spec)
+        spec = dsp.pcen(spec)
 
-    freq_values = torch.fft.rfftfreq(n_fft, d=1 / samplerate).cpu().numpy()
+    freq_values = np.fft.rfftfreq(n_fft, d=1 / samplerate).astype(np.float32)
     hop_seconds = hop_length / samplerate
     time_offset = float(wav.time.data[0]) + hop_seconds / 2
     time_values = (
-        time_offset
-        + np.arange(spec.shape[-1], dtype=np.float64) * hop_seconds
+        time_offset + np.arange(spec.shape[-1], dtype=np.float64) * hop_seconds
     )
 
-    spectrogram = xr.DataArray(
-        data=spec.permute(1, 2, 0).cpu().numpy(),
+    return xr.DataArray(
+        data=spec.transpose(1, 2, 0),
         dims=("frequency", "time", "channel"),
         coords={
             "frequency": arrays.create_frequency_dim_from_array(
@@ -201,6 +124,28 @@ def compute_spectrogram(
         },
     )
 
+
+@timed("spectrogram")
+def compute_spectrogram(
+    recording: schemas.Recording,
+    start_time: float,
+    end_time: float,
+    audio_parameters: schemas.AudioParameters,
+    spectrogram_parameters: schemas.SpectrogramParameters,
+    audio_dir: Path | None = None,
+    backend: str | None = None,
+) -> np.ndarray:
+    """Compute a spectrogram for a recording."""
+    spectrogram = compute_power_spectrogram(
+        recording,
+        start_time,
+        end_time,
+        audio_parameters=audio_parameters,
+        spectrogram_parameters=spectrogram_parameters,
+        audio_dir=audio_dir,
+        backend=backend,
+    )
+
     spectrogram = arrays.to_db(
         spectrogram,
         min_db=spectrogram_parameters.min_dB,
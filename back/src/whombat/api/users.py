@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from whombat import exceptions, models, schemas
 from whombat.api import common
 from whombat.api.common import BaseAPI
+from whombat.system.auth import token_cache
 from whombat.system.users import UserDatabase, UserManager
 
 SYSTEM_USER_ID = UUID("00000000-0000-0000-0000-000000000000")
@@ -193,6 +194,16 @@ class UserAPI(
         db_user = await user_manager.update(data, db_user)
         return schemas.SimpleUser.model_validate(db_user)
 
+    async def delete(
+        self,
+        session: AsyncSession,
+        obj: schemas.SimpleUser,
+    ) -> schemas.SimpleUser:
+        """Delete a user and forget their cached access tokens."""
+        deleted = await super().delete(session, obj)
+        token_cache.invalidate_user(obj.id)
+        return deleted
+
     async def from_soundevent(
         self,
         session: AsyncSession,
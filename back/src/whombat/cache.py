@@ -1,28 +1,48 @@
-"""Cache functions."""
-
+"""Cache functions.
+
+Caches live in the memory of the process by default. When the server
+runs several worker processes, the `AppCache` caches are moved to a
+`SharedCache`, a SQLite file that all workers read and write, so that
+work done by one worker, such as rendering a spectrogram, is reused by
+the others.
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
 from contextlib import AbstractContextManager
 from functools import wraps
+from pathlib import Path
 from typing import (
     Any,
     Awaitable,
     Callable,
     Generic,
     Hashable,
+    Iterator,
     MutableMapping,
     ParamSpec,
     TypeVar,
 )
 
+import cachetools
 from asyncache import cached as _cached
 from cachetools import keys
 from pydantic import BaseModel
 
+from whombat.system.metrics import record_cache_access
+
 __all__ = [
+    "AppCache",
+    "SharedCache",
     "cached",
     "clear_cache",
     "clear_all_caches",
     "get_cache",
     "clear_cache_key",
+    "share_caches",
     "update_cache_key",
     "CacheCollection",
 ]
@@ -188,3 +208,222 @@ class CacheCollection(Generic[M]):
         """Update the cache for an object."""
         for name, data_key in self.caches:
             update_cache_key(name, data_key(data), data)
+
+
+class SharedCache(MutableMapping[Hashable, Any]):
+    """A cache stored in a SQLite file shared between processes.
+
+    Values are pickled and keys are stored by their `repr`, so keys must
+    be built from values with a stable representation, such as strings,
+    numbers, UUIDs and tuples of them. When the cache grows beyond
+    `maxsize` entries, the oldest entries are evicted.
+
+    Errors of the underlying database, such as a lock timeout, are
+    treated as cache misses so they never fail a request.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        namespace: str,
+        maxsize: int,
+        ttl: float | None = None,
+    ):
+        self.path = path
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._pid: int | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections can not be used across a fork, so each worker
+        # process opens its own.
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path,
+                timeout=5,
+                check_same_thread=False,
+                isolation_level=None,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "namespace TEXT NOT NULL, "
+                "key TEXT NOT NULL, "
+                "value BLOB NOT NULL, "
+                "created REAL NOT NULL, "
+                "expires REAL, "
+                "PRIMARY KEY (namespace, key)"
+                ") WITHOUT ROWID"
+            )
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def _execute(self, sql: str, *parameters: Any) -> list[tuple]:
+        with self._lock:
+            return self._connect().execute(sql, parameters).fetchall()
+
+    def __getitem__(self, key: Hashable) -> Any:
+        try:
+            rows = self._execute(
+                "SELECT value, expires FROM cache "
+                "WHERE namespace = ? AND key = ?",
+                self.namespace,
+                repr(key),
+            )
+        except sqlite3.Error:
+            rows = []
+        if not rows or (rows[0][1] is not None and rows[0][1] < time.time()):
+            raise KeyError(key)
+        return pickle.loads(rows[0][0])
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        now = time.time()
+        try:
+            self._execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)",
+                self.namespace,
+                repr(key),
+                pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                now,
+                now + self.ttl if self.ttl is not None else None,
+            )
+            self._evict()
+        except sqlite3.Error:
+            pass
+
+    def __delitem__(self, key: Hashable) -> None:
+        if key not in self:
+            raise KeyError(key)
+        try:
+            self._execute(
+                "DELETE FROM cache WHERE namespace = ? AND key = ?",
+                self.namespace,
+                repr(key),
+            )
+        except sqlite3.Error:
+            pass
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]  # type: ignore
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self) -> Iterator[Hashable]:
+        # Keys are stored by their representation, so they can not be
+        # iterated over.
+        raise TypeError("Shared cache keys can not be iterated over.")
+
+    def __len__(self) -> int:
+        try:
+            ((count,),) = self._execute(
+                "SELECT COUNT(*) FROM cache WHERE namespace = ?",
+                self.namespace,
+            )
+        except sqlite3.Error:
+            return 0
+        return count
+
+    def clear(self) -> None:
+        try:
+            self._execute(
+                "DELETE FROM cache WHERE namespace = ?",
+                self.namespace,
+            )
+        except sqlite3.Error:
+            pass
+
+    def _evict(self) -> None:
+        excess = len(self) - self.maxsize
+        if excess <= 0:
+            return
+        self._execute(
+            "DELETE FROM cache WHERE namespace = ? AND key IN ("
+            "SELECT key FROM cache WHERE namespace = ? "
+            "ORDER BY created LIMIT ?)",
+            self.namespace,
+            self.namespace,
+            excess,
+        )
+
+
+class AppCache(MutableMapping[Hashable, Any]):
+    """A named application cache that can be shared between workers.
+
+    The values are kept in an in-process LRU cache until `share_caches`
+    moves all application caches to a `SharedCache`. Lookups are
+    recorded in the cache metrics under the name of the cache.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float | None = None):
+        if name in CACHES:
+            raise ValueError(f"Cache {name} already exists.")
+
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.backend: MutableMapping[Hashable, Any] = (
+            cachetools.TTLCache(maxsize=maxsize, ttl=ttl)
+            if ttl is not None
+            else cachetools.LRUCache(maxsize=maxsize)
+        )
+        CACHES[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            value = self.backend[key]
+        except KeyError:
+            record_cache_access(self.name, hit=False)
+            return default
+        record_cache_access(self.name, hit=True)
+        return value
+
+    def share(self, path: Path) -> None:
+        """Move the cache to a SQLite file shared between processes."""
+        self.backend = SharedCache(path, self.name, self.maxsize, self.ttl)
+
+    def __getitem__(self, key: Hashable) -> Any:
+        return self.backend[key]
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self.backend[key] = value
+
+    def __delitem__(self, key: Hashable) -> None:
+        del self.backend[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.backend
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.backend)
+
+    def __len__(self) -> int:
+        return len(self.backend)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+def share_caches(path: Path, clear: bool = False) -> None:
+    """Move all application caches to a shared SQLite file.
+
+    Parameters
+    ----------
+    path
+        Path of the SQLite file. All the processes that share the caches
+        must use the same path.
+    clear
+        Remove the values left in the file by a previous run.
+    """
+    for cache in CACHES.values():
+        if isinstance(cache, AppCache):
+            cache.share(path)
+            if clear:
+                cache.clear()
@@ -0,0 +1,526 @@
+"""Partitioned evaluation of predictions.
+
+The evaluation tasks of `soundevent.evaluation` evaluate every clip
+independently and only combine the results at the end, when computing
+the run level metrics. This module splits the (prediction, annotation)
+clip pairs into partitions that can be evaluated in separate processes,
+and merges the partial results into a single evaluation that is
+identical to the one produced by evaluating all clips at once.
+
+This module only depends on `soundevent` so that worker processes can
+import it without loading the rest of the application.
+"""
+
+import datetime
+from importlib import import_module
+from typing import Any, Callable, NamedTuple, Sequence
+from uuid import uuid4
+
+import numpy as np
+from soundevent import data
+from soundevent.data.geometries import GEOMETRY_MAPPING
+from soundevent.evaluation.encoding import create_tag_encoder
+from soundevent.evaluation.tasks.common import iterate_over_valid_clips
+
+__all__ = [
+    "ClipResult",
+    "PackedPartition",
+    "PartialEvaluation",
+    "TASKS",
+    "evaluate_partition",
+    "merge_partitions",
+    "pack_partition",
+    "partition_clips",
+]
+
+
+# NOTE: The task modules are shadowed by the task functions of the same name
+# exported by `soundevent.evaluation.tasks`, so they are imported by path.
+sound_event_detection = import_module(
+    "soundevent.evaluation.tasks.sound_event_detection"
+)
+sound_event_classification = import_module(
+    "soundevent.evaluation.tasks.sound_event_classification"
+)
+clip_classification = import_module(
+    "soundevent.evaluation.tasks.clip_classification"
+)
+clip_multilabel_classification = import_module(
+    "soundevent.evaluation.tasks.clip_multilabel_classification"
+)
+
+
+class _Task(NamedTuple):
+    name: str
+    """Name of the task as stored in the evaluation."""
+
+    evaluate_clips: Callable[..., tuple[list[data.ClipEvaluation], Any, Any]]
+    """Evaluate a sequence of clips, returning per clip results."""
+
+    compute_metrics: Callable[[Any, Any], list[data.Feature]]
+    """Compute the run level metrics from the per clip results."""
+
+    stack_true_classes: bool = False
+    """Whether the metrics expect the true classes as a single array."""
+
+
+TASKS: dict[str, _Task] = {
+    "Sound Event Detection": _Task(
+        "sound_event_detection",
+        sound_event_detection._evaluate_clips,
+        sound_event_detection.compute_overall_metrics,
+    ),
+    "Sound Event Tagging": _Task(
+        "sound_event_classification",
+        sound_event_classification._evaluate_clips,
+        sound_event_classification._compute_overall_metrics,
+    ),
+    "Clip Classification": _Task(
+        "clip_classification",
+        clip_classification._evaluate_all_clips,
+        clip_classification._compute_overall_metrics,
+    ),
+    "Clip Tagging": _Task(
+        "clip_multilabel_classification",
+        clip_multilabel_classification._evaluate_clips,
+        clip_multilabel_classification._compute_overall_metrics,
+        stack_true_classes=True,
+    ),
+}
+"""Evaluation tasks that support partitioning, by evaluation set task.
+
+The per clip functions are internal to `soundevent`; they are the pieces
+that the public task functions are composed of. As they can change in
+any release, the supported `soundevent` versions are capped in
+``pyproject.toml`` and their signatures are checked by the tests.
+"""
+
+
+class ClipResult(NamedTuple):
+    """Compact result of evaluating a single clip.
+
+    Sound events are referenced by their index in the clip prediction and
+    clip annotation, so that the result is cheap to send between processes.
+    """
+
+    score: float | None
+    """The score of the clip."""
+
+    metrics: list[data.Feature]
+    """The metrics of the clip."""
+
+    matches: list[
+        tuple[int | None, int | None, float, float | None, list[data.Feature]]
+    ]
+    """Source index, target index, affinity, score and metrics of each
+    match."""
+
+
+class PartialEvaluation(NamedTuple):
+    """Result of evaluating a single partition of clips."""
+
+    clip_results: list[ClipResult]
+    """The result of every clip in the partition, in order."""
+
+    true_classes: list
+    """The encoded ground truth of every evaluated example."""
+
+    predicted_scores: np.ndarray
+    """The encoded predicted scores of every evaluated example."""
+
+
+def partition_clips(
+    clip_predictions: Sequence[data.ClipPrediction],
+    clip_annotations: Sequence[data.ClipAnnotation],
+    num_partitions: int,
+) -> list[tuple[list[data.ClipPrediction], list[data.ClipAnnotation]]]:
+    """Split the clips to evaluate into contiguous partitions.
+
+    Only clip predictions with a matching clip annotation are kept, in the
+    order in which they would be evaluated. Empty partitions are dropped.
+
+    Parameters
+    ----------
+    clip_predictions
+        The clip predictions to evaluate.
+    clip_annotations
+        The ground truth clip annotations.
+    num_partitions
+        The maximum number of partitions.
+
+    Returns
+    -------
+    list[tuple[list[data.ClipPrediction], list[data.ClipAnnotation]]]
+        The clip predictions and annotations of each partition.
+    """
+    pairs = list(
+        iterate_over_valid_clips(
+            clip_predictions=clip_predictions,
+            clip_annotations=clip_annotations,
+        )
+    )
+    num_partitions = max(1, min(num_partitions, len(pairs)))
+    partitions = []
+    for indices in np.array_split(np.arange(len(pairs)), num_partitions):
+        if len(indices) == 0:
+            continue
+        partitions.append(
+            (
+                [pairs[index][1] for index in indices],
+                [pairs[index][0] for index in indices],
+            )
+        )
+    return partitions
+
+
+class PackedPartition(NamedTuple):
+    """Compact representation of a partition of clips.
+
+    Pickling `soundevent` objects is slow, so only the attributes used by
+    the evaluation are sent to the workers, as plain tuples. Tags are
+    referenced by their index in a shared tag table.
+    """
+
+    tags: list[data.Tag]
+    """The tags to evaluate, followed by any other tag in the partition."""
+
+    clip_predictions: list[tuple]
+    """Clip UUID, tags with scores and sound events of each prediction."""
+
+    clip_annotations: list[tuple]
+    """Clip UUID, tags and sound events of each annotation."""
+
+
+def pack_partition(
+    clip_predictions: Sequence[data.ClipPrediction],
+    clip_annotations: Sequence[data.ClipAnnotation],
+    tags: Sequence[data.Tag],
+) -> PackedPartition:
+    """Pack a partition of clips to be sent to a worker process.
+
+    Parameters
+    ----------
+    clip_predictions
+        The clip predictions of the partition.
+    clip_annotations
+        The clip annotations of the partition.
+    tags
+        The tags to evaluate.
+
+    Returns
+    -------
+    PackedPartition
+        The packed partition.
+    """
+    table: dict[tuple[str, str], int] = {}
+    tag_list: list[data.Tag] = []
+
+    def index(tag: data.Tag) -> int:
+        key = (tag.key, tag.value)
+        if key not in table:
+            table[key] = len(tag_list)
+            tag_list.append(tag)
+        return table[key]
+
+    for tag in tags:
+        index(tag)
+
+    return PackedPartition(
+        tags=tag_list,
+        clip_predictions=[
+            (
+                clip_prediction.clip.uuid,
+                [(index(tag.tag), tag.score) for tag in clip_prediction.tags],
+                [
+                    (
+                        prediction.uuid,
+                        prediction.sound_event.uuid,
+                        _pack_geometry(prediction.sound_event.geometry),
+                        [
+                            (index(tag.tag), tag.score)
+                            for tag in prediction.tags
+                        ],
+                        prediction.score,
+                    )
+                    for prediction in clip_prediction.sound_events
+                ],
+            )
+            for clip_prediction in clip_predictions
+        ],
+        clip_annotations=[
+            (
+                clip_annotation.clip.uuid,
+                [index(tag) for tag in clip_annotation.tags],
+                [
+                    (
+                        annotation.uuid,
+                        annotation.sound_event.uuid,
+                        _pack_geometry(annotation.sound_event.geometry),
+                        [index(tag) for tag in annotation.tags],
+                    )
+                    for annotation in clip_annotation.sound_events
+                ],
+            )
+            for clip_annotation in clip_annotations
+        ],
+    )
+
+
+def evaluate_partition(
+    task: str,
+    partition: PackedPartition,
+    num_tags: int,
+) -> PartialEvaluation:
+    """Evaluate a partition of clips.
+
+    This function is meant to be run in a worker process.
+
+    Parameters
+    ----------
+    task
+        The evaluation set task, one of the keys of `TASKS`.
+    partition
+        The packed partition, as returned by `pack_partition`.
+    num_tags
+        The number of tags to evaluate, which come first in the tag
+        table of the partition.
+    """
+    tags = partition.tags[:num_tags]
+    clip_predictions, clip_annotations = _unpack_partition(partition)
+    encoder = create_tag_encoder(tags)
+    clip_evaluations, true_classes, predicted_scores = TASKS[
+        task
+    ].evaluate_clips(clip_predictions, clip_annotations, encoder)
+    return PartialEvaluation(
+        clip_results=[
+            _compress(clip_evaluation) for clip_evaluation in clip_evaluations
+        ],
+        true_classes=list(true_classes),
+        predicted_scores=np.asarray(predicted_scores),
+    )
+
+
+def merge_partitions(
+    task: str,
+    partitions: Sequence[
+        tuple[Sequence[data.ClipPrediction], Sequence[data.ClipAnnotation]]
+    ],
+    results: Sequence[PartialEvaluation],
+) -> data.Evaluation:
+    """Merge the evaluations of all partitions into a single evaluation.
+
+    Parameters
+    ----------
+    task
+        The evaluation set task, one of the keys of `TASKS`.
+    partitions
+        The clip predictions and annotations of each partition, as
+        returned by `partition_clips`.
+    results
+        The partial evaluation of each partition.
+
+    Returns
+    -------
+    data.Evaluation
+        The evaluation of all clips.
+    """
+    definition = TASKS[task]
+    clip_evaluations = [
+        _expand(clip_result, clip_prediction, clip_annotation)
+        for (clip_predictions, clip_annotations), result in zip(
+            partitions, results, strict=True
+        )
+        for clip_result, clip_prediction, clip_annotation in zip(
+            result.clip_results,
+            clip_predictions,
+            clip_annotations,
+            strict=True,
+        )
+    ]
+    true_classes = [
+        true_class for result in results for true_class in result.true_classes
+    ]
+    scores = [
+        result.predicted_scores
+        for result in results
+        if result.predicted_scores.size
+    ]
+    predicted_scores = (
+        np.concatenate(scores, axis=0) if scores else np.array([])
+    )
+
+    if definition.stack_true_classes:
+        true_classes = np.array(true_classes)
+
+    return data.Evaluation(
+        evaluation_task=definition.name,
+        clip_evaluations=clip_evaluations,
+        metrics=definition.compute_metrics(true_classes, predicted_scores),
+        score=_mean_score(clip_evaluations),
+    )
+
+
+def _pack_geometry(geometry: data.Geometry) -> tuple[str, Any]:
+    return geometry.type, geometry.coordinates
+
+
+def _unpack_geometry(packed: tuple[str, Any]) -> data.Geometry:
+    geom_type, coordinates = packed
+    return GEOMETRY_MAPPING[geom_type].model_construct(
+        type=geom_type,
+        coordinates=coordinates,
+    )
+
+
+def _unpack_partition(
+    partition: PackedPartition,
+) -> tuple[list[data.ClipPrediction], list[data.ClipAnnotation]]:
+    # NOTE: The objects were validated before being packed, so they are
+    # rebuilt without validation. Only the attributes used by the
+    # evaluation tasks are set.
+    tags = partition.tags
+    created_on = datetime.datetime.now()
+    clip_predictions = [
+        data.ClipPrediction.model_construct(
+            uuid=uuid4(),
+            clip=data.Clip.model_construct(uuid=clip_uuid, features=[]),
+            tags=[
+                data.PredictedTag.model_construct(tag=tags[tag], score=score)
+                for tag, score in clip_tags
+            ],
+            sound_events=[
+                data.SoundEventPrediction.model_construct(
+                    uuid=uuid,
+                    sound_event=data.SoundEvent.model_construct(
+                        uuid=sound_event_uuid,
+                        geometry=_unpack_geometry(geometry),
+                        features=[],
+                    ),
+                    tags=[
+                        data.PredictedTag.model_construct(
+                            tag=tags[tag],
+                            score=tag_score,
+                        )
+                        for tag, tag_score in sound_event_tags
+                    ],
+                    score=score,
+                )
+                for (
+                    uuid,
+                    sound_event_uuid,
+                    geometry,
+                    sound_event_tags,
+                    score,
+                ) in sound_events
+            ],
+            sequences=[],
+            features=[],
+        )
+        for clip_uuid, clip_tags, sound_events in partition.clip_predictions
+    ]
+    clip_annotations = [
+        data.ClipAnnotation.model_construct(
+            uuid=uuid4(),
+            clip=data.Clip.model_construct(uuid=clip_uuid, features=[]),
+            tags=[tags[tag] for tag in clip_tags],
+            sound_events=[
+                data.SoundEventAnnotation.model_construct(
+                    uuid=uuid,
+                    sound_event=data.SoundEvent.model_construct(
+                        uuid=sound_event_uuid,
+                        geometry=_unpack_geometry(geometry),
+                        features=[],
+                    ),
+                    tags=[tags[tag] for tag in sound_event_tags],
+                    notes=[],
+                    created_by=None,
+                    created_on=created_on,
+                )
+                for (
+                    uuid,
+                    sound_event_uuid,
+                    geometry,
+                    sound_event_tags,
+                ) in sound_events
+            ],
+            sequences=[],
+            notes=[],
+            created_on=created_on,
+        )
+        for clip_uuid, clip_tags, sound_events in partition.clip_annotations
+    ]
+    return clip_predictions, clip_annotations
+
+
+def _compress(clip_evaluation: data.ClipEvaluation) -> ClipResult:
+    sources = {
+        sound_event.uuid: index
+        for index, sound_event in enumerate(
+            clip_evaluation.predictions.sound_events
+        )
+    }
+    targets = {
+        sound_event.uuid: index
+        for index, sound_event in enumerate(
+            clip_evaluation.annotations.sound_events
+        )
+    }
+    return ClipResult(
+        score=clip_evaluation.score,
+        metrics=list(clip_evaluation.metrics),
+        matches=[
+            (
+                sources[match.source.uuid] if match.source else None,
+                targets[match.target.uuid] if match.target else None,
+                match.affinity,
+                match.score,
+                list(match.metrics),
+            )
+            for match in clip_evaluation.matches
+        ],
+    )
+
+
+def _expand(
+    clip_result: ClipResult,
+    clip_prediction: data.ClipPrediction,
+    clip_annotation: data.ClipAnnotation,
+) -> data.ClipEvaluation:
+    # NOTE: The results were validated when created in the worker, so the
+    # objects are rebuilt without validation.
+    return data.ClipEvaluation.model_construct(
+        annotations=clip_annotation,
+        predictions=clip_prediction,
+        score=clip_result.score,
+        metrics=clip_result.metrics,
+        matches=[
+            data.Match.model_construct(
+                source=clip_prediction.sound_events[source]
+                if source is not None
+                else None,
+                target=clip_annotation.sound_events[target]
+                if target is not None
+                else None,
+                affinity=affinity,
+                score=score,
+                metrics=metrics,
+            )
+            for source, target, affinity, score, metrics in clip_result.matches
+        ],
+    )
+
+
+def _mean_score(clip_evaluations: Sequence[data.ClipEvaluation]) -> float:
+    scores = [
+        clip_evaluation.score
+        for clip_evaluation in clip_evaluations
+        if clip_evaluation.score is not None
+    ]
+    if not scores:
+        return 0.0
+
+    score = float(np.mean(scores))
+    if np.isnan(score):
+        return 0.0
+
+    return score
@@ -1,25 +1,37 @@
-"""File handling functions."""
+"""File handling functions.
+
+`soundevent.audio` imports the whole audio stack of ``soundevent``,
+including ``scipy.signal`` and ``xarray``, so it is only imported when a
+file is inspected.
+"""
+
+from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from soundevent.audio import (
-    MediaInfo,
-    compute_md5_checksum,
-    get_media_info,
-    is_audio_file,
-)
+if TYPE_CHECKING:
+    from soundevent.audio import MediaInfo
 
 logger = logging.getLogger(__name__)
 
 __all__ = [
     "get_audio_files_in_folder",
     "get_file_info",
+    "is_audio_file",
     "FileInfo",
 ]
 
 
+def is_audio_file(path: Path) -> bool:
+    """Check if a file is an audio file supported by `soundevent`."""
+    from soundevent.audio import is_audio_file
+
+    return is_audio_file(path)
+
+
 def get_audio_files_in_folder(
     audio_dir: Path, relative: bool = True
 ) -> list[Path]:
@@ -78,6 +90,8 @@ def get_file_info(path: Path) -> FileInfo:
     file_info: FileInfo
         Information about the file.
     """
+    from soundevent.audio import compute_md5_checksum, get_media_info
+
     logger.debug(f"Getting information about file: {path}")
 
     if not path.is_file():
@@ -0,0 +1,184 @@
+"""Compact binary encoding of sound event geometries.
+
+Geometries are stored as a one byte type tag followed by their
+coordinates packed as little-endian float64 values. Nested coordinate
+lists, such as the rings of a polygon, are prefixed with their length as
+a little-endian uint32. Decoding this format is much cheaper than parsing
+and validating the JSON representation of a geometry, as the coordinates
+were already validated when the geometry was stored.
+
+Geometries loaded from the database are wrapped in a `LazyGeometry`
+proxy, that only decodes the coordinates on first access. Code that needs
+an actual `soundevent` geometry, for example to pass it to
+`soundevent.geometry` functions, should call `load_geometry` first.
+"""
+
+import struct
+from typing import Any
+
+from soundevent import data
+from soundevent.data.geometries import GeometryType
+
+__all__ = [
+    "LazyGeometry",
+    "decode_geometry",
+    "encode_geometry",
+    "load_geometry",
+]
+
+
+_GEOMETRIES: dict[int, tuple[type[data.Geometry], int]] = {
+    1: (data.TimeStamp, 0),
+    2: (data.TimeInterval, 1),
+    3: (data.Point, 1),
+    4: (data.BoundingBox, 1),
+    5: (data.LineString, 2),
+    6: (data.MultiPoint, 2),
+    7: (data.Polygon, 3),
+    8: (data.MultiLineString, 3),
+    9: (data.MultiPolygon, 4),
+}
+"""Geometry class and coordinate nesting depth of each type tag."""
+
+_TAGS: dict[str, int] = {
+    cls.geom_type(): tag for tag, (cls, _) in _GEOMETRIES.items()
+}
+
+_DOUBLE = struct.Struct("<d")
+
+_COUNT = struct.Struct("<I")
+
+
+def encode_geometry(geometry: data.Geometry) -> bytes:
+    """Encode a geometry into its compact binary representation.
+
+    Parameters
+    ----------
+    geometry
+        The geometry to encode.
+
+    Returns
+    -------
+    bytes
+        The type tag of the geometry followed by its packed coordinates.
+    """
+    tag = _TAGS[geometry.type]
+    _, depth = _GEOMETRIES[tag]
+    parts = [bytes([tag])]
+    _pack(geometry.coordinates, depth, parts)
+    return b"".join(parts)
+
+
+def decode_geometry(value: bytes) -> data.Geometry:
+    """Decode a geometry from its compact binary representation.
+
+    The geometry is built without running the Pydantic validators, as
+    the coordinates were validated before they were encoded.
+
+    Parameters
+    ----------
+    value
+        The encoded geometry, as returned by `encode_geometry`.
+
+    Returns
+    -------
+    data.Geometry
+        The decoded geometry.
+    """
+    cls, depth = _GEOMETRIES[value[0]]
+    coordinates, _ = _unpack(value, 1, depth)
+    return cls.model_construct(coordinates=coordinates)
+
+
+class LazyGeometry:
+    """Proxy to a geometry that is only decoded on first access.
+
+    The type of the geometry is read from the type tag without decoding
+    the coordinates. Any other attribute is looked up on the decoded
+    geometry.
+    """
+
+    __slots__ = ("_value", "_geometry")
+
+    def __init__(self, value: bytes):
+        self._value = value
+        self._geometry: data.Geometry | None = None
+
+    @property
+    def type(self) -> GeometryType:
+        """The type of the geometry."""
+        if self._geometry is not None:
+            return self._geometry.type
+        cls, _ = _GEOMETRIES[self._value[0]]
+        return cls.geom_type()  # type: ignore
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the geometry has been decoded."""
+        return self._geometry is not None
+
+    def load(self) -> data.Geometry:
+        """Decode the geometry, or return it if already decoded."""
+        if self._geometry is None:
+            self._geometry = decode_geometry(self._value)
+        return self._geometry
+
+    def encode(self) -> bytes:
+        """Return the binary representation of the geometry."""
+        if self._geometry is None:
+            return self._value
+        return encode_geometry(self._geometry)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.load(), name)
+
+    def __eq__(self, other: object) -> bool:
+        return self.load() == load_geometry(other)  # type: ignore
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        if self._geometry is None:
+            return f"LazyGeometry(type={self.type!r})"
+        return f"LazyGeometry({self._geometry!r})"
+
+
+def load_geometry(geometry: data.Geometry | LazyGeometry) -> data.Geometry:
+    """Return the geometry, decoding it if it is a lazy proxy."""
+    if isinstance(geometry, LazyGeometry):
+        return geometry.load()
+    return geometry
+
+
+def _pack(coordinates: Any, depth: int, parts: list[bytes]) -> None:
+    if depth == 0:
+        parts.append(_DOUBLE.pack(coordinates))
+        return
+
+    parts.append(_COUNT.pack(len(coordinates)))
+
+    if depth == 1:
+        parts.append(struct.pack(f"<{len(coordinates)}d", *coordinates))
+        return
+
+    for child in coordinates:
+        _pack(child, depth - 1, parts)
+
+
+def _unpack(value: bytes, offset: int, depth: int) -> tuple[Any, int]:
+    if depth == 0:
+        (coordinate,) = _DOUBLE.unpack_from(value, offset)
+        return coordinate, offset + _DOUBLE.size
+
+    (count,) = _COUNT.unpack_from(value, offset)
+    offset += _COUNT.size
+
+    if depth == 1:
+        coordinates = list(struct.unpack_from(f"<{count}d", value, offset))
+        return coordinates, offset + count * _DOUBLE.size
+
+    children = []
+    for _ in range(count):
+        child, offset = _unpack(value, offset, depth - 1)
+        children.append(child)
+    return children, offset
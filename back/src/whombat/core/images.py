@@ -3,7 +3,6 @@
 from io import BytesIO
 
 import numpy as np
-from matplotlib import colormaps
 from PIL import Image as img
 from PIL.Image import Image
 
@@ -45,6 +44,8 @@ def array_to_image(
     if array.ndim != 2:
         raise ValueError("The array must be 2D.")
 
+    from matplotlib import colormaps
+
     # Get the colormap
     colormap = colormaps.get_cmap(cmap)
 
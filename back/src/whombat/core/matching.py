@@ -0,0 +1,343 @@
+"""Vectorized geometry matching functions.
+
+These functions mirror the matching semantics of
+`soundevent.evaluation.match_geometries` but operate on arrays of
+geometry bounds instead of individual `soundevent` objects. This makes it
+possible to match thousands of predictions against annotations without
+building a Python object per pair.
+
+The semantics changed between the supported `soundevent` versions.
+Version 2.1 buffers only point-like geometries before comparing them and
+keeps every pair assigned by the Hungarian algorithm, even those with zero
+affinity. Later versions buffer every geometry and split assigned pairs
+with an affinity at or below a threshold into unmatched entries. The
+installed version is inspected once, so the results always agree with
+the default evaluation.
+"""
+
+import functools
+import inspect
+from typing import Sequence
+
+import numpy as np
+from soundevent import data
+
+__all__ = [
+    "bbox_iou",
+    "compute_affinity_matrix",
+    "get_geometry_bounds",
+    "get_soundevent_semantics",
+    "interval_iou",
+    "select_matches",
+]
+
+
+TIME_GEOMETRY_TYPES = {
+    data.TimeStamp.geom_type(),
+    data.TimeInterval.geom_type(),
+}
+
+
+@functools.cache
+def get_soundevent_semantics() -> tuple[frozenset[str] | None, float | None]:
+    """Get how the installed `soundevent` prepares and pairs geometries.
+
+    Returns
+    -------
+    buffered_types : frozenset[str] | None
+        The geometry types that are buffered before computing their
+        affinity, or None if every geometry is buffered.
+    affinity_threshold : float | None
+        The affinity at or below which assigned pairs are split into
+        unmatched entries, or None if every assigned pair is kept.
+    """
+    from soundevent.evaluation import affinity, match
+
+    buffered_types = getattr(affinity, "BUFFER_GEOMETRY_TYPES", None)
+    parameter = inspect.signature(match.match_geometries).parameters.get(
+        "affinity_threshold"
+    )
+    return (
+        frozenset(buffered_types) if buffered_types is not None else None,
+        parameter.default if parameter is not None else None,
+    )
+
+
+def get_geometry_bounds(
+    geometries: Sequence[data.Geometry],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compute the bounds of a sequence of geometries.
+
+    Parameters
+    ----------
+    geometries
+        The geometries to compute the bounds of.
+
+    Returns
+    -------
+    bounds : np.ndarray
+        Array of shape (N, 4) with the start time, low frequency, end time
+        and high frequency of each geometry.
+    is_time : np.ndarray
+        Boolean array of shape (N,) that indicates whether each geometry
+        is a purely temporal geometry (a time stamp or a time interval).
+    is_buffered : np.ndarray
+        Boolean array of shape (N,) that indicates whether each geometry
+        is buffered before computing its affinity.
+    """
+    from soundevent.geometry import compute_bounds
+
+    buffered_types, _ = get_soundevent_semantics()
+    bounds = np.zeros((len(geometries), 4), dtype=np.float64)
+    is_time = np.zeros(len(geometries), dtype=bool)
+    is_buffered = np.ones(len(geometries), dtype=bool)
+    for index, geometry in enumerate(geometries):
+        bounds[index] = compute_bounds(geometry)
+        is_time[index] = geometry.type in TIME_GEOMETRY_TYPES
+        if buffered_types is not None:
+            is_buffered[index] = geometry.type in buffered_types
+    return bounds, is_time, is_buffered
+
+
+def buffer_bounds(
+    bounds: np.ndarray,
+    time_buffer: float = 0.01,
+    freq_buffer: float = 100,
+) -> np.ndarray:
+    """Add a time and frequency buffer to an array of bounds.
+
+    The buffer is applied in the same way as
+    `soundevent.geometry.buffer_geometry`, clipping times and frequencies at
+    zero and frequencies at the maximum allowed frequency.
+    """
+    buffered = np.array(bounds, dtype=np.float64, copy=True)
+    buffered[:, 0] = np.maximum(buffered[:, 0] - time_buffer, 0)
+    buffered[:, 1] = np.maximum(buffered[:, 1] - freq_buffer, 0)
+    buffered[:, 2] = buffered[:, 2] + time_buffer
+    buffered[:, 3] = np.minimum(
+        buffered[:, 3] + freq_buffer,
+        data.MAX_FREQUENCY,
+    )
+    return buffered
+
+
+def _buffer_some(
+    bounds: np.ndarray,
+    is_buffered: np.ndarray | None,
+    time_buffer: float,
+    freq_buffer: float,
+) -> np.ndarray:
+    buffered = buffer_bounds(bounds, time_buffer, freq_buffer)
+    if is_buffered is None:
+        return buffered
+    return np.where(is_buffered[:, None], buffered, bounds)
+
+
+def interval_iou(source: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Compute the pairwise IoU between two sets of time intervals.
+
+    Parameters
+    ----------
+    source
+        Array of shape (N, 2) with the start and end time of each interval.
+    target
+        Array of shape (M, 2) with the start and end time of each interval.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (N, M) with the IoU of each pair of intervals. Pairs
+        with a union of zero have an IoU of zero.
+    """
+    start = np.maximum(source[:, None, 0], target[None, :, 0])
+    end = np.minimum(source[:, None, 1], target[None, :, 1])
+    intersection = np.clip(end - start, 0, None)
+    lengths1 = source[:, 1] - source[:, 0]
+    lengths2 = target[:, 1] - target[:, 0]
+    union = lengths1[:, None] + lengths2[None, :] - intersection
+    return np.divide(
+        intersection,
+        union,
+        out=np.zeros_like(intersection),
+        where=union > 0,
+    )
+
+
+def bbox_iou(source: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Compute the pairwise IoU between two sets of bounding boxes.
+
+    Parameters
+    ----------
+    source
+        Array of shape (N, 4) with the start time, low frequency, end time
+        and high frequency of each box.
+    target
+        Array of shape (M, 4) with the start time, low frequency, end time
+        and high frequency of each box.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (N, M) with the IoU of each pair of boxes. Pairs with
+        a union of zero have an IoU of zero.
+    """
+    width = np.clip(
+        np.minimum(source[:, None, 2], target[None, :, 2])
+        - np.maximum(source[:, None, 0], target[None, :, 0]),
+        0,
+        None,
+    )
+    height = np.clip(
+        np.minimum(source[:, None, 3], target[None, :, 3])
+        - np.maximum(source[:, None, 1], target[None, :, 1]),
+        0,
+        None,
+    )
+    intersection = width * height
+    area1 = (source[:, 2] - source[:, 0]) * (source[:, 3] - source[:, 1])
+    area2 = (target[:, 2] - target[:, 0]) * (target[:, 3] - target[:, 1])
+    union = area1[:, None] + area2[None, :] - intersection
+    return np.divide(
+        intersection,
+        union,
+        out=np.zeros_like(intersection),
+        where=union > 0,
+    )
+
+
+def compute_affinity_matrix(
+    source_bounds: np.ndarray,
+    target_bounds: np.ndarray,
+    source_is_time: np.ndarray | None = None,
+    target_is_time: np.ndarray | None = None,
+    time_buffer: float = 0.01,
+    freq_buffer: float = 100,
+    source_is_buffered: np.ndarray | None = None,
+    target_is_buffered: np.ndarray | None = None,
+) -> np.ndarray:
+    """Compute the affinity between all pairs of source and target bounds.
+
+    Pairs in which either geometry is purely temporal are compared using the
+    IoU of their time intervals; all other pairs are compared using the IoU
+    of their bounding boxes.
+
+    Parameters
+    ----------
+    source_bounds
+        Array of shape (N, 4) with the bounds of the source geometries.
+    target_bounds
+        Array of shape (M, 4) with the bounds of the target geometries.
+    source_is_time
+        Boolean array of shape (N,) indicating which source geometries are
+        temporal. If None, all geometries are assumed to be 2D.
+    target_is_time
+        Boolean array of shape (M,) indicating which target geometries are
+        temporal. If None, all geometries are assumed to be 2D.
+    time_buffer
+        Time buffer in seconds added to each geometry. Default is 0.01.
+    freq_buffer
+        Frequency buffer in Hertz added to each geometry. Default is 100.
+    source_is_buffered
+        Boolean array of shape (N,) indicating which source geometries are
+        buffered. If None, all geometries are buffered.
+    target_is_buffered
+        Boolean array of shape (M,) indicating which target geometries are
+        buffered. If None, all geometries are buffered.
+
+    Returns
+    -------
+    np.ndarray
+        Affinity matrix of shape (N, M).
+
+    Notes
+    -----
+    Non rectangular geometries (polygons, lines, ...) are compared through
+    their bounding boxes. This is an approximation of the exact IoU computed
+    by `soundevent.evaluation.compute_affinity`.
+    """
+    num_source = source_bounds.shape[0]
+    num_target = target_bounds.shape[0]
+
+    if num_source == 0 or num_target == 0:
+        return np.zeros((num_source, num_target), dtype=np.float64)
+
+    if source_is_time is None:
+        source_is_time = np.zeros(num_source, dtype=bool)
+
+    if target_is_time is None:
+        target_is_time = np.zeros(num_target, dtype=bool)
+
+    source = _buffer_some(
+        source_bounds, source_is_buffered, time_buffer, freq_buffer
+    )
+    target = _buffer_some(
+        target_bounds, target_is_buffered, time_buffer, freq_buffer
+    )
+
+    affinity = bbox_iou(source, target)
+    use_time = source_is_time[:, None] | target_is_time[None, :]
+
+    if use_time.any():
+        time_affinity = interval_iou(source[:, [0, 2]], target[:, [0, 2]])
+        affinity = np.where(use_time, time_affinity, affinity)
+
+    return affinity
+
+
+def select_matches(
+    affinity: np.ndarray,
+    affinity_threshold: float | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Select the optimal one-to-one matches from an affinity matrix.
+
+    Uses the Hungarian algorithm to find the assignment that maximizes the
+    total affinity. If a threshold is given, assigned pairs with an
+    affinity less than or equal to it are split into an unmatched source
+    and an unmatched target.
+
+    Parameters
+    ----------
+    affinity
+        Affinity matrix of shape (N, M).
+    affinity_threshold
+        Minimum affinity for a pair to be considered a match. Defaults to
+        what the installed `soundevent` does (see
+        `get_soundevent_semantics`).
+
+    Returns
+    -------
+    source_index : np.ndarray
+        Index of the source of each match, or -1 for unmatched targets.
+    target_index : np.ndarray
+        Index of the target of each match, or -1 for unmatched sources.
+    match_affinity : np.ndarray
+        Affinity of each match. Zero for unmatched entries.
+    """
+    from scipy.optimize import linear_sum_assignment
+
+    if affinity_threshold is None:
+        _, affinity_threshold = get_soundevent_semantics()
+
+    num_source, num_target = affinity.shape
+    rows, cols = linear_sum_assignment(affinity, maximize=True)
+
+    values = affinity[rows, cols]
+    if affinity_threshold is not None:
+        valid = values > affinity_threshold
+        rows = rows[valid]
+        cols = cols[valid]
+        values = values[valid]
+
+    unmatched_rows = np.setdiff1d(np.arange(num_source), rows)
+    unmatched_cols = np.setdiff1d(np.arange(num_target), cols)
+
+    source_index = np.concatenate(
+        [rows, unmatched_rows, np.full(len(unmatched_cols), -1)]
+    ).astype(np.int64)
+    target_index = np.concatenate(
+        [cols, np.full(len(unmatched_rows), -1), unmatched_cols]
+    ).astype(np.int64)
+    match_affinity = np.concatenate(
+        [values, np.zeros(len(unmatched_rows) + len(unmatched_cols))]
+    )
+    return source_index, target_index, match_affinity
@@ -3,10 +3,11 @@
 from uuid import UUID
 
 from soundevent import data
-from sqlalchemy import Select, or_
+from sqlalchemy import Select, and_
 
 from whombat import models
 from whombat.filters import base
+from whombat.models import search
 
 __all__ = [
     "AnnotationProjectFilter",
@@ -72,13 +73,7 @@ class PendingFilter(base.Filter):
         if self.eq is None:
             return query
 
-        return query.where(
-            models.AnnotationTask.status_badges.any(
-                models.AnnotationStatusBadge.state
-                == data.AnnotationState.completed,
-            )
-            != self.eq,
-        )
+        return query.where(models.AnnotationTask.is_completed != self.eq)
 
 
 class IsVerifiedFilter(base.Filter):
@@ -91,13 +86,7 @@ class IsVerifiedFilter(base.Filter):
         if self.eq is None:
             return query
 
-        return query.where(
-            models.AnnotationTask.status_badges.any(
-                models.AnnotationStatusBadge.state
-                == data.AnnotationState.verified,
-            )
-            == self.eq,
-        )
+        return query.where(models.AnnotationTask.is_verified == self.eq)
 
 
 class IsRejectedFilter(base.Filter):
@@ -110,13 +99,7 @@ class IsRejectedFilter(base.Filter):
         if self.eq is None:
             return query
 
-        return query.where(
-            models.AnnotationTask.status_badges.any(
-                models.AnnotationStatusBadge.state
-                == data.AnnotationState.rejected,
-            )
-            == self.eq,
-        )
+        return query.where(models.AnnotationTask.is_rejected == self.eq)
 
 
 class IsCompletedFilter(base.Filter):
@@ -129,13 +112,7 @@ class IsCompletedFilter(base.Filter):
         if self.eq is None:
             return query
 
-        return query.where(
-            models.AnnotationTask.status_badges.any(
-                models.AnnotationStatusBadge.state
-                == data.AnnotationState.completed,
-            )
-            == self.eq,
-        )
+        return query.where(models.AnnotationTask.is_completed == self.eq)
 
 
 class IsAssignedFilter(base.Filter):
@@ -148,13 +125,7 @@ class IsAssignedFilter(base.Filter):
         if self.eq is None:
             return query
 
-        return query.where(
-            models.AnnotationTask.status_badges.any(
-                models.AnnotationStatusBadge.state
-                == data.AnnotationState.assigned,
-            )
-            == self.eq,
-        )
+        return query.where(models.AnnotationTask.is_assigned == self.eq)
 
 
 class AssignedToFilter(base.Filter):
@@ -167,12 +138,16 @@ class AssignedToFilter(base.Filter):
         if self.eq is None:
             return query
 
-        return query.join(
-            models.AnnotationStatusBadge,
-        ).where(
-            models.AnnotationStatusBadge.state
-            == data.AnnotationState.assigned,
-            models.AnnotationStatusBadge.user_id == self.eq,
+        # NOTE: A task can be assigned to several users, while
+        # `assigned_to_id` only holds the last one.
+        return query.where(
+            models.AnnotationTask.status_badges.any(
+                and_(
+                    models.AnnotationStatusBadge.state
+                    == data.AnnotationState.assigned,
+                    models.AnnotationStatusBadge.user_id == self.eq,
+                )
+            )
         )
 
 
@@ -233,6 +208,9 @@ class SearchRecordingsFilter(base.Filter):
 
     def filter(self, query: Select) -> Select:
         """Filter the query."""
+        if not self.search_recordings:
+            return query
+
         query = (
             query.join(
                 models.ClipAnnotation,
@@ -249,9 +227,7 @@ class SearchRecordingsFilter(base.Filter):
             )
         )
         fields = [models.Recording.path]
-
-        term = f"%{self.search_recordings}%"
-        return query.where(or_(*[field.ilike(term) for field in fields]))
+        return query.where(search.match(fields, self.search_recordings))
 
 
 class SoundEventAnnotationTagFilter(base.Filter):
@@ -8,9 +8,10 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, create_model
 from pydantic.fields import FieldInfo
-from sqlalchemy import Select, or_
+from sqlalchemy import Select
 from sqlalchemy.orm import InstrumentedAttribute, MappedColumn
 
+from whombat.models import search
 from whombat.models.base import Base
 
 __all__ = [
@@ -97,7 +98,7 @@ def has_filter(
     value: str,
 ) -> Select:
     """Filter a query by a has condition."""
-    return query.where(field.ilike(f"%{value}%"))
+    return query.where(search.match([field], value))
 
 
 def isin_filter(
@@ -369,9 +370,18 @@ def search_filter(
         """Filter by a search term."""
 
         def filter(self, query: Select) -> Select:
-            """Filter a query."""
-            term = f"%{self.search}%"
-            return query.where(or_(*[field.ilike(term) for field in fields]))
+            """Filter a query.
+
+            Matching rows are sorted by relevance, using the full text
+            search index of the fields if there is one. An explicit sort
+            given to `get_objects_from_query` replaces this ordering.
+            """
+            if not self.search:
+                return query
+
+            return query.where(search.match(fields, self.search)).order_by(
+                *search.relevance(fields, self.search)
+            )
 
     return _SearchFilter
 
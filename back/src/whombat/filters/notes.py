@@ -9,6 +9,7 @@ from whombat.filters import base
 
 __all__ = [
     "MessageFilter",
+    "SearchFilter",
     "CreatedByFilter",
     "CreatedAtFilter",
     "IssueFilter",
@@ -19,6 +20,9 @@ __all__ = [
 MessageFilter = base.string_filter(models.Note.message)
 """Filter note by message content."""
 
+SearchFilter = base.search_filter([models.Note.message])
+"""Search notes by message content."""
+
 CreatedByFilter = base.uuid_filter(models.Note.created_by_id)
 """Filter notes by the user who created them."""
 
@@ -190,6 +194,7 @@ class DatasetFilter(base.Filter):
 
 
 NoteFilter = base.combine(
+    SearchFilter,
     message=MessageFilter,
     created_by=CreatedByFilter,
     created_on=CreatedAtFilter,
@@ -2,7 +2,7 @@
 
 from uuid import UUID
 
-from sqlalchemy import Select
+from sqlalchemy import Select, exists, select
 
 from whombat import models
 from whombat.filters import base
@@ -10,6 +10,9 @@ from whombat.filters import base
 __all__ = [
     "SoundEventFilter",
     "RecordingFilter",
+    "DatasetFilter",
+    "AnnotationProjectFilter",
+    "AnnotatedFilter",
     "GeometryTypeFilter",
     "CreatedOnFilter",
     "UUIDFilter",
@@ -30,6 +33,75 @@ class RecordingFilter(base.Filter):
         ).filter(models.Recording.uuid == self.eq)
 
 
+class DatasetFilter(base.Filter):
+    eq: UUID | None = None
+
+    def filter(self, query: Select) -> Select:
+        """Filter by the dataset of the sound event recording."""
+        if self.eq is None:
+            return query
+
+        return query.where(
+            exists(
+                select(models.DatasetRecording.recording_id)
+                .join(
+                    models.Dataset,
+                    models.DatasetRecording.dataset_id == models.Dataset.id,
+                )
+                .where(
+                    models.DatasetRecording.recording_id
+                    == models.SoundEvent.recording_id,
+                    models.Dataset.uuid == self.eq,
+                )
+            )
+        )
+
+
+class AnnotationProjectFilter(base.Filter):
+    eq: UUID | None = None
+
+    def filter(self, query: Select) -> Select:
+        """Filter by recordings with clips in an annotation project."""
+        if self.eq is None:
+            return query
+
+        return query.where(
+            exists(
+                select(models.Clip.id)
+                .join(
+                    models.AnnotationTask,
+                    models.AnnotationTask.clip_id == models.Clip.id,
+                )
+                .join(
+                    models.AnnotationProject,
+                    models.AnnotationTask.annotation_project_id
+                    == models.AnnotationProject.id,
+                )
+                .where(
+                    models.Clip.recording_id == models.SoundEvent.recording_id,
+                    models.AnnotationProject.uuid == self.eq,
+                )
+            )
+        )
+
+
+class AnnotatedFilter(base.Filter):
+    is_true: bool | None = None
+
+    def filter(self, query: Select) -> Select:
+        """Filter by whether the sound event has been annotated."""
+        if self.is_true is None:
+            return query
+
+        annotated = exists(
+            select(models.SoundEventAnnotation.id).where(
+                models.SoundEventAnnotation.sound_event_id
+                == models.SoundEvent.id
+            )
+        )
+        return query.where(annotated if self.is_true else ~annotated)
+
+
 GeometryTypeFilter = base.string_filter(models.SoundEvent.geometry_type)
 """Filter by geometry type."""
 
@@ -72,6 +144,9 @@ class FeatureFilter(base.Filter):
 
 SoundEventFilter = base.combine(
     recording=RecordingFilter,
+    dataset=DatasetFilter,
+    annotation_project=AnnotationProjectFilter,
+    annotated=AnnotatedFilter,
     geometry_type=GeometryTypeFilter,
     created_on=CreatedOnFilter,
     uuid=UUIDFilter,
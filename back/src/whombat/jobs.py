@@ -0,0 +1,196 @@
+"""In-process background jobs.
+
+Long running operations, such as evaluating a model run with many clip
+predictions, should not block the request that started them. This module
+provides a minimal job manager that runs coroutines as background tasks
+on the running event loop and keeps track of their progress so that the
+client can poll for it.
+
+Jobs are kept in memory; they are lost if the server is restarted. When
+the server runs several worker processes, the jobs are stored in the
+cache file shared by the workers (see `JobManager.share`), so that any
+worker can report on a job started by another.
+"""
+
+import asyncio
+import datetime
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, MutableMapping
+from uuid import UUID, uuid4
+
+from whombat import exceptions, schemas
+from whombat.cache import SharedCache
+
+__all__ = [
+    "JobManager",
+    "ProgressReporter",
+    "jobs",
+]
+
+logger = logging.getLogger(__name__)
+
+
+class ProgressReporter:
+    """Handle passed to a running job to report its progress."""
+
+    def __init__(
+        self,
+        job: schemas.Job,
+        on_change: Callable[[schemas.Job], None] | None = None,
+    ):
+        self._job = job
+        self._on_change = on_change
+
+    @property
+    def job(self) -> schemas.Job:
+        """The job being reported on."""
+        return self._job
+
+    def set_total(self, total: int) -> None:
+        """Set the total number of work units of the job."""
+        self._job.total = total
+        self._changed()
+
+    def advance(self, amount: int = 1) -> None:
+        """Mark a number of work units as done."""
+        self._job.done += amount
+        self._changed()
+
+    def set_message(self, message: str | None) -> None:
+        """Set a message describing the current state of the job."""
+        self._job.message = message
+        self._changed()
+
+    def _changed(self) -> None:
+        if self._on_change is not None:
+            self._on_change(self._job)
+
+
+JobFunction = Callable[[ProgressReporter], Awaitable[UUID | None]]
+"""A job is a coroutine function that receives a progress reporter.
+
+It may return the UUID of the object it produced.
+"""
+
+
+class JobManager:
+    """Run and keep track of background jobs.
+
+    Parameters
+    ----------
+    max_jobs
+        Maximum number of finished jobs to keep in memory. The oldest
+        finished jobs are discarded first.
+    """
+
+    def __init__(self, max_jobs: int = 100):
+        self.max_jobs = max_jobs
+        self._jobs: MutableMapping[UUID, schemas.Job] = OrderedDict()
+        self._tasks: dict[UUID, asyncio.Task] = {}
+
+    def share(self, path: Path, clear: bool = False) -> None:
+        """Store the jobs in a SQLite file shared between processes.
+
+        Jobs still run in the process that submitted them, but their state
+        is written to the file on every change, so that all processes can
+        report on them. When more than `max_jobs` jobs are stored, the
+        least recently updated ones are discarded.
+
+        Parameters
+        ----------
+        path
+            Path of the SQLite file. All the processes that share the
+            jobs must use the same path.
+        clear
+            Remove the jobs left in the file by a previous run.
+        """
+        self._jobs = SharedCache(path, "jobs", self.max_jobs)
+        if clear:
+            self._jobs.clear()
+
+    def submit(self, name: str, func: JobFunction) -> schemas.Job:
+        """Submit a new job to run in the background.
+
+        Must be called from within a running event loop.
+
+        Parameters
+        ----------
+        name
+            A short description of the job.
+        func
+            The coroutine function to run. It receives a
+            `ProgressReporter` to report on its progress.
+
+        Returns
+        -------
+        schemas.Job
+            The submitted job.
+        """
+        job = schemas.Job(uuid=uuid4(), name=name)
+        self._save(job)
+        self._prune()
+        task = asyncio.create_task(self._run(job, func))
+        self._tasks[job.uuid] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.uuid, None))
+        return job
+
+    def get(self, uuid: UUID) -> schemas.Job:
+        """Get a job by its UUID.
+
+        Raises
+        ------
+        whombat.exceptions.NotFoundError
+            If no job with the given UUID exists.
+        """
+        job = self._jobs.get(uuid)
+        if job is None:
+            raise exceptions.NotFoundError(f"Job with uuid {uuid} not found")
+        return job
+
+    async def wait(self, uuid: UUID) -> schemas.Job:
+        """Wait until a job has finished and return it."""
+        task = self._tasks.get(uuid)
+        if task is not None:
+            await asyncio.shield(task)
+        return self.get(uuid)
+
+    async def _run(self, job: schemas.Job, func: JobFunction) -> None:
+        job.status = schemas.JobStatus.running
+        self._save(job)
+        try:
+            job.result = await func(ProgressReporter(job, self._save))
+        except Exception as error:
+            logger.exception("Job %s (%s) failed", job.uuid, job.name)
+            job.status = schemas.JobStatus.failed
+            job.message = str(error)
+        else:
+            job.status = schemas.JobStatus.completed
+        finally:
+            job.finished_on = datetime.datetime.now(datetime.timezone.utc)
+            self._save(job)
+
+    def _save(self, job: schemas.Job) -> None:
+        # In memory this stores the same object again, in a shared file
+        # it writes the current state for the other processes.
+        self._jobs[job.uuid] = job
+
+    def _prune(self) -> None:
+        if isinstance(self._jobs, SharedCache):
+            # The shared cache evicts the oldest entries itself.
+            return
+
+        finished = [
+            uuid
+            for uuid, job in self._jobs.items()
+            if job.status
+            in (schemas.JobStatus.completed, schemas.JobStatus.failed)
+        ]
+        excess = len(self._jobs) - self.max_jobs
+        for uuid in finished[: max(excess, 0)]:
+            del self._jobs[uuid]
+
+
+jobs = JobManager()
+"""The default job manager of the application."""
@@ -0,0 +1,90 @@
+"""Add full text search indexes.
+
+Revision ID: 4f2a9c1d7b3e
+Revises: d51f1cf7a1c2
+Create Date: 2026-10-19 10:00:00.000000
+"""
+
+import sqlite3
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4f2a9c1d7b3e"
+down_revision: Union[str, None] = "d51f1cf7a1c2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXED_COLUMNS = {
+    "recording": ("path",),
+    "tag": ("key", "value"),
+    "note": ("message",),
+    "annotation_project": ("name", "description"),
+}
+
+
+def _sqlite_statements(table: str, columns: tuple[str, ...]) -> list[str]:
+    fts = f"{table}_fts"
+    names = ", ".join(columns)
+    new = ", ".join(f"new.{column}" for column in columns)
+    old = ", ".join(f"old.{column}" for column in columns)
+    insert = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new});"
+    delete = (
+        f"INSERT INTO {fts}({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old});"
+    )
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{names}, content='{table}', content_rowid='id', "
+        "tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai "
+        f"AFTER INSERT ON {table} BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad "
+        f"AFTER DELETE ON {table} BEGIN {delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au "
+        f"AFTER UPDATE ON {table} BEGIN {delete} {insert} END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def _postgresql_statements(
+    table: str,
+    columns: tuple[str, ...],
+) -> list[str]:
+    return ["CREATE EXTENSION IF NOT EXISTS pg_trgm"] + [
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_{column}_trgm "
+        f"ON {table} USING gin ({column} gin_trgm_ops)"
+        for column in columns
+    ]
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for table, columns in INDEXED_COLUMNS.items():
+        if dialect == "sqlite" and sqlite3.sqlite_version_info >= (3, 34):
+            statements = _sqlite_statements(table, columns)
+        elif dialect == "postgresql":
+            statements = _postgresql_statements(table, columns)
+        else:
+            return
+
+        for statement in statements:
+            op.execute(sa.text(statement))
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for table, columns in INDEXED_COLUMNS.items():
+        if dialect == "sqlite":
+            for suffix in ["ai", "ad", "au"]:
+                op.execute(
+                    sa.text(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+                )
+            op.execute(sa.text(f"DROP TABLE IF EXISTS {table}_fts"))
+        elif dialect == "postgresql":
+            for column in columns:
+                op.execute(
+                    sa.text(f"DROP INDEX IF EXISTS ix_{table}_{column}_trgm")
+                )
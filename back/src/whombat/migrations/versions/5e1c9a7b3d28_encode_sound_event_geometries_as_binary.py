@@ -0,0 +1,170 @@
+"""Encode sound event geometries in a compact binary format.
+
+Revision ID: 5e1c9a7b3d28
+Revises: b4e8c2d17f63
+Create Date: 2026-10-19 18:00:00.000000
+
+Geometries were stored as JSON text. They are now stored in the binary
+encoding of `whombat.core.geometries`: a one byte type tag followed by
+the coordinates as little-endian float64 values, with nested coordinate
+lists prefixed by their length as a little-endian uint32. The first
+version of that encoding is copied here so later changes to the module
+do not change what this migration writes. SQLite column types are only
+advisory and a text column can hold binary values, so on SQLite the
+column is left as is and only the rows are converted. Recreating the
+table instead would cascade deletes to all the annotations and
+predictions of the sound events.
+"""
+
+import json
+import struct
+from typing import Any, Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e1c9a7b3d28"
+down_revision: Union[str, None] = "b4e8c2d17f63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+GEOMETRIES: dict[int, tuple[str, int]] = {
+    1: ("TimeStamp", 0),
+    2: ("TimeInterval", 1),
+    3: ("Point", 1),
+    4: ("BoundingBox", 1),
+    5: ("LineString", 2),
+    6: ("MultiPoint", 2),
+    7: ("Polygon", 3),
+    8: ("MultiLineString", 3),
+    9: ("MultiPolygon", 4),
+}
+"""Geometry type and coordinate nesting depth of each type tag."""
+
+TAGS = {name: tag for tag, (name, _) in GEOMETRIES.items()}
+
+DOUBLE = struct.Struct("<d")
+
+COUNT = struct.Struct("<I")
+
+
+def _pack(coordinates: Any, depth: int, parts: list[bytes]) -> None:
+    if depth == 0:
+        parts.append(DOUBLE.pack(coordinates))
+        return
+
+    parts.append(COUNT.pack(len(coordinates)))
+    if depth == 1:
+        parts.append(struct.pack(f"<{len(coordinates)}d", *coordinates))
+        return
+
+    for child in coordinates:
+        _pack(child, depth - 1, parts)
+
+
+def _unpack(value: bytes, offset: int, depth: int) -> tuple[Any, int]:
+    if depth == 0:
+        (coordinate,) = DOUBLE.unpack_from(value, offset)
+        return coordinate, offset + DOUBLE.size
+
+    (count,) = COUNT.unpack_from(value, offset)
+    offset += COUNT.size
+    if depth == 1:
+        coordinates = list(struct.unpack_from(f"<{count}d", value, offset))
+        return coordinates, offset + count * DOUBLE.size
+
+    children = []
+    for _ in range(count):
+        child, offset = _unpack(value, offset, depth - 1)
+        children.append(child)
+    return children, offset
+
+
+def encode_geometry(geometry: dict[str, Any]) -> bytes:
+    tag = TAGS[geometry["type"]]
+    _, depth = GEOMETRIES[tag]
+    parts = [bytes([tag])]
+    _pack(geometry["coordinates"], depth, parts)
+    return b"".join(parts)
+
+
+def decode_geometry(value: bytes) -> dict[str, Any]:
+    name, depth = GEOMETRIES[value[0]]
+    coordinates, _ = _unpack(value, 1, depth)
+    return {"type": name, "coordinates": coordinates}
+
+
+def _is_json(value: str | bytes) -> bool:
+    return isinstance(value, str) or value[:1] == b"{"
+
+
+def _to_binary(value: str | bytes) -> bytes | None:
+    if not _is_json(value):
+        return None
+    return encode_geometry(json.loads(value))
+
+
+def _to_json(value: str | bytes) -> str | bytes | None:
+    if _is_json(value):
+        return None
+    geometry = json.dumps(
+        decode_geometry(value),  # type: ignore
+        separators=(",", ":"),
+    )
+    if op.get_bind().dialect.name == "sqlite":
+        return geometry
+    return geometry.encode("utf-8")
+
+
+def _convert_rows(convert) -> None:
+    conn = op.get_bind()
+    select = sa.text(
+        "SELECT id, geometry FROM sound_event WHERE id > :last "
+        "ORDER BY id LIMIT :limit"
+    )
+    update = sa.text("UPDATE sound_event SET geometry = :value WHERE id = :id")
+    last = 0
+    while True:
+        rows = conn.execute(select, {"last": last, "limit": BATCH_SIZE}).all()
+        if not rows:
+            break
+
+        values = [
+            {"id": id, "value": value}
+            for id, value in ((id, convert(raw)) for id, raw in rows)
+            if value is not None
+        ]
+        if values:
+            conn.execute(update, values)
+        last = rows[-1].id
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        op.alter_column(
+            "sound_event",
+            "geometry",
+            existing_type=sa.String(),
+            type_=sa.LargeBinary(),
+            existing_nullable=False,
+            postgresql_using="convert_to(geometry, 'UTF8')",
+        )
+
+    _convert_rows(_to_binary)
+
+
+def downgrade() -> None:
+    _convert_rows(_to_json)
+
+    if op.get_bind().dialect.name != "sqlite":
+        op.alter_column(
+            "sound_event",
+            "geometry",
+            existing_type=sa.LargeBinary(),
+            type_=sa.String(),
+            existing_nullable=False,
+            postgresql_using="convert_from(geometry, 'UTF8')",
+        )
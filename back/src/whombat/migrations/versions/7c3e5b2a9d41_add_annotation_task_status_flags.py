@@ -0,0 +1,112 @@
+"""Add status flags to annotation tasks.
+
+Revision ID: 7c3e5b2a9d41
+Revises: 4f2a9c1d7b3e
+Create Date: 2026-10-19 12:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c3e5b2a9d41"
+down_revision: Union[str, None] = "4f2a9c1d7b3e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FLAGS = {
+    "is_completed": "completed",
+    "is_verified": "verified",
+    "is_rejected": "rejected",
+    "is_assigned": "assigned",
+}
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("annotation_task") as batch_op:
+        for name in FLAGS:
+            batch_op.add_column(
+                sa.Column(
+                    name,
+                    sa.Boolean(),
+                    nullable=False,
+                    server_default=sa.false(),
+                )
+            )
+        batch_op.add_column(
+            sa.Column("assigned_to_id", sa.Uuid(), nullable=True)
+        )
+        batch_op.create_foreign_key(
+            batch_op.f("fk_annotation_task_assigned_to_id_user"),
+            "user",
+            ["assigned_to_id"],
+            ["id"],
+            ondelete="SET NULL",
+        )
+        batch_op.create_index(
+            "ix_annotation_task_project_status",
+            [
+                "annotation_project_id",
+                "is_completed",
+                "is_verified",
+                "is_rejected",
+                "is_assigned",
+            ],
+            unique=False,
+        )
+        batch_op.create_index(
+            "ix_annotation_task_project_assigned_to",
+            ["annotation_project_id", "assigned_to_id"],
+            unique=False,
+        )
+
+    task = sa.table(
+        "annotation_task",
+        sa.column("id", sa.Integer),
+        *[sa.column(name, sa.Boolean) for name in FLAGS],
+        sa.column("assigned_to_id", sa.Uuid),
+    )
+    badge = sa.table(
+        "annotation_status_badge",
+        sa.column("id", sa.Integer),
+        sa.column("annotation_task_id", sa.Integer),
+        sa.column("user_id", sa.Uuid),
+        sa.column("state", sa.String),
+        sa.column("created_on", sa.DateTime),
+    )
+    values = {
+        name: sa.select(badge.c.id)
+        .where(
+            badge.c.annotation_task_id == task.c.id,
+            badge.c.state == state,
+        )
+        .exists()
+        for name, state in FLAGS.items()
+    }
+    values["assigned_to_id"] = (
+        sa.select(badge.c.user_id)
+        .where(
+            badge.c.annotation_task_id == task.c.id,
+            badge.c.state == "assigned",
+            badge.c.user_id.is_not(None),
+        )
+        .order_by(badge.c.created_on.desc(), badge.c.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    op.execute(sa.update(task).values(**values))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("annotation_task") as batch_op:
+        batch_op.drop_index("ix_annotation_task_project_assigned_to")
+        batch_op.drop_index("ix_annotation_task_project_status")
+        batch_op.drop_constraint(
+            batch_op.f("fk_annotation_task_assigned_to_id_user"),
+            type_="foreignkey",
+        )
+        batch_op.drop_column("assigned_to_id")
+        for name in FLAGS:
+            batch_op.drop_column(name)
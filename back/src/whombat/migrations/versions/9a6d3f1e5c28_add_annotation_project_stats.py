@@ -0,0 +1,282 @@
+"""Add annotation project statistics tables.
+
+Revision ID: 9a6d3f1e5c28
+Revises: 7c3e5b2a9d41
+Create Date: 2026-10-19 14:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9a6d3f1e5c28"
+down_revision: Union[str, None] = "7c3e5b2a9d41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FLAGS = {
+    "is_completed": "num_completed",
+    "is_verified": "num_verified",
+    "is_rejected": "num_rejected",
+    "is_assigned": "num_assigned",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "annotation_project_stats",
+        sa.Column("annotation_project_id", sa.Integer(), nullable=False),
+        sa.Column("num_tasks", sa.Integer(), nullable=False),
+        *[
+            sa.Column(counter, sa.Integer(), nullable=False)
+            for counter in FLAGS.values()
+        ],
+        sa.Column("created_on", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["annotation_project_id"],
+            ["annotation_project.id"],
+            name=op.f(
+                "fk_annotation_project_stats_annotation_project_id_annotation_project"
+            ),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "annotation_project_id",
+            name=op.f("pk_annotation_project_stats"),
+        ),
+    )
+    op.create_table(
+        "annotation_project_tag_count",
+        sa.Column("annotation_project_id", sa.Integer(), nullable=False),
+        sa.Column("tag_id", sa.Integer(), nullable=False),
+        sa.Column("clip_annotations", sa.Integer(), nullable=False),
+        sa.Column("sound_event_annotations", sa.Integer(), nullable=False),
+        sa.Column("created_on", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["annotation_project_id"],
+            ["annotation_project.id"],
+            name=op.f(
+                "fk_annotation_project_tag_count_annotation_project_id_annotation_project"
+            ),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["tag_id"],
+            ["tag.id"],
+            name=op.f("fk_annotation_project_tag_count_tag_id_tag"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "annotation_project_id",
+            "tag_id",
+            name=op.f("pk_annotation_project_tag_count"),
+        ),
+    )
+    op.create_table(
+        "annotation_project_user_activity",
+        sa.Column("annotation_project_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("sound_event_annotations", sa.Integer(), nullable=False),
+        sa.Column("completed_tasks", sa.Integer(), nullable=False),
+        sa.Column("created_on", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["annotation_project_id"],
+            ["annotation_project.id"],
+            name=op.f(
+                "fk_annotation_project_user_activity_annotation_project_id_annotation_project"
+            ),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["user.id"],
+            name=op.f("fk_annotation_project_user_activity_user_id_user"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "annotation_project_id",
+            "user_id",
+            "date",
+            name=op.f("pk_annotation_project_user_activity"),
+        ),
+    )
+    backfill()
+
+
+def backfill() -> None:
+    task = sa.table(
+        "annotation_task",
+        sa.column("id", sa.Integer),
+        sa.column("annotation_project_id", sa.Integer),
+        sa.column("clip_annotation_id", sa.Integer),
+        *[sa.column(flag, sa.Boolean) for flag in FLAGS],
+    )
+    badge = sa.table(
+        "annotation_status_badge",
+        sa.column("annotation_task_id", sa.Integer),
+        sa.column("user_id", sa.Uuid),
+        sa.column("state", sa.String),
+        sa.column("created_on", sa.DateTime),
+    )
+    clip_tag = sa.table(
+        "clip_annotation_tag",
+        sa.column("clip_annotation_id", sa.Integer),
+        sa.column("tag_id", sa.Integer),
+    )
+    sound_event_annotation = sa.table(
+        "sound_event_annotation",
+        sa.column("id", sa.Integer),
+        sa.column("clip_annotation_id", sa.Integer),
+        sa.column("created_by_id", sa.Uuid),
+        sa.column("created_on", sa.DateTime),
+    )
+    sound_event_tag = sa.table(
+        "sound_event_annotation_tag",
+        sa.column("sound_event_annotation_id", sa.Integer),
+        sa.column("tag_id", sa.Integer),
+    )
+    now = sa.func.current_timestamp()
+
+    stats = sa.table(
+        "annotation_project_stats",
+        sa.column("annotation_project_id"),
+        sa.column("num_tasks"),
+        *[sa.column(counter) for counter in FLAGS.values()],
+        sa.column("created_on"),
+    )
+    op.execute(
+        stats.insert().from_select(
+            [column.name for column in stats.columns],
+            sa.select(
+                task.c.annotation_project_id,
+                sa.func.count(),
+                *[
+                    sa.func.sum(sa.case((task.c[flag], 1), else_=0))
+                    for flag in FLAGS
+                ],
+                now,
+            ).group_by(task.c.annotation_project_id),
+        )
+    )
+
+    clip_counts = (
+        sa.select(
+            task.c.annotation_project_id,
+            clip_tag.c.tag_id,
+            sa.literal(1).label("clip_annotations"),
+            sa.literal(0).label("sound_event_annotations"),
+        )
+        .select_from(task)
+        .join(
+            clip_tag,
+            clip_tag.c.clip_annotation_id == task.c.clip_annotation_id,
+        )
+    )
+    sound_event_counts = (
+        sa.select(
+            task.c.annotation_project_id,
+            sound_event_tag.c.tag_id,
+            sa.literal(0).label("clip_annotations"),
+            sa.literal(1).label("sound_event_annotations"),
+        )
+        .select_from(task)
+        .join(
+            sound_event_annotation,
+            sound_event_annotation.c.clip_annotation_id
+            == task.c.clip_annotation_id,
+        )
+        .join(
+            sound_event_tag,
+            sound_event_tag.c.sound_event_annotation_id
+            == sound_event_annotation.c.id,
+        )
+    )
+    tag_rows = sa.union_all(clip_counts, sound_event_counts).subquery()
+    tag_count = sa.table(
+        "annotation_project_tag_count",
+        sa.column("annotation_project_id"),
+        sa.column("tag_id"),
+        sa.column("clip_annotations"),
+        sa.column("sound_event_annotations"),
+        sa.column("created_on"),
+    )
+    op.execute(
+        tag_count.insert().from_select(
+            [column.name for column in tag_count.columns],
+            sa.select(
+                tag_rows.c.annotation_project_id,
+                tag_rows.c.tag_id,
+                sa.func.sum(tag_rows.c.clip_annotations),
+                sa.func.sum(tag_rows.c.sound_event_annotations),
+                now,
+            ).group_by(tag_rows.c.annotation_project_id, tag_rows.c.tag_id),
+        )
+    )
+
+    annotation_rows = (
+        sa.select(
+            task.c.annotation_project_id,
+            sound_event_annotation.c.created_by_id.label("user_id"),
+            sa.func.date(sound_event_annotation.c.created_on).label("date"),
+            sa.literal(1).label("sound_event_annotations"),
+            sa.literal(0).label("completed_tasks"),
+        )
+        .select_from(task)
+        .join(
+            sound_event_annotation,
+            sound_event_annotation.c.clip_annotation_id
+            == task.c.clip_annotation_id,
+        )
+        .where(sound_event_annotation.c.created_by_id.is_not(None))
+    )
+    completed_rows = (
+        sa.select(
+            task.c.annotation_project_id,
+            badge.c.user_id,
+            sa.func.date(badge.c.created_on).label("date"),
+            sa.literal(0).label("sound_event_annotations"),
+            sa.literal(1).label("completed_tasks"),
+        )
+        .select_from(task)
+        .join(badge, badge.c.annotation_task_id == task.c.id)
+        .where(
+            badge.c.state == "completed",
+            badge.c.user_id.is_not(None),
+        )
+    )
+    activity_rows = sa.union_all(annotation_rows, completed_rows).subquery()
+    activity = sa.table(
+        "annotation_project_user_activity",
+        sa.column("annotation_project_id"),
+        sa.column("user_id"),
+        sa.column("date"),
+        sa.column("sound_event_annotations"),
+        sa.column("completed_tasks"),
+        sa.column("created_on"),
+    )
+    op.execute(
+        activity.insert().from_select(
+            [column.name for column in activity.columns],
+            sa.select(
+                activity_rows.c.annotation_project_id,
+                activity_rows.c.user_id,
+                activity_rows.c.date,
+                sa.func.sum(activity_rows.c.sound_event_annotations),
+                sa.func.sum(activity_rows.c.completed_tasks),
+                now,
+            ).group_by(
+                activity_rows.c.annotation_project_id,
+                activity_rows.c.user_id,
+                activity_rows.c.date,
+            ),
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("annotation_project_user_activity")
+    op.drop_table("annotation_project_tag_count")
+    op.drop_table("annotation_project_stats")
@@ -0,0 +1,60 @@
+"""Add sound event embedding tables.
+
+Revision ID: b4e8c2d17f63
+Revises: 9a6d3f1e5c28
+Create Date: 2026-10-19 15:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b4e8c2d17f63"
+down_revision: Union[str, None] = "9a6d3f1e5c28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "embedding_space",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("dimension", sa.Integer(), nullable=False),
+        sa.Column("created_on", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_embedding_space")),
+        sa.UniqueConstraint("name", name=op.f("uq_embedding_space_name")),
+    )
+    op.create_table(
+        "sound_event_embedding",
+        sa.Column("sound_event_id", sa.Integer(), nullable=False),
+        sa.Column("embedding_space_id", sa.Integer(), nullable=False),
+        sa.Column("vector", sa.LargeBinary(), nullable=False),
+        sa.Column("created_on", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["sound_event_id"],
+            ["sound_event.id"],
+            name=op.f("fk_sound_event_embedding_sound_event_id_sound_event"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["embedding_space_id"],
+            ["embedding_space.id"],
+            name=op.f(
+                "fk_sound_event_embedding_embedding_space_id_embedding_space"
+            ),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "sound_event_id",
+            "embedding_space_id",
+            name=op.f("pk_sound_event_embedding"),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("sound_event_embedding")
+    op.drop_table("embedding_space")
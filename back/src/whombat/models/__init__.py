@@ -25,6 +25,7 @@ from whombat.models.clip_annotation import (
 from whombat.models.clip_evaluation import ClipEvaluation, ClipEvaluationMetric
 from whombat.models.clip_prediction import ClipPrediction, ClipPredictionTag
 from whombat.models.dataset import Dataset, DatasetRecording, VisibilityLevel
+from whombat.models.embedding import EmbeddingSpace, SoundEventEmbedding
 from whombat.models.evaluation import Evaluation, EvaluationMetric
 from whombat.models.evaluation_set import (
     EvaluationSet,
@@ -41,6 +42,11 @@ from whombat.models.model_run import (
     ModelRunPrediction,
 )
 from whombat.models.note import Note
+from whombat.models.project_stats import (
+    AnnotationProjectStats,
+    AnnotationProjectTagCount,
+    AnnotationProjectUserActivity,
+)
 from whombat.models.recording import (
     Recording,
     RecordingFeature,
@@ -48,6 +54,7 @@ from whombat.models.recording import (
     RecordingOwner,
     RecordingTag,
 )
+from whombat.models.search import SEARCH_INDEXES, SearchIndex
 from whombat.models.sound_event import SoundEvent, SoundEventFeature
 from whombat.models.sound_event_annotation import (
     SoundEventAnnotation,
@@ -74,7 +81,10 @@ from whombat.models.user_run import (
 __all__ = [
     "AccessToken",
     "AnnotationProject",
+    "AnnotationProjectStats",
     "AnnotationProjectTag",
+    "AnnotationProjectTagCount",
+    "AnnotationProjectUserActivity",
     "AnnotationStatusBadge",
     "AnnotationTask",
     "Base",
@@ -90,6 +100,7 @@ __all__ = [
     "Dataset",
     "DatasetRecording",
     "VisibilityLevel",
+    "EmbeddingSpace",
     "Evaluation",
     "EvaluationMetric",
     "Group",
@@ -110,10 +121,13 @@ __all__ = [
     "RecordingNote",
     "RecordingOwner",
     "RecordingTag",
+    "SEARCH_INDEXES",
+    "SearchIndex",
     "SoundEvent",
     "SoundEventAnnotation",
     "SoundEventAnnotationNote",
     "SoundEventAnnotationTag",
+    "SoundEventEmbedding",
     "SoundEventEvaluation",
     "SoundEventEvaluationMetric",
     "SoundEventFeature",
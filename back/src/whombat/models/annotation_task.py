@@ -25,7 +25,7 @@ from uuid import UUID, uuid4
 
 import sqlalchemy.orm as orm
 from soundevent import data
-from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, UniqueConstraint, false
 
 from whombat.models.base import Base
 from whombat.models.clip import Clip
@@ -45,7 +45,22 @@ class AnnotationTask(Base):
     """Annotation Task model."""
 
     __tablename__ = "annotation_task"
-    __table_args__ = (UniqueConstraint("annotation_project_id", "clip_id"),)
+    __table_args__ = (
+        UniqueConstraint("annotation_project_id", "clip_id"),
+        Index(
+            "ix_annotation_task_project_status",
+            "annotation_project_id",
+            "is_completed",
+            "is_verified",
+            "is_rejected",
+            "is_assigned",
+        ),
+        Index(
+            "ix_annotation_task_project_assigned_to",
+            "annotation_project_id",
+            "assigned_to_id",
+        ),
+    )
 
     id: orm.Mapped[int] = orm.mapped_column(primary_key=True, init=False)
     """The database id of the task."""
@@ -75,6 +90,49 @@ class AnnotationTask(Base):
     )
     """The UUID of the task."""
 
+    # Status flags. These are derived from the status badges of the task so
+    # that task queues can be filtered without querying the badges. They are
+    # kept up to date by the annotation task API.
+    is_completed: orm.Mapped[bool] = orm.mapped_column(
+        nullable=False,
+        default=False,
+        server_default=false(),
+        init=False,
+    )
+    """Whether the task has a completed badge."""
+
+    is_verified: orm.Mapped[bool] = orm.mapped_column(
+        nullable=False,
+        default=False,
+        server_default=false(),
+        init=False,
+    )
+    """Whether the task has a verified badge."""
+
+    is_rejected: orm.Mapped[bool] = orm.mapped_column(
+        nullable=False,
+        default=False,
+        server_default=false(),
+        init=False,
+    )
+    """Whether the task has a rejected badge."""
+
+    is_assigned: orm.Mapped[bool] = orm.mapped_column(
+        nullable=False,
+        default=False,
+        server_default=false(),
+        init=False,
+    )
+    """Whether the task has an assigned badge."""
+
+    assigned_to_id: orm.Mapped[Optional[UUID]] = orm.mapped_column(
+        ForeignKey("user.id", ondelete="SET NULL"),
+        nullable=True,
+        default=None,
+        init=False,
+    )
+    """The id of the user the task was last assigned to."""
+
     # Relationships
     annotation_project: orm.Mapped["AnnotationProject"] = orm.relationship(
         back_populates="annotation_tasks",
@@ -0,0 +1,61 @@
+"""Embedding models.
+
+Embeddings are fixed length vectors that describe the content of a sound
+event, usually produced by a deep learning model. Unlike features, the
+individual components of an embedding have no meaning on their own, but
+the distance between two embeddings is a measure of how similar the
+sound events are. This makes them useful for finding sounds similar to a
+given one.
+
+Each embedding belongs to an embedding space, which identifies the model
+that produced it. Only embeddings of the same space can be compared.
+Vectors are stored as raw little-endian float32 bytes. When the vector
+of a sound event is replaced, its `created_on` is updated too, so that
+in-memory copies of the vector can tell that they are out of date.
+"""
+
+import sqlalchemy.orm as orm
+from sqlalchemy import ForeignKey, LargeBinary
+
+from whombat.models.base import Base
+
+__all__ = [
+    "EmbeddingSpace",
+    "SoundEventEmbedding",
+]
+
+
+class EmbeddingSpace(Base):
+    """Embedding Space model."""
+
+    __tablename__ = "embedding_space"
+
+    id: orm.Mapped[int] = orm.mapped_column(primary_key=True, init=False)
+    """The database id of the embedding space."""
+
+    name: orm.Mapped[str] = orm.mapped_column(nullable=False, unique=True)
+    """The name of the embedding space, usually the name of the model."""
+
+    dimension: orm.Mapped[int] = orm.mapped_column(nullable=False)
+    """The length of the vectors in this space."""
+
+
+class SoundEventEmbedding(Base):
+    """Sound Event Embedding model."""
+
+    __tablename__ = "sound_event_embedding"
+
+    sound_event_id: orm.Mapped[int] = orm.mapped_column(
+        ForeignKey("sound_event.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    """The id of the sound event."""
+
+    embedding_space_id: orm.Mapped[int] = orm.mapped_column(
+        ForeignKey("embedding_space.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    """The id of the embedding space."""
+
+    vector: orm.Mapped[bytes] = orm.mapped_column(LargeBinary, nullable=False)
+    """The embedding vector as little-endian float32 bytes."""
@@ -0,0 +1,104 @@
+"""Annotation Project Statistics.
+
+Project dashboards show how many tasks have been completed, which tags
+have been used and how much work each annotator has done. Computing these
+numbers from the tasks, badges and tags on every request requires
+aggregating over the whole project, so they are instead stored in small
+summary tables that are updated in the same transaction as the changes
+that affect them.
+
+The summary tables can always be recomputed from the source tables, see
+`whombat.api.project_stats.rebuild`.
+"""
+
+import datetime
+from uuid import UUID
+
+import sqlalchemy.orm as orm
+from sqlalchemy import ForeignKey
+
+from whombat.models.base import Base
+
+__all__ = [
+    "AnnotationProjectStats",
+    "AnnotationProjectTagCount",
+    "AnnotationProjectUserActivity",
+]
+
+
+class AnnotationProjectStats(Base):
+    """Task counts of an annotation project by status."""
+
+    __tablename__ = "annotation_project_stats"
+
+    annotation_project_id: orm.Mapped[int] = orm.mapped_column(
+        ForeignKey("annotation_project.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    """The id of the annotation project."""
+
+    num_tasks: orm.Mapped[int] = orm.mapped_column(default=0)
+    """Total number of tasks in the project."""
+
+    num_completed: orm.Mapped[int] = orm.mapped_column(default=0)
+    """Number of tasks with a completed badge."""
+
+    num_verified: orm.Mapped[int] = orm.mapped_column(default=0)
+    """Number of tasks with a verified badge."""
+
+    num_rejected: orm.Mapped[int] = orm.mapped_column(default=0)
+    """Number of tasks with a rejected badge."""
+
+    num_assigned: orm.Mapped[int] = orm.mapped_column(default=0)
+    """Number of tasks with an assigned badge."""
+
+
+class AnnotationProjectTagCount(Base):
+    """Number of annotations in a project that use a tag."""
+
+    __tablename__ = "annotation_project_tag_count"
+
+    annotation_project_id: orm.Mapped[int] = orm.mapped_column(
+        ForeignKey("annotation_project.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    """The id of the annotation project."""
+
+    tag_id: orm.Mapped[int] = orm.mapped_column(
+        ForeignKey("tag.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    """The id of the tag."""
+
+    clip_annotations: orm.Mapped[int] = orm.mapped_column(default=0)
+    """Number of clip annotations of the project with the tag."""
+
+    sound_event_annotations: orm.Mapped[int] = orm.mapped_column(default=0)
+    """Number of sound event annotations of the project with the tag."""
+
+
+class AnnotationProjectUserActivity(Base):
+    """Daily number of annotations made by a user in a project."""
+
+    __tablename__ = "annotation_project_user_activity"
+
+    annotation_project_id: orm.Mapped[int] = orm.mapped_column(
+        ForeignKey("annotation_project.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    """The id of the annotation project."""
+
+    user_id: orm.Mapped[UUID] = orm.mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    """The id of the user."""
+
+    date: orm.Mapped[datetime.date] = orm.mapped_column(primary_key=True)
+    """The day (in UTC) on which the annotations were made."""
+
+    sound_event_annotations: orm.Mapped[int] = orm.mapped_column(default=0)
+    """Number of sound event annotations created by the user."""
+
+    completed_tasks: orm.Mapped[int] = orm.mapped_column(default=0)
+    """Number of tasks marked as completed by the user."""
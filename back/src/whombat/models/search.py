@@ -0,0 +1,383 @@
+"""Full text search indexes.
+
+Searching with `column ILIKE '%term%'` cannot use a regular index, so it
+scans the whole table. The tables with large search boxes (recordings,
+tags, notes and annotation projects) get a search index instead:
+
+* On SQLite, an external content FTS5 table with the `trigram` tokenizer,
+  kept in sync with the indexed table by triggers. The trigram tokenizer
+  matches substrings, so search results are the same as with `ILIKE`.
+* On PostgreSQL, a `pg_trgm` GIN index on each column, which is used by
+  the planner to answer `ILIKE` queries directly.
+
+The indexes are created together with the tables. Use the `match` and
+`relevance` functions to build search conditions and orderings that
+use them; on other dialects they fall back to `ILIKE`.
+
+Notes
+-----
+Migrations that recreate an indexed table on SQLite (e.g. with
+`batch_alter_table`) drop its triggers. Call `create_search_index` and
+`rebuild_search_index` after such migrations.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import InstrumentedAttribute, QueryableAttribute
+from sqlalchemy.sql import ColumnElement
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.visitors import InternalTraversal
+
+from whombat.models.annotation_project import AnnotationProject
+from whombat.models.note import Note
+from whombat.models.recording import Recording
+from whombat.models.tag import Tag
+
+__all__ = [
+    "SEARCH_INDEXES",
+    "SearchIndex",
+    "create_search_index",
+    "drop_search_index",
+    "match",
+    "rebuild_search_index",
+    "relevance",
+]
+
+MIN_TRIGRAM_LENGTH = 3
+"""Search terms shorter than this cannot use a trigram index."""
+
+FTS5_TRIGRAM_AVAILABLE = sqlite3.sqlite_version_info >= (3, 34)
+"""Whether the SQLite library supports the FTS5 trigram tokenizer."""
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    """Search index over some text columns of a table."""
+
+    table: sa.Table
+    """The indexed table. Must have an integer `id` primary key."""
+
+    columns: tuple[str, ...]
+    """Names of the indexed columns."""
+
+    @property
+    def name(self) -> str:
+        """Name of the SQLite FTS5 table."""
+        return f"{self.table.name}_fts"
+
+    def sqlite_statements(self) -> list[str]:
+        """Get the statements that create the SQLite FTS5 index."""
+        table = self.table.name
+        columns = ", ".join(self.columns)
+        new = ", ".join(f"new.{column}" for column in self.columns)
+        old = ", ".join(f"old.{column}" for column in self.columns)
+        insert = (
+            f"INSERT INTO {self.name}(rowid, {columns}) "
+            f"VALUES (new.id, {new});"
+        )
+        delete = (
+            f"INSERT INTO {self.name}({self.name}, rowid, {columns}) "
+            f"VALUES ('delete', old.id, {old});"
+        )
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.name} USING fts5("
+            f"{columns}, content='{table}', content_rowid='id', "
+            "tokenize='trigram')",
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_ai "
+            f"AFTER INSERT ON {table} BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_ad "
+            f"AFTER DELETE ON {table} BEGIN {delete} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_au "
+            f"AFTER UPDATE ON {table} BEGIN {delete} {insert} END",
+        ]
+
+    def postgresql_statements(self) -> list[str]:
+        """Get the statements that create the PostgreSQL trigram indexes."""
+        return ["CREATE EXTENSION IF NOT EXISTS pg_trgm"] + [
+            f"CREATE INDEX IF NOT EXISTS ix_{self.table.name}_{column}_trgm "
+            f"ON {self.table.name} USING gin ({column} gin_trgm_ops)"
+            for column in self.columns
+        ]
+
+
+SEARCH_INDEXES: dict[str, SearchIndex] = {
+    index.table.name: index
+    for index in [
+        SearchIndex(Recording.__table__, ("path",)),  # type: ignore
+        SearchIndex(Tag.__table__, ("key", "value")),  # type: ignore
+        SearchIndex(Note.__table__, ("message",)),  # type: ignore
+        SearchIndex(
+            AnnotationProject.__table__,  # type: ignore
+            ("name", "description"),
+        ),
+    ]
+}
+"""Search indexes by the name of the indexed table."""
+
+
+def _uses_fts5(dialect: sa.Dialect) -> bool:
+    return dialect.name == "sqlite" and FTS5_TRIGRAM_AVAILABLE
+
+
+def create_search_index(connection: Connection, index: SearchIndex) -> None:
+    """Create a search index if the database supports it."""
+    if _uses_fts5(connection.dialect):
+        statements = index.sqlite_statements()
+    elif connection.dialect.name == "postgresql":
+        statements = index.postgresql_statements()
+    else:
+        return
+
+    for statement in statements:
+        connection.execute(sa.text(statement))
+
+
+def rebuild_search_index(connection: Connection, index: SearchIndex) -> None:
+    """Fill a search index with the current content of its table."""
+    if not _uses_fts5(connection.dialect):
+        return
+
+    connection.execute(
+        sa.text(f"INSERT INTO {index.name}({index.name}) VALUES ('rebuild')")
+    )
+
+
+def drop_search_index(connection: Connection, index: SearchIndex) -> None:
+    """Drop a search index."""
+    if connection.dialect.name == "sqlite":
+        for suffix in ["ai", "ad", "au"]:
+            connection.execute(
+                sa.text(f"DROP TRIGGER IF EXISTS {index.name}_{suffix}")
+            )
+        connection.execute(sa.text(f"DROP TABLE IF EXISTS {index.name}"))
+    elif connection.dialect.name == "postgresql":
+        for column in index.columns:
+            name = f"ix_{index.table.name}_{column}_trgm"
+            connection.execute(sa.text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def _create_after_table(target: sa.Table, connection: Connection, **_):
+    create_search_index(connection, SEARCH_INDEXES[target.name])
+
+
+for _index in SEARCH_INDEXES.values():
+    event.listen(_index.table, "after_create", _create_after_table)
+
+
+class _SearchExpression(ColumnElement):
+    """Search expression over the columns of a search index."""
+
+    inherit_cache = True
+
+    _traverse_internals = [
+        ("table_name", InternalTraversal.dp_string),
+        ("id_column", InternalTraversal.dp_clauseelement),
+        ("columns", InternalTraversal.dp_clauseelement_tuple),
+        ("term", InternalTraversal.dp_clauseelement),
+        ("match_term", InternalTraversal.dp_clauseelement),
+        ("like_term", InternalTraversal.dp_clauseelement),
+    ]
+
+    def __init__(
+        self,
+        index: SearchIndex,
+        id_column: ColumnElement,
+        columns: tuple[ColumnElement, ...],
+        term: str,
+    ):
+        self.table_name = index.table.name
+        self.id_column = id_column
+        self.columns = columns
+        self.term = sa.bindparam(None, term, type_=sa.String)
+        # Quote the term so that it is matched as a single FTS5 string.
+        match_term = '"' + term.replace('"', '""') + '"'
+        names = [column.name for column in columns]  # type: ignore
+        if set(names) != set(index.columns):
+            # Without a column filter FTS5 searches all indexed columns.
+            match_term = "{" + " ".join(names) + "} : " + match_term
+        self.match_term = sa.bindparam(None, match_term, type_=sa.String)
+        self.like_term = _like_pattern(term)
+
+    @property
+    def fts_name(self) -> str:
+        return SEARCH_INDEXES[self.table_name].name
+
+    def fts_match(self) -> ColumnElement[bool]:
+        return sa.literal_column(self.fts_name).op("MATCH")(self.match_term)
+
+
+class SearchMatch(_SearchExpression):
+    """Whether a row matches a search term."""
+
+    __visit_name__ = "search_match"
+
+    type = sa.Boolean()
+
+    # Render as a condition, not as a boolean column compared to 1.
+    _is_implicitly_boolean = True
+
+
+class SearchScore(_SearchExpression):
+    """Relevance score of a row for a search term. Lower is better."""
+
+    __visit_name__ = "search_score"
+
+    type = sa.Float()
+
+
+@compiles(SearchMatch)
+def _compile_match(element: SearchMatch, compiler: SQLCompiler, **kw):
+    condition = _ilike(element.columns, element.like_term)
+    return compiler.process(condition, **kw)
+
+
+@compiles(SearchMatch, "sqlite")
+def _compile_match_sqlite(element: SearchMatch, compiler: SQLCompiler, **kw):
+    if not FTS5_TRIGRAM_AVAILABLE:
+        return _compile_match(element, compiler, **kw)
+
+    fts = sa.table(element.fts_name, sa.column("rowid"))
+    rowids = sa.select(fts.c.rowid).where(element.fts_match())
+    return compiler.process(element.id_column.in_(rowids), **kw)
+
+
+@compiles(SearchScore)
+def _compile_score(element: SearchScore, compiler: SQLCompiler, **kw):
+    return compiler.process(sa.literal(0), **kw)
+
+
+@compiles(SearchScore, "sqlite")
+def _compile_score_sqlite(element: SearchScore, compiler: SQLCompiler, **kw):
+    if not FTS5_TRIGRAM_AVAILABLE:
+        return _compile_score(element, compiler, **kw)
+
+    # The FTS5 rank column holds the bm25 score of the row, which is lower
+    # for better matches.
+    fts = sa.table(element.fts_name, sa.column("rowid"), sa.column("rank"))
+    bm25 = (
+        sa.select(fts.c.rank)
+        .where(element.fts_match(), fts.c.rowid == element.id_column)
+        .scalar_subquery()
+    )
+    return compiler.process(bm25, **kw)
+
+
+@compiles(SearchScore, "postgresql")
+def _compile_score_postgresql(
+    element: SearchScore,
+    compiler: SQLCompiler,
+    **kw,
+):
+    similarity = sa.func.greatest(
+        *[
+            sa.func.word_similarity(element.term, sa.cast(column, sa.Text))
+            for column in element.columns
+        ]
+    )
+    return compiler.process(-similarity, **kw)
+
+
+def _get_index(
+    fields: Sequence[InstrumentedAttribute],
+) -> tuple[SearchIndex, tuple[ColumnElement, ...]] | None:
+    columns = tuple(
+        field.expression if isinstance(field, QueryableAttribute) else field
+        for field in fields
+    )
+    tables = {getattr(column, "table", None) for column in columns}
+    if len(tables) != 1:
+        return None
+
+    (table,) = tables
+    index = SEARCH_INDEXES.get(getattr(table, "name", None))  # type: ignore
+    if index is None or table is not index.table:
+        return None
+
+    names = {getattr(column, "name", None) for column in columns}
+    if not names.issubset(index.columns):
+        return None
+
+    return index, columns
+
+
+def _like_pattern(term: str, prefix: bool = False) -> sa.BindParameter:
+    escaped = term.replace("\\", "\\\\")
+    escaped = escaped.replace("%", "\\%").replace("_", "\\_")
+    pattern = f"{escaped}%" if prefix else f"%{escaped}%"
+    return sa.bindparam(None, pattern, type_=sa.String)
+
+
+def _ilike(
+    fields: Sequence[ColumnElement | InstrumentedAttribute],
+    pattern: sa.BindParameter,
+) -> ColumnElement[bool]:
+    return sa.or_(*[field.ilike(pattern, escape="\\") for field in fields])
+
+
+def match(
+    fields: Sequence[InstrumentedAttribute],
+    term: str,
+) -> ColumnElement[bool]:
+    """Build a condition that checks if any of the fields contain a term.
+
+    The condition is equivalent to `field ILIKE '%term%'` for any of the
+    fields, but uses the search index when all fields are indexed columns
+    of the same table.
+
+    Parameters
+    ----------
+    fields
+        The columns to search in.
+    term
+        The search term.
+
+    Returns
+    -------
+    ColumnElement[bool]
+        The search condition.
+    """
+    resolved = _get_index(fields)
+    if resolved is None or len(term) < MIN_TRIGRAM_LENGTH:
+        return _ilike(fields, _like_pattern(term))
+
+    index, columns = resolved
+    return SearchMatch(index, index.table.c.id, columns, term)
+
+
+def relevance(
+    fields: Sequence[InstrumentedAttribute],
+    term: str,
+) -> list[ColumnElement]:
+    """Build the expressions that sort search results by relevance.
+
+    Rows with a field that starts with the term come first. The rest of
+    the ordering is given by the relevance score of the search index, if
+    any. All expressions sort in ascending order.
+
+    Parameters
+    ----------
+    fields
+        The columns to search in.
+    term
+        The search term.
+
+    Returns
+    -------
+    list[ColumnElement]
+        The expressions to pass to `order_by`.
+    """
+    starts_with = _ilike(fields, _like_pattern(term, prefix=True))
+    order = [sa.case((starts_with, 0), else_=1)]
+
+    resolved = _get_index(fields)
+    if resolved is not None and len(term) >= MIN_TRIGRAM_LENGTH:
+        index, columns = resolved
+        order.append(SearchScore(index, index.table.c.id, columns, term))
+
+    return order
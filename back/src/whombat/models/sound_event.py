@@ -57,7 +57,9 @@ class SoundEvent(Base):
 
     Notes
     -----
-    The geometry attribute is stored as a JSON string in the database.
+    The geometry attribute is stored in a compact binary encoding and is
+    loaded as a `LazyGeometry` proxy. Use
+    `whombat.core.geometries.load_geometry` to get the actual geometry.
     """
 
     __tablename__ = "sound_event"
@@ -1,8 +1,18 @@
-"""Functions to load plugin modules."""
+"""Functions to load plugin modules.
+
+Plugins are Python packages that register themselves as entry points of
+the ``whombat.plugins`` group. For example, a plugin distributed as the
+``whombat_birds`` package declares in its ``pyproject.toml``::
+
+    [project.entry-points."whombat.plugins"]
+    birds = "whombat_birds"
+
+The entry point name is the name of the plugin in the app URLs.
+"""
 
-import importlib
-import pkgutil
 import warnings
+from functools import cache
+from importlib.metadata import entry_points
 from types import ModuleType
 from typing import Generator
 
@@ -10,6 +20,7 @@ from fastapi import APIRouter, FastAPI
 from fastapi.staticfiles import StaticFiles
 
 __all__ = [
+    "PLUGIN_ENTRY_POINT_GROUP",
     "load_plugins",
     "add_plugin_routes",
     "get_plugin_page_url",
@@ -18,21 +29,33 @@ __all__ = [
 ]
 
 
-def load_plugins() -> Generator[tuple[str, ModuleType], None, None]:
-    """Load all plugins in the plugins directory.
+PLUGIN_ENTRY_POINT_GROUP = "whombat.plugins"
+"""Entry point group under which plugins are registered."""
 
-    Will load all modules in the python path that start with 'whombat_'.
 
-    Returns
-    -------
-    dict[str, ModuleType]
-        A dictionary mapping plugin names to plugin modules.
+def load_plugins() -> Generator[tuple[str, ModuleType], None, None]:
+    """Load all installed plugins.
+
+    Plugins are discovered from the entry points of the
+    `PLUGIN_ENTRY_POINT_GROUP` group. Reading the entry points only
+    requires the metadata of the installed distributions, so it is much
+    faster than scanning every module in the Python path. The plugins
+    are loaded once and reused by later calls.
+
+    Yields
+    ------
+    tuple[str, ModuleType]
+        The name and module of each plugin.
     """
-    for _, name, _ in pkgutil.iter_modules():
-        if not name.startswith("whombat_"):
-            continue
+    yield from _load_plugins()
+
 
-        module = importlib.import_module(name)
+@cache
+def _load_plugins() -> tuple[tuple[str, ModuleType], ...]:
+    plugins = []
+    for entry_point in entry_points(group=PLUGIN_ENTRY_POINT_GROUP):
+        name = entry_point.name
+        module = entry_point.load()
 
         if not hasattr(module, "__description__"):
             warnings.warn(
@@ -46,7 +69,8 @@ def load_plugins() -> Generator[tuple[str, ModuleType], None, None]:
                 f"Plugin {name} has no __version__ attribute.", stacklevel=2
             )
 
-        yield name[8:], module
+        plugins.append((name, module))
+    return tuple(plugins)
 
 
 def add_plugin_routes(app: FastAPI, name: str, plugin: ModuleType) -> None:
@@ -67,11 +91,9 @@ def add_plugin_routes(app: FastAPI, name: str, plugin: ModuleType) -> None:
     `APIRouter` instance. If this attribute is not present, or is not
     an `APIRouter` instance, the plugin's routes will not be added.
     """
-    if not hasattr(plugin.module, "router") or not isinstance(
-        plugin.module.router, APIRouter
-    ):
+    if not isinstance(getattr(plugin, "router", None), APIRouter):
         return
-    app.include_router(plugin.module.router, prefix=f"/plugins/routes/{name}")
+    app.include_router(plugin.router, prefix=f"/plugins/routes/{name}")
 
 
 def get_plugin_page_url(name: str) -> str:
@@ -109,7 +131,7 @@ def plugin_has_pages(plugin: ModuleType) -> bool:
     If this is the case it is assumed that the plugin has a `statics`
     directory that contains the plugin's pages.
     """
-    return getattr(plugin.module, "has_pages", False)
+    return getattr(plugin, "has_pages", False)
 
 
 def add_plugin_pages(app: FastAPI, name: str, plugin: ModuleType) -> None:
@@ -136,6 +158,6 @@ def add_plugin_pages(app: FastAPI, name: str, plugin: ModuleType) -> None:
 
     app.mount(
         get_plugin_page_url(name),
-        StaticFiles(packages=[name], html=True),
+        StaticFiles(packages=[plugin.__name__], html=True),
         name=f"{name}",
     )
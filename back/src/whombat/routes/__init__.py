@@ -15,6 +15,7 @@ from whombat.routes.evaluation_sets import evaluation_sets_router
 from whombat.routes.evaluations import evaluations_router
 from whombat.routes.features import features_router
 from whombat.routes.groups import get_groups_router
+from whombat.routes.jobs import jobs_router
 from whombat.routes.model_runs import model_runs_router
 from whombat.routes.notes import notes_router
 from whombat.routes.plugins import plugin_router
@@ -203,6 +204,13 @@ def get_main_router(settings: Settings):
         tags=["Evaluations"],
     )
 
+    # Jobs
+    main_router.include_router(
+        jobs_router,
+        prefix="/jobs",
+        tags=["Jobs"],
+    )
+
     # Extensions
     main_router.include_router(
         plugin_router,
@@ -90,6 +90,22 @@ def get_annotation_projects_router(settings: WhombatSettings) -> APIRouter:
             user=user,
         )
 
+    @router.get(
+        "/detail/stats/",
+        response_model=schemas.AnnotationProjectStats,
+    )
+    async def get_annotation_project_stats(
+        session: Session,
+        annotation_project_uuid: UUID,
+        user: models.User | None = Depends(optional_user_dep),
+    ) -> schemas.AnnotationProjectStats:
+        annotation_project = await api.annotation_projects.get(
+            session,
+            annotation_project_uuid,
+            user=user,
+        )
+        return await api.project_stats.get(session, annotation_project)
+
     @router.patch(
         "/detail/",
         response_model=schemas.AnnotationProject,
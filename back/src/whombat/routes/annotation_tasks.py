@@ -3,11 +3,12 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 from soundevent.data import AnnotationState
 
 from whombat import api, models, schemas
 from whombat.filters.annotation_tasks import AnnotationTaskFilter
+from whombat.filters.clips import ClipFilter
 from whombat.filters.clips import UUIDFilter as ClipUUIDFilter
 from whombat.routes.dependencies import Session, get_current_user_dependency
 from whombat.routes.dependencies.settings import WhombatSettings
@@ -69,6 +70,41 @@ def get_annotation_tasks_router(settings: WhombatSettings) -> APIRouter:
         await session.commit()
         return tasks
 
+    @annotation_tasks_router.post(
+        "/bulk/",
+        response_model=list[UUID],
+    )
+    async def create_tasks_from_clips(
+        session: Session,
+        annotation_project_uuid: UUID,
+        filter: Annotated[ClipFilter, Depends(ClipFilter)],  # type: ignore
+        user: models.User = Depends(active_user),
+    ):
+        """Create annotation tasks for all clips matching the filter.
+
+        Clips are selected in the database and the UUIDs of the created
+        tasks are returned. Clips that already have a task in the project
+        are skipped.
+        """
+        if not filter.model_dump(exclude_none=True):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="At least one clip filter must be provided.",
+            )
+        annotation_project = await api.annotation_projects.get(
+            session,
+            annotation_project_uuid,
+            user=user,
+        )
+        task_uuids = await api.annotation_projects.add_tasks_from_clips(
+            session,
+            annotation_project,
+            filters=[filter],
+            user=user,
+        )
+        await session.commit()
+        return task_uuids
+
     @annotation_tasks_router.get(
         "/",
         response_model=schemas.Page[schemas.AnnotationTask],
@@ -95,6 +131,45 @@ def get_annotation_tasks_router(settings: WhombatSettings) -> APIRouter:
             offset=offset,
         )
 
+    @annotation_tasks_router.get(
+        "/next/",
+        response_model=schemas.AnnotationTask,
+    )
+    async def get_next_task(
+        session: Session,
+        annotation_project_uuid: UUID,
+        filter: Annotated[AnnotationTaskFilter, Depends(AnnotationTaskFilter)],  # type: ignore
+        user: Annotated[schemas.SimpleUser, Depends(active_user)],
+        after: UUID | None = None,
+        claim: bool = False,
+    ):
+        """Get the next task in the queue of an annotation project.
+
+        Returns the first task after the `after` task that matches the
+        filter. If `claim` is set, the task is assigned to the current
+        user, and tasks assigned to other users are skipped.
+        """
+        annotation_project = await api.annotation_projects.get(
+            session,
+            annotation_project_uuid,
+            user=user,
+        )
+        current = (
+            await api.annotation_tasks.get(session, after)
+            if after is not None
+            else None
+        )
+        task = await api.annotation_tasks.get_next(
+            session,
+            annotation_project,
+            after=current,
+            filters=[filter],
+            claim_for=user if claim else None,
+        )
+        if claim:
+            await session.commit()
+        return task
+
     @annotation_tasks_router.delete(
         "/detail/",
         response_model=schemas.AnnotationTask,
@@ -85,6 +85,7 @@ async def stream_recording_audio(
         start_time=start_time,
         end_time=end_time,
         target_samplerate=target_samplerate,
+        backend=settings.audio_backend,
     )
 
     # If a specific end was requested and we got more data than requested,
@@ -165,6 +166,7 @@ async def download_recording_audio(
         end_time=end_time,
         audio_parameters=audio_parameters,
         audio_dir=settings.audio_dir,
+        backend=settings.audio_backend,
     )
 
     # Get the samplerate and recording ID.
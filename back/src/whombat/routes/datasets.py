@@ -14,7 +14,9 @@ from soundevent.io.aoef import DatasetObject
 from sqlalchemy.exc import IntegrityError
 
 from whombat import api, exceptions, models, schemas
+from whombat.api.common.permissions import can_edit_dataset
 from whombat.filters.datasets import DatasetFilter
+from whombat.jobs import ProgressReporter, jobs
 from whombat.routes.dependencies import (
     Session,
     WhombatSettings,
@@ -22,6 +24,7 @@ from whombat.routes.dependencies import (
     get_optional_current_user_dependency,
 )
 from whombat.routes.types import Limit, Offset
+from whombat.system.database import get_database_url
 
 __all__ = ["get_dataset_router"]
 
@@ -236,6 +239,46 @@ def get_dataset_router(settings: WhombatSettings) -> APIRouter:
             headers={"Content-Disposition": f"attachment; filename={filename}"},
         )
 
+    @router.post(
+        "/detail/acoustic_features/",
+        response_model=schemas.Job,
+    )
+    async def compute_dataset_acoustic_features(
+        session: Session,
+        dataset_uuid: UUID,
+        settings: WhombatSettings,
+        user: models.User = Depends(current_user_dep),
+    ) -> schemas.Job:
+        """Compute the acoustic features of the dataset sound events.
+
+        Returns a job that can be polled at `/jobs/detail/`. The features
+        are stored as sound event features as each recording is processed.
+        """
+        dataset_obj = await api.datasets.get(session, dataset_uuid, user=user)
+        db_dataset = await session.get(models.Dataset, dataset_obj.id)
+        if db_dataset is None or not await can_edit_dataset(
+            session, db_dataset, user
+        ):
+            raise exceptions.PermissionDeniedError(
+                "You do not have permission to update this dataset"
+            )
+        db_url = get_database_url(settings)
+
+        async def compute(progress: ProgressReporter) -> None:
+            async with api.create_session(db_url) as job_session:
+                await api.compute_dataset_acoustic_features(
+                    job_session,
+                    dataset_obj,
+                    audio_dir=settings.audio_dir,
+                    progress=progress,
+                )
+                await job_session.commit()
+
+        return jobs.submit(
+            f"Compute acoustic features of {dataset_obj.name}",
+            compute,
+        )
+
     @router.post(
         "/import/",
         response_model=schemas.Dataset,
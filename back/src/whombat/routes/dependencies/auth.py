@@ -1,6 +1,12 @@
-"""Authentication dependencies."""
+"""Authentication dependencies.
 
-from typing import Annotated
+The authentication objects are built once per settings object and
+reused by every router. Sharing the current user dependencies means
+FastAPI resolves the current user at most once per request, however many
+dependencies of a route need it.
+"""
+
+from typing import Annotated, Any, Callable, TypeVar
 from uuid import UUID
 
 from fastapi import Depends
@@ -12,6 +18,23 @@ from whombat.routes.dependencies.session import Session
 from whombat.routes.dependencies.settings import WhombatSettings
 from whombat.routes.dependencies.users import get_user_manager
 from whombat.system import auth
+from whombat.system.settings import Settings
+
+T = TypeVar("T")
+
+_built: dict[tuple[int, str], tuple[Settings, Any]] = {}
+
+
+def _build_once(settings: Settings, name: str, factory: Callable[[], T]) -> T:
+    """Build an object once per settings object."""
+    key = (id(settings), name)
+    cached = _built.get(key)
+    if cached is not None and cached[0] is settings:
+        return cached[1]
+
+    obj = factory()
+    _built[key] = (settings, obj)
+    return obj
 
 
 def get_access_token_db(
@@ -32,20 +55,26 @@ def get_auth_backend(
     settings: WhombatSettings,
 ):
     """Get the authentication backend."""
-    cookie_transport = auth.get_cookie_transport(settings)
-    return AuthenticationBackend(
-        name="database",
-        transport=cookie_transport,
-        get_strategy=get_database_strategy,
+    return _build_once(
+        settings,
+        "auth_backend",
+        lambda: AuthenticationBackend(
+            name="database",
+            transport=auth.get_cookie_transport(settings),
+            get_strategy=get_database_strategy,
+        ),
     )
 
 
 def get_users_api(settings: WhombatSettings):
     """Get the users API."""
-    auth_backend = get_auth_backend(settings)
-    return FastAPIUsers[models.User, UUID](  # type: ignore
-        get_user_manager,
-        [auth_backend],
+    return _build_once(
+        settings,
+        "users_api",
+        lambda: FastAPIUsers[models.User, UUID](  # type: ignore
+            get_user_manager,
+            [get_auth_backend(settings)],
+        ),
     )
 
 
@@ -54,7 +83,11 @@ def get_current_user_dependency(
 ):
     """Get the current user."""
     fastapi_users = get_users_api(settings)
-    return fastapi_users.current_user(active=True)
+    return _build_once(
+        settings,
+        "current_user",
+        lambda: fastapi_users.current_user(active=True),
+    )
 
 
 def get_current_admin_dependency(
@@ -63,7 +96,11 @@ def get_current_admin_dependency(
     """Return a dependency that requires the current user to be an admin."""
 
     fastapi_users = get_users_api(settings)
-    return fastapi_users.current_user(active=True, superuser=True)
+    return _build_once(
+        settings,
+        "current_admin",
+        lambda: fastapi_users.current_user(active=True, superuser=True),
+    )
 
 
 def get_optional_current_user_dependency(
@@ -72,4 +109,8 @@ def get_optional_current_user_dependency(
     """Return a dependency that allows unauthenticated access."""
 
     fastapi_users = get_users_api(settings)
-    return fastapi_users.current_user(active=True, optional=True)
+    return _build_once(
+        settings,
+        "optional_user",
+        lambda: fastapi_users.current_user(active=True, optional=True),
+    )
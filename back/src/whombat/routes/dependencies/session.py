@@ -6,11 +6,7 @@ from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat.routes.dependencies.settings import WhombatSettings
-from whombat.system.database import (
-    create_async_db_engine,
-    get_async_session,
-    get_database_url,
-)
+from whombat.system.database import get_async_db_engine, get_async_session
 
 __all__ = ["Session"]
 
@@ -19,8 +15,7 @@ async def async_session(
     settings: WhombatSettings,
 ) -> AsyncGenerator[AsyncSession, None]:
     """Get an async session for the database."""
-    url = get_database_url(settings)
-    engine = create_async_db_engine(url)
+    engine = get_async_db_engine(settings)
     async with get_async_session(engine) as session:
         yield session
 
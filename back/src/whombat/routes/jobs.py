@@ -0,0 +1,21 @@
+"""REST API routes for background jobs."""
+
+from uuid import UUID
+
+from fastapi import APIRouter
+
+from whombat import schemas
+from whombat.jobs import jobs
+
+__all__ = [
+    "jobs_router",
+]
+
+
+jobs_router = APIRouter()
+
+
+@jobs_router.get("/detail/", response_model=schemas.Job)
+async def get_job(job_uuid: UUID) -> schemas.Job:
+    """Get the status and progress of a background job."""
+    return jobs.get(job_uuid)
@@ -3,13 +3,17 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Body, Depends, UploadFile
+from fastapi import APIRouter, Body, Depends, Query, UploadFile
 
 from whombat import api, schemas
 from whombat.api.io import aoef
 from whombat.filters.model_runs import ModelRunFilter
+from whombat.jobs import ProgressReporter, jobs
 from whombat.routes.dependencies import Session, WhombatSettings
 from whombat.routes.types import Limit, Offset
+from whombat.schemas.evaluation_sets import PredictionTypes
+from whombat.schemas.evaluations import EvaluationMode
+from whombat.system.database import get_database_url
 
 __all__ = [
     "model_runs_router",
@@ -97,7 +101,14 @@ async def evaluate_model_run(
     model_run_uuid: UUID,
     evaluation_set_uuid: UUID,
     settings: WhombatSettings,
+    mode: EvaluationMode = EvaluationMode.sequential,
+    max_workers: Annotated[int | None, Query(ge=1)] = None,
 ) -> schemas.Evaluation:
+    """Evaluate a model run against an evaluation set.
+
+    Use `mode=parallel` to evaluate the clips across a pool of worker
+    processes.
+    """
     model_run = await api.model_runs.get(session, model_run_uuid)
     evaluation_set = await api.evaluation_sets.get(
         session, evaluation_set_uuid
@@ -107,11 +118,60 @@ async def evaluate_model_run(
         model_run,
         evaluation_set,
         audio_dir=settings.audio_dir,
+        mode=mode,
+        max_workers=max_workers,
     )
     await session.commit()
     return evaluation
 
 
+@model_runs_router.post(
+    "/detail/evaluate/background/",
+    response_model=schemas.Job,
+)
+async def evaluate_model_run_in_background(
+    session: Session,
+    model_run_uuid: UUID,
+    evaluation_set_uuid: UUID,
+    settings: WhombatSettings,
+) -> schemas.Job:
+    """Start evaluating a model run in the background.
+
+    Returns a job that can be polled at `/jobs/detail/`. Once the job has
+    completed, its result is the UUID of the created evaluation.
+    """
+    model_run = await api.model_runs.get(session, model_run_uuid)
+    evaluation_set = await api.evaluation_sets.get(
+        session, evaluation_set_uuid
+    )
+    db_url = get_database_url(settings)
+
+    async def evaluate(progress: ProgressReporter) -> UUID:
+        async with api.create_session(db_url) as job_session:
+            evaluations = api.evaluations
+            if evaluation_set.task == PredictionTypes.sound_event_detection:
+                evaluation = await evaluations.evaluate_model_run_in_batches(
+                    job_session,
+                    model_run,
+                    evaluation_set,
+                    progress=progress,
+                )
+            else:
+                evaluation = await evaluations.evaluate_model_run(
+                    job_session,
+                    model_run,
+                    evaluation_set,
+                    audio_dir=settings.audio_dir,
+                )
+            await job_session.commit()
+            return evaluation.uuid
+
+    return jobs.submit(
+        f"Evaluate model run {model_run.name} on {evaluation_set.name}",
+        evaluate,
+    )
+
+
 @model_runs_router.delete("/detail/", response_model=schemas.ModelRun)
 async def delete_model_run(
     session: Session,
@@ -3,11 +3,13 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 
 from whombat import api, schemas
 from whombat.api.scatterplots.sound_event_annotations import (
+    COLUMNS_MEDIA_TYPE,
     ScatterPlotData,
+    get_scatterplot_columns,
     get_scatterplot_data,
 )
 from whombat.filters.sound_event_annotations import SoundEventAnnotationFilter
@@ -304,4 +306,33 @@ def get_sound_event_annotations_router(settings: WhombatSettings) -> APIRouter:
             offset=offset,
         )
 
+    @sound_event_annotations_router.get(
+        "/scatter_plot/columns/",
+        response_class=Response,
+        responses={200: {"content": {COLUMNS_MEDIA_TYPE: {}}}},
+    )
+    async def get_scatter_plot_columns(
+        session: Session,
+        filter: Annotated[
+            SoundEventAnnotationFilter,  # type: ignore
+            Depends(SoundEventAnnotationFilter),
+        ],
+        limit: Annotated[int, Query(ge=-1)] = 100_000,
+        offset: Offset = 0,
+    ) -> Response:
+        """Get scatter plot data in the whombat columnar binary format.
+
+        See `ScatterPlotColumns.to_bytes` for a description of the format.
+        """
+        columns = await get_scatterplot_columns(
+            session,
+            limit=limit,
+            offset=offset,
+            filters=[filter],
+        )
+        return Response(
+            content=columns.to_bytes(),
+            media_type=COLUMNS_MEDIA_TYPE,
+        )
+
     return sound_event_annotations_router
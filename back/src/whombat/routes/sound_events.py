@@ -3,9 +3,9 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 
-from whombat import api, schemas
+from whombat import api, exceptions, models, schemas
 from whombat.filters.sound_events import SoundEventFilter
 from whombat.routes.dependencies import Session
 from whombat.routes.types import Limit, Offset
@@ -77,6 +77,70 @@ async def create_sound_event(
     return sound_event
 
 
+@sound_events_router.get(
+    "/detail/similar/",
+    response_model=list[schemas.SimilarSoundEvent],
+)
+async def get_similar_sound_events(
+    session: Session,
+    sound_event_uuid: UUID,
+    embedding: str,
+    filter: Annotated[SoundEventFilter, Depends(SoundEventFilter)],  # type: ignore
+    limit: Annotated[int, Query(ge=1, le=1000)] = 10,
+):
+    """Get the sound events most similar to a given one.
+
+    Similarity is measured between the embeddings of the sound events in
+    the given embedding space. Use the filters to restrict the search, for
+    example `dataset__eq` and `annotated__is_true=false` to find
+    unannotated sound events of a dataset.
+    """
+    sound_event = await api.sound_events.get(session, sound_event_uuid)
+    return await api.embeddings.find_similar(
+        session,
+        sound_event,
+        embedding,
+        limit=limit,
+        filters=[filter],
+    )
+
+
+@sound_events_router.post(
+    "/embeddings/",
+    response_model=schemas.EmbeddingSpace,
+)
+async def add_sound_event_embeddings(
+    session: Session,
+    data: schemas.SoundEventEmbeddingsCreate,
+):
+    """Add or replace the embeddings of many sound events."""
+    uuids = {embedding.sound_event_uuid for embedding in data.embeddings}
+    found, _ = await api.sound_events.get_many(
+        session,
+        limit=None,
+        filters=[models.SoundEvent.uuid.in_(uuids)],
+        sort_by=None,
+    )
+    by_uuid = {sound_event.uuid: sound_event for sound_event in found}
+    missing = uuids - by_uuid.keys()
+    if missing:
+        raise exceptions.NotFoundError(
+            f"Sound events not found: {', '.join(map(str, missing))}"
+        )
+
+    sound_events = [
+        by_uuid[embedding.sound_event_uuid] for embedding in data.embeddings
+    ]
+    space = await api.embeddings.add(
+        session,
+        data.name,
+        sound_events,
+        [embedding.vector for embedding in data.embeddings],
+    )
+    await session.commit()
+    return space
+
+
 @sound_events_router.get(
     "/detail/",
     response_model=schemas.SoundEvent,
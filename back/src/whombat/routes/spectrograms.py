@@ -6,6 +6,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Response
 
 from whombat import api, schemas
+from whombat.cache import AppCache
 from whombat.core import images
 from whombat.routes.dependencies import Session, WhombatSettings
 
@@ -13,6 +14,9 @@ __all__ = ["spectrograms_router"]
 
 spectrograms_router = APIRouter()
 
+spectrogram_cache = AppCache("spectrograms", maxsize=256)
+"""Rendered spectrogram images by recording, time range and parameters."""
+
 
 @spectrograms_router.get(
     "/",
@@ -52,6 +56,17 @@ async def get_spectrogram(
         Spectrogram image.
 
     """
+    key = (
+        recording_uuid,
+        start_time,
+        end_time,
+        audio_parameters.model_dump_json(),
+        spectrogram_parameters.model_dump_json(),
+    )
+    content = spectrogram_cache.get(key)
+    if content is not None:
+        return Response(content=content, media_type="image/png")
+
     recording = await api.recordings.get(session, recording_uuid)
 
     data = api.compute_spectrogram(
@@ -61,6 +76,7 @@ async def get_spectrogram(
         audio_parameters,
         spectrogram_parameters,
         audio_dir=settings.audio_dir,
+        backend=settings.audio_backend,
     )
 
     # Normalize.
@@ -85,8 +101,10 @@ async def get_spectrogram(
     )
 
     buffer = images.image_to_buffer(image)
+    content = buffer.read()
+    spectrogram_cache[key] = content
 
     return Response(
-        content=buffer.read(),
+        content=content,
         media_type="image/png",
     )
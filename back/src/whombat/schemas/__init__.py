@@ -15,7 +15,10 @@ to validate data before it is inserted into the database.
 from whombat.schemas.annotation_projects import (
     AnnotationProject,
     AnnotationProjectCreate,
+    AnnotationProjectStats,
+    AnnotationProjectTagCount,
     AnnotationProjectUpdate,
+    AnnotationProjectUserActivity,
 )
 from whombat.schemas.annotation_tasks import (
     AnnotationStatusBadge,
@@ -57,6 +60,12 @@ from whombat.schemas.datasets import (
     DatasetUpdate,
     FileState,
 )
+from whombat.schemas.embeddings import (
+    EmbeddingSpace,
+    SimilarSoundEvent,
+    SoundEventEmbeddingCreate,
+    SoundEventEmbeddingsCreate,
+)
 from whombat.schemas.evaluation_sets import (
     EvaluationSet,
     EvaluationSetCreate,
@@ -83,6 +92,7 @@ from whombat.schemas.groups import (
     GroupRole,
     GroupUpdate,
 )
+from whombat.schemas.jobs import Job, JobStatus
 from whombat.schemas.model_runs import ModelRun, ModelRunCreate, ModelRunUpdate
 from whombat.schemas.notes import Note, NoteCreate, NoteUpdate
 from whombat.schemas.plugin import PluginInfo
@@ -144,7 +154,10 @@ __all__ = [
     "AmplitudeParameters",
     "AnnotationProject",
     "AnnotationProjectCreate",
+    "AnnotationProjectStats",
+    "AnnotationProjectTagCount",
     "AnnotationProjectUpdate",
+    "AnnotationProjectUserActivity",
     "AnnotationStatusBadge",
     "AnnotationStatusBadgeUpdate",
     "AnnotationTask",
@@ -176,6 +189,7 @@ __all__ = [
     "DatasetRecording",
     "DatasetRecordingCreate",
     "DatasetUpdate",
+    "EmbeddingSpace",
     "Evaluation",
     "EvaluationCreate",
     "EvaluationSet",
@@ -195,6 +209,8 @@ __all__ = [
     "GroupRole",
     "GroupUpdate",
     "FileState",
+    "Job",
+    "JobStatus",
     "ModelRun",
     "ModelRunCreate",
     "ModelRunUpdate",
@@ -214,6 +230,7 @@ __all__ = [
     "Scale",
     "SimpleUser",
     "SpeciesCandidate",
+    "SimilarSoundEvent",
     "SoundEvent",
     "SoundEventAnnotation",
     "SoundEventAnnotationCreate",
@@ -221,6 +238,8 @@ __all__ = [
     "SoundEventAnnotationTag",
     "SoundEventAnnotationUpdate",
     "SoundEventCreate",
+    "SoundEventEmbeddingCreate",
+    "SoundEventEmbeddingsCreate",
     "SoundEventEvaluation",
     "SoundEventEvaluationCreate",
     "SoundEventEvaluationUpdate",
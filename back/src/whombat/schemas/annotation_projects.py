@@ -1,11 +1,13 @@
 """Schemas for Annotation Projects."""
 
+import datetime
 from uuid import UUID
 
 from pydantic import BaseModel, Field, model_validator
 
 from whombat.schemas.base import BaseSchema
 from whombat.schemas.tags import Tag
+from whombat.schemas.users import SimpleUser
 from whombat.models.dataset import VisibilityLevel
 
 __all__ = [
@@ -13,6 +15,9 @@ __all__ = [
     "AnnotationProjectCreate",
     "AnnotationProject",
     "AnnotationProjectUpdate",
+    "AnnotationProjectStats",
+    "AnnotationProjectTagCount",
+    "AnnotationProjectUserActivity",
 ]
 
 
@@ -120,3 +125,57 @@ class AnnotationProjectUpdate(BaseModel):
                 "owner_group_id can only be set when visibility is 'restricted'."
             )
         return self
+
+
+class AnnotationProjectTagCount(BaseModel):
+    """Number of annotations of a project that use a tag."""
+
+    tag: Tag
+    """The tag."""
+
+    clip_annotations: int = 0
+    """Number of clip annotations with the tag."""
+
+    sound_event_annotations: int = 0
+    """Number of sound event annotations with the tag."""
+
+
+class AnnotationProjectUserActivity(BaseModel):
+    """Number of annotations made by a user in a project on a day."""
+
+    user: SimpleUser
+    """The user."""
+
+    date: datetime.date
+    """The day (in UTC)."""
+
+    sound_event_annotations: int = 0
+    """Number of sound event annotations created by the user."""
+
+    completed_tasks: int = 0
+    """Number of tasks marked as completed by the user."""
+
+
+class AnnotationProjectStats(BaseModel):
+    """Progress statistics of an annotation project."""
+
+    num_tasks: int = 0
+    """Total number of tasks."""
+
+    num_completed: int = 0
+    """Number of completed tasks."""
+
+    num_verified: int = 0
+    """Number of verified tasks."""
+
+    num_rejected: int = 0
+    """Number of rejected tasks."""
+
+    num_assigned: int = 0
+    """Number of assigned tasks."""
+
+    tags: list[AnnotationProjectTagCount] = Field(default_factory=list)
+    """Tag usage counts of the project."""
+
+    activity: list[AnnotationProjectUserActivity] = Field(default_factory=list)
+    """Daily annotation counts by user."""
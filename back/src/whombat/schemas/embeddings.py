@@ -0,0 +1,58 @@
+"""Schemas for handling embeddings."""
+
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from whombat.schemas.base import BaseSchema
+from whombat.schemas.sound_events import SoundEvent
+
+__all__ = [
+    "EmbeddingSpace",
+    "SimilarSoundEvent",
+    "SoundEventEmbeddingCreate",
+    "SoundEventEmbeddingsCreate",
+]
+
+
+class EmbeddingSpace(BaseSchema):
+    """Schema for EmbeddingSpace objects returned to the user."""
+
+    id: int = Field(..., exclude=True)
+    """The database id of the embedding space."""
+
+    name: str
+    """The name of the embedding space."""
+
+    dimension: int
+    """The length of the vectors in this space."""
+
+
+class SoundEventEmbeddingCreate(BaseModel):
+    """Schema for the embedding of a single sound event."""
+
+    sound_event_uuid: UUID
+    """The UUID of the sound event."""
+
+    vector: list[float]
+    """The embedding vector."""
+
+
+class SoundEventEmbeddingsCreate(BaseModel):
+    """Schema for adding embeddings of many sound events at once."""
+
+    name: str
+    """The name of the embedding space."""
+
+    embeddings: list[SoundEventEmbeddingCreate]
+    """The embeddings to add."""
+
+
+class SimilarSoundEvent(BaseModel):
+    """A sound event returned by a similarity search."""
+
+    sound_event: SoundEvent
+    """The similar sound event."""
+
+    similarity: float
+    """Cosine similarity to the query, from -1 to 1."""
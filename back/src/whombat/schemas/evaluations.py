@@ -1,5 +1,6 @@
 """Schemas for Evaluations."""
 
+from enum import Enum
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -10,10 +11,21 @@ from whombat.schemas.features import Feature
 __all__ = [
     "EvaluationCreate",
     "Evaluation",
+    "EvaluationMode",
     "EvaluationUpdate",
 ]
 
 
+class EvaluationMode(str, Enum):
+    """How to run the evaluation of a model run."""
+
+    sequential = "sequential"
+    """Evaluate all clips one after the other in the server process."""
+
+    parallel = "parallel"
+    """Evaluate partitions of clips in a pool of worker processes."""
+
+
 class EvaluationCreate(BaseModel):
     """Evaluation creation schema."""
 
@@ -0,0 +1,64 @@
+"""Schemas for background jobs."""
+
+import datetime
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel, Field, computed_field
+
+__all__ = [
+    "Job",
+    "JobStatus",
+]
+
+
+class JobStatus(str, Enum):
+    """Status of a background job."""
+
+    pending = "pending"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+class Job(BaseModel):
+    """Schema of a background job as returned to the user."""
+
+    uuid: UUID
+    """The unique identifier of the job."""
+
+    name: str
+    """A short description of the work done by the job."""
+
+    status: JobStatus = JobStatus.pending
+    """The current status of the job."""
+
+    total: int = 0
+    """The total number of work units the job has to process."""
+
+    done: int = 0
+    """The number of work units processed so far."""
+
+    message: str | None = None
+    """An optional message, e.g. the error that made the job fail."""
+
+    result: UUID | None = None
+    """The UUID of the object produced by the job, if any."""
+
+    created_on: datetime.datetime = Field(
+        default_factory=lambda: datetime.datetime.now(datetime.timezone.utc),
+    )
+    """The time at which the job was submitted."""
+
+    finished_on: datetime.datetime | None = None
+    """The time at which the job finished, if it has finished."""
+
+    @computed_field
+    @property
+    def progress(self) -> float:
+        """The fraction of work done, between 0 and 1."""
+        if self.status == JobStatus.completed:
+            return 1
+        if self.total <= 0:
+            return 0
+        return min(self.done / self.total, 1)
@@ -2,9 +2,10 @@
 
 from uuid import UUID
 
-from pydantic import BaseModel, Field, computed_field
+from pydantic import BaseModel, Field, computed_field, field_validator
 from soundevent.data.geometries import Geometry, GeometryType
 
+from whombat.core.geometries import load_geometry
 from whombat.schemas.base import BaseSchema
 from whombat.schemas.features import Feature
 
@@ -44,6 +45,12 @@ class SoundEvent(BaseSchema):
     features: list[Feature] = Field(default_factory=list)
     """The features associated with the sound event."""
 
+    @field_validator("geometry", mode="before")
+    @classmethod
+    def load_geometry(cls, value):
+        """Decode geometries loaded lazily from the database."""
+        return load_geometry(value)
+
 
 class SoundEventUpdate(BaseSchema):
     """Schema for SoundEvent objects updated by the user."""
@@ -2,18 +2,38 @@ import functools
 
 from fastapi import FastAPI
 
+from whombat.cache import share_caches
+from whombat.core.dsp import set_dsp_backend
+from whombat.jobs import jobs
 from whombat.system.app.error_handlers import add_error_handlers
 from whombat.system.app.lifespan import lifespan
 from whombat.system.app.middleware import add_middlewares
+from whombat.system.app.responses import ORJSONResponse, add_fast_responses
 from whombat.system.app.routes import ROOT_DIR, add_routes
+from whombat.system.auth import token_cache
+from whombat.system.data import get_whombat_cache_file
 from whombat.system.settings import Settings
 
 __all__ = ["create_app", "ROOT_DIR"]
 
 
 def create_app(settings: Settings) -> FastAPI:
-    app = FastAPI(lifespan=functools.partial(lifespan, settings))
+    app = FastAPI(
+        lifespan=functools.partial(lifespan, settings),
+        default_response_class=ORJSONResponse,
+    )
     add_routes(app, settings)
+    add_fast_responses(app)
     add_error_handlers(app, settings)
     add_middlewares(app, settings)
+    set_dsp_backend(settings.audio_backend)
+
+    if settings.workers > 1:
+        from whombat.api.common.permissions import disable_group_roles_cache
+
+        share_caches(get_whombat_cache_file())
+        jobs.share(get_whombat_cache_file())
+        token_cache.disable()
+        disable_group_roles_cache()
+
     return app
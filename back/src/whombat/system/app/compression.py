@@ -0,0 +1,201 @@
+"""Response compression middleware.
+
+Compresses responses with brotli when the `brotli` package is installed
+and the client accepts it, and with gzip otherwise. Only responses with
+an allowed media type and a body of at least a minimum size are
+compressed, so that audio streams, spectrogram images and small
+responses are sent as they are.
+"""
+
+import zlib
+from typing import Callable, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli  # type: ignore
+except ImportError:
+    brotli = None
+
+__all__ = [
+    "CompressionMiddleware",
+    "select_encoding",
+]
+
+UNCOMPRESSED_STATUS_CODES = {204, 206, 304}
+
+Compressor = tuple[Callable[[bytes], bytes], Callable[[], bytes]]
+
+
+def select_encoding(accept_encoding: str) -> str | None:
+    """Select the preferred supported encoding of an Accept-Encoding header.
+
+    Parameters
+    ----------
+    accept_encoding
+        The value of the Accept-Encoding header.
+
+    Returns
+    -------
+    str | None
+        Either "br" or "gzip", or None if the client accepts neither.
+    """
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0
+        accepted[name.strip().lower()] = quality
+
+    supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+    for encoding in supported:
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+
+    return None
+
+
+class CompressionMiddleware:
+    """Compress responses with gzip or brotli."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        media_types: Sequence[str] = ("application/json",),
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.media_types = set(media_types)
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = select_encoding(
+            Headers(scope=scope).get("accept-encoding", "")
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def should_compress(self, message: Message) -> bool:
+        """Check whether a response can be compressed from its start."""
+        if message["status"] in UNCOMPRESSED_STATUS_CODES:
+            return False
+
+        headers = Headers(raw=message["headers"])
+        if "content-encoding" in headers:
+            return False
+
+        media_type = headers.get("content-type", "").split(";")[0].strip()
+        return media_type in self.media_types
+
+    def create_compressor(self, encoding: str) -> Compressor:
+        """Create the compress and finish functions of an encoding."""
+        if encoding == "br":
+            assert brotli is not None
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            return compressor.process, compressor.finish
+
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+        return compressor.compress, compressor.flush
+
+
+class _CompressionResponder:
+    def __init__(
+        self,
+        middleware: CompressionMiddleware,
+        encoding: str,
+        send: Send,
+    ):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start: Message | None = None
+        self.compressor: Compressor | None = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self._flush_start()
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            if self._should_compress(start, body, more_body):
+                self.compressor = self.middleware.create_compressor(
+                    self.encoding
+                )
+                headers = MutableHeaders(raw=start["headers"])
+                headers["Content-Encoding"] = self.encoding
+                headers.add_vary_header("Accept-Encoding")
+                del headers["Content-Length"]
+
+                if not more_body:
+                    # The whole body is known, so it can be sent with the
+                    # compressed content length.
+                    compress, finish = self.compressor
+                    body = compress(body) + finish()
+                    headers["Content-Length"] = str(len(body))
+                    await self._send(start)
+                    await self._send(
+                        {"type": "http.response.body", "body": body}
+                    )
+                    return
+
+            await self._send(start)
+
+        if self.compressor is None:
+            await self._send(message)
+            return
+
+        compress, finish = self.compressor
+        chunk = compress(body)
+        if not more_body:
+            chunk += finish()
+
+        await self._send(
+            {
+                "type": "http.response.body",
+                "body": chunk,
+                "more_body": more_body,
+            }
+        )
+
+    def _should_compress(
+        self,
+        start: Message,
+        body: bytes,
+        more_body: bool,
+    ) -> bool:
+        if not self.middleware.should_compress(start):
+            return False
+        return more_body or len(body) >= self.middleware.minimum_size
+
+    async def _flush_start(self) -> None:
+        if self.start is None:
+            return
+        start, self.start = self.start, None
+        await self._send(start)
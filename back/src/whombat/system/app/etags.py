@@ -0,0 +1,109 @@
+"""Conditional GET support for detail endpoints.
+
+Detail responses include related objects, such as the tags and notes of
+an annotation, which change without updating the object they belong to.
+Database timestamps can therefore not tell whether a response changed,
+so the weak ETag of a response is computed from its body instead. A
+client that sends the ETag back in an If-None-Match header receives an
+empty 304 response if the object has not changed.
+"""
+
+import hashlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+__all__ = [
+    "ETagMiddleware",
+    "compute_etag",
+    "etag_matches",
+]
+
+DETAIL_PATH = "/detail/"
+
+
+def compute_etag(body: bytes) -> str:
+    """Compute the weak ETag of a response body."""
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    """Check if an ETag matches an If-None-Match header.
+
+    Uses the weak comparison, as required for If-None-Match.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque
+        for tag in if_none_match.split(",")
+    )
+
+
+class ETagMiddleware:
+    """Add weak ETags to GET detail responses and answer with 304s."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or DETAIL_PATH not in scope["path"]
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        responder = _ETagResponder(send, if_none_match)
+        await self.app(scope, receive, responder.send)
+
+
+class _ETagResponder:
+    def __init__(self, send: Send, if_none_match: str | None):
+        self._send = send
+        self.if_none_match = if_none_match
+        self.start: Message | None = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            if message["status"] == 200:
+                self.start = message
+                return
+            await self._send(message)
+            return
+
+        if self.start is None:
+            await self._send(message)
+            return
+
+        start, self.start = self.start, None
+        headers = MutableHeaders(raw=start["headers"])
+        if (
+            message["type"] != "http.response.body"
+            or message.get("more_body", False)
+            or "etag" in headers
+        ):
+            # Streamed responses are not buffered to compute their ETag.
+            await self._send(start)
+            await self._send(message)
+            return
+
+        etag = compute_etag(message.get("body", b""))
+        headers["ETag"] = etag
+        if "cache-control" not in headers:
+            headers["Cache-Control"] = "private, no-cache"
+
+        if self.if_none_match is None or not etag_matches(
+            etag, self.if_none_match
+        ):
+            await self._send(start)
+            await self._send(message)
+            return
+
+        del headers["Content-Length"]
+        del headers["Content-Type"]
+        await self._send({**start, "status": 304})
+        await self._send({"type": "http.response.body", "body": b""})
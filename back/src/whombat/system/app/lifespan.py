@@ -1,8 +1,13 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 
 from whombat.system.boot import whombat_init
+from whombat.system.database import (
+    dispose_async_db_engines,
+    run_database_maintenance,
+)
 from whombat.system.settings import Settings
 
 __all__ = ["lifespan"]
@@ -11,6 +16,13 @@ __all__ = ["lifespan"]
 @asynccontextmanager
 async def lifespan(settings: Settings, _: FastAPI):
     """Context manager to run startup and shutdown events."""
-    await whombat_init(settings)
+    if settings.init_on_startup:
+        await whombat_init(settings)
+    maintenance = asyncio.create_task(run_database_maintenance(settings))
 
     yield
+
+    maintenance.cancel()
+    with suppress(asyncio.CancelledError):
+        await maintenance
+    await dispose_async_db_engines(settings)
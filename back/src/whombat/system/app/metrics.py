@@ -0,0 +1,118 @@
+"""Request instrumentation middleware and metrics endpoint."""
+
+import logging
+
+from fastapi import Request
+from fastapi.responses import PlainTextResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from whombat.system.metrics import (
+    render_metrics,
+    request_db_duration,
+    request_db_queries,
+    request_duration,
+    track_request,
+)
+from whombat.system.queries import count_queries
+
+__all__ = [
+    "METRICS_PATH",
+    "MetricsMiddleware",
+    "QueryBudgetMiddleware",
+    "metrics_endpoint",
+]
+
+METRICS_PATH = "/metrics"
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """Record the latency and database usage of each request.
+
+    The timings of the request are also sent to the client in the
+    `Server-Timing` header, where browser developer tools display them.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] == METRICS_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        with track_request() as timings:
+
+            async def send_with_timings(message: Message) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", timings.server_timing())
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timings)
+            finally:
+                route = _get_route_path(scope)
+                request_duration.observe(
+                    timings.elapsed(),
+                    scope["method"],
+                    route,
+                    str(status),
+                )
+                request_db_queries.inc(route, value=timings.db_queries)
+                request_db_duration.inc(
+                    route,
+                    value=timings.durations.get("db", 0),
+                )
+
+
+class QueryBudgetMiddleware:
+    """Warn about requests that execute too many database queries.
+
+    Meant for development, where it points at endpoints that load
+    related objects one query at a time.
+    """
+
+    def __init__(self, app: ASGIApp, budget: int):
+        self.app = app
+        self.budget = budget
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with count_queries() as log:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                if log.count > self.budget:
+                    logger.warning(
+                        "%s %s exceeded the query budget of %d. %s",
+                        scope["method"],
+                        scope["path"],
+                        self.budget,
+                        log.report(),
+                    )
+
+
+async def metrics_endpoint(_: Request) -> PlainTextResponse:
+    """Expose the metrics in the Prometheus text format."""
+    return PlainTextResponse(
+        render_metrics(),
+        media_type=PROMETHEUS_CONTENT_TYPE,
+    )
+
+
+def _get_route_path(scope: Scope) -> str:
+    # Use the route template, not the path, to keep the number of label
+    # values bounded.
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
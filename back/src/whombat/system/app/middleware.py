@@ -5,6 +5,12 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from whombat.system.app.compression import CompressionMiddleware
+from whombat.system.app.etags import ETagMiddleware
+from whombat.system.app.metrics import (
+    MetricsMiddleware,
+    QueryBudgetMiddleware,
+)
 from whombat.system.settings import Settings
 
 logger = logging.getLogger(__name__)
@@ -30,6 +36,26 @@ def add_middlewares(app: FastAPI, settings: Settings):
     if settings.debug:
         app.middleware("http")(debug_exception_handling_middleware)
 
+    # NOTE: Middlewares added last run first. ETags are computed from the
+    # uncompressed body.
+    app.add_middleware(ETagMiddleware)
+
+    if settings.compression:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_minimum_size,
+            media_types=settings.compression_media_types,
+        )
+
+    if settings.metrics:
+        app.add_middleware(MetricsMiddleware)
+
+    if settings.dev:
+        app.add_middleware(
+            QueryBudgetMiddleware,
+            budget=settings.dev_query_budget,
+        )
+
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_origins,
@@ -0,0 +1,131 @@
+"""Fast serialization of API responses.
+
+FastAPI validates the value returned by a route against its response
+model, converts it to JSON compatible Python objects and only then
+renders it to JSON. For routes that already return instances of their
+response model this is redundant work that, for large nested pages such
+as annotation tasks with their clips, recordings and tags, dominates the
+response time.
+
+Routes are therefore wrapped so that, when the returned value exactly
+matches the response model, it is dumped to JSON directly by Pydantic.
+Any other value goes through the regular FastAPI serialization, which is
+rendered with orjson.
+"""
+
+import functools
+import inspect
+from typing import Any, Callable, get_args, get_origin
+
+from fastapi import FastAPI
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.dependencies.models import Dependant
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+from starlette.routing import request_response
+
+from whombat.schemas import Page
+
+__all__ = [
+    "ORJSONResponse",
+    "add_fast_responses",
+    "get_exact_response",
+]
+
+
+def get_exact_response(value: Any, response_model: Any) -> Any | None:
+    """Return the value if it exactly matches the response model.
+
+    Parameters
+    ----------
+    value
+        The value returned by the route.
+    response_model
+        The response model of the route.
+
+    Returns
+    -------
+    Any | None
+        The value to serialize with the response model, or None if the
+        value needs to be validated first. Pages built without type
+        parameters, as most routes do, are rebuilt as pages of the
+        response model type.
+    """
+    if type(value) is response_model:
+        return value
+
+    if type(value) is list and get_origin(response_model) is list:
+        (item_type,) = get_args(response_model)
+        if all(type(item) is item_type for item in value):
+            return value
+        return None
+
+    metadata = getattr(response_model, "__pydantic_generic_metadata__", None)
+    if (
+        metadata is not None
+        and metadata["origin"] is Page
+        and type(value) is Page
+        and all(type(item) is metadata["args"][0] for item in value.items)
+    ):
+        return response_model.model_construct(**dict(value))
+
+    return None
+
+
+def add_fast_responses(app: FastAPI) -> None:
+    """Skip revalidation of responses that match their response model.
+
+    Must be called after all routes have been added to the app.
+    """
+    for route in app.routes:
+        if isinstance(route, APIRoute) and _supports_fast_response(route):
+            route.dependant.call = _wrap_endpoint(route)
+            route.app = request_response(route.get_route_handler())
+
+
+def _wrap_endpoint(route: APIRoute) -> Callable[..., Any]:
+    call = route.dependant.call
+    adapter = TypeAdapter(route.response_model)
+    status_code = route.status_code or 200
+
+    @functools.wraps(call)  # type: ignore
+    async def endpoint(*args, **kwargs):
+        content = await call(*args, **kwargs)  # type: ignore
+        exact = get_exact_response(content, route.response_model)
+        if exact is None:
+            return content
+        return Response(
+            content=adapter.dump_json(exact, by_alias=True),
+            status_code=status_code,
+            media_type="application/json",
+        )
+
+    return endpoint
+
+
+def _supports_fast_response(route: APIRoute) -> bool:
+    response_class = route.response_class
+    if isinstance(response_class, DefaultPlaceholder):
+        response_class = response_class.value
+
+    return (
+        route.response_model is not None
+        and inspect.iscoroutinefunction(route.dependant.call)
+        and response_class in (JSONResponse, ORJSONResponse)
+        and route.response_model_include is None
+        and route.response_model_exclude is None
+        and route.response_model_by_alias
+        and not route.response_model_exclude_unset
+        and not route.response_model_exclude_defaults
+        and not route.response_model_exclude_none
+        and not _sets_response_headers(route.dependant)
+    )
+
+
+def _sets_response_headers(dependant: Dependant) -> bool:
+    # Headers and cookies set on an injected Response are only copied to
+    # responses built by FastAPI.
+    return dependant.response_param_name is not None or any(
+        _sets_response_headers(sub) for sub in dependant.dependencies
+    )
@@ -4,6 +4,7 @@ from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
 from whombat.plugins import add_plugin_pages, add_plugin_routes, load_plugins
+from whombat.system.app.metrics import METRICS_PATH, metrics_endpoint
 from whombat.system.settings import Settings
 
 ROOT_DIR = Path(__file__).parent.parent.parent
@@ -20,6 +21,9 @@ def add_routes(app: FastAPI, settings: Settings):
     main_router = get_main_router(settings)
     app.include_router(main_router)
 
+    if settings.metrics:
+        app.add_route(METRICS_PATH, metrics_endpoint, include_in_schema=False)
+
     # Load plugins.
     for name, plugin in load_plugins():
         add_plugin_routes(app, name, plugin)
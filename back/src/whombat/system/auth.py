@@ -1,7 +1,22 @@
-"""Authentication dependencies."""
+"""Authentication dependencies.
 
+Validating an access token takes two queries, one for the token and one
+for its user, on every authenticated request. Validated tokens are kept
+in a small in-memory cache, together with a detached copy of the user,
+so that repeated requests with the same token skip both queries. Entries
+expire after a short time and are dropped on logout and whenever the
+user is updated or deleted.
+"""
+
+import logging
+import threading
+import time
 import warnings
+from collections import OrderedDict
+from typing import Optional
+from uuid import UUID
 
+from fastapi_users import BaseUserManager
 from fastapi_users.authentication import AuthenticationBackend, CookieTransport
 from fastapi_users.authentication.strategy.db import (
     AccessTokenDatabase,
@@ -10,13 +25,181 @@ from fastapi_users.authentication.strategy.db import (
 from fastapi_users_db_sqlalchemy.access_token import (
     SQLAlchemyAccessTokenDatabase,
 )
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
 
 from whombat import models
+from whombat.system.metrics import record_cache_access
 from whombat.system.settings import Settings
 
+__all__ = [
+    "CachedDatabaseStrategy",
+    "TokenCache",
+    "get_access_token_db",
+    "get_auth_backend",
+    "get_cookie_transport",
+    "get_database_strategy",
+    "token_cache",
+]
+
+logger = logging.getLogger(__name__)
+
 TokenDatabase = AccessTokenDatabase[models.AccessToken]  # type: ignore
 
+TOKEN_CACHE_TTL = 60.0
+"""Seconds a validated token is trusted without checking the database."""
+
+TOKEN_CACHE_SIZE = 1024
+"""Maximum number of tokens kept in the cache."""
+
+QUERIES_PER_LOOKUP = 2
+"""Queries needed to validate a token: the token and its user."""
+
+
+class TokenCache:
+    """Bounded LRU cache of validated tokens with a time to live.
+
+    The cache lives in the memory of one process. When several workers
+    serve the app, a token revoked on one worker would still be accepted
+    by the others until it expires, so :func:`~whombat.system.create_app`
+    disables the cache and every token is checked against the database.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = TOKEN_CACHE_SIZE,
+        ttl: float = TOKEN_CACHE_TTL,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, models.User]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def saved_queries(self) -> int:
+        """Number of queries avoided by cache hits so far."""
+        return self.hits * QUERIES_PER_LOOKUP
+
+    def get(self, token: str) -> models.User | None:
+        """Return the cached user of a token, if still valid."""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[token]
+                self.misses += 1
+                record_cache_access("auth_tokens", hit=False)
+                return None
+
+            self._entries.move_to_end(token)
+            self.hits += 1
+            record_cache_access("auth_tokens", hit=True)
+            return entry[1]
+
+    def set(self, token: str, user: models.User) -> None:
+        """Cache the user of a validated token."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[token] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate_token(self, token: str) -> None:
+        """Forget a token."""
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        """Forget all tokens of a user."""
+        with self._lock:
+            for token, (_, user) in list(self._entries.items()):
+                if user.id == user_id:
+                    del self._entries[token]
+
+    def clear(self) -> None:
+        """Forget all tokens."""
+        with self._lock:
+            self._entries.clear()
+
+    def disable(self) -> None:
+        """Stop caching tokens and forget the cached ones."""
+        self.enabled = False
+        self.clear()
+
+
+token_cache = TokenCache()
+"""Token cache shared by all requests of this process."""
+
+
+class CachedDatabaseStrategy(DatabaseStrategy):
+    """Database strategy that caches validated tokens."""
+
+    def __init__(
+        self,
+        database: TokenDatabase,
+        lifetime_seconds: Optional[int] = None,
+        cache: TokenCache = token_cache,
+    ):
+        super().__init__(database, lifetime_seconds)  # type: ignore
+        self.cache = cache
+
+    async def read_token(
+        self,
+        token: Optional[str],
+        user_manager: BaseUserManager[models.User, UUID],  # type: ignore
+    ) -> Optional[models.User]:
+        if token is None:
+            return None
+
+        session: AsyncSession = user_manager.user_db.session  # type: ignore
+        cached = self.cache.get(token)
+        if cached is not None:
+            logger.debug(
+                "Token cache hit, saved %d queries (%d in total)",
+                QUERIES_PER_LOOKUP,
+                self.cache.saved_queries,
+            )
+            return await session.merge(cached, load=False)
+
+        user = await super().read_token(token, user_manager)
+        if user is not None:
+            self.cache.set(token, _detached_copy(user))
+        return user
+
+    async def destroy_token(self, token: str, user: models.User) -> None:
+        self.cache.invalidate_token(token)
+        await super().destroy_token(token, user)
+
+
+def _detached_copy(user: models.User) -> models.User:
+    """Copy the column values of a user into a new detached instance.
+
+    The copy can be attached to any session with `merge(load=False)`,
+    which does not query the database.
+    """
+    mapper = inspect(models.User)
+    copy = mapper.class_manager.new_instance()
+    for attr in mapper.column_attrs:
+        set_committed_value(copy, attr.key, getattr(user, attr.key))
+    make_transient_to_detached(copy)
+    return copy
+
 
 def get_access_token_db(session: AsyncSession):
     """Get the access token database."""
@@ -30,8 +213,8 @@ def get_database_strategy(
     access_token_db: TokenDatabase,
 ) -> DatabaseStrategy:
     """Get the database strategy."""
-    return DatabaseStrategy(
-        access_token_db,  # type: ignore
+    return CachedDatabaseStrategy(
+        access_token_db,
         lifetime_seconds=24 * 3600,
     )
 
@@ -1,10 +1,13 @@
 """Function to initialize the database."""
 
+import asyncio
+import functools
 import logging
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from enum import Enum
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Mapping
 
 from alembic import script
 from alembic.command import stamp, upgrade
@@ -31,11 +34,16 @@ __all__ = [
     "create_or_update_db",
     "create_async_db_engine",
     "create_sync_db_engine",
+    "dispose_async_db_engines",
+    "get_async_db_engine",
     "get_database_url",
     "get_db_state",
+    "get_sqlite_pragmas",
     "init_database",
     "get_async_session",
     "models",
+    "optimize_database",
+    "run_database_maintenance",
     "run_migrations",
     "validate_database_url",
 ]
@@ -129,7 +137,37 @@ def get_database_url(
     return validate_database_url(url, is_async=is_async)
 
 
-def create_async_db_engine(database_url: str | URL) -> AsyncEngine:
+def get_sqlite_pragmas(settings: Settings) -> dict[str, str | int]:
+    """Get the pragmas of the configured SQLite tuning profile.
+
+    Parameters
+    ----------
+    settings : Settings
+        The settings for the application.
+
+    Returns
+    -------
+    dict[str, str | int]
+        The pragmas to set on every new SQLite connection.
+    """
+    if settings.db_sqlite_profile != "performance":
+        return {}
+
+    return {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": settings.db_sqlite_mmap_size,
+        # Negative values are interpreted as KiB instead of pages.
+        "cache_size": -settings.db_sqlite_cache_size,
+        "temp_store": "MEMORY",
+        "busy_timeout": settings.db_sqlite_busy_timeout,
+    }
+
+
+def create_async_db_engine(
+    database_url: str | URL,
+    sqlite_pragmas: Mapping[str, str | int] | None = None,
+) -> AsyncEngine:
     """Create the database engine.
 
     Parameters
@@ -138,6 +176,9 @@ def create_async_db_engine(database_url: str | URL) -> AsyncEngine:
         The url to the database. Defaults to `sqlite+aiosqlite://`. See
         https://docs.sqlalchemy.org/en/14/core/engines.html#database-urls for
         more information on the format.
+    sqlite_pragmas : Mapping[str, str | int], optional
+        Pragmas to set on every new connection if the database is SQLite.
+        See `get_sqlite_pragmas`.
 
     Notes
     -----
@@ -153,7 +194,117 @@ def create_async_db_engine(database_url: str | URL) -> AsyncEngine:
         database_url = make_url(database_url)
 
     database_url = validate_database_url(database_url, is_async=True)
-    return create_async_engine(database_url)
+    engine = create_async_engine(database_url)
+
+    if sqlite_pragmas and database_url.get_backend_name() == "sqlite":
+        event.listen(
+            engine.sync_engine,
+            "connect",
+            functools.partial(set_sqlite_pragmas, sqlite_pragmas),
+        )
+
+    return engine
+
+
+MAX_CACHED_ENGINES = 8
+"""Maximum number of engines kept by `get_async_db_engine`."""
+
+_engines: OrderedDict[tuple, AsyncEngine] = OrderedDict()
+
+_disposing: set[asyncio.Task] = set()
+
+
+def get_async_db_engine(settings: Settings) -> AsyncEngine:
+    """Get the shared database engine for the settings.
+
+    Engines, and with them their connection pools, are reused across
+    requests instead of being created for each one. This keeps SQLite
+    page caches and memory maps warm and avoids reconnecting to the
+    database on every request.
+
+    Parameters
+    ----------
+    settings : Settings
+        The settings for the application.
+
+    Returns
+    -------
+    AsyncEngine
+        The database engine.
+    """
+    url = get_database_url(settings)
+    pragmas = get_sqlite_pragmas(settings)
+
+    # Async drivers bind connections to the event loop that opened them.
+    loop = asyncio.get_running_loop()
+    key = (
+        id(loop),
+        url.render_as_string(hide_password=False),
+        tuple(sorted(pragmas.items())),
+    )
+
+    engine = _engines.get(key)
+    if engine is not None:
+        _engines.move_to_end(key)
+        return engine
+
+    engine = create_async_db_engine(url, sqlite_pragmas=pragmas)
+    _engines[key] = engine
+    while len(_engines) > MAX_CACHED_ENGINES:
+        _, evicted = _engines.popitem(last=False)
+        task = loop.create_task(evicted.dispose())
+        _disposing.add(task)
+        task.add_done_callback(_disposing.discard)
+    return engine
+
+
+async def dispose_async_db_engines(settings: Settings | None = None) -> None:
+    """Dispose the shared engines of the settings, or all of them."""
+    url = None
+    if settings is not None:
+        url = get_database_url(settings).render_as_string(hide_password=False)
+
+    for key in list(_engines):
+        if url is None or key[1] == url:
+            await _engines.pop(key).dispose()
+
+
+async def optimize_database(engine: AsyncEngine) -> None:
+    """Run routine maintenance on the database.
+
+    For SQLite databases this lets SQLite refresh the statistics used by
+    the query planner with `PRAGMA optimize`, and moves the write-ahead
+    log into the database file, truncating the log. Other databases take
+    care of this on their own.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    async with engine.connect() as conn:
+        await conn.exec_driver_sql("PRAGMA optimize")
+        result = await conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        busy, log_frames, checkpointed = result.one()
+
+    logger.debug(
+        "Database maintenance done (busy=%s, log=%s, checkpointed=%s)",
+        busy,
+        log_frames,
+        checkpointed,
+    )
+
+
+async def run_database_maintenance(settings: Settings) -> None:
+    """Run database maintenance periodically, until cancelled."""
+    interval = settings.db_maintenance_interval
+    if interval <= 0:
+        return
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await optimize_database(get_async_db_engine(settings))
+        except Exception:
+            logger.exception("Database maintenance failed")
 
 
 def create_sync_db_engine(database_url: str | URL) -> Engine:
@@ -270,6 +421,18 @@ def is_sqlite(dbapi_connection: DBAPIConnection) -> bool:
     return dbapi is not None and hasattr(dbapi, "sqlite_version")
 
 
+def set_sqlite_pragmas(
+    pragmas: Mapping[str, str | int],
+    dbapi_connection: DBAPIConnection,
+    _,
+) -> None:
+    """Set pragmas on a new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
 @event.listens_for(Engine, "connect")
 def enable_foreign_key_support_sqlite(dbapi_connection: DBAPIConnection, _):
     if not is_sqlite(dbapi_connection):
@@ -283,8 +446,13 @@ def enable_foreign_key_support_sqlite(dbapi_connection: DBAPIConnection, _):
 async def init_database(settings: Settings) -> None:
     """Create the database and tables on startup."""
     db_url = get_database_url(settings)
-    engine = create_async_db_engine(db_url)
+    engine = create_async_db_engine(
+        db_url,
+        sqlite_pragmas=get_sqlite_pragmas(settings),
+    )
 
     async with engine.begin() as conn:
         cfg = create_alembic_config(db_url, is_async=False)
         await conn.run_sync(create_or_update_db, cfg)
+
+    await engine.dispose()
@@ -0,0 +1,350 @@
+"""In-process performance metrics.
+
+Metrics are kept in memory and rendered in the Prometheus text format,
+so no external service is needed to collect them. Besides the global
+metrics, the timings of the request being handled are accumulated in a
+`RequestTimings` object, which is used to build the `Server-Timing`
+header of the response.
+
+The time spent executing database queries is recorded through
+SQLAlchemy cursor events, and compute heavy functions, such as loading
+audio or computing spectrograms, are recorded with the `timed`
+decorator.
+"""
+
+import functools
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, ParamSpec, Sequence, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+__all__ = [
+    "Counter",
+    "Histogram",
+    "RequestTimings",
+    "cache_requests",
+    "compute_duration",
+    "db_query_duration",
+    "get_request_timings",
+    "record_cache_access",
+    "render_metrics",
+    "request_db_duration",
+    "request_db_queries",
+    "request_duration",
+    "timed",
+    "track_request",
+]
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+"""Histogram bucket upper bounds in seconds."""
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+class Counter:
+    """A monotonically increasing value per label combination."""
+
+    type = "counter"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, value: float = 1) -> None:
+        """Increase the counter of the given label values."""
+        with self._lock:
+            self._values[labels] += value
+
+    def get(self, *labels: str) -> float:
+        """Get the counter of the given label values."""
+        return self._values.get(labels, 0)
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Iterate over the samples of the metric."""
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield (
+                self.name,
+                dict(zip(self.labelnames, labels, strict=True)),
+                value,
+            )
+
+    def clear(self) -> None:
+        """Remove all values."""
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """Distribution of observed values per label combination."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[tuple[str, ...], list[int]] = {}
+        self._sums: dict[tuple[str, ...], float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record an observation for the given label values."""
+        with self._lock:
+            counts = self._counts.get(labels)
+            if counts is None:
+                counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._sums[labels] += value
+
+    def count(self, *labels: str) -> int:
+        """Get the number of observations for the given label values."""
+        return sum(self._counts.get(labels, []))
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Iterate over the samples of the metric."""
+        with self._lock:
+            items = [
+                (labels, list(counts), self._sums[labels])
+                for labels, counts in self._counts.items()
+            ]
+        for labels, counts, total in items:
+            base = dict(zip(self.labelnames, labels, strict=True))
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts, strict=False):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket",
+                    {**base, "le": repr(bound)},
+                    cumulative,
+                )
+            cumulative += counts[-1]
+            yield f"{self.name}_bucket", {**base, "le": "+Inf"}, cumulative
+            yield f"{self.name}_sum", base, total
+            yield f"{self.name}_count", base, cumulative
+
+    def clear(self) -> None:
+        """Remove all observations."""
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+
+
+request_duration = Histogram(
+    "whombat_http_request_duration_seconds",
+    "Time spent handling HTTP requests.",
+    ["method", "route", "status"],
+)
+
+request_db_queries = Counter(
+    "whombat_http_request_db_queries_total",
+    "Database queries executed while handling HTTP requests.",
+    ["route"],
+)
+
+request_db_duration = Counter(
+    "whombat_http_request_db_seconds_total",
+    "Time spent in database queries while handling HTTP requests.",
+    ["route"],
+)
+
+db_query_duration = Histogram(
+    "whombat_db_query_duration_seconds",
+    "Time spent executing database queries.",
+)
+
+compute_duration = Histogram(
+    "whombat_compute_duration_seconds",
+    "Time spent in compute heavy tasks, such as computing spectrograms.",
+    ["task"],
+)
+
+cache_requests = Counter(
+    "whombat_cache_requests_total",
+    "Cache lookups by cache and result.",
+    ["cache", "result"],
+)
+
+METRICS = [
+    request_duration,
+    request_db_queries,
+    request_db_duration,
+    db_query_duration,
+    compute_duration,
+    cache_requests,
+]
+
+
+@dataclass
+class RequestTimings:
+    """Timings accumulated while handling a single request."""
+
+    start: float = field(default_factory=time.perf_counter)
+    """Time at which the request started."""
+
+    db_queries: int = 0
+    """Number of database queries executed."""
+
+    durations: dict[str, float] = field(
+        default_factory=lambda: defaultdict(float)
+    )
+    """Total seconds spent on each kind of work, such as `db`."""
+
+    def add(self, name: str, duration: float) -> None:
+        """Add the time spent on some kind of work."""
+        self.durations[name] += duration
+
+    def elapsed(self) -> float:
+        """Seconds since the request started."""
+        return time.perf_counter() - self.start
+
+    def server_timing(self) -> str:
+        """Format the timings as the value of a Server-Timing header."""
+        entries = [f"app;dur={self.elapsed() * 1000:.1f}"]
+        for name, duration in self.durations.items():
+            entry = f"{name};dur={duration * 1000:.1f}"
+            if name == "db":
+                entry += f';desc="{self.db_queries} queries"'
+            entries.append(entry)
+        return ", ".join(entries)
+
+
+_request_timings: ContextVar[RequestTimings | None] = ContextVar(
+    "whombat_request_timings",
+    default=None,
+)
+
+
+def get_request_timings() -> RequestTimings | None:
+    """Get the timings of the request being handled, if any."""
+    return _request_timings.get()
+
+
+@contextmanager
+def track_request() -> Iterator[RequestTimings]:
+    """Accumulate the timings of the work done within the context."""
+    timings = RequestTimings()
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def timed(task: str) -> Callable[[Callable[P, T]], Callable[P, T]]:
+    """Record the time spent in a function as a compute task.
+
+    Nested timed functions are recorded separately, so the time of a
+    spectrogram includes the time spent loading its audio.
+    """
+
+    def decorator(func: Callable[P, T]) -> Callable[P, T]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                compute_duration.observe(duration, task)
+                timings = _request_timings.get()
+                if timings is not None:
+                    timings.add(task, duration)
+
+        return wrapper
+
+    return decorator
+
+
+def record_cache_access(cache: str, hit: bool) -> None:
+    """Record a lookup in one of the application caches."""
+    cache_requests.inc(cache, "hit" if hit else "miss")
+
+
+def render_metrics() -> str:
+    """Render all metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for name, labels, value in metric.samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _format(value: float) -> str:
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"'))
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, _):
+    if context is not None:
+        context._whombat_query_start = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(conn, cursor, statement, parameters, context, _):
+    start = getattr(context, "_whombat_query_start", None)
+    if start is None:
+        return
+
+    duration = time.perf_counter() - start
+    db_query_duration.observe(duration)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.db_queries += 1
+        timings.add("db", duration)
@@ -0,0 +1,123 @@
+"""Database query counting.
+
+Loading related objects one row at a time, instead of in a single query,
+is an easy mistake to make with an ORM and it is invisible in small test
+databases. The `count_queries` context manager records every statement
+executed within it, so tests can assert a query budget for an operation,
+and the application can warn in development mode when a request executes
+more queries than expected.
+
+Statements are recorded through SQLAlchemy cursor events, so every
+engine is observed. Repeated statements are grouped by their
+fingerprint, the SQL text with literals and parameter lists collapsed,
+which points directly at the query that is run once per row.
+"""
+
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+__all__ = [
+    "QueryLog",
+    "count_queries",
+    "fingerprint",
+]
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAMETER = re.compile(r"\?|%\(\w+\)s|%s|:\w+|\$\d+")
+_PARAMETER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a SQL statement to group repetitions of the same query.
+
+    Literals and bound parameters are replaced by `?`, and lists of
+    parameters, such as those of `IN` clauses, by a single `(...)`.
+    """
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _STRING.sub("?", statement)
+    statement = _PARAMETER.sub("?", statement)
+    statement = _NUMBER.sub("?", statement)
+    return _PARAMETER_LIST.sub("(...)", statement)
+
+
+@dataclass
+class QueryLog:
+    """Statements executed within a `count_queries` context."""
+
+    statements: list[str] = field(default_factory=list)
+    """SQL of the executed statements, in execution order."""
+
+    @property
+    def count(self) -> int:
+        """Number of executed statements."""
+        return len(self.statements)
+
+    def repeated(self, min_count: int = 2) -> list[tuple[str, int]]:
+        """Get the fingerprints executed at least `min_count` times.
+
+        Returns
+        -------
+        list[tuple[str, int]]
+            Fingerprints and their number of executions, most frequent
+            first.
+        """
+        counts = Counter(fingerprint(sql) for sql in self.statements)
+        return [
+            (sql, count)
+            for sql, count in counts.most_common()
+            if count >= min_count
+        ]
+
+    def report(self, max_length: int = 200) -> str:
+        """Summarize the executed statements for error and log messages."""
+        lines = [f"{self.count} queries executed."]
+        repeated = self.repeated()
+        if repeated:
+            lines.append("Repeated queries:")
+        for sql, count in repeated:
+            if len(sql) > max_length:
+                sql = sql[: max_length - 3] + "..."
+            lines.append(f"  {count}x {sql}")
+        return "\n".join(lines)
+
+
+_active_logs: ContextVar[tuple[QueryLog, ...]] = ContextVar(
+    "whombat_query_logs",
+    default=(),
+)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryLog]:
+    """Record the database queries executed within the context.
+
+    Contexts can be nested, and each of them records all the queries
+    executed within it.
+
+    Examples
+    --------
+    >>> with count_queries() as log:
+    ...     await api.annotation_tasks.get_many(session, limit=100)
+    >>> assert log.count <= 5, log.report()
+    """
+    log = QueryLog()
+    token = _active_logs.set((*_active_logs.get(), log))
+    try:
+        yield log
+    finally:
+        _active_logs.reset(token)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _log_query(conn, cursor, statement, parameters, context, executemany):
+    for log in _active_logs.get():
+        log.statements.append(statement)
@@ -107,6 +107,32 @@ class Settings(BaseSettings):
     Only use this if you know what you are doing.
     """
 
+    db_sqlite_profile: Literal["default", "performance"] = "performance"
+    """Tuning profile applied to SQLite connections.
+
+    The `performance` profile uses write-ahead logging, so that readers
+    do not block writers, relaxes fsync calls to `synchronous=NORMAL`
+    and enables memory mapping. Use `default` to keep the SQLite
+    defaults, for example when the database lives on a network drive,
+    where write-ahead logging is not supported.
+    """
+
+    db_sqlite_mmap_size: int = 256 * 1024 * 1024
+    """Bytes of the SQLite database file to memory map."""
+
+    db_sqlite_cache_size: int = 64 * 1024
+    """KiB of page cache per SQLite connection."""
+
+    db_sqlite_busy_timeout: int = 5000
+    """Milliseconds to wait for a lock before failing with busy errors."""
+
+    db_maintenance_interval: float = 3600
+    """Seconds between database maintenance runs.
+
+    Maintenance runs `PRAGMA optimize` and checkpoints the write-ahead
+    log of SQLite databases. Set to 0 to disable it.
+    """
+
     audio_dir: Path = Path.home()
     """Directory where the all audio files are stored.
 
@@ -118,12 +144,40 @@ class Settings(BaseSettings):
     outside of the audio directory.
     """
 
+    audio_backend: Literal["torch", "numpy"] = "torch"
+    """Signal processing backend used to resample, filter and compute
+    spectrograms.
+
+    The `numpy` backend gives the same results as `torch` without
+    loading `torch`, which reduces the memory and startup time of every
+    server process.
+    """
+
     host: str = "localhost"
     """Host on which the backend is running."""
 
     port: int = 5000
     """Port on which the backend is running."""
 
+    workers: int = 1
+    """Number of server processes.
+
+    Audio and spectrogram computations hold the GIL, so a single process
+    uses a single core. With more than one worker, migrations and other
+    startup work run once in the main process, and the spectrogram and
+    audio metadata caches and the state of background jobs are shared by
+    all workers through a SQLite file in the application data directory.
+    Login tokens and group roles are then checked against the database on
+    every request. Ignored in development mode.
+    """
+
+    init_on_startup: bool = True
+    """Run migrations and the startup checks when the app starts.
+
+    Disabled in the workers of a multi-worker server, where the main
+    process runs them once before the workers start.
+    """
+
     domain: str = "localhost"
     """Domain on which the backend is running."""
 
@@ -151,6 +205,44 @@ class Settings(BaseSettings):
     If not specified, will be automatically generated based on domain and frontend port.
     """
 
+    compression: bool = True
+    """Compress responses with gzip, or brotli if it is installed."""
+
+    compression_minimum_size: int = 1024
+    """Responses smaller than this number of bytes are not compressed."""
+
+    compression_media_types: list[str] = [
+        "application/json",
+        "application/javascript",
+        "text/csv",
+        "text/css",
+        "text/html",
+        "text/plain",
+        "image/svg+xml",
+    ]
+    """Media types of the responses that are compressed.
+
+    Audio and image streams are already compressed, or are streamed in
+    ranges, so they are not included.
+    """
+
+    metrics: bool = False
+    """Record request metrics.
+
+    Metrics are exposed in the Prometheus format on `/metrics` and the
+    timings of each request are sent in the `Server-Timing` header. The
+    endpoint does not require a login and reveals the routes and load of
+    the server, so when enabling it on a public server, restrict access
+    to `/metrics` in the reverse proxy.
+    """
+
+    dev_query_budget: int = 50
+    """Maximum number of database queries per request in development.
+
+    In development mode, a warning listing the repeated queries is
+    logged for every request that executes more queries than this.
+    """
+
     open_on_startup: bool = True
     """Open the application in the browser on startup."""
 
@@ -9,6 +9,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
+from whombat.system.auth import token_cache
 
 __all__ = [
     "UserDatabase",
@@ -56,6 +57,19 @@ class UserDatabase(SQLAlchemyUserDatabase):
         )
         return await self._get_user(statement)
 
+    async def update(
+        self, user: models.User, update_dict: dict
+    ) -> models.User:
+        """Update a user and forget their cached access tokens."""
+        user = await super().update(user, update_dict)
+        token_cache.invalidate_user(user.id)
+        return user
+
+    async def delete(self, user: models.User) -> None:
+        """Delete a user and forget their cached access tokens."""
+        token_cache.invalidate_user(user.id)
+        await super().delete(user)
+
 
 class UserManager(
     UUIDIDMixin,
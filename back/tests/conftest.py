@@ -6,8 +6,9 @@ import random
 import shutil
 import string
 from collections.abc import Awaitable, Callable
+from contextlib import AbstractContextManager, contextmanager
 from pathlib import Path
-from typing import AsyncGenerator, Optional
+from typing import AsyncGenerator, Iterator, Optional
 
 import numpy as np
 import pytest
@@ -18,6 +19,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import api, cache, models, schemas
 from whombat.system import get_database_url, init_database
+from whombat.system.queries import QueryLog, count_queries
 from whombat.system.settings import Settings
 
 # Avoid noisy logging during tests.
@@ -197,6 +199,27 @@ async def session(
         yield sess
 
 
+@pytest.fixture
+def max_queries() -> Callable[[int], AbstractContextManager[QueryLog]]:
+    """Assert that a block executes at most a number of queries.
+
+    Examples
+    --------
+    >>> with max_queries(3):
+    ...     await api.annotation_tasks.get_many(session, limit=100)
+    """
+
+    @contextmanager
+    def check(budget: int) -> Iterator[QueryLog]:
+        with count_queries() as log:
+            yield log
+        assert (
+            log.count <= budget
+        ), f"Query budget of {budget} exceeded. {log.report()}"
+
+    return check
+
+
 @pytest.fixture
 async def user(session: AsyncSession) -> schemas.SimpleUser:
     """Create a user for tests."""
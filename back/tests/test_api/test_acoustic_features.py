@@ -0,0 +1,93 @@
+"""Test suite for the acoustic feature extraction."""
+
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+import xarray as xr
+from soundevent import data
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, schemas
+from whombat.api.acoustic_features import (
+    ACOUSTIC_FEATURES,
+    compute_acoustic_features,
+)
+
+
+def test_compute_acoustic_features_of_many_events():
+    freqs = np.linspace(0, 10_000, 101)
+    times = np.linspace(0, 1, 11)
+    power = np.full((len(freqs), len(times)), 1e-6)
+    power[20, :5] = 1  # 2 kHz tone in the first half
+    power[60, 5:] = 1  # 6 kHz tone in the second half
+    spectrogram = xr.DataArray(
+        power,
+        dims=("frequency", "time"),
+        coords={"frequency": freqs, "time": times},
+    )
+
+    values = compute_acoustic_features(
+        spectrogram,
+        np.array(
+            [
+                [0.0, 1_000, 0.4, 3_000],
+                [0.5, 5_000, 1.0, 7_000],
+                [0.0, 0, 1.0, 20_000],
+            ]
+        ),
+    )
+
+    assert values.shape == (3, len(ACOUSTIC_FEATURES))
+    features = dict(zip(ACOUSTIC_FEATURES, values.T, strict=True))
+    assert np.allclose(features["peak_frequency"][:2], [2_000, 6_000])
+    assert np.allclose(features["spectral_centroid"][:2], [2_000, 6_000])
+    assert np.allclose(features["spectral_centroid"][2], 4_000, rtol=0.05)
+    assert features["spectral_bandwidth"][0] < 10
+    assert features["spectral_bandwidth"][2] > 1_000
+    assert np.all(features["spectral_flatness"] < 0.1)
+
+
+async def test_compute_dataset_acoustic_features(
+    session: AsyncSession,
+    dataset: schemas.Dataset,
+    dataset_dir: Path,
+    audio_dir: Path,
+):
+    samplerate = 22_050
+    t = np.arange(samplerate) / samplerate
+    path = dataset_dir / "tone.wav"
+    sf.write(path, 0.5 * np.sin(2 * np.pi * 3_000 * t), samplerate)
+    recording = await api.recordings.create(
+        session,
+        path=path,
+        audio_dir=audio_dir,
+    )
+    await api.datasets.add_recording(session, dataset, recording)
+    sound_event = await api.sound_events.create(
+        session,
+        recording=recording,
+        geometry=data.BoundingBox(coordinates=[0.2, 2_000, 0.8, 4_000]),
+    )
+
+    processed = await api.compute_dataset_acoustic_features(
+        session,
+        dataset,
+        audio_dir=audio_dir,
+    )
+
+    assert processed == 1
+    sound_event = await api.sound_events.get(session, sound_event.uuid)
+    features = {f.name: f.value for f in sound_event.features}
+    assert set(ACOUSTIC_FEATURES) <= set(features)
+    assert abs(features["peak_frequency"] - 3_000) < 50
+    assert abs(features["spectral_centroid"] - 3_000) < 200
+
+    # Recomputing overwrites the stored values.
+    await api.compute_dataset_acoustic_features(
+        session,
+        dataset,
+        audio_dir=audio_dir,
+    )
+    sound_event = await api.sound_events.get(session, sound_event.uuid)
+    assert len(sound_event.features) == len(features)
@@ -1,10 +1,17 @@
 """Test suite for annotation task API."""
 
+from pathlib import Path
+from typing import Callable
+
 import pytest
+from soundevent import data
+from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from whombat import api, schemas
+from whombat import api, exceptions, models, schemas
+from whombat.filters import annotation_tasks as task_filters
+from whombat.filters.clips import DatasetFilter
 
 
 async def test_cant_delete_annotation_task_clip(
@@ -15,3 +22,274 @@ async def test_cant_delete_annotation_task_clip(
 
     with pytest.raises(IntegrityError):
         await api.clips.delete(session, clip)
+
+
+async def test_can_create_tasks_from_a_clip_query(
+    session: AsyncSession,
+    annotation_project: schemas.AnnotationProject,
+    dataset: schemas.Dataset,
+    clip: schemas.Clip,
+    random_wav_factory: Callable[..., Path],
+    audio_dir: Path,
+    user: schemas.SimpleUser,
+):
+    recording = await api.recordings.create(
+        session,
+        path=random_wav_factory(audio_dir / dataset.audio_dir / "file.wav"),
+        audio_dir=audio_dir,
+    )
+    await api.datasets.add_recording(session, dataset, recording)
+    clips = [
+        await api.clips.create(
+            session,
+            recording=recording,
+            start_time=index / 100,
+            end_time=(index + 1) / 100,
+        )
+        for index in range(3)
+    ]
+    existing = await api.annotation_projects.add_task(
+        session,
+        annotation_project,
+        clips[0],
+        user=user,
+    )
+
+    task_uuids = await api.annotation_projects.add_tasks_from_clips(
+        session,
+        annotation_project,
+        filters=[DatasetFilter(eq=dataset.uuid)],
+        user=user,
+    )
+
+    assert len(task_uuids) == 2
+    assert existing.uuid not in task_uuids
+    rows = (
+        await session.execute(
+            select(models.Clip.uuid, models.ClipAnnotation.clip_id)
+            .join(
+                models.AnnotationTask,
+                models.AnnotationTask.clip_id == models.Clip.id,
+            )
+            .join(
+                models.ClipAnnotation,
+                models.AnnotationTask.clip_annotation_id
+                == models.ClipAnnotation.id,
+            )
+            .where(
+                models.AnnotationTask.annotation_project_id
+                == annotation_project.id
+            )
+        )
+    ).all()
+    assert {row[0] for row in rows} == {c.uuid for c in clips}
+    assert clip.uuid not in {row[0] for row in rows}
+    assert all(
+        row[1] == next(c.id for c in clips if c.uuid == row[0]) for row in rows
+    )
+
+    # Running the query again does not create any new tasks or annotations.
+    annotations = await session.scalar(
+        select(func.count()).select_from(models.ClipAnnotation)
+    )
+    assert (
+        await api.annotation_tasks.create_from_clips(
+            session,
+            annotation_project,
+            filters=[DatasetFilter(eq=dataset.uuid)],
+            batch_size=1,
+        )
+        == []
+    )
+    assert annotations == await session.scalar(
+        select(func.count()).select_from(models.ClipAnnotation)
+    )
+
+
+async def test_status_flags_follow_status_badges(
+    session: AsyncSession,
+    annotation_task: schemas.AnnotationTask,
+    user: schemas.SimpleUser,
+):
+    async def get_flags():
+        row = (
+            await session.execute(
+                select(
+                    models.AnnotationTask.is_completed,
+                    models.AnnotationTask.is_verified,
+                    models.AnnotationTask.is_rejected,
+                    models.AnnotationTask.is_assigned,
+                    models.AnnotationTask.assigned_to_id,
+                ).where(models.AnnotationTask.id == annotation_task.id)
+            )
+        ).one()
+        return tuple(row)
+
+    assert await get_flags() == (False, False, False, False, None)
+
+    annotation_task = await api.annotation_tasks.add_status_badge(
+        session,
+        annotation_task,
+        state=data.AnnotationState.assigned,
+        user=user,
+    )
+    annotation_task = await api.annotation_tasks.add_status_badge(
+        session,
+        annotation_task,
+        state=data.AnnotationState.completed,
+    )
+    assert await get_flags() == (True, False, False, True, user.id)
+
+    tasks, _ = await api.annotation_tasks.get_many(
+        session,
+        filters=[
+            task_filters.IsCompletedFilter(eq=True),
+            task_filters.AssignedToFilter(eq=user.id),
+        ],
+    )
+    assert [task.uuid for task in tasks] == [annotation_task.uuid]
+    tasks, _ = await api.annotation_tasks.get_many(
+        session,
+        filters=[task_filters.PendingFilter(eq=True)],
+    )
+    assert tasks == []
+
+    await api.annotation_tasks.remove_status_badge(
+        session,
+        annotation_task,
+        state=data.AnnotationState.assigned,
+    )
+    assert await get_flags() == (True, False, False, False, None)
+
+
+async def test_tasks_assigned_to_several_users_are_in_every_queue(
+    session: AsyncSession,
+    annotation_project: schemas.AnnotationProject,
+    annotation_task: schemas.AnnotationTask,
+    user: schemas.SimpleUser,
+    other_user: schemas.SimpleUser,
+):
+    for assignee in [user, other_user]:
+        annotation_task = await api.annotation_tasks.add_status_badge(
+            session,
+            annotation_task,
+            state=data.AnnotationState.assigned,
+            user=assignee,
+        )
+
+    for assignee in [user, other_user]:
+        tasks, _ = await api.annotation_tasks.get_many(
+            session,
+            filters=[task_filters.AssignedToFilter(eq=assignee.id)],
+        )
+        assert [task.uuid for task in tasks] == [annotation_task.uuid]
+
+        task = await api.annotation_tasks.get_next(
+            session,
+            annotation_project,
+            claim_for=assignee,
+        )
+        assert task.uuid == annotation_task.uuid
+
+
+async def test_get_next_task_seeks_after_the_current_task(
+    session: AsyncSession,
+    annotation_project: schemas.AnnotationProject,
+    recording: schemas.Recording,
+    user: schemas.SimpleUser,
+):
+    tasks = []
+    for index in range(3):
+        clip = await api.clips.create(
+            session,
+            recording=recording,
+            start_time=index / 100,
+            end_time=(index + 1) / 100,
+        )
+        tasks.append(
+            await api.annotation_projects.add_task(
+                session,
+                annotation_project,
+                clip,
+                user=user,
+            )
+        )
+    await api.annotation_tasks.add_status_badge(
+        session,
+        tasks[1],
+        state=data.AnnotationState.completed,
+    )
+
+    first = await api.annotation_tasks.get_next(session, annotation_project)
+    second = await api.annotation_tasks.get_next(
+        session,
+        annotation_project,
+        after=first,
+        filters=[task_filters.PendingFilter(eq=True)],
+    )
+
+    assert first.uuid == tasks[0].uuid
+    assert second.uuid == tasks[2].uuid
+    with pytest.raises(exceptions.NotFoundError):
+        await api.annotation_tasks.get_next(
+            session,
+            annotation_project,
+            after=second,
+        )
+
+
+async def test_claimed_tasks_are_skipped_by_other_users(
+    session: AsyncSession,
+    annotation_project: schemas.AnnotationProject,
+    recording: schemas.Recording,
+    user: schemas.SimpleUser,
+):
+    other = await api.users.create(
+        session,
+        username="other",
+        password="password",
+        email="other@whombat.com",
+    )
+    for index in range(2):
+        clip = await api.clips.create(
+            session,
+            recording=recording,
+            start_time=index / 100,
+            end_time=(index + 1) / 100,
+        )
+        await api.annotation_projects.add_task(
+            session,
+            annotation_project,
+            clip,
+            user=user,
+        )
+
+    claimed = await api.annotation_tasks.get_next(
+        session,
+        annotation_project,
+        claim_for=user,
+    )
+    again = await api.annotation_tasks.get_next(
+        session,
+        annotation_project,
+        claim_for=user,
+    )
+    other_claimed = await api.annotation_tasks.get_next(
+        session,
+        annotation_project,
+        claim_for=other,
+    )
+
+    assert again.uuid == claimed.uuid
+    assert other_claimed.uuid != claimed.uuid
+    assert [
+        (badge.state, badge.user.id if badge.user else None)
+        for badge in claimed.status_badges
+    ] == [(data.AnnotationState.assigned, user.id)]
+    with pytest.raises(exceptions.NotFoundError):
+        await api.annotation_tasks.get_next(
+            session,
+            annotation_project,
+            after=other_claimed,
+            claim_for=other,
+        )
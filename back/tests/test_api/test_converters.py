@@ -0,0 +1,166 @@
+"""Test suite for the bulk soundevent converters."""
+
+from pathlib import Path
+
+from soundevent import data
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, schemas
+from whombat.api import converters
+
+
+async def test_bulk_clip_annotations_match_single_conversion(
+    session: AsyncSession,
+    audio_dir: Path,
+    user: schemas.SimpleUser,
+    recording: schemas.Recording,
+    clip_annotation: schemas.ClipAnnotation,
+    sound_event_annotation: schemas.SoundEventAnnotation,
+    tag: schemas.Tag,
+    note: schemas.Note,
+    feature: schemas.Feature,
+):
+    recording = await api.recordings.add_tag(session, recording, tag)
+    recording = await api.recordings.add_note(session, recording, note)
+    recording = await api.recordings.add_feature(session, recording, feature)
+    recording = await api.recordings.add_owner(session, recording, user)
+    await api.sound_events.add_feature(
+        session,
+        sound_event_annotation.sound_event,
+        feature,
+    )
+    await api.sound_event_annotations.add_tag(
+        session,
+        sound_event_annotation,
+        tag,
+        user,
+    )
+    await api.sound_event_annotations.add_note(
+        session,
+        sound_event_annotation,
+        note,
+    )
+    clip_annotation = await api.clip_annotations.add_tag(
+        session,
+        clip_annotation,
+        tag,
+        user,
+    )
+    clip_annotation = await api.clip_annotations.add_note(
+        session,
+        clip_annotation,
+        note,
+    )
+    clip_annotation = await api.clip_annotations.get(
+        session,
+        clip_annotation.uuid,
+    )
+
+    expected = await api.clip_annotations.to_soundevent(
+        session,
+        clip_annotation,
+        audio_dir=audio_dir,
+    )
+    (converted,) = await converters.get_clip_annotations(
+        session,
+        [clip_annotation.id],
+        audio_dir=audio_dir,
+    )
+
+    # NOTE: The single object converters do not export clip features.
+    exclude = {"clip": {"features"}}
+    assert converted.model_dump(exclude=exclude) == expected.model_dump(
+        exclude=exclude
+    )
+    assert len(converted.sound_events) == 1
+    assert converted.sound_events[0].tags == [api.tags.to_soundevent(tag)]
+    assert len(converted.clip.recording.owners) == 1
+
+
+async def test_bulk_clip_predictions_match_single_conversion(
+    session: AsyncSession,
+    audio_dir: Path,
+    clip_prediction: schemas.ClipPrediction,
+    sound_event_prediction: schemas.SoundEventPrediction,
+    tag: schemas.Tag,
+):
+    await api.sound_event_predictions.add_tag(
+        session,
+        sound_event_prediction,
+        tag,
+        0.7,
+    )
+    await api.clip_predictions.add_tag(session, clip_prediction, tag, 0.3)
+    clip_prediction = await api.clip_predictions.get(
+        session,
+        clip_prediction.uuid,
+    )
+
+    expected = await api.clip_predictions.to_soundevent(
+        session,
+        clip_prediction,
+        audio_dir=audio_dir,
+    )
+    (converted,) = await converters.get_clip_predictions(
+        session,
+        [clip_prediction.id],
+        audio_dir=audio_dir,
+    )
+
+    # NOTE: The single object converters do not export clip features.
+    exclude = {"clip": {"features"}}
+    assert converted.model_dump(exclude=exclude) == expected.model_dump(
+        exclude=exclude
+    )
+    assert converted.sound_events[0].tags[0].score == 0.7
+
+
+async def test_bulk_conversion_keeps_order_and_shares_objects(
+    session: AsyncSession,
+    audio_dir: Path,
+    clip: schemas.Clip,
+):
+    first = await api.clip_annotations.create(session, clip=clip)
+    second = await api.clip_annotations.create(session, clip=clip)
+
+    converted = await converters.get_clip_annotations(
+        session,
+        [second.id, first.id, -1],
+        audio_dir=audio_dir,
+    )
+
+    assert [ann.uuid for ann in converted] == [second.uuid, first.uuid]
+    assert converted[0].clip is converted[1].clip
+    assert len(converted[0].clip.features) == len(clip.features)
+
+
+async def test_bulk_annotation_tasks_include_status_badges(
+    session: AsyncSession,
+    audio_dir: Path,
+    user: schemas.SimpleUser,
+    annotation_task: schemas.AnnotationTask,
+):
+    annotation_task = await api.annotation_tasks.add_status_badge(
+        session,
+        annotation_task,
+        state=data.AnnotationState.completed,
+        user=user,
+    )
+
+    expected = await api.annotation_tasks.to_soundevent(
+        session,
+        annotation_task,
+        audio_dir=audio_dir,
+    )
+    (converted,) = await converters.get_annotation_tasks(
+        session,
+        [annotation_task.id],
+        audio_dir=audio_dir,
+    )
+
+    # NOTE: The single object converters do not export clip features.
+    exclude = {"clip": {"features"}}
+    assert converted.model_dump(exclude=exclude) == expected.model_dump(
+        exclude=exclude
+    )
+    assert converted.status_badges[0].owner is not None
@@ -0,0 +1,125 @@
+"""Test suite for the sound event embeddings API."""
+
+import numpy as np
+import pytest
+from soundevent import data
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, exceptions, schemas
+from whombat.api.embeddings import EmbeddingAPI, EmbeddingIndex
+from whombat.filters.sound_events import AnnotatedFilter, RecordingFilter
+
+
+def test_embedding_index_incremental_insertion_and_search():
+    index = EmbeddingIndex(dimension=2, capacity=2)
+    index.add([1, 2, 3], np.array([[1, 0], [0, 1], [1, 1]]))
+    index.add([4, 2], np.array([[-1, 0], [1, 0.1]]))
+
+    assert len(index) == 4
+    ids, similarities = index.search(np.array([1, 0]), limit=3)
+    assert ids.tolist() == [1, 2, 3]
+    assert similarities[0] == pytest.approx(1)
+
+    ids, _ = index.search(
+        np.array([1, 0]),
+        limit=3,
+        candidates=np.array([3, 4]),
+        exclude=[3],
+    )
+    assert ids.tolist() == [4]
+
+    index.add([1, 2], np.array([[1, 0], [0, 1]]), versions=[1.0, 1.0])
+    assert index.stale([1, 2, 3, 5], [1.0, 2.0, 1.0, 1.0]).tolist() == [
+        2,
+        3,
+        5,
+    ]
+
+
+async def test_find_similar_sound_events(
+    session: AsyncSession,
+    recording: schemas.Recording,
+    sound_event_annotation: schemas.SoundEventAnnotation,
+):
+    api.embeddings.clear_cache()
+    sound_events = [sound_event_annotation.sound_event] + [
+        await api.sound_events.create(
+            session,
+            recording=recording,
+            geometry=data.TimeStamp(coordinates=time),
+        )
+        for time in [0.1, 0.2, 0.3]
+    ]
+    query, *others = sound_events
+    await api.embeddings.add(
+        session,
+        "model",
+        sound_events,
+        [[1, 0, 0], [0, 0, 1], [1, 1, 0], [-1, 0, 0]],
+    )
+
+    similar = await api.embeddings.find_similar(
+        session,
+        others[1],
+        "model",
+        limit=2,
+    )
+    assert [s.sound_event.uuid for s in similar] == [
+        query.uuid,
+        others[0].uuid,
+    ]
+    assert similar[0].similarity == pytest.approx(np.sqrt(0.5))
+
+    # Vectors added after the index is loaded are searched too.
+    await api.embeddings.add(session, "model", [others[2]], [[1, 1, 0.1]])
+    similar = await api.embeddings.find_similar(
+        session,
+        others[1],
+        "model",
+        limit=1,
+        filters=[
+            RecordingFilter(eq=recording.uuid),
+            AnnotatedFilter(is_true=False),
+        ],
+    )
+    assert [s.sound_event.uuid for s in similar] == [others[2].uuid]
+
+    with pytest.raises(exceptions.InvalidDataError):
+        await api.embeddings.add(session, "model", [query], [[1, 0]])
+
+
+async def test_search_only_serves_committed_and_current_vectors(
+    session: AsyncSession,
+    recording: schemas.Recording,
+):
+    api.embeddings.clear_cache()
+    query, other = [
+        await api.sound_events.create(
+            session,
+            recording=recording,
+            geometry=data.TimeStamp(coordinates=time),
+        )
+        for time in [0.1, 0.2]
+    ]
+    await api.embeddings.add(
+        session, "model", [query, other], [[1, 0], [0, 1]]
+    )
+    await session.commit()
+
+    async def get_similarity() -> float:
+        similar = await api.embeddings.find_similar(session, query, "model")
+        return similar[0].similarity
+
+    assert await get_similarity() == pytest.approx(0)
+
+    # Vectors of transactions that are rolled back are not served.
+    await api.embeddings.add(session, "model", [other], [[1, 0]])
+    assert await get_similarity() == pytest.approx(1)
+    await session.rollback()
+    assert await get_similarity() == pytest.approx(0)
+
+    # Vectors replaced by another process are reloaded. A separate API
+    # instance stands in for the other process, as it has its own index.
+    await EmbeddingAPI().add(session, "model", [other], [[1, 0]])
+    await session.commit()
+    assert await get_similarity() == pytest.approx(1)
@@ -0,0 +1,246 @@
+"""Test suite for the evaluations API module."""
+
+from pathlib import Path
+
+import pytest
+from soundevent import data
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tests.test_core.test_evaluation import TAGS, create_examples
+
+from whombat import api, models, schemas
+from whombat.api.evaluations import (
+    evaluate_predictions,
+    evaluate_predictions_in_parallel,
+)
+from whombat.core.matching import get_soundevent_semantics
+from whombat.schemas.evaluation_sets import PredictionTypes
+
+
+@pytest.fixture
+async def detection_setup(
+    session: AsyncSession,
+    recording: schemas.Recording,
+    tag_factory,
+) -> tuple[schemas.ModelRun, schemas.EvaluationSet]:
+    """Create a model run and a sound event detection evaluation set."""
+    dog = await tag_factory(key="species", value="dog")
+    cat = await tag_factory(key="species", value="cat")
+    other = await tag_factory(key="species", value="bird")
+
+    evaluation_set = await api.evaluation_sets.create(
+        session,
+        name="detection_set",
+        description="test",
+        task=PredictionTypes.sound_event_detection,
+    )
+    evaluation_set = await api.evaluation_sets.add_tag(
+        session, evaluation_set, dog
+    )
+    evaluation_set = await api.evaluation_sets.add_tag(
+        session, evaluation_set, cat
+    )
+    model_run = await api.model_runs.create(
+        session,
+        name="detector",
+        version="1.0.0",
+        description="test",
+    )
+
+    clips_spec = [
+        # (annotations, predictions) per clip
+        (
+            [((0.1, 1000, 0.3, 2000), dog), ((0.5, 3000, 0.8, 4000), cat)],
+            [
+                ((0.12, 1100, 0.31, 2050), [(dog, 0.8), (cat, 0.1)]),
+                ((1.0, 500, 1.2, 600), [(cat, 0.6)]),
+            ],
+        ),
+        (
+            [((0.2, 100, 0.4, 900), other)],
+            [((0.2, 150, 0.45, 850), [(dog, 0.3), (cat, 0.2)])],
+        ),
+        ([((0.1, 1000, 0.2, 1500), cat)], []),
+    ]
+
+    for index, (annotations, predictions) in enumerate(clips_spec):
+        clip = await api.clips.create(
+            session,
+            recording=recording,
+            start_time=index,
+            end_time=index + 1,
+        )
+        clip_annotation = await api.clip_annotations.create(session, clip=clip)
+        for coords, tag in annotations:
+            sound_event = await api.sound_events.create(
+                session,
+                recording=recording,
+                geometry=data.BoundingBox(coordinates=list(coords)),
+            )
+            annotation = await api.sound_event_annotations.create(
+                session,
+                sound_event=sound_event,
+                clip_annotation=clip_annotation,
+            )
+            await api.sound_event_annotations.add_tag(session, annotation, tag)
+        evaluation_set = await api.evaluation_sets.add_clip_annotation(
+            session, evaluation_set, clip_annotation
+        )
+
+        clip_prediction = await api.clip_predictions.create(session, clip=clip)
+        for coords, scores in predictions:
+            sound_event = await api.sound_events.create(
+                session,
+                recording=recording,
+                geometry=data.BoundingBox(coordinates=list(coords)),
+            )
+            prediction = await api.sound_event_predictions.create(
+                session,
+                sound_event=sound_event,
+                clip_prediction=clip_prediction,
+                score=0.9,
+            )
+            for tag, score in scores:
+                prediction = await api.sound_event_predictions.add_tag(
+                    session, prediction, tag, score
+                )
+        model_run = await api.model_runs.add_clip_prediction(
+            session, model_run, clip_prediction
+        )
+
+    await session.commit()
+    return model_run, evaluation_set
+
+
+async def test_batched_evaluation_matches_default_evaluation(
+    session: AsyncSession,
+    audio_dir: Path,
+    detection_setup: tuple[schemas.ModelRun, schemas.EvaluationSet],
+):
+    """Test the batched engine produces the same scores and metrics."""
+    model_run, evaluation_set = detection_setup
+
+    expected = await api.evaluations.evaluate_model_run(
+        session,
+        model_run,
+        evaluation_set,
+        audio_dir=audio_dir,
+    )
+    # A model run can only be linked to one evaluation per set.
+    await session.execute(delete(models.ModelRunEvaluation))
+    result = await api.evaluations.evaluate_model_run_in_batches(
+        session,
+        model_run,
+        evaluation_set,
+        batch_size=2,
+    )
+
+    assert result.task == expected.task
+    assert result.score == pytest.approx(expected.score)
+    assert {m.name: pytest.approx(m.value) for m in result.metrics} == {
+        m.name: m.value for m in expected.metrics
+    }
+
+    expected_clips, _ = await api.evaluations.get_clip_evaluations(
+        session, expected
+    )
+    result_clips, _ = await api.evaluations.get_clip_evaluations(
+        session, result
+    )
+    assert sorted(c.score for c in result_clips) == pytest.approx(
+        sorted(c.score for c in expected_clips)
+    )
+
+    async def get_matches(evaluation: schemas.Evaluation):
+        query = (
+            select(
+                models.SoundEventEvaluation.score,
+                models.SoundEventEvaluation.source_id.is_(None),
+                models.SoundEventEvaluation.target_id.is_(None),
+            )
+            .join(models.ClipEvaluation)
+            .where(models.ClipEvaluation.evaluation_id == evaluation.id)
+        )
+        return sorted(tuple(row) for row in await session.execute(query))
+
+    result_matches = await get_matches(result)
+    expected_matches = await get_matches(expected)
+    assert len(result_matches) == len(expected_matches)
+    for result_match, expected_match in zip(
+        result_matches, expected_matches, strict=True
+    ):
+        assert result_match == pytest.approx(expected_match)
+
+
+async def test_batched_evaluation_links_model_run(
+    session: AsyncSession,
+    detection_setup: tuple[schemas.ModelRun, schemas.EvaluationSet],
+):
+    """Test the batched evaluation is registered for the model run."""
+    model_run, evaluation_set = detection_setup
+
+    evaluation = await api.evaluations.evaluate_model_run_in_batches(
+        session,
+        model_run,
+        evaluation_set,
+    )
+
+    linked = await api.model_runs.get_evaluation(
+        session, model_run, evaluation_set
+    )
+    assert linked.uuid == evaluation.uuid
+
+    count = await session.scalar(
+        select(func.count()).select_from(models.SoundEventEvaluation)
+    )
+    # The first clip assigns a prediction to an annotation it does not
+    # overlap. soundevent 2.1 keeps the pair, later versions split it.
+    _, affinity_threshold = get_soundevent_semantics()
+    assert count == (4 if affinity_threshold is None else 5)
+
+
+async def test_batched_evaluation_rejects_other_tasks(
+    session: AsyncSession,
+    model_run: schemas.ModelRun,
+):
+    """Test the batched evaluation only supports sound event detection."""
+    evaluation_set = await api.evaluation_sets.create(
+        session,
+        name="classification_set",
+        description="test",
+        task=PredictionTypes.clip_classification,
+    )
+
+    with pytest.raises(ValueError):
+        await api.evaluations.evaluate_model_run_in_batches(
+            session,
+            model_run,
+            evaluation_set,
+        )
+
+
+async def test_parallel_evaluation_matches_sequential_evaluation():
+    """Test evaluating in worker processes gives the same evaluation."""
+    predictions, annotations = create_examples(20)
+
+    expected = evaluate_predictions(
+        predictions,
+        annotations,
+        TAGS,
+        PredictionTypes.sound_event_detection,
+    )
+    result = await evaluate_predictions_in_parallel(
+        predictions,
+        annotations,
+        TAGS,
+        PredictionTypes.sound_event_detection,
+        max_workers=2,
+        min_clips_per_partition=5,
+    )
+
+    assert result.score == pytest.approx(expected.score)
+    assert [m.value for m in result.metrics] == pytest.approx(
+        [m.value for m in expected.metrics]
+    )
+    assert len(result.clip_evaluations) == len(expected.clip_evaluations)
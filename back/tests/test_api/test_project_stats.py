@@ -0,0 +1,193 @@
+"""Test suite for the annotation project statistics API."""
+
+from soundevent import data
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, schemas
+
+
+async def test_project_stats_are_updated_with_badges_and_tags(
+    session: AsyncSession,
+    annotation_project: schemas.AnnotationProject,
+    annotation_task: schemas.AnnotationTask,
+    clip_annotation: schemas.ClipAnnotation,
+    sound_event: schemas.SoundEvent,
+    user: schemas.SimpleUser,
+    tag: schemas.Tag,
+):
+    stats = await api.project_stats.get(session, annotation_project)
+    assert stats.num_tasks == 1
+    assert stats.num_completed == 0
+    assert stats.tags == []
+
+    annotation_task = await api.annotation_tasks.add_status_badge(
+        session,
+        annotation_task,
+        state=data.AnnotationState.completed,
+        user=user,
+    )
+    await api.clip_annotations.add_tag(session, clip_annotation, tag)
+    sound_event_annotation = await api.sound_event_annotations.create(
+        session,
+        sound_event=sound_event,
+        clip_annotation=clip_annotation,
+        created_by=user,
+    )
+    await api.sound_event_annotations.add_tag(
+        session,
+        sound_event_annotation,
+        tag,
+    )
+
+    stats = await api.project_stats.get(session, annotation_project)
+    assert stats.num_tasks == 1
+    assert stats.num_completed == 1
+    assert stats.num_verified == 0
+    assert len(stats.tags) == 1
+    assert stats.tags[0].tag.key == tag.key
+    assert stats.tags[0].clip_annotations == 1
+    assert stats.tags[0].sound_event_annotations == 1
+    assert len(stats.activity) == 1
+    assert stats.activity[0].user.id == user.id
+    assert stats.activity[0].sound_event_annotations == 1
+    assert stats.activity[0].completed_tasks == 1
+
+    await api.annotation_tasks.remove_status_badge(
+        session,
+        annotation_task,
+        state=data.AnnotationState.completed,
+    )
+    await api.sound_event_annotations.delete(session, sound_event_annotation)
+
+    stats = await api.project_stats.get(session, annotation_project)
+    assert stats.num_completed == 0
+    assert stats.tags[0].clip_annotations == 1
+    assert stats.tags[0].sound_event_annotations == 0
+    assert stats.activity == []
+
+
+async def test_project_stats_rebuild_matches_incremental_updates(
+    session: AsyncSession,
+    annotation_project: schemas.AnnotationProject,
+    annotation_task: schemas.AnnotationTask,
+    clip_annotation: schemas.ClipAnnotation,
+    sound_event_annotation: schemas.SoundEventAnnotation,
+    user: schemas.SimpleUser,
+    tag: schemas.Tag,
+):
+    await api.annotation_tasks.get_next(
+        session,
+        annotation_project,
+        claim_for=user,
+    )
+    await api.annotation_tasks.add_status_badge(
+        session,
+        await api.annotation_tasks.get(session, annotation_task.uuid),
+        state=data.AnnotationState.verified,
+        user=user,
+    )
+    await api.clip_annotations.add_tag(session, clip_annotation, tag)
+    await api.sound_event_annotations.add_tag(
+        session,
+        sound_event_annotation,
+        tag,
+    )
+    incremental = await api.project_stats.get(session, annotation_project)
+    assert incremental.num_assigned == 1
+    assert incremental.num_verified == 1
+
+    await api.project_stats.rebuild(session)
+    rebuilt = await api.project_stats.get(session, annotation_project)
+
+    assert rebuilt == incremental
+
+
+async def test_project_stats_are_updated_without_rebuilding(
+    session: AsyncSession,
+    annotation_project: schemas.AnnotationProject,
+    annotation_task: schemas.AnnotationTask,
+    clip: schemas.Clip,
+    clip_annotation: schemas.ClipAnnotation,
+    sound_event_annotation: schemas.SoundEventAnnotation,
+    recording: schemas.Recording,
+    user: schemas.SimpleUser,
+    tag: schemas.Tag,
+    monkeypatch,
+):
+    await api.annotation_tasks.add_status_badge(
+        session,
+        annotation_task,
+        state=data.AnnotationState.completed,
+        user=user,
+    )
+    clip_annotation = await api.clip_annotations.add_tag(
+        session, clip_annotation, tag
+    )
+    await api.sound_event_annotations.add_tag(
+        session,
+        sound_event_annotation,
+        tag,
+    )
+    other_clip = await api.clips.create(
+        session,
+        recording=recording,
+        start_time=0.3,
+        end_time=0.4,
+    )
+    other_annotation = await api.clip_annotations.create(
+        session,
+        clip=other_clip,
+    )
+    other_annotation = await api.clip_annotations.add_tag(
+        session, other_annotation, tag
+    )
+
+    async def rebuild(*args, **kwargs):
+        raise AssertionError("The statistics should not be rebuilt.")
+
+    monkeypatch.setattr(api.project_stats, "rebuild", rebuild)
+
+    await api.annotation_tasks.create_many_without_duplicates(
+        session,
+        [
+            {
+                "annotation_project_id": annotation_project.id,
+                "clip_id": clip_id,
+                "clip_annotation_id": clip_annotation_id,
+            }
+            for clip_id, clip_annotation_id in [
+                (clip.id, clip_annotation.id),
+                (other_clip.id, other_annotation.id),
+            ]
+        ],
+    )
+    stats = await api.project_stats.get(session, annotation_project)
+    assert stats.num_tasks == 2
+    assert stats.num_completed == 1
+    assert stats.tags[0].clip_annotations == 2
+    assert stats.tags[0].sound_event_annotations == 1
+    assert stats.activity[0].sound_event_annotations == 1
+
+    # Deleting the clip annotation takes its tags and sound events with
+    # it, but the task remains.
+    await api.clip_annotations.delete(session, clip_annotation)
+    stats = await api.project_stats.get(session, annotation_project)
+    assert stats.num_tasks == 2
+    assert stats.num_completed == 1
+    assert stats.tags[0].clip_annotations == 1
+    assert stats.tags[0].sound_event_annotations == 0
+    assert stats.activity[0].sound_event_annotations == 0
+    assert stats.activity[0].completed_tasks == 1
+
+    await api.annotation_tasks.delete(session, annotation_task)
+    incremental = await api.project_stats.get(session, annotation_project)
+    assert incremental.num_tasks == 1
+    assert incremental.num_completed == 0
+    assert incremental.tags[0].clip_annotations == 1
+    assert incremental.activity == []
+
+    monkeypatch.undo()
+    await api.project_stats.rebuild(session)
+    assert await api.project_stats.get(session, annotation_project) == (
+        incremental
+    )
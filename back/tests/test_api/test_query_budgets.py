@@ -0,0 +1,132 @@
+"""Query budgets of key API operations.
+
+These tests guard against operations that load related objects with one
+query per row, so their budgets do not depend on the number of rows.
+"""
+
+from contextlib import AbstractContextManager
+from typing import Callable
+
+import pytest
+from soundevent import data
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, models, schemas
+from whombat.system.queries import QueryLog, count_queries, fingerprint
+
+MaxQueries = Callable[[int], AbstractContextManager[QueryLog]]
+
+NUM_TASKS = 100
+
+
+@pytest.fixture
+async def annotation_tasks(
+    session: AsyncSession,
+    annotation_project: schemas.AnnotationProject,
+    recording: schemas.Recording,
+    tag: schemas.Tag,
+    user: schemas.SimpleUser,
+) -> list[schemas.AnnotationTask]:
+    await api.clips.create_many_without_duplicates(
+        session,
+        [
+            dict(
+                recording_id=recording.id,
+                start_time=index,
+                end_time=index + 1,
+            )
+            for index in range(NUM_TASKS)
+        ],
+    )
+    await api.annotation_tasks.create_from_clips(session, annotation_project)
+    tasks, _ = await api.annotation_tasks.get_many(
+        session,
+        limit=None,
+        filters=[
+            models.AnnotationTask.annotation_project_id
+            == annotation_project.id
+        ],
+    )
+    for task in tasks:
+        await api.annotation_tasks.add_status_badge(
+            session,
+            task,
+            data.AnnotationState.completed,
+            user=user,
+        )
+        clip_annotation = await api.annotation_tasks.get_clip_annotation(
+            session,
+            task,
+        )
+        await api.clip_annotations.add_tag(
+            session,
+            clip_annotation,
+            tag,
+            user=user,
+        )
+    return list(tasks)
+
+
+def test_fingerprint_collapses_literals_and_parameter_lists():
+    assert fingerprint(
+        "SELECT *\n  FROM tag WHERE id IN (?, ?, ?) AND key = 'a'"
+    ) == fingerprint("SELECT * FROM tag WHERE id IN (?) AND key = 'b'")
+    assert fingerprint("SELECT 1 LIMIT :param_1") == "SELECT ? LIMIT ?"
+
+
+async def test_query_logs_report_repeated_queries(
+    session: AsyncSession,
+    tag: schemas.Tag,
+):
+    with count_queries() as outer:
+        for _ in range(3):
+            with count_queries() as inner:
+                await api.tags.get(session, (tag.key, tag.value))
+            assert inner.count == 1
+
+    assert outer.count == 3
+    ((sql, count),) = outer.repeated()
+    assert count == 3
+    assert "3x" in outer.report()
+
+
+async def test_list_annotation_tasks(
+    session: AsyncSession,
+    annotation_tasks: list[schemas.AnnotationTask],
+    max_queries: MaxQueries,
+):
+    with max_queries(3):
+        tasks, count = await api.annotation_tasks.get_many(
+            session,
+            limit=NUM_TASKS,
+        )
+    assert len(tasks) == NUM_TASKS
+    assert all(task.status_badges for task in tasks)
+
+
+async def test_list_clip_annotations(
+    session: AsyncSession,
+    annotation_tasks: list[schemas.AnnotationTask],
+    max_queries: MaxQueries,
+):
+    with max_queries(4):
+        annotations, _ = await api.clip_annotations.get_many(
+            session,
+            limit=NUM_TASKS,
+        )
+    assert len(annotations) == NUM_TASKS
+    assert all(annotation.tags for annotation in annotations)
+
+
+async def test_export_annotation_project(
+    session: AsyncSession,
+    annotation_project: schemas.AnnotationProject,
+    annotation_tasks: list[schemas.AnnotationTask],
+    max_queries: MaxQueries,
+):
+    with max_queries(20):
+        project = await api.annotation_projects.to_soundevent(
+            session,
+            annotation_project,
+        )
+    assert len(project.tasks) == NUM_TASKS
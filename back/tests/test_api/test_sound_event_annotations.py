@@ -1,12 +1,20 @@
 """Test Suite for the Sound Event Annotation API."""
 
+import json
+import struct
 from uuid import uuid4
 
+import numpy as np
 import pytest
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import api, exceptions, models, schemas
+from whombat.api.scatterplots.sound_event_annotations import (
+    COLUMNS_MAGIC,
+    get_scatterplot_columns,
+    get_scatterplot_data,
+)
 
 
 async def test_created_annotation_is_stored_in_the_database(
@@ -83,3 +91,47 @@ async def test_can_get_annotations(
     """Test that all annotations can be retrieved."""
     annotations, _ = await api.sound_event_annotations.get_many(session)
     assert sound_event_annotation in annotations
+
+
+async def test_scatterplot_columns_match_scatterplot_data(
+    session: AsyncSession,
+    sound_event_annotation: schemas.SoundEventAnnotation,
+    tag: schemas.Tag,
+    feature: schemas.Feature,
+) -> None:
+    await api.sound_events.add_feature(
+        session,
+        sound_event_annotation.sound_event,
+        feature,
+    )
+    await api.sound_event_annotations.add_tag(
+        session,
+        sound_event_annotation,
+        tag,
+    )
+    items, _ = await get_scatterplot_data(session)
+    columns = await get_scatterplot_columns(session)
+
+    assert columns.num_rows == columns.total == 1
+    assert bytes(columns.uuids[0]) == sound_event_annotation.uuid.bytes
+    assert set(columns.feature_names) == {f.name for f in items[0].features}
+    for item_feature in items[0].features:
+        index = columns.feature_names.index(item_feature.name)
+        assert columns.features[index, 0] == pytest.approx(item_feature.value)
+    assert list(columns.tags) == [tag.key]
+    assert columns.tags[tag.key].values == [tag.value]
+    assert columns.tags[tag.key].codes.tolist() == [0]
+
+    content = columns.to_bytes()
+    magic, version, size = struct.unpack_from("<4sII", content)
+    assert (magic, version) == (COLUMNS_MAGIC, 1)
+    header = json.loads(content[12 : 12 + size])
+    assert (12 + size) % 8 == 0
+    spec = header["features"]
+    features = np.frombuffer(
+        content,
+        dtype="<f4",
+        offset=12 + size + spec["offset"],
+        count=spec["length"] // 4,
+    )
+    np.testing.assert_array_equal(features, columns.features.ravel())
@@ -3,10 +3,11 @@
 import datetime
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import api, exceptions, models, schemas
+from whombat.api import common
 
 
 async def create_tag(
@@ -373,8 +374,12 @@ async def test_get_or_create_tags_with_nonexisting_tags(session: AsyncSession):
     """Test getting or creating tags."""
     # Arrange
     tags_to_create = [
-        dict(key="test_key1", value="test_value1", canonical_name="test_value1"),
-        dict(key="test_key2", value="test_value2", canonical_name="test_value2"),
+        dict(
+            key="test_key1", value="test_value1", canonical_name="test_value1"
+        ),
+        dict(
+            key="test_key2", value="test_value2", canonical_name="test_value2"
+        ),
     ]
 
     # Act
@@ -398,8 +403,12 @@ async def test_get_or_create_tags_with_existing_tags(session: AsyncSession):
     """Test getting or creating tags."""
     # Arrange
     tags_to_create = [
-        dict(key="test_key1", value="test_value1", canonical_name="test_value1"),
-        dict(key="test_key2", value="test_value2", canonical_name="test_value2"),
+        dict(
+            key="test_key1", value="test_value1", canonical_name="test_value1"
+        ),
+        dict(
+            key="test_key2", value="test_value2", canonical_name="test_value2"
+        ),
     ]
     await api.tags.create(
         session,
@@ -429,8 +438,12 @@ async def test_get_or_create_tags_with_existing_and_nonexisting_tags(
     """Test getting or creating tags, when some exist and others dont."""
     # Arrange
     tags_to_create = [
-        dict(key="test_key1", value="test_value1", canonical_name="test_value1"),
-        dict(key="test_key2", value="test_value2", canonical_name="test_value2"),
+        dict(
+            key="test_key1", value="test_value1", canonical_name="test_value1"
+        ),
+        dict(
+            key="test_key2", value="test_value2", canonical_name="test_value2"
+        ),
     ]
     await api.tags.create(
         session,
@@ -449,3 +462,55 @@ async def test_get_or_create_tags_with_existing_and_nonexisting_tags(
     assert len(created_tags) == 1
     assert created_tags[0].key == "test_key2"
     assert created_tags[0].value == "test_value2"
+
+
+async def test_create_many_tags_skips_existing_tags(
+    session: AsyncSession,
+):
+    existing = await create_tag(session, key="species", value="a")
+
+    created = await api.tags.create_many_without_duplicates(
+        session,
+        data=[
+            dict(key="species", value="a", canonical_name="a"),
+            dict(key="species", value="b", canonical_name="b"),
+            dict(key="species", value="b", canonical_name="b"),
+        ],
+    )
+
+    assert [(tag.key, tag.value) for tag in created] == [("species", "b")]
+    count = await session.scalar(select(func.count()).select_from(models.Tag))
+    assert count == 2
+
+    everything = await api.tags.create_many_without_duplicates(
+        session,
+        data=[
+            dict(key="species", value="a", canonical_name="a"),
+            dict(key="species", value="b", canonical_name="b"),
+        ],
+        return_all=True,
+    )
+    assert {tag.id for tag in everything} == {existing.id, created[0].id}
+
+
+async def test_create_many_tags_without_duplicates_in_small_batches(
+    session: AsyncSession,
+):
+    await create_tag(session, key="species", value="value_0")
+    data = [
+        dict(key="species", value=f"value_{index}", canonical_name="")
+        for index in range(7)
+    ]
+
+    created = await common.create_objects_without_duplicates(
+        session,
+        models.Tag,
+        data,
+        key=lambda x: (x["key"], x["value"]),
+        key_column=tuple_(models.Tag.key, models.Tag.value),
+        rows_batch=2,
+    )
+
+    assert sorted(tag.value for tag in created) == [
+        f"value_{index}" for index in range(1, 7)
+    ]
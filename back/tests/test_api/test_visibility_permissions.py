@@ -10,11 +10,13 @@ import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import api, exceptions, models, schemas
+from whombat.api.common import permissions
 from whombat.api.common.permissions import (
     can_edit_annotation_project,
     can_edit_dataset,
     can_view_annotation_project,
     can_view_dataset,
+    get_group_roles,
 )
 
 
@@ -182,6 +184,51 @@ async def test_can_edit_dataset_requires_manager(
     assert await can_edit_dataset(session, dataset, other) is True
 
 
+async def test_group_roles_are_loaded_once_per_session(
+    session: AsyncSession,
+    user: schemas.SimpleUser,
+    group: schemas.Group,
+    group_manager_membership: schemas.GroupMembership,
+) -> None:
+    db_user = await session.get(models.User, user.id)
+    assert db_user is not None
+
+    roles = await get_group_roles(session, db_user)
+    assert roles == {group.id: models.GroupRole.MANAGER}
+    assert await get_group_roles(session, db_user) is roles
+
+    await api.groups.update_membership_role(
+        session,
+        group.id,
+        user.id,
+        models.GroupRole.MEMBER,
+    )
+    roles = await get_group_roles(session, db_user)
+    assert roles == {group.id: models.GroupRole.MEMBER}
+
+    await api.groups.remove_membership(session, group.id, user.id)
+    assert await get_group_roles(session, db_user) == {}
+
+
+async def test_group_roles_are_not_shared_when_disabled(
+    monkeypatch: pytest.MonkeyPatch,
+    session: AsyncSession,
+    user: schemas.SimpleUser,
+    group: schemas.Group,
+    group_manager_membership: schemas.GroupMembership,
+) -> None:
+    monkeypatch.setattr(permissions, "_group_roles", {})
+    monkeypatch.setattr(permissions, "_share_group_roles", True)
+    permissions.disable_group_roles_cache()
+    db_user = await session.get(models.User, user.id)
+    assert db_user is not None
+
+    roles = await get_group_roles(session, db_user)
+    assert roles == {group.id: models.GroupRole.MANAGER}
+    assert await get_group_roles(session, db_user) is roles
+    assert permissions._group_roles == {}
+
+
 async def test_can_view_annotation_project_private(
     session: AsyncSession,
     user: schemas.SimpleUser,
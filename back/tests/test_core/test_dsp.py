@@ -0,0 +1,129 @@
+"""Test suite for the signal processing backends."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from whombat import api, schemas
+from whombat.core import dsp
+
+numpy_backend = dsp.get_dsp_backend("numpy")
+torch_backend = dsp.get_dsp_backend("torch")
+
+
+@pytest.fixture
+def waveform() -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return (0.1 * rng.standard_normal((2, 8_000))).astype(np.float32)
+
+
+@pytest.mark.parametrize(
+    "samplerate,target_samplerate",
+    [
+        (44_100, 22_050),
+        (22_050, 44_100),
+        (48_000, 44_100),
+        (96_000, 16_000),
+        (8_000, 8_000),
+    ],
+)
+def test_backends_resample_alike(
+    waveform: np.ndarray,
+    samplerate: int,
+    target_samplerate: int,
+):
+    expected = torch_backend.resample(waveform, samplerate, target_samplerate)
+    result = numpy_backend.resample(waveform, samplerate, target_samplerate)
+    assert result.dtype == np.float32
+    assert result.shape == expected.shape
+    np.testing.assert_allclose(result, expected, atol=5e-5)
+
+
+@pytest.mark.parametrize("filter_type", ["highpass", "lowpass"])
+def test_backends_filter_alike(waveform: np.ndarray, filter_type):
+    expected = torch_backend.biquad(waveform, 22_050, 2_000, filter_type)
+    result = numpy_backend.biquad(waveform, 22_050, 2_000, filter_type)
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, expected, atol=1e-5)
+
+
+@pytest.mark.parametrize(
+    "window_type",
+    ["hann", "hamming", "bartlett", "blackman", "kaiser", "unknown"],
+)
+def test_backends_create_the_same_windows(window_type: str):
+    expected = torch_backend.window(window_type, 512)
+    result = numpy_backend.window(window_type, 512)
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, expected, atol=1e-6)
+
+
+@pytest.mark.parametrize("n_fft,win_length", [(512, 512), (512, 400)])
+def test_backends_compute_the_same_spectrogram(
+    waveform: np.ndarray,
+    n_fft: int,
+    win_length: int,
+):
+    window = numpy_backend.window("hann", win_length)
+    expected = torch_backend.power_stft(waveform, window, n_fft, 128)
+    result = numpy_backend.power_stft(waveform, window, n_fft, 128)
+    assert result.shape == expected.shape
+    np.testing.assert_allclose(result, expected, rtol=1e-4, atol=1e-6)
+
+    expected = torch_backend.pcen(expected)
+    result = numpy_backend.pcen(result)
+    np.testing.assert_allclose(result, expected, rtol=1e-4, atol=1e-5)
+
+
+def test_backends_compute_the_same_recording_spectrogram(
+    recording: schemas.Recording,
+    audio_dir: Path,
+):
+    audio_parameters = schemas.AudioParameters(
+        resample=True, samplerate=16_000
+    )
+    spectrogram_parameters = schemas.SpectrogramParameters()
+    expected, result = [
+        api.compute_spectrogram(
+            recording,
+            0,
+            recording.duration,
+            audio_parameters,
+            spectrogram_parameters,
+            audio_dir=audio_dir,
+            backend=backend,
+        )
+        for backend in ["torch", "numpy"]
+    ]
+    assert result.shape == expected.shape
+    np.testing.assert_allclose(result, expected, atol=1e-3)
+
+
+def test_unknown_backends_are_rejected():
+    with pytest.raises(ValueError):
+        dsp.get_dsp_backend("cupy")
+
+    with pytest.raises(ValueError):
+        dsp.set_dsp_backend("cupy")
+
+
+def test_numpy_backend_does_not_import_torch(random_wav_factory):
+    path = random_wav_factory(samplerate=44_100, duration=0.5)
+    code = (
+        "import sys\n"
+        "from whombat import api\n"
+        "from whombat.core.dsp import set_dsp_backend\n"
+        "set_dsp_backend('numpy')\n"
+        f"api.load_clip_bytes({str(path)!r}, 0, target_samplerate=16_000)\n"
+        "print('torch' in sys.modules)"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert process.stdout.strip() == "False"
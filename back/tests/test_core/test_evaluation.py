@@ -0,0 +1,241 @@
+"""Test suite for the partitioned evaluation functions."""
+
+import inspect
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pytest
+from soundevent import data
+from soundevent.evaluation.tasks.common import iterate_over_valid_clips
+
+from whombat.api.evaluations import evaluate_predictions
+from whombat.core.evaluation import (
+    TASKS,
+    evaluate_partition,
+    merge_partitions,
+    pack_partition,
+    partition_clips,
+)
+from whombat.schemas.evaluation_sets import PredictionTypes
+
+TAGS = [
+    data.Tag(key="species", value="dog"),
+    data.Tag(key="species", value="cat"),
+    data.Tag(key="species", value="bird"),
+]
+
+
+def create_examples(
+    num_clips: int,
+    seed: int = 0,
+    num_sound_events: int = 4,
+    prediction_rate: float = 0.7,
+    min_sound_events: int = 0,
+) -> tuple[list[data.ClipPrediction], list[data.ClipAnnotation]]:
+    """Create random clip predictions and annotations."""
+    rng = np.random.default_rng(seed)
+    recording = data.Recording(
+        path=Path("recording.wav"),
+        duration=num_clips,
+        samplerate=48_000,
+        channels=1,
+    )
+
+    predictions = []
+    annotations = []
+    for index in range(num_clips):
+        clip = data.Clip(
+            recording=recording,
+            start_time=index,
+            end_time=index + 1,
+        )
+        sound_events = []
+        predicted_sound_events = []
+        for _ in range(rng.integers(min_sound_events, num_sound_events + 1)):
+            start = index + rng.uniform(0, 0.8)
+            low = rng.uniform(1_000, 5_000)
+            sound_event = data.SoundEvent(
+                recording=recording,
+                geometry=data.BoundingBox(
+                    coordinates=[start, low, start + 0.1, low + 1_000]
+                ),
+            )
+            tag = TAGS[rng.integers(0, len(TAGS))]
+            sound_events.append(
+                data.SoundEventAnnotation(sound_event=sound_event, tags=[tag])
+            )
+            if rng.uniform() < prediction_rate:
+                predicted_sound_events.append(
+                    data.SoundEventPrediction(
+                        sound_event=sound_event,
+                        score=0.9,
+                        tags=[
+                            data.PredictedTag(
+                                tag=tag, score=float(rng.uniform())
+                            )
+                            for tag in TAGS
+                        ],
+                    )
+                )
+
+        clip_tag = TAGS[rng.integers(0, len(TAGS))]
+        annotations.append(
+            data.ClipAnnotation(
+                clip=clip,
+                sound_events=sound_events,
+                tags=[clip_tag],
+            )
+        )
+        predictions.append(
+            data.ClipPrediction(
+                clip=clip,
+                sound_events=predicted_sound_events,
+                tags=[
+                    data.PredictedTag(tag=tag, score=float(rng.uniform()))
+                    for tag in TAGS
+                ],
+            )
+        )
+
+    return predictions, annotations
+
+
+@pytest.mark.parametrize("task", list(TASKS))
+def test_soundevent_internals_keep_their_signatures(task: str):
+    """Test the internal soundevent functions used for partitioning.
+
+    They are not part of the public API of soundevent, so a new release
+    can change them without notice.
+    """
+    definition = TASKS[task]
+    assert list(inspect.signature(definition.evaluate_clips).parameters) == [
+        "clip_predictions",
+        "clip_annotations",
+        "encoder",
+    ]
+    assert list(inspect.signature(definition.compute_metrics).parameters) == [
+        "true_classes",
+        "predicted_classes_scores",
+    ]
+    assert list(inspect.signature(iterate_over_valid_clips).parameters) == [
+        "clip_predictions",
+        "clip_annotations",
+    ]
+
+
+def test_partition_clips_keeps_order_and_pairs():
+    """Test partitions cover all clips in order."""
+    predictions, annotations = create_examples(10)
+
+    partitions = partition_clips(predictions, annotations, 3)
+
+    assert len(partitions) == 3
+    flat = [p for preds, _ in partitions for p in preds]
+    assert [p.uuid for p in flat] == [p.uuid for p in predictions]
+    for preds, anns in partitions:
+        assert [p.clip.uuid for p in preds] == [a.clip.uuid for a in anns]
+
+
+def test_partition_clips_drops_empty_partitions():
+    """Test that there are never more partitions than clips."""
+    predictions, annotations = create_examples(2)
+    assert len(partition_clips(predictions, annotations, 8)) == 2
+
+
+def evaluate_in_partitions(
+    predictions: list[data.ClipPrediction],
+    annotations: list[data.ClipAnnotation],
+    task: PredictionTypes,
+) -> data.Evaluation:
+    partitions = partition_clips(predictions, annotations, 4)
+    return merge_partitions(
+        task,
+        partitions,
+        [
+            evaluate_partition(
+                task,
+                pickle.loads(pickle.dumps(pack_partition(preds, anns, TAGS))),
+                len(TAGS),
+            )
+            for preds, anns in partitions
+        ],
+    )
+
+
+@pytest.mark.parametrize(
+    "task, min_sound_events, num_sound_events, prediction_rate",
+    [
+        (PredictionTypes.sound_event_detection, 0, 3, 0.7),
+        # Clips without sound events have no score in this task, and some
+        # soundevent versions reject the NaN. See the test below.
+        (PredictionTypes.sound_event_tagging, 1, 3, 1),
+        (PredictionTypes.clip_classification, 0, 0, 0),
+        (PredictionTypes.clip_tagging, 0, 0, 0),
+    ],
+)
+def test_merged_partitions_match_full_evaluation(
+    task: PredictionTypes,
+    min_sound_events: int,
+    num_sound_events: int,
+    prediction_rate: float,
+):
+    """Test merging partial evaluations reproduces the full evaluation."""
+    predictions, annotations = create_examples(
+        30,
+        seed=1,
+        num_sound_events=num_sound_events,
+        prediction_rate=prediction_rate,
+        min_sound_events=min_sound_events,
+    )
+
+    expected = evaluate_predictions(predictions, annotations, TAGS, task)
+    result = evaluate_in_partitions(predictions, annotations, task)
+
+    assert result.evaluation_task == expected.evaluation_task
+    assert result.score == pytest.approx(expected.score)
+    assert [m.name for m in result.metrics] == [
+        m.name for m in expected.metrics
+    ]
+    assert [m.value for m in result.metrics] == pytest.approx(
+        [m.value for m in expected.metrics], nan_ok=True
+    )
+    assert [c.score for c in result.clip_evaluations] == pytest.approx(
+        [c.score for c in expected.clip_evaluations], nan_ok=True
+    )
+    assert [
+        [(m.source, m.target, m.score) for m in c.matches]
+        for c in result.clip_evaluations
+    ] == [
+        [(m.source, m.target, m.score) for m in c.matches]
+        for c in expected.clip_evaluations
+    ]
+
+
+def test_partitions_fail_like_the_full_evaluation_on_empty_clips():
+    """Test clips without sound events are handled as in soundevent.
+
+    soundevent 2.1 fails to score sound event tagging clips without sound
+    events, as their score is NaN. The partitioned evaluation must raise
+    the same error instead of producing a result.
+    """
+    task = PredictionTypes.sound_event_tagging
+    predictions, annotations = create_examples(
+        30,
+        seed=1,
+        num_sound_events=3,
+        prediction_rate=1,
+    )
+    assert any(not annotation.sound_events for annotation in annotations)
+
+    try:
+        expected = evaluate_predictions(predictions, annotations, TAGS, task)
+    except Exception as error:
+        with pytest.raises(type(error)):
+            evaluate_in_partitions(predictions, annotations, task)
+        return
+
+    result = evaluate_in_partitions(predictions, annotations, task)
+    assert [c.score for c in result.clip_evaluations] == pytest.approx(
+        [c.score for c in expected.clip_evaluations], nan_ok=True
+    )
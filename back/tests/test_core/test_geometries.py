@@ -0,0 +1,75 @@
+"""Test suite for the binary geometry encoding."""
+
+import pytest
+from soundevent import data
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, models, schemas
+from whombat.core.geometries import (
+    LazyGeometry,
+    decode_geometry,
+    encode_geometry,
+    load_geometry,
+)
+
+GEOMETRIES = [
+    data.TimeStamp(coordinates=0.5),
+    data.TimeInterval(coordinates=[0.1, 0.4]),
+    data.Point(coordinates=[0.2, 1_000]),
+    data.BoundingBox(coordinates=[0.1, 1_000, 0.3, 2_000]),
+    data.LineString(coordinates=[[0.1, 100], [0.2, 200], [0.3, 150]]),
+    data.MultiPoint(coordinates=[[0.1, 100], [0.2, 200]]),
+    data.Polygon(
+        coordinates=[
+            [[0, 0], [1, 0], [1, 1000], [0, 0]],
+            [[0.2, 10], [0.5, 10], [0.5, 500], [0.2, 10]],
+        ]
+    ),
+    data.MultiLineString(
+        coordinates=[[[0.1, 100], [0.2, 200]], [[0.3, 300], [0.4, 100]]]
+    ),
+    data.MultiPolygon(
+        coordinates=[
+            [[[0, 0], [1, 0], [1, 1000], [0, 0]]],
+            [[[2, 0], [3, 0], [3, 1000], [2, 0]]],
+        ]
+    ),
+]
+
+
+@pytest.mark.parametrize("geometry", GEOMETRIES, ids=lambda g: g.type)
+def test_geometry_encoding_roundtrip(geometry: data.Geometry):
+    encoded = encode_geometry(geometry)
+    assert decode_geometry(encoded) == geometry
+
+    lazy = LazyGeometry(encoded)
+    assert lazy.type == geometry.type
+    assert not lazy.is_loaded
+    assert lazy.coordinates == geometry.coordinates
+    assert lazy.is_loaded
+    assert load_geometry(lazy) == geometry
+
+
+async def test_sound_event_geometries_are_loaded_lazily(
+    session: AsyncSession,
+    recording: schemas.Recording,
+):
+    geometry = data.BoundingBox(coordinates=[0.1, 1_000, 0.3, 2_000])
+    created = await api.sound_events.create(
+        session,
+        recording=recording,
+        geometry=geometry,
+    )
+    session.expunge_all()
+
+    model = await session.scalar(
+        select(models.SoundEvent).where(models.SoundEvent.id == created.id)
+    )
+    assert model is not None
+    assert isinstance(model.geometry, LazyGeometry)
+    assert not model.geometry.is_loaded
+
+    sound_event = schemas.SoundEvent.model_validate(model)
+    assert sound_event.geometry == geometry
+    assert isinstance(sound_event.geometry, data.BoundingBox)
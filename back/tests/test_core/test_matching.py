@@ -0,0 +1,129 @@
+"""Test suite for the vectorized geometry matching functions."""
+
+import numpy as np
+import pytest
+from soundevent import data
+from soundevent.evaluation import match_geometries
+
+from whombat.core.matching import (
+    compute_affinity_matrix,
+    get_geometry_bounds,
+    interval_iou,
+    select_matches,
+)
+
+
+def random_boxes(rng: np.random.Generator, size: int) -> list[data.Geometry]:
+    start = rng.uniform(0, 5, size)
+    low = rng.uniform(0, 10_000, size)
+    return [
+        data.BoundingBox(
+            coordinates=[
+                float(start[i]),
+                float(low[i]),
+                float(start[i] + rng.uniform(0.01, 1)),
+                float(low[i] + rng.uniform(100, 5_000)),
+            ]
+        )
+        for i in range(size)
+    ]
+
+
+def expected_matches(
+    source: list[data.Geometry],
+    target: list[data.Geometry],
+) -> set[tuple]:
+    return {
+        (s, t, round(a, 6)) for s, t, a in match_geometries(source, target)
+    }
+
+
+def match(source: list[data.Geometry], target: list[data.Geometry]) -> set:
+    source_bounds, source_is_time, source_is_buffered = get_geometry_bounds(
+        source
+    )
+    target_bounds, target_is_time, target_is_buffered = get_geometry_bounds(
+        target
+    )
+    affinity = compute_affinity_matrix(
+        source_bounds,
+        target_bounds,
+        source_is_time=source_is_time,
+        target_is_time=target_is_time,
+        source_is_buffered=source_is_buffered,
+        target_is_buffered=target_is_buffered,
+    )
+    return {
+        (
+            int(s) if s >= 0 else None,
+            int(t) if t >= 0 else None,
+            round(float(a), 6),
+        )
+        for s, t, a in zip(*select_matches(affinity), strict=True)
+    }
+
+
+def test_interval_iou():
+    """Test the IoU of time intervals."""
+    source = np.array([[0, 1], [2, 3]], dtype=float)
+    target = np.array([[0.5, 1.5], [5, 6]], dtype=float)
+
+    iou = interval_iou(source, target)
+
+    assert iou.shape == (2, 2)
+    assert iou[0, 0] == pytest.approx(1 / 3)
+    assert iou[0, 1] == 0
+    assert iou[1, 0] == 0
+
+
+def test_affinity_of_empty_inputs_is_empty():
+    """Test that matching no geometries returns an empty matrix."""
+    affinity = compute_affinity_matrix(np.zeros((0, 4)), np.zeros((3, 4)))
+    assert affinity.shape == (0, 3)
+
+    source_index, target_index, _ = select_matches(affinity)
+    assert list(source_index) == [-1, -1, -1]
+    assert list(target_index) == [0, 1, 2]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_agree_with_soundevent(seed: int):
+    """Test that bounding boxes are matched as soundevent does."""
+    rng = np.random.default_rng(seed)
+    source = random_boxes(rng, 12)
+    target = random_boxes(rng, 9)
+
+    assert match(source, target) == expected_matches(source, target)
+
+
+def test_time_geometries_and_distant_pairs_match_as_in_soundevent():
+    """Test time stamps, intervals and pairs without overlap."""
+    source = [
+        data.TimeStamp(coordinates=0.5),
+        data.TimeInterval(coordinates=[2, 3]),
+        data.BoundingBox(coordinates=[10, 1000, 11, 2000]),
+    ]
+    target = [
+        data.TimeInterval(coordinates=[0.45, 0.6]),
+        data.BoundingBox(coordinates=[2.5, 1000, 3.5, 5000]),
+        data.BoundingBox(coordinates=[20, 1000, 21, 2000]),
+    ]
+    assert match(source, target) == expected_matches(source, target)
+
+
+def test_time_geometries_use_interval_iou():
+    """Test that temporal geometries are compared on the time axis."""
+    source = [data.TimeInterval(coordinates=[0, 1])]
+    target = [data.BoundingBox(coordinates=[0, 1000, 1, 2000])]
+
+    source_bounds, source_is_time, _ = get_geometry_bounds(source)
+    target_bounds, target_is_time, _ = get_geometry_bounds(target)
+    affinity = compute_affinity_matrix(
+        source_bounds,
+        target_bounds,
+        source_is_time=source_is_time,
+        target_is_time=target_is_time,
+    )
+
+    assert source_is_time.tolist() == [True]
+    assert affinity[0, 0] == pytest.approx(1)
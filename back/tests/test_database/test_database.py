@@ -7,6 +7,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from whombat import models
+from whombat.system import database
+from whombat.system.settings import Settings
 
 
 def check_all_tables_exist(session: Session):
@@ -22,3 +24,24 @@ def check_all_tables_exist(session: Session):
 async def test_can_create_all_models(session: AsyncSession):
     """Test that all models can be created."""
     await session.run_sync(check_all_tables_exist)
+
+
+async def test_shared_engine_applies_sqlite_tuning_profile(
+    settings: Settings,
+):
+    """Test that the shared engine uses the SQLite performance profile."""
+    engine = database.get_async_db_engine(settings)
+    assert database.get_async_db_engine(settings) is engine
+
+    async with engine.connect() as conn:
+        journal_mode = await conn.exec_driver_sql("PRAGMA journal_mode")
+        assert journal_mode.scalar() == "wal"
+        synchronous = await conn.exec_driver_sql("PRAGMA synchronous")
+        assert synchronous.scalar() == 1  # NORMAL
+        busy_timeout = await conn.exec_driver_sql("PRAGMA busy_timeout")
+        assert busy_timeout.scalar() == settings.db_sqlite_busy_timeout
+
+    await database.optimize_database(engine)
+    await database.dispose_async_db_engines(settings)
+    assert database.get_async_db_engine(settings) is not engine
+    await database.dispose_async_db_engines(settings)
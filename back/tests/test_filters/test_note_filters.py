@@ -201,3 +201,32 @@ async def test_get_notes_by_message(
     assert len(db_notes) == 2
     assert db_notes[0] == notes[3]
     assert db_notes[1] == notes[2]
+
+
+async def test_search_notes_by_message(
+    session: AsyncSession,
+    notes: list[schemas.Note],
+):
+    """Test searching notes with the full text search index."""
+    db_notes, _ = await api.notes.get_many(
+        session,
+        filters=[note_filters.SearchFilter(search="TE3")],
+    )
+    assert db_notes == [notes[2]]
+
+    db_notes, total = await api.notes.get_many(
+        session,
+        filters=[note_filters.SearchFilter(search="note")],
+    )
+    assert total == 4
+
+    await api.notes.update(
+        session,
+        notes[2],
+        schemas.NoteUpdate(message="updated message"),
+    )
+    db_notes, _ = await api.notes.get_many(
+        session,
+        filters=[note_filters.SearchFilter(search="note3")],
+    )
+    assert db_notes == []
@@ -359,3 +359,57 @@ async def test_issues_filter(
     # Assert
     assert len(results) == 1
     assert results[0].hash == recording_list[1].hash
+
+
+async def test_search_filter(
+    session: AsyncSession,
+    random_wav_factory: Callable[..., Path],
+    audio_dir: Path,
+):
+    """Test searching recordings by path."""
+    # Arrange
+    recording_list = [
+        await api.recordings.create(
+            session,
+            path=random_wav_factory(audio_dir / name),
+            audio_dir=audio_dir,
+        )
+        for name in [
+            "site_b/recording_night.wav",
+            "night_recording.wav",
+            "site_b/day_100%.wav",
+        ]
+    ]
+
+    # Act
+    results, _ = await api.recordings.get_many(
+        session,
+        filters=[recording_filters.SearchFilter(search="NIGHT")],
+        sort_by=None,
+    )
+    short, _ = await api.recordings.get_many(
+        session,
+        filters=[recording_filters.SearchFilter(search="b/")],
+    )
+    wildcard, _ = await api.recordings.get_many(
+        session,
+        filters=[recording_filters.SearchFilter(search="0%")],
+    )
+    await api.recordings.delete(session, recording_list[1])
+    deleted, _ = await api.recordings.get_many(
+        session,
+        filters=[recording_filters.SearchFilter(search="night")],
+    )
+
+    # Assert
+    # Paths starting with the search term come first.
+    assert [rec.path for rec in results] == [
+        recording_list[1].path,
+        recording_list[0].path,
+    ]
+    assert {rec.path for rec in short} == {
+        recording_list[0].path,
+        recording_list[2].path,
+    }
+    assert [rec.path for rec in wildcard] == [recording_list[2].path]
+    assert [rec.path for rec in deleted] == [recording_list[0].path]
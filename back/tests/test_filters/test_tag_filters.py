@@ -25,7 +25,10 @@ async def setup_test(session: AsyncSession):
         dict(key="ca", value="ab2"),
     ]
 
-    await api.tags.create_many(session, tags_to_create)
+    await api.tags.create_many(
+        session,
+        [{**tag, "canonical_name": tag["value"]} for tag in tags_to_create],
+    )
 
 
 async def test_filter_by_exact_key(session: AsyncSession):
@@ -86,3 +89,47 @@ async def test_filter_by_search(session: AsyncSession):
     # Assert.
     assert len(tags) == 10
     assert all("a" in tag.key or "a" in tag.value for tag in tags)
+
+
+async def test_has_filters_only_search_their_column(session: AsyncSession):
+    """Test that key and value filters do not match the other column."""
+    await api.tags.create(session, key="species", value="Myotis")
+    await api.tags.create(session, key="call", value="buzz")
+
+    tags, _ = await api.tags.get_many(
+        session, filters=[tag_filters.ValueFilter(has="spec")]
+    )
+    assert tags == []
+
+    tags, _ = await api.tags.get_many(
+        session, filters=[tag_filters.KeyFilter(has="buz")]
+    )
+    assert tags == []
+
+    tags, _ = await api.tags.get_many(
+        session, filters=[tag_filters.KeyFilter(has="spec")]
+    )
+    assert [(tag.key, tag.value) for tag in tags] == [("species", "Myotis")]
+
+    tags, _ = await api.tags.get_many(
+        session, filters=[tag_filters.SearchFilter(search="buz")]
+    )
+    assert [(tag.key, tag.value) for tag in tags] == [("call", "buzz")]
+
+
+async def test_search_sorts_by_relevance_unless_sorted(session: AsyncSession):
+    """Test that an explicit sort replaces the relevance ordering."""
+    await api.tags.create(session, key="species", value="Myotis myotis")
+
+    search = tag_filters.SearchFilter(search="tis")
+    tags, _ = await api.tags.get_many(session, filters=[search], sort_by=None)
+    assert {tag.key for tag in tags} == {"species"}
+
+    await api.tags.create(session, key="alias", value="tisserand")
+    tags, _ = await api.tags.get_many(session, filters=[search], sort_by=None)
+    assert [tag.key for tag in tags] == ["alias", "species"]
+
+    tags, _ = await api.tags.get_many(
+        session, filters=[search], sort_by="-key"
+    )
+    assert [tag.key for tag in tags] == ["species", "alias"]
@@ -2,8 +2,10 @@
 
 from pathlib import Path
 
+import pytest
 from fastapi.testclient import TestClient
 from soundevent.io import aoef
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import schemas
 
@@ -86,3 +88,40 @@ def test_can_export_annotation_project(
         cookies=cookies,
     )
     assert response.status_code == 200
+
+
+@pytest.fixture
+async def committed_clip(
+    session: AsyncSession,
+    annotation_project: schemas.AnnotationProject,
+    clip: schemas.Clip,
+) -> schemas.Clip:
+    """Commit the project and clip so that the client can see them."""
+    await session.commit()
+    return clip
+
+
+def test_can_get_annotation_project_stats(
+    client: TestClient,
+    annotation_project: schemas.AnnotationProject,
+    committed_clip: schemas.Clip,
+    cookies: dict[str, str],
+):
+    response = client.post(
+        "/api/v1/annotation_tasks/",
+        params={"annotation_project_uuid": str(annotation_project.uuid)},
+        json=[str(committed_clip.uuid)],
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+
+    response = client.get(
+        "/api/v1/annotation_projects/detail/stats/",
+        params={"annotation_project_uuid": str(annotation_project.uuid)},
+        cookies=cookies,
+    )
+
+    assert response.status_code == 200
+    stats = schemas.AnnotationProjectStats.model_validate(response.json())
+    assert stats.num_tasks == 1
+    assert stats.num_completed == 0
@@ -0,0 +1,48 @@
+"""Test the Annotation Task endpoints."""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import schemas
+
+
+@pytest.fixture
+async def annotation_task(
+    session: AsyncSession,
+    annotation_task: schemas.AnnotationTask,
+) -> schemas.AnnotationTask:
+    """Commit the annotation task so that the client can see it."""
+    await session.commit()
+    return annotation_task
+
+
+def test_can_get_and_claim_the_next_task(
+    client: TestClient,
+    annotation_project: schemas.AnnotationProject,
+    annotation_task: schemas.AnnotationTask,
+    cookies: dict[str, str],
+):
+    response = client.get(
+        "/api/v1/annotation_tasks/next/",
+        params={
+            "annotation_project_uuid": str(annotation_project.uuid),
+            "claim": True,
+        },
+        cookies=cookies,
+    )
+
+    assert response.status_code == 200
+    task = response.json()
+    assert task["uuid"] == str(annotation_task.uuid)
+    assert [badge["state"] for badge in task["status_badges"]] == ["assigned"]
+
+    response = client.get(
+        "/api/v1/annotation_tasks/next/",
+        params={
+            "annotation_project_uuid": str(annotation_project.uuid),
+            "after": str(annotation_task.uuid),
+        },
+        cookies=cookies,
+    )
+    assert response.status_code == 404
@@ -3,6 +3,7 @@
 from fastapi.testclient import TestClient
 
 from whombat import schemas
+from whombat.system.auth import token_cache
 
 
 async def test_admin_can_login(client: TestClient, user: schemas.User):
@@ -31,3 +32,35 @@ async def test_can_get_active_user(
 
     assert response.status_code == 200, response.text
     assert schemas.SimpleUser.model_validate(response.json()) == user
+
+
+async def test_validated_tokens_are_cached_until_user_update(
+    client: TestClient,
+    user: schemas.SimpleUser,
+    cookies: dict[str, str],
+):
+    """Test that repeated requests reuse the validated token."""
+    token = cookies["whombatauth"]
+    token_cache.invalidate_token(token)
+
+    client.get("/api/v1/users/me", cookies=cookies)
+    hits = token_cache.hits
+    response = client.get("/api/v1/users/me", cookies=cookies)
+    assert response.status_code == 200, response.text
+    assert token_cache.hits == hits + 1
+
+    response = client.patch(
+        "/api/v1/users/me",
+        json={"name": "New Name"},
+        cookies=cookies,
+    )
+    assert response.status_code == 200, response.text
+    assert token_cache.get(token) is None
+
+    response = client.get("/api/v1/users/me", cookies=cookies)
+    assert response.json()["name"] == "New Name"
+
+    response = client.post("/api/v1/auth/logout", cookies=cookies)
+    assert response.status_code == 204, response.text
+    response = client.get("/api/v1/users/me", cookies=cookies)
+    assert response.status_code == 401
@@ -0,0 +1,71 @@
+"""Tests for the background job endpoints."""
+
+import time
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, schemas
+
+
+def test_unknown_job_returns_404(client: TestClient):
+    response = client.get(
+        "/api/v1/jobs/detail/",
+        params={"job_uuid": str(uuid4())},
+    )
+    assert response.status_code == 404
+
+
+async def test_model_run_can_be_evaluated_in_background(
+    client: TestClient,
+    session: AsyncSession,
+    model_run: schemas.ModelRun,
+    evaluation_set: schemas.EvaluationSet,
+    clip_annotation: schemas.ClipAnnotation,
+    sound_event_annotation: schemas.SoundEventAnnotation,
+    sound_event_prediction: schemas.SoundEventPrediction,
+    clip_prediction: schemas.ClipPrediction,
+):
+    await api.evaluation_sets.add_clip_annotation(
+        session, evaluation_set, clip_annotation
+    )
+    await api.model_runs.add_clip_prediction(
+        session, model_run, clip_prediction
+    )
+    await session.commit()
+
+    response = client.post(
+        "/api/v1/model_runs/detail/evaluate/background/",
+        params={
+            "model_run_uuid": str(model_run.uuid),
+            "evaluation_set_uuid": str(evaluation_set.uuid),
+        },
+    )
+    assert response.status_code == 200
+    job = schemas.Job.model_validate(response.json())
+
+    for _ in range(100):
+        response = client.get(
+            "/api/v1/jobs/detail/",
+            params={"job_uuid": str(job.uuid)},
+        )
+        data = response.json()
+        job = schemas.Job.model_validate(data)
+        if job.status not in (
+            schemas.JobStatus.pending,
+            schemas.JobStatus.running,
+        ):
+            break
+        time.sleep(0.05)
+
+    assert job.status == schemas.JobStatus.completed, job.message
+    assert job.total == 1
+    assert job.done == 1
+    assert data["progress"] == 1
+    assert job.result is not None
+
+    evaluation = await api.model_runs.get_evaluation(
+        session, model_run, evaluation_set
+    )
+    assert evaluation.uuid == job.result
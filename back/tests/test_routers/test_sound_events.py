@@ -0,0 +1,82 @@
+"""Test the Sound Event endpoints."""
+
+from uuid import uuid4
+
+import numpy as np
+from fastapi.testclient import TestClient
+from soundevent import data
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, models, schemas
+
+
+async def test_can_add_sound_event_embeddings(
+    client: TestClient,
+    session: AsyncSession,
+    recording: schemas.Recording,
+    cookies: dict[str, str],
+):
+    sound_events = [
+        await api.sound_events.create(
+            session,
+            recording,
+            data.TimeInterval(coordinates=[start, start + 0.1]),
+        )
+        for start in [0.1, 0.2]
+    ]
+    await session.commit()
+
+    response = client.post(
+        "/api/v1/sound_events/embeddings/",
+        json={
+            "name": "test",
+            "embeddings": [
+                {
+                    "sound_event_uuid": str(sound_event.uuid),
+                    "vector": [index, 1],
+                }
+                for index, sound_event in enumerate(sound_events)
+            ],
+        },
+        cookies=cookies,
+    )
+
+    assert response.status_code == 200, response.text
+    rows = await session.execute(
+        select(
+            models.SoundEventEmbedding.sound_event_id,
+            models.SoundEventEmbedding.vector,
+        )
+    )
+    vectors = {
+        id: np.frombuffer(vector, dtype=np.float32).tolist()
+        for id, vector in rows.all()
+    }
+    assert vectors == {
+        sound_events[0].id: [0, 1],
+        sound_events[1].id: [1, 1],
+    }
+
+
+def test_adding_embeddings_of_missing_sound_events_fails(
+    client: TestClient,
+    sound_event: schemas.SoundEvent,
+    cookies: dict[str, str],
+):
+    missing = uuid4()
+
+    response = client.post(
+        "/api/v1/sound_events/embeddings/",
+        json={
+            "name": "test",
+            "embeddings": [
+                {"sound_event_uuid": str(sound_event.uuid), "vector": [0]},
+                {"sound_event_uuid": str(missing), "vector": [1]},
+            ],
+        },
+        cookies=cookies,
+    )
+
+    assert response.status_code == 404
+    assert str(missing) in response.text
@@ -0,0 +1,153 @@
+"""Test suite for the caches shared between server workers."""
+
+import multiprocessing
+import os
+import sqlite3
+import time
+from pathlib import Path
+from uuid import uuid4
+
+from whombat import __main__ as main
+from whombat import schemas
+from whombat.cache import AppCache, SharedCache, clear_all_caches
+from whombat.jobs import JobManager, ProgressReporter
+from whombat.system import app as app_module
+from whombat.system import create_app
+from whombat.system import settings as settings_module
+from whombat.system.auth import TokenCache
+
+
+def test_shared_cache_values_are_seen_by_other_processes(tmp_path: Path):
+    cache = SharedCache(tmp_path / "cache.sqlite3", "test", maxsize=10)
+    key = (uuid4(), 0.5, "params")
+    cache["parent"] = 1
+
+    def write():
+        cache[key] = b"image"
+        os._exit(0 if cache["parent"] == 1 else 1)
+
+    process = multiprocessing.get_context("fork").Process(target=write)
+    process.start()
+    process.join()
+
+    assert process.exitcode == 0
+    assert cache[key] == b"image"
+    assert (
+        SharedCache(tmp_path / "cache.sqlite3", "other", 10).get(key) is None
+    )
+
+
+def test_shared_cache_evicts_oldest_and_expired_entries(tmp_path: Path):
+    cache = SharedCache(tmp_path / "cache.sqlite3", "test", maxsize=2)
+    for index in range(3):
+        cache[index] = index
+
+    assert 0 not in cache
+    assert len(cache) == 2
+
+    expiring = SharedCache(tmp_path / "cache.sqlite3", "ttl", 2, ttl=0.01)
+    expiring["key"] = "value"
+    time.sleep(0.02)
+    assert "key" not in expiring
+
+
+def test_shared_cache_database_errors_are_not_raised(
+    monkeypatch,
+    tmp_path: Path,
+):
+    cache = SharedCache(tmp_path / "cache.sqlite3", "test", maxsize=10)
+    cache["key"] = "value"
+
+    def locked(*args):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(cache, "_execute", locked)
+
+    cache["other"] = "value"
+    assert cache.get("key") is None
+    assert len(cache) == 0
+    cache.clear()
+    cache.pop("key", None)
+
+
+def test_app_caches_can_be_shared(tmp_path: Path):
+    cache = AppCache(f"test_{uuid4().hex}", maxsize=10)
+    cache["local"] = 1
+    assert cache.get("local") == 1
+
+    cache.share(tmp_path / "cache.sqlite3")
+    assert cache.get("local") is None
+
+    cache["shared"] = 2
+    other = SharedCache(tmp_path / "cache.sqlite3", cache.name, maxsize=10)
+    assert other["shared"] == 2
+
+    clear_all_caches()
+    assert "shared" not in other
+
+
+async def test_jobs_can_be_shared(tmp_path: Path):
+    worker, other = JobManager(), JobManager()
+    worker.share(tmp_path / "cache.sqlite3")
+    other.share(tmp_path / "cache.sqlite3")
+    progress = []
+
+    async def job(reporter: ProgressReporter) -> None:
+        reporter.set_total(2)
+        reporter.advance()
+        progress.append(other.get(reporter.job.uuid).done)
+        reporter.advance()
+
+    submitted = worker.submit("test", job)
+    await worker.wait(submitted.uuid)
+
+    assert progress == [1]
+    job_state = other.get(submitted.uuid)
+    assert job_state.status == schemas.JobStatus.completed
+    assert job_state.done == 2
+    assert job_state.finished_on is not None
+
+
+def test_multi_worker_server_initializes_once(monkeypatch, tmp_path: Path):
+    settings = settings_module.Settings(workers=4, dev=False)
+    calls = []
+
+    async def whombat_init(settings):
+        calls.append("init")
+
+    monkeypatch.setenv("WHOMBAT_DATA_DIR", str(tmp_path))
+    monkeypatch.delenv("WHOMBAT_INIT_ON_STARTUP", raising=False)
+    monkeypatch.setattr(main, "get_settings", lambda: settings)
+    monkeypatch.setattr("whombat.system.boot.whombat_init", whombat_init)
+    monkeypatch.setattr(
+        main.uvicorn,
+        "run",
+        lambda *args, **kwargs: calls.append(kwargs["workers"]),
+    )
+    monkeypatch.setattr("whombat.cache.share_caches", lambda *_, **__: None)
+    monkeypatch.setattr("whombat.jobs.jobs.share", lambda *_, **__: None)
+
+    main.serve()
+
+    assert calls == ["init", 4]
+    assert os.environ["WHOMBAT_INIT_ON_STARTUP"] == "false"
+    assert not settings_module.Settings().init_on_startup
+
+
+def test_multi_worker_app_does_not_cache_tokens(monkeypatch, test_settings):
+    cache = TokenCache()
+    disabled = []
+    monkeypatch.setattr(app_module, "token_cache", cache)
+    monkeypatch.setattr(
+        "whombat.api.common.permissions.disable_group_roles_cache",
+        lambda: disabled.append(True),
+    )
+    monkeypatch.setattr(app_module, "share_caches", lambda *_: None)
+    monkeypatch.setattr(app_module.jobs, "share", lambda *_: None)
+
+    create_app(test_settings.model_copy(update={"workers": 2}))
+
+    cache.set("token", object())  # type: ignore
+    assert cache.get("token") is None
+    assert len(cache) == 0
+    assert disabled == [True]
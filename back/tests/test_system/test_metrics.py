@@ -0,0 +1,118 @@
+"""Test suite for the request metrics."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from whombat.system import create_app
+from whombat.system.app.metrics import (
+    METRICS_PATH,
+    MetricsMiddleware,
+    QueryBudgetMiddleware,
+    metrics_endpoint,
+)
+from whombat.system.metrics import (
+    Histogram,
+    record_cache_access,
+    render_metrics,
+    request_db_queries,
+    request_duration,
+    timed,
+)
+from whombat.system.settings import Settings
+
+
+@timed("spectrogram")
+def compute():
+    return sum(range(1000))
+
+
+def create_test_app() -> FastAPI:
+    app = FastAPI()
+    engine = create_async_engine("sqlite+aiosqlite://")
+
+    @app.get("/items/{item_id}/")
+    async def get_item(item_id: int):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+        return {"id": item_id, "value": compute()}
+
+    app.add_route(METRICS_PATH, metrics_endpoint)
+    app.add_middleware(MetricsMiddleware)
+    app.add_middleware(QueryBudgetMiddleware, budget=1)
+    return app
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_seconds", "Test.", ["route"], [0.1, 1])
+    histogram.observe(0.05, "/a/")
+    histogram.observe(0.5, "/a/")
+    histogram.observe(5, "/a/")
+
+    samples = {
+        (name, labels.get("le")): value
+        for name, labels, value in histogram.samples()
+    }
+    assert samples["test_seconds_bucket", "0.1"] == 1
+    assert samples["test_seconds_bucket", "1"] == 2
+    assert samples["test_seconds_bucket", "+Inf"] == 3
+    assert samples["test_seconds_count", None] == 3
+    assert samples["test_seconds_sum", None] == pytest.approx(5.55)
+
+
+def test_requests_are_timed_and_exposed():
+    client = TestClient(create_test_app())
+    route = "/items/{item_id}/"
+    requests_before = request_duration.count("GET", route, "200")
+    queries_before = request_db_queries.get(route)
+
+    response = client.get("/items/1/")
+    assert response.status_code == 200
+
+    server_timing = response.headers["server-timing"]
+    assert server_timing.startswith("app;dur=")
+    assert "db;dur=" in server_timing
+    assert "spectrogram;dur=" in server_timing
+
+    assert request_duration.count("GET", route, "200") == requests_before + 1
+    assert request_db_queries.get(route) >= queries_before + 2
+
+    record_cache_access("test_cache", hit=True)
+    response = client.get(METRICS_PATH)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "server-timing" not in response.headers
+    assert (
+        'whombat_http_request_duration_seconds_count{method="GET",'
+        'route="/items/{item_id}/",status="200"}'
+    ) in response.text
+    assert (
+        'whombat_cache_requests_total{cache="test_cache",result="hit"}'
+        in render_metrics()
+    )
+
+
+def test_requests_over_the_query_budget_are_logged(caplog):
+    client = TestClient(create_test_app())
+
+    with caplog.at_level("WARNING", logger="whombat.system.app.metrics"):
+        client.get("/items/1/")
+
+    assert "exceeded the query budget of 1" in caplog.text
+    assert "2 queries executed" in caplog.text
+
+
+def test_metrics_are_only_served_when_enabled(test_settings: Settings):
+    client = TestClient(create_app(test_settings))
+    response = client.get(METRICS_PATH)
+    assert response.status_code == 404
+    assert "server-timing" not in response.headers
+
+    settings = test_settings.model_copy(update={"metrics": True})
+    client = TestClient(create_app(settings))
+    response = client.get(METRICS_PATH)
+    assert response.status_code == 200
+    assert "whombat_http_request_duration_seconds" in response.text
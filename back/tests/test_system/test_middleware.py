@@ -0,0 +1,97 @@
+"""Test suite for the compression and ETag middlewares."""
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from whombat.system.app.compression import (
+    CompressionMiddleware,
+    select_encoding,
+)
+from whombat.system.app.etags import ETagMiddleware, etag_matches
+
+PAYLOAD = {"items": [{"name": f"item {index}"} for index in range(200)]}
+
+
+def create_test_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/detail/")
+    async def get_items():
+        return PAYLOAD
+
+    @app.get("/small/")
+    async def get_small():
+        return {"name": "small"}
+
+    @app.get("/audio/")
+    async def get_audio():
+        return Response(b"\0" * 4096, media_type="audio/wav")
+
+    @app.get("/csv/")
+    async def get_csv():
+        rows = (f"{index},{index * 2}\n" for index in range(1000))
+        return StreamingResponse(rows, media_type="text/csv")
+
+    @app.get("/text/detail/")
+    async def get_text():
+        return PlainTextResponse("not json", status_code=201)
+
+    app.add_middleware(ETagMiddleware)
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=500,
+        media_types=["application/json", "text/csv"],
+    )
+    return app
+
+
+def test_select_encoding():
+    assert select_encoding("gzip, deflate") == "gzip"
+    assert select_encoding("gzip;q=0, deflate") is None
+    assert select_encoding("*") in {"br", "gzip"}
+    assert select_encoding("") is None
+
+
+def test_responses_are_compressed_by_media_type_and_size():
+    client = TestClient(create_test_app())
+    headers = {"Accept-Encoding": "gzip"}
+
+    response = client.get("/items/detail/", headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json() == PAYLOAD
+
+    response = client.get("/csv/", headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text.startswith("0,0\n1,2\n")
+
+    response = client.get("/small/", headers=headers)
+    assert "content-encoding" not in response.headers
+
+    response = client.get("/audio/", headers=headers)
+    assert "content-encoding" not in response.headers
+    assert len(response.content) == 4096
+
+
+def test_unchanged_detail_responses_return_not_modified():
+    client = TestClient(create_test_app())
+
+    response = client.get("/items/detail/")
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+
+    response = client.get("/items/detail/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    response = client.get(
+        "/items/detail/",
+        headers={"If-None-Match": 'W/"other"'},
+    )
+    assert response.status_code == 200
+
+    assert "etag" not in client.get("/small/").headers
+    assert "etag" not in client.get("/text/detail/").headers
+    assert etag_matches('W/"a"', '"b", "a"')
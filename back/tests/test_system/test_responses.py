@@ -0,0 +1,82 @@
+"""Test suite for the fast response serialization."""
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from whombat import schemas
+from whombat.system.app.responses import (
+    ORJSONResponse,
+    add_fast_responses,
+    get_exact_response,
+)
+
+
+def create_test_app() -> FastAPI:
+    app = FastAPI(default_response_class=ORJSONResponse)
+    tag = schemas.Tag(
+        id=1,
+        key="species",
+        value="Myotis myotis",
+        canonical_name="Myotis myotis",
+    )
+
+    @app.get("/page/", response_model=schemas.Page[schemas.Tag])
+    async def get_page():
+        return schemas.Page(items=[tag], total=1, offset=0, limit=10)
+
+    @app.get("/dict/", response_model=schemas.Tag)
+    async def get_dict():
+        return {
+            "id": 1,
+            "key": "species",
+            "value": "Myotis myotis",
+            "canonical_name": "Myotis myotis",
+        }
+
+    @app.get("/header/", response_model=schemas.Tag)
+    async def get_with_header(response: Response):
+        response.headers["x-test"] = "yes"
+        return tag
+
+    add_fast_responses(app)
+    return app
+
+
+def test_get_exact_response_rebuilds_untyped_pages():
+    tag = schemas.Tag(
+        id=1,
+        key="species",
+        value="Myotis myotis",
+        canonical_name="Myotis myotis",
+    )
+    page = schemas.Page(items=[tag], total=1, offset=0, limit=10)
+
+    exact = get_exact_response(page, schemas.Page[schemas.Tag])
+    assert isinstance(exact, schemas.Page[schemas.Tag])
+    assert exact.items == [tag]
+
+    assert get_exact_response(tag, schemas.Tag) is tag
+    assert get_exact_response([tag], list[schemas.Tag]) == [tag]
+    assert get_exact_response({"key": "a"}, schemas.Tag) is None
+    assert get_exact_response([tag], list[schemas.Note]) is None
+
+
+def test_fast_responses_match_regular_serialization():
+    client = TestClient(create_test_app())
+
+    response = client.get("/page/")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    page = response.json()
+    assert page["total"] == 1
+    assert page["items"][0]["key"] == "species"
+    assert page["items"][0]["value"] == "Myotis myotis"
+    assert "id" not in page["items"][0]
+
+    response = client.get("/dict/")
+    assert response.status_code == 200
+    assert response.json()["value"] == "Myotis myotis"
+
+    response = client.get("/header/")
+    assert response.status_code == 200
+    assert response.headers["x-test"] == "yes"
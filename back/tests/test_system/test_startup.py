@@ -0,0 +1,78 @@
+"""Test suite for the startup cost of the app."""
+
+import subprocess
+import sys
+from importlib.metadata import EntryPoint
+from types import ModuleType
+
+import pytest
+from fastapi import APIRouter, FastAPI
+
+from whombat import api, plugins
+from whombat.api import spectrograms
+
+HEAVY_MODULES = [
+    "matplotlib",
+    "pandas",
+    "pygbif",
+    "scipy",
+    "soundevent.audio",
+    "soundevent.evaluation",
+    "soundevent.geometry",
+    "torch",
+    "torchaudio",
+    "xarray",
+]
+
+
+def test_heavy_modules_are_not_imported_at_startup():
+    code = (
+        "import sys\n"
+        "import whombat.api, whombat.routes, whombat.system\n"
+        f"print([name for name in {HEAVY_MODULES!r} if name in sys.modules])"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert process.stdout.strip() == "[]"
+
+
+def test_heavy_api_functions_are_loaded_on_access():
+    assert api.compute_spectrogram is spectrograms.compute_spectrogram
+
+    with pytest.raises(AttributeError):
+        api.does_not_exist  # noqa: B018
+
+
+@pytest.fixture
+def plugin(monkeypatch: pytest.MonkeyPatch) -> ModuleType:
+    module = ModuleType("whombat_example")
+    module.__description__ = "An example plugin"
+    module.__version__ = "1.0.0"
+    module.router = APIRouter()
+    module.router.get("/hello")(lambda: "hello")
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+    monkeypatch.setattr(
+        plugins,
+        "entry_points",
+        lambda group: [
+            EntryPoint(name="example", value=module.__name__, group=group)
+        ],
+    )
+    plugins._load_plugins.cache_clear()
+    yield module
+    plugins._load_plugins.cache_clear()
+
+
+def test_plugins_are_loaded_from_entry_points(plugin: ModuleType):
+    loaded = list(plugins.load_plugins())
+    assert loaded == [("example", plugin)]
+
+    app = FastAPI()
+    plugins.add_plugin_routes(app, "example", plugin)
+    assert "/plugins/routes/example/hello" in {
+        route.path for route in app.routes
+    }
@@ -29,6 +29,11 @@ a = Analysis(
         "rasterio.crs",
         "rasterio.vrt",
         "rasterio._features",
+        # Imported on first use by `whombat.api`.
+        "whombat.api.acoustic_features",
+        "whombat.api.audio",
+        "whombat.api.species",
+        "whombat.api.spectrograms",
     ],
     hookspath=[],
     hooksconfig={},